@@ -5,12 +5,14 @@ This package provides centralized AI management for the CV application.
 """
 
 from .ai_config import ai_config
-from .ai_service import ai_service
-from .base_provider import BaseAIProvider, AIResponse
+from .ai_service import ai_service, AIProviderHandle
+from .base_provider import BaseAIProvider, AIResponse, AIStreamEvent
 
 __all__ = [
     "ai_config",
     "ai_service", 
+    "AIProviderHandle",
     "BaseAIProvider",
-    "AIResponse"
+    "AIResponse",
+    "AIStreamEvent"
 ]
@@ -5,16 +5,153 @@ This module provides a centralized service for managing all AI providers,
 handling dynamic switching, and providing a unified interface for AI operations.
 """
 
-from typing import Dict, List, Optional, Any, Type, Tuple
+import copy
+import hashlib
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any, Type, Tuple
 from app.ai.ai_config import ai_config
-from app.ai.base_provider import BaseAIProvider, AIResponse
+from app.ai.base_provider import BaseAIProvider, AIResponse, AIStreamEvent
 from app.ai.providers import OpenAIProvider, AnthropicProvider, DeepSeekProvider
+from app.ai.response_cache import llm_response_cache
+from app.utils.single_flight import llm_single_flight
 import logging
 from app.core.model_dependency import get_request_model
 
 logger = logging.getLogger(__name__)
 
 
+class AIProviderHandle:
+    """
+    Request-scoped handle to a user's AI provider.
+    
+    The handle owns its own copy of the provider pinned to the model resolved
+    for the request, so concurrent requests for different users or models never
+    share mutable provider state. Resolve it once and pass it down to every
+    stage that needs to talk to the LLM.
+    """
+    
+    def __init__(self, user: Any, provider: BaseAIProvider):
+        self.user = user
+        self.provider = provider
+    
+    @property
+    def provider_name(self) -> str:
+        return self.provider.provider_name
+    
+    @property
+    def model_name(self) -> str:
+        return self.provider.model_name
+    
+    async def generate_response(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True,
+        on_chunk: Optional[Callable[[str], Awaitable[None]]] = None,
+        **kwargs
+    ) -> AIResponse:
+        """
+        Generate a response with this handle's provider and model, replaying cached deterministic calls
+        
+        When on_chunk is given the provider streams the completion and every text
+        delta is passed to on_chunk as it arrives; the assembled response is returned.
+        """
+        if on_chunk is not None:
+            response = None
+            async for event in self.stream_response(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                use_cache=use_cache,
+                **kwargs
+            ):
+                if event.is_final:
+                    response = event.response
+                else:
+                    await on_chunk(event.delta)
+            return response
+        
+        cache_key = self._cache_key(prompt, system_prompt, temperature, max_tokens, use_cache, kwargs)
+        if cache_key:
+            cached = await llm_response_cache.get_async(cache_key)
+            if cached:
+                logger.info(f"⚡ [LLM_CACHE] Hit for provider: {self.provider_name}, model: {self.model_name}")
+                return cached
+        
+        async def _call_provider() -> AIResponse:
+            logger.info(f"Generating response with provider: {self.provider_name}, model: {self.model_name}")
+            response = await self.provider.generate_response(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+            if cache_key:
+                await llm_response_cache.set_async(cache_key, response)
+            return response
+        
+        if cache_key:
+            # Concurrent identical deterministic calls share one provider round-trip
+            return await llm_single_flight.do(cache_key, _call_provider)
+        return await _call_provider()
+    
+    async def stream_response(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True,
+        **kwargs
+    ) -> AsyncIterator[AIStreamEvent]:
+        """Stream a response as text deltas followed by a final event with the assembled AIResponse"""
+        cache_key = self._cache_key(prompt, system_prompt, temperature, max_tokens, use_cache, kwargs)
+        if cache_key:
+            cached = await llm_response_cache.get_async(cache_key)
+            if cached:
+                logger.info(f"⚡ [LLM_CACHE] Hit for provider: {self.provider_name}, model: {self.model_name} (streamed)")
+                yield AIStreamEvent(delta=cached.content)
+                yield AIStreamEvent(response=cached)
+                return
+        
+        logger.info(f"Streaming response with provider: {self.provider_name}, model: {self.model_name}")
+        async for event in self.provider.stream_response(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        ):
+            if event.is_final and cache_key:
+                await llm_response_cache.set_async(cache_key, event.response)
+            yield event
+    
+    def _cache_key(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        use_cache: bool,
+        kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        if not use_cache or not llm_response_cache.is_cacheable(temperature, kwargs):
+            return None
+        return llm_response_cache.make_key(
+            self._owner(), self.provider_name, self.model_name, prompt, system_prompt, temperature, max_tokens, kwargs
+        )
+    
+    def _owner(self) -> str:
+        """Caller identity for cache and in-flight keys: completions and errors are per user and API key"""
+        user_id = getattr(self.user, "id", None) or getattr(self.user, "email", None) or ""
+        api_key = getattr(self.provider, "api_key", None) or ""
+        key_fingerprint = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16] if api_key else ""
+        return f"{user_id}:{key_fingerprint}"
+
+
 class AIServiceManager:
     """
     Centralized AI service manager that handles all AI providers
@@ -48,24 +185,20 @@ class AIServiceManager:
         logger.info(f"- Current provider name: {self.config.get_current_provider()}")
         logger.info(f"- Cached providers for user: {list(self._validated_providers.get(user_email, {}).keys())}")
         
-        # Check if we already have validated providers for this user
-        if user_email in self._validated_providers and self._validated_providers[user_email]:
-            logger.info(f"✅ [AI_SERVICE] Using cached providers for user {user_email}")
-            self._providers = self._validated_providers[user_email].copy()
-        else:
-            logger.info(f"🔄 [AI_SERVICE] Initializing new providers for user {user_email}")
-            self._providers.clear()
-            self._initialize_providers(user)
-            
-            # Cache the validated providers for this user
-            if self._providers:
-                self._validated_providers[user_email] = self._providers.copy()
-                logger.info(f"💾 [AI_SERVICE] Cached {len(self._providers)} providers for user {user_email}")
+        # Legacy global view; request handlers should use resolve_provider() instead
+        self._providers = self._get_user_providers(user).copy()
         
         logger.info(f"🔍 [AI_SERVICE] After initialization:")
         logger.info(f"- Current providers: {list(self._providers.keys())}")
         logger.info(f"- Current provider name: {self.config.get_current_provider()}")
     
+    async def initialize_for_user_async(self, user: Any):
+        """initialize_for_user for request handlers: the user's keys are loaded without blocking the loop"""
+        if user and user.email not in self._validated_providers:
+            from app.services.user_api_key_manager import user_api_key_manager
+            await user_api_key_manager.get_all_api_key_info_async(user)
+        self.initialize_for_user(user)
+    
     def refresh_providers(self, user: Optional[Any] = None):
         """Refresh all providers after API keys have been updated"""
         logger.info("🔄 Refreshing AI providers after API key changes")
@@ -81,18 +214,40 @@ class AIServiceManager:
         
         self._providers.clear()
         if user:
-            self._initialize_providers(user)
-            # Re-cache the providers
-            if self._providers:
-                self._validated_providers[user.email] = self._providers.copy()
+            self._providers = self._get_user_providers(user).copy()
     
-    def _initialize_providers(self, user: Optional[Any] = None):
+    def _get_user_providers(self, user: Any) -> Dict[str, BaseAIProvider]:
+        """Return the user's validated providers, initializing and caching them on first use"""
+        user_email = user.email
+        cached = self._validated_providers.get(user_email)
+        if cached:
+            logger.debug(f"✅ [AI_SERVICE] Using cached providers for user {user_email}")
+            return cached
+        
+        logger.info(f"🔄 [AI_SERVICE] Initializing new providers for user {user_email}")
+        providers = self._initialize_providers(user)
+        
+        # Cache the validated providers for this user
+        if providers:
+            self._validated_providers[user_email] = providers
+            logger.info(f"💾 [AI_SERVICE] Cached {len(providers)} providers for user {user_email}")
+        return providers
+    
+    def _initialize_providers(self, user: Optional[Any] = None) -> Dict[str, BaseAIProvider]:
         """Initialize all available providers based on user-specific API keys"""
+        providers: Dict[str, BaseAIProvider] = {}
         if not user:
             logger.warning("⚠️ No user provided for provider initialization - providers will not be initialized")
-            return
+            return providers
             
+        # One query for every provider's key and validation status; the lookups below hit the cache
+        from app.services.user_api_key_manager import user_api_key_manager
+        key_infos = user_api_key_manager.get_all_api_key_info(user)
+        
         for provider_name, provider_class in self._provider_classes.items():
+            if provider_name not in key_infos:
+                logger.debug(f"🔍 No API key found for {provider_name} for user {user.email}")
+                continue
             api_key = self.config.get_api_key(provider_name, user)
             if api_key:
                 try:
@@ -104,12 +259,11 @@ class AIServiceManager:
                         
                         # Trust the database validation status instead of re-validating every time
                         # Only validate if the key was never validated or marked as invalid
-                        from app.services.user_api_key_manager import user_api_key_manager
-                        key_info = user_api_key_manager.get_api_key_info(user, provider_name)
+                        key_info = key_infos.get(provider_name)
                         
                         if key_info:
                             # API key exists (valid or invalid), initialize provider
-                            self._providers[provider_name] = provider_instance
+                            providers[provider_name] = provider_instance
                             if key_info.is_valid:
                                 logger.info(f"✅ Initialized {provider_name} provider with model {default_model} for user {user.email} (valid API key)")
                             else:
@@ -118,7 +272,7 @@ class AIServiceManager:
                             # No validation record, do a one-time validation
                             logger.info(f"🔍 No validation record for {provider_name}, performing one-time validation for user {user.email}")
                             if provider_instance.is_available():
-                                self._providers[provider_name] = provider_instance
+                                providers[provider_name] = provider_instance
                                 # Mark as valid in database
                                 user_api_key_manager._mark_key_as_valid(user, provider_name)
                                 logger.info(f"✅ Initialized {provider_name} provider with model {default_model} for user {user.email} (validated and cached)")
@@ -130,6 +284,8 @@ class AIServiceManager:
                     logger.error(f"❌ Failed to initialize {provider_name} provider for user {user.email}: {e}")
             else:
                 logger.debug(f"🔍 No API key found for {provider_name} for user {user.email}")
+        
+        return providers
     
     def get_current_provider(self) -> Optional[BaseAIProvider]:
         """Get the current active provider"""
@@ -294,6 +450,66 @@ class AIServiceManager:
         logger.info(f"✅ Switched to model {resolved_model_name}")
         return True
     
+    def resolve_provider(
+        self,
+        user: Any,
+        provider_name: Optional[str] = None,
+        model_name: Optional[str] = None
+    ) -> AIProviderHandle:
+        """
+        Resolve a request-scoped provider handle for a user
+        
+        The provider comes from the per-user validated cache; the model comes from
+        the explicit argument, then the request-specific model, then the configured
+        current model.
+        
+        Args:
+            user: User object (required for API key access)
+            provider_name: Optional specific provider to use
+            model_name: Optional model name or display name to pin the handle to
+            
+        Returns:
+            AIProviderHandle bound to a private copy of the provider
+            
+        Raises:
+            Exception: If no user provided or no valid API key found
+        """
+        if not user:
+            from app.exceptions.cv_exceptions import APIKeyError
+            raise APIKeyError("User context is required for AI operations. Please ensure you are authenticated.")
+        
+        providers = self._get_user_providers(user)
+        model_name = model_name or get_request_model()
+        explicit_provider = provider_name is not None
+        
+        # Find the provider owning the requested model, preferring providers the user has keys for
+        if not provider_name and model_name:
+            candidates = list(providers.keys()) + [p for p in self.config.get_available_providers() if p not in providers]
+            for candidate in candidates:
+                if self._resolve_model_name(model_name, candidate):
+                    provider_name = candidate
+                    break
+        
+        if not provider_name:
+            provider_name = self.config.get_current_provider()
+            model_name = model_name or self.config.get_current_model_name()
+        
+        provider = providers.get(provider_name) if provider_name else None
+        if not provider:
+            if explicit_provider:
+                available_providers = list(providers.keys())
+                logger.error(f"❌ Provider '{provider_name}' not available. Available providers: {available_providers}")
+                raise Exception(f"Provider '{provider_name}' not available. Available providers: {available_providers}")
+            from app.exceptions.cv_exceptions import APIKeyNotFoundError
+            raise APIKeyNotFoundError(provider_name or "any", user.email)
+        
+        scoped_provider = copy.copy(provider)
+        resolved_model = self._resolve_model_name(model_name, provider_name) if model_name else None
+        if resolved_model:
+            scoped_provider.model_name = resolved_model
+        
+        return AIProviderHandle(user, scoped_provider)
+    
     async def generate_response(
         self, 
         prompt: str, 
@@ -302,6 +518,9 @@ class AIServiceManager:
         temperature: float = 0.0,
         max_tokens: Optional[int] = None,
         provider_name: Optional[str] = None,
+        provider: Optional[AIProviderHandle] = None,
+        use_cache: bool = True,
+        on_chunk: Optional[Callable[[str], Awaitable[None]]] = None,
         **kwargs
     ) -> AIResponse:
         """
@@ -314,6 +533,9 @@ class AIServiceManager:
             temperature: Response randomness (0.0 to 1.0)
             max_tokens: Maximum tokens in response
             provider_name: Optional specific provider to use
+            provider: Optional pre-resolved request-scoped provider handle
+            use_cache: Replay identical deterministic (temperature 0) calls from the response cache
+            on_chunk: Optional coroutine called with each text delta; enables provider streaming
             **kwargs: Additional provider-specific parameters
             
         Returns:
@@ -322,11 +544,6 @@ class AIServiceManager:
         Raises:
             Exception: If no user provided or no valid API key found
         """
-        # Validate user is provided
-        if not user:
-            from app.exceptions.cv_exceptions import APIKeyError
-            raise APIKeyError("User context is required for AI operations. Please ensure you are authenticated.")
-        
         logger.info(f"🔍 [AI_SERVICE] Generating response:")
         logger.info(f"- User: {user.email if hasattr(user, 'email') else 'Unknown'}")
         logger.info(f"- Prompt length: {len(prompt)}")
@@ -335,55 +552,57 @@ class AIServiceManager:
         logger.info(f"- Max tokens: {max_tokens}")
         logger.info(f"- Provider override: {provider_name}")
         
-        # Check if there's a request-specific model set
-        request_model_id = get_request_model()
-        if request_model_id:
-            # Ensure we're using the request-specific model
-            logger.debug(f"Using request-specific model: {request_model_id}")
-            # The model should already be switched by the dependency
-            # but let's make sure the provider is correctly set
-            current_provider_name = self.config.get_current_provider()
-            provider = self._providers.get(current_provider_name)
-            if provider and provider.model_name != request_model_id:
-                # Need to ensure the model is correctly set
-                model_config = self.config.get_model_config()
-                if model_config and model_config.model == request_model_id:
-                    provider.model_name = request_model_id
-                    logger.debug(f"Updated provider model to match request: {request_model_id}")
-        
-        # Determine which provider to use
-        if provider_name:
-            provider = self.get_provider(provider_name)
-            if not provider:
-                available_providers = self.get_available_providers()
-                logger.error(f"❌ Provider '{provider_name}' not available. Available providers: {available_providers}")
-                raise Exception(f"Provider '{provider_name}' not available. Available providers: {available_providers}")
-        else:
-            provider = self.get_current_provider()
-            if not provider:
-                current_provider_name = self.config.get_current_provider()
-                from app.exceptions.cv_exceptions import APIKeyNotFoundError, AIProviderUnavailableError
-                
-                # Check if it's an API key issue or provider availability issue
-                if current_provider_name:
-                    # Provider is configured but not available - likely API key issue
-                    raise APIKeyNotFoundError(current_provider_name, user.email)
-                else:
-                    # No provider configured at all
-                    raise APIKeyNotFoundError("any", user.email)
-        
-        # Log the actual model being used
-        logger.info(f"Generating response with provider: {provider.provider_name}, model: {provider.model_name}")
+        if provider is None:
+            provider = self.resolve_provider(user, provider_name)
         
-        # Generate response
         return await provider.generate_response(
             prompt=prompt,
             system_prompt=system_prompt,
             temperature=temperature,
             max_tokens=max_tokens,
+            use_cache=use_cache,
+            on_chunk=on_chunk,
             **kwargs
         )
     
+    async def stream_response(
+        self,
+        prompt: str,
+        user: Any,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        provider_name: Optional[str] = None,
+        provider: Optional[AIProviderHandle] = None,
+        use_cache: bool = True,
+        **kwargs
+    ) -> AsyncIterator[AIStreamEvent]:
+        """
+        Stream a response using the current or specified provider
+        
+        Yields:
+            AIStreamEvent text deltas, then a final event carrying the assembled AIResponse
+        """
+        if provider is None:
+            provider = self.resolve_provider(user, provider_name)
+        
+        async for event in provider.stream_response(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            use_cache=use_cache,
+            **kwargs
+        ):
+            yield event
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get LLM response cache hit/miss counters and in-flight deduplication stats"""
+        return {
+            **llm_response_cache.get_stats(),
+            "single_flight": llm_single_flight.get_stats()
+        }
+    
     def get_available_providers(self) -> List[str]:
         """Get list of available providers"""
         return list(self._providers.keys())
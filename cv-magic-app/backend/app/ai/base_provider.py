@@ -6,7 +6,7 @@ This ensures consistency across different AI services (OpenAI, Claude, DeepSeek,
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 from enum import Enum
 
 
@@ -48,6 +48,23 @@ class AIResponse:
         }
 
 
+class AIStreamEvent:
+    """
+    One step of a streamed response.
+    
+    Intermediate events carry a text delta; the final event carries the
+    assembled AIResponse (full content, token usage and cost).
+    """
+    
+    def __init__(self, delta: str = "", response: Optional[AIResponse] = None):
+        self.delta = delta
+        self.response = response
+    
+    @property
+    def is_final(self) -> bool:
+        return self.response is not None
+
+
 class BaseAIProvider(ABC):
     """
     Abstract base class for all AI providers.
@@ -95,6 +112,34 @@ class BaseAIProvider(ABC):
         """
         pass
     
+    async def stream_response(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[AIStreamEvent]:
+        """
+        Stream a response from the AI model as it is generated.
+        
+        Providers with native streaming override this. The default falls back
+        to a single delta containing the whole completion.
+        
+        Yields:
+            AIStreamEvent deltas, then one final event with the assembled AIResponse
+        """
+        response = await self.generate_response(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+        if response.content:
+            yield AIStreamEvent(delta=response.content)
+        yield AIStreamEvent(response=response)
+    
     @abstractmethod
     def get_available_models(self) -> List[str]:
         """Return list of available models for this provider"""
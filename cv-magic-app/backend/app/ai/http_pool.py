@@ -0,0 +1,109 @@
+"""
+AI Provider Connection Pool
+
+This module keeps one keep-alive HTTP connection pool and one concurrency
+limiter per AI provider, so provider calls never block the event loop and
+never open more than a bounded number of concurrent LLM requests.
+
+Pools are tracked per running event loop because some background tasks run
+the pipeline on their own loop, and httpx clients cannot be shared across loops.
+"""
+
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _LoopPools:
+    """HTTP clients and semaphores owned by a single event loop"""
+
+    def __init__(self):
+        self.clients: Dict[str, httpx.AsyncClient] = {}
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+class ProviderConnectionPool:
+    """
+    Shared keep-alive connection pools for AI providers.
+
+    Every provider instance (one per user API key) borrows the same
+    `httpx.AsyncClient` for its provider name, so TLS connections to the
+    upstream API are reused across users and requests.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        max_concurrent_requests: int = 10,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.max_concurrent_requests = max_concurrent_requests
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopPools]" = weakref.WeakKeyDictionary()
+
+    def _loop_pools(self) -> _LoopPools:
+        loop = asyncio.get_running_loop()
+        pools = self._pools.get(loop)
+        if pools is None:
+            pools = _LoopPools()
+            self._pools[loop] = pools
+        return pools
+
+    def get_http_client(self, provider_name: str) -> httpx.AsyncClient:
+        """Return the pooled async HTTP client for a provider on the running loop"""
+        pools = self._loop_pools()
+        client = pools.clients.get(provider_name)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(120.0, connect=15.0),
+            )
+            pools.clients[provider_name] = client
+            logger.info(f"🔌 [AI_POOL] Created connection pool for {provider_name}")
+        return client
+
+    @asynccontextmanager
+    async def limit(self, provider_name: str):
+        """Hold one of the provider's concurrent request slots for the duration of a call"""
+        pools = self._loop_pools()
+        semaphore = pools.semaphores.get(provider_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            pools.semaphores[provider_name] = semaphore
+        async with semaphore:
+            yield
+
+    async def aclose(self):
+        """Close all pooled clients owned by the running event loop"""
+        pools = self._pools.pop(asyncio.get_running_loop(), None)
+        if not pools:
+            return
+        for provider_name, client in pools.clients.items():
+            try:
+                await client.aclose()
+                logger.info(f"🔌 [AI_POOL] Closed connection pool for {provider_name}")
+            except Exception as e:
+                logger.warning(f"⚠️ [AI_POOL] Failed to close pool for {provider_name}: {e}")
+
+
+# Global connection pool instance
+provider_pool = ProviderConnectionPool(
+    max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE,
+    max_concurrent_requests=settings.AI_MAX_CONCURRENT_REQUESTS,
+)
@@ -0,0 +1,235 @@
+"""
+Prompt Template Registry
+
+This module loads every prompt template once and serves rendered prompts from
+memory. Python template modules are compiled once into a private namespace
+(instead of being imported or exec'd per call), str.format templates have
+their fields parsed up front, and plain text templates are read once.
+
+Each template carries a hash of its source file and every rendered prompt a
+hash of its final text, so callers can key caches on exactly what was sent.
+With hot reload enabled (development), a template whose file changed on disk
+is recompiled on its next use.
+"""
+
+import hashlib
+import logging
+import string
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent.parent
+
+FORMAT = "format"      # str.format template (module constant or text file)
+CALLABLE = "callable"  # function in a template module
+TEXT = "text"          # literal text, returned as-is
+
+
+class RenderedPrompt(NamedTuple):
+    """A rendered prompt and the hashes to key caches on"""
+    name: str
+    text: str
+    template_hash: str
+    content_hash: str
+
+
+class PromptTemplate:
+    """One compiled template and the file it came from"""
+
+    def __init__(self, name: str, kind: str, source: Path, attr: Optional[str] = None):
+        self.name = name
+        self.kind = kind
+        self.source = source
+        self.attr = attr
+        self.template: Any = None
+        self.fields: List[str] = []
+        self.template_hash = ""
+        self.mtime = 0.0
+        self.checked_at = 0.0
+
+    def load(self) -> None:
+        """(Re)compile the template from its source file"""
+        raw = self.source.read_bytes()
+        mtime = self.source.stat().st_mtime
+        if self.attr is None:
+            template: Any = raw.decode("utf-8")
+        else:
+            template = _compile_module(self.source, raw)
+            for part in self.attr.split("."):
+                template = getattr(template, part) if not isinstance(template, dict) else template[part]
+
+        if self.kind == FORMAT:
+            self.fields = sorted({field for _, field, _, _ in string.Formatter().parse(template) if field})
+        elif self.kind == CALLABLE and not callable(template):
+            raise TypeError(f"Prompt '{self.name}': {self.attr} in {self.source} is not callable")
+
+        self.template = template
+        self.template_hash = hashlib.sha256(raw).hexdigest()
+        self.mtime = mtime
+        self.checked_at = time.monotonic()
+
+    def render(self, *args: Any, **kwargs: Any) -> str:
+        if self.kind == CALLABLE:
+            return self.template(*args, **kwargs)
+        if self.kind == FORMAT:
+            missing = [field for field in self.fields if field not in kwargs]
+            if missing:
+                raise KeyError(f"Prompt '{self.name}' is missing values for: {', '.join(missing)}")
+            return self.template.format(**kwargs)
+        return self.template
+
+
+def _compile_module(path: Path, source: bytes) -> Dict[str, Any]:
+    """Execute a template module's code once into a fresh namespace"""
+    try:
+        module_name = ".".join(path.relative_to(BACKEND_ROOT).with_suffix("").parts)
+    except ValueError:
+        module_name = path.stem
+    namespace: Dict[str, Any] = {
+        "__name__": module_name,
+        "__file__": str(path),
+        # Lets lazy relative imports inside template functions resolve
+        "__package__": module_name.rpartition(".")[0],
+    }
+    exec(compile(source, str(path), "exec"), namespace)
+    return namespace
+
+
+class PromptRegistry:
+    """
+    Named prompt templates compiled once per process.
+
+    Lookups are lock-free once loaded; with hot reload on, each template's
+    file is stat'ed at most once per check interval.
+    """
+
+    def __init__(self, hot_reload: bool = False, check_interval: float = 2.0):
+        self.hot_reload = hot_reload
+        self.check_interval = check_interval
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._lock = threading.RLock()
+        self._stats = {"renders": 0, "loads": 0, "reloads": 0}
+
+    def register(self, name: str, kind: str, path: str, attr: Optional[str] = None) -> None:
+        """
+        Register a template source (compiled lazily or by load_all)
+
+        Args:
+            name: Registry key used by callers
+            kind: FORMAT, CALLABLE or TEXT
+            path: Source file, relative to the backend root
+            attr: Dotted attribute inside a Python module; None for text files
+        """
+        with self._lock:
+            self._templates[name] = PromptTemplate(name, kind, BACKEND_ROOT / path, attr)
+
+    def load_all(self) -> int:
+        """Compile every registered template; returns how many loaded"""
+        loaded = 0
+        for name in list(self._templates):
+            try:
+                self.get(name)
+                loaded += 1
+            except Exception as e:
+                logger.error(f"❌ [PROMPTS] Failed to load prompt template '{name}': {e}")
+        logger.info(f"📋 [PROMPTS] Loaded {loaded}/{len(self._templates)} prompt templates (hot reload: {self.hot_reload})")
+        return loaded
+
+    def get(self, name: str) -> PromptTemplate:
+        """Compiled template by name, reloading it first if its file changed"""
+        template = self._templates.get(name)
+        if template is None:
+            raise KeyError(f"Unknown prompt template: {name}")
+        if template.template is None:
+            with self._lock:
+                if template.template is None:
+                    template.load()
+                    self._stats["loads"] += 1
+        elif self.hot_reload and time.monotonic() - template.checked_at >= self.check_interval:
+            self._maybe_reload(template)
+        return template
+
+    def _maybe_reload(self, template: PromptTemplate) -> None:
+        with self._lock:
+            template.checked_at = time.monotonic()
+            try:
+                if template.source.stat().st_mtime == template.mtime:
+                    return
+                template.load()
+                self._stats["reloads"] += 1
+                logger.info(f"🔄 [PROMPTS] Reloaded prompt template '{template.name}' from {template.source}")
+            except Exception as e:
+                # Keep serving the last good version while the file is being edited
+                logger.warning(f"⚠️ [PROMPTS] Could not reload '{template.name}', keeping previous version: {e}")
+
+    def render(self, name: str, *args: Any, **kwargs: Any) -> RenderedPrompt:
+        """
+        Render a template
+
+        Args:
+            name: Registry key
+            *args, **kwargs: Arguments for callable templates, or format values
+
+        Returns:
+            RenderedPrompt with the text, the template source hash and the text hash
+        """
+        template = self.get(name)
+        text = template.render(*args, **kwargs)
+        self._stats["renders"] += 1
+        return RenderedPrompt(
+            name=name,
+            text=text,
+            template_hash=template.template_hash,
+            content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        )
+
+    def text(self, name: str) -> str:
+        """Raw template text (for TEXT templates such as the tailoring framework)"""
+        return self.render(name).text
+
+    def list_templates(self) -> List[Dict[str, Any]]:
+        """Registered templates with their source and current hash"""
+        return [
+            {
+                "name": template.name,
+                "kind": template.kind,
+                "source": str(template.source),
+                "template_hash": template.template_hash or None,
+                "fields": template.fields,
+                "loaded": template.template is not None,
+            }
+            for template in self._templates.values()
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Render, load and reload counters"""
+        return dict(self._stats, templates=len(self._templates))
+
+
+# Global prompt registry instance
+prompt_registry = PromptRegistry(
+    hot_reload=settings.PROMPT_HOT_RELOAD,
+    check_interval=settings.PROMPT_RELOAD_CHECK_SECONDS,
+)
+
+for _name, _kind, _path, _attr in (
+    ("ai_recommendation", CALLABLE, "prompt/ai_recommendation_prompt_template.py", "generate_ai_recommendation_prompt"),
+    ("ats_technical", FORMAT, "prompt/ats_technical_prompt.py", "TECHNICAL_DEPTH_PROMPT"),
+    ("ats_experience", FORMAT, "prompt/ats_experience_prompt.py", "EXPERIENCE_ALIGNMENT_PROMPT"),
+    ("ats_industry", FORMAT, "prompt/ats_industry_prompt.py", "INDUSTRY_FIT_PROMPT"),
+    ("ats_seniority", FORMAT, "prompt/ats_seniority_prompt.py", "ROLE_SENIORITY_PROMPT"),
+    ("ats_skills_relevance", FORMAT, "prompt/ats_skills_relevance_prompt.py", "SKILLS_RELEVANCE_PROMPT"),
+    ("job_extraction", TEXT, "prompt/job_extraction_prompt.txt", None),
+    ("jd_analysis_system", TEXT, "app/services/jd_analysis/jd_analysis_prompt.py", "JD_ANALYSIS_SYSTEM_PROMPT"),
+    ("jd_analysis_user", FORMAT, "app/services/jd_analysis/jd_analysis_prompt.py", "JD_ANALYSIS_USER_PROMPT"),
+    ("skill_extraction", CALLABLE, "app/services/skill_extraction/prompt_templates.py", "SkillExtractionPrompts.get_skill_extraction_template"),
+    ("skill_extraction_system", CALLABLE, "app/services/skill_extraction/prompt_templates.py", "SkillExtractionPrompts.get_system_prompt"),
+    ("tailoring_framework", TEXT, "app/tailored_cv/prompts/framework.md", None),
+):
+    prompt_registry.register(_name, _kind, _path, _attr)
@@ -5,8 +5,9 @@ This module implements the Anthropic provider for the AI service system.
 """
 
 import anthropic
-from typing import Dict, List, Optional, Any
-from app.ai.base_provider import BaseAIProvider, AIResponse
+from typing import AsyncIterator, Dict, List, Optional, Any
+from app.ai.base_provider import BaseAIProvider, AIResponse, AIStreamEvent
+from app.ai.http_pool import provider_pool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +18,9 @@ class AnthropicProvider(BaseAIProvider):
     
     def __init__(self, api_key: str, model_name: str = "claude-3-5-haiku-20241022"):
         super().__init__(api_key, model_name)
-        self.client = anthropic.Anthropic(api_key=api_key)
+        # Async client is bound lazily to the shared connection pool of the running loop
+        self._async_client: Optional[anthropic.AsyncAnthropic] = None
+        self._async_http_client = None
     
     def _get_provider_name(self) -> str:
         """Return the provider name"""
@@ -26,8 +29,9 @@ class AnthropicProvider(BaseAIProvider):
     def _validate_api_key(self) -> bool:
         """Validate if the API key is working"""
         try:
-            # Try a simple completion as a test
-            response = self.client.messages.create(
+            # Try a simple completion as a test (sync: validation runs outside the event loop)
+            client = anthropic.Anthropic(api_key=self.api_key)
+            response = client.messages.create(
                 model=self.model_name,
                 max_tokens=10,
                 messages=[{"role": "user", "content": "test"}]
@@ -37,6 +41,38 @@ class AnthropicProvider(BaseAIProvider):
             logger.error(f"Anthropic API key validation failed: {e}")
             return False
     
+    def _get_async_client(self) -> anthropic.AsyncAnthropic:
+        """Return an async client that uses the pooled keep-alive connections"""
+        http_client = provider_pool.get_http_client(self.provider_name)
+        if self._async_client is None or self._async_http_client is not http_client:
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key, http_client=http_client)
+            self._async_http_client = http_client
+        return self._async_client
+    
+    def _build_request_params(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Prepare Messages API request parameters"""
+        request_params = {
+            "model": self.model_name,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens or 4000,  # Claude requires max_tokens
+        }
+        
+        # Add system prompt if provided
+        if system_prompt:
+            request_params["system"] = system_prompt
+        
+        # Add any additional parameters
+        request_params.update(kwargs)
+        return request_params
+    
     async def generate_response(
         self, 
         prompt: str, 
@@ -48,23 +84,11 @@ class AnthropicProvider(BaseAIProvider):
         """Generate response using Anthropic Claude"""
         
         try:
-            # Prepare request parameters
-            request_params = {
-                "model": self.model_name,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": temperature,
-                "max_tokens": max_tokens or 4000,  # Claude requires max_tokens
-            }
+            request_params = self._build_request_params(prompt, system_prompt, temperature, max_tokens, **kwargs)
             
-            # Add system prompt if provided
-            if system_prompt:
-                request_params["system"] = system_prompt
-            
-            # Add any additional parameters
-            request_params.update(kwargs)
-            
-            # Make API call
-            response = self.client.messages.create(**request_params)
+            # Make API call without blocking the event loop
+            async with provider_pool.limit(self.provider_name):
+                response = await self._get_async_client().messages.create(**request_params)
             
             # Extract response data
             content = response.content[0].text if response.content else ""
@@ -94,6 +118,50 @@ class AnthropicProvider(BaseAIProvider):
             logger.error(f"Anthropic API call failed: {e}")
             raise Exception(f"Anthropic API error: {str(e)}")
     
+    async def stream_response(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[AIStreamEvent]:
+        """Stream a response from Anthropic Claude token by token"""
+        
+        try:
+            request_params = self._build_request_params(prompt, system_prompt, temperature, max_tokens, **kwargs)
+            request_params.pop("stream", None)
+            
+            parts: List[str] = []
+            async with provider_pool.limit(self.provider_name):
+                async with self._get_async_client().messages.stream(**request_params) as stream:
+                    async for text in stream.text_stream:
+                        parts.append(text)
+                        yield AIStreamEvent(delta=text)
+                    final_message = await stream.get_final_message()
+            
+            tokens_used = None
+            if getattr(final_message, 'usage', None):
+                tokens_used = final_message.usage.input_tokens + final_message.usage.output_tokens
+            
+            yield AIStreamEvent(response=AIResponse(
+                content="".join(parts),
+                model=self.model_name,
+                provider=self.provider_name,
+                tokens_used=tokens_used,
+                cost=self._calculate_cost(tokens_used) if tokens_used else None,
+                metadata={
+                    "stop_reason": final_message.stop_reason,
+                    "response_id": final_message.id,
+                    "role": final_message.role,
+                    "streamed": True
+                }
+            ))
+            
+        except Exception as e:
+            logger.error(f"Anthropic streaming call failed: {e}")
+            raise Exception(f"Anthropic API error: {str(e)}")
+    
     def get_available_models(self) -> List[str]:
         """Get available Anthropic models"""
         return [
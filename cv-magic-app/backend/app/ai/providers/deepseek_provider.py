@@ -5,9 +5,11 @@ This module implements the DeepSeek provider for the AI service system.
 """
 
 import requests
+import httpx
 import json
-from typing import Dict, List, Optional, Any
-from app.ai.base_provider import BaseAIProvider, AIResponse
+from typing import AsyncIterator, Dict, List, Optional, Any
+from app.ai.base_provider import BaseAIProvider, AIResponse, AIStreamEvent
+from app.ai.http_pool import provider_pool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -42,6 +44,40 @@ class DeepSeekProvider(BaseAIProvider):
             logger.error(f"DeepSeek API key validation failed: {e}")
             return False
     
+    def _build_payload(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        stream: bool = False,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Prepare chat completion request payload"""
+        messages = []
+        
+        # Add system prompt if provided
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        
+        # Add user prompt
+        messages.append({"role": "user", "content": prompt})
+        
+        # Prepare request payload
+        payload = {
+            "model": self.model_name,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": stream
+        }
+        
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        
+        # Add any additional parameters
+        payload.update(kwargs)
+        return payload
+    
     async def generate_response(
         self, 
         prompt: str, 
@@ -53,36 +89,17 @@ class DeepSeekProvider(BaseAIProvider):
         """Generate response using DeepSeek"""
         
         try:
-            messages = []
-            
-            # Add system prompt if provided
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
+            payload = self._build_payload(prompt, system_prompt, temperature, max_tokens, **kwargs)
             
-            # Add user prompt
-            messages.append({"role": "user", "content": prompt})
-            
-            # Prepare request payload
-            payload = {
-                "model": self.model_name,
-                "messages": messages,
-                "temperature": temperature,
-                "stream": False
-            }
-            
-            if max_tokens:
-                payload["max_tokens"] = max_tokens
-            
-            # Add any additional parameters
-            payload.update(kwargs)
-            
-            # Make API call with extended read timeout (connect, read)
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=self.headers,
-                json=payload,
-                timeout=(15, 120)
-            )
+            # Make API call on the pooled async client with extended read timeout
+            http_client = provider_pool.get_http_client(self.provider_name)
+            async with provider_pool.limit(self.provider_name):
+                response = await http_client.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=self.headers,
+                    json=payload,
+                    timeout=httpx.Timeout(120.0, connect=15.0)
+                )
             
             if response.status_code != 200:
                 raise Exception(f"DeepSeek API returned status {response.status_code}: {response.text}")
@@ -113,6 +130,75 @@ class DeepSeekProvider(BaseAIProvider):
             logger.error(f"DeepSeek API call failed: {e}")
             raise Exception(f"DeepSeek API error: {str(e)}")
     
+    async def stream_response(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[AIStreamEvent]:
+        """Stream a response from DeepSeek (OpenAI-compatible server-sent events)"""
+        
+        try:
+            kwargs.pop("stream", None)
+            payload = self._build_payload(prompt, system_prompt, temperature, max_tokens, stream=True, **kwargs)
+            payload["stream_options"] = {"include_usage": True}
+            
+            parts: List[str] = []
+            tokens_used = None
+            finish_reason = None
+            response_id = None
+            created = None
+            http_client = provider_pool.get_http_client(self.provider_name)
+            async with provider_pool.limit(self.provider_name):
+                async with http_client.stream(
+                    "POST",
+                    f"{self.base_url}/chat/completions",
+                    headers=self.headers,
+                    json=payload,
+                    timeout=httpx.Timeout(120.0, connect=15.0)
+                ) as response:
+                    if response.status_code != 200:
+                        body = await response.aread()
+                        raise Exception(f"DeepSeek API returned status {response.status_code}: {body.decode(errors='replace')}")
+                    
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        chunk = json.loads(data)
+                        response_id = response_id or chunk.get("id")
+                        created = created or chunk.get("created")
+                        if chunk.get("usage"):
+                            tokens_used = chunk["usage"].get("total_tokens")
+                        for choice in chunk.get("choices") or []:
+                            finish_reason = choice.get("finish_reason") or finish_reason
+                            delta = (choice.get("delta") or {}).get("content")
+                            if delta:
+                                parts.append(delta)
+                                yield AIStreamEvent(delta=delta)
+            
+            yield AIStreamEvent(response=AIResponse(
+                content="".join(parts),
+                model=self.model_name,
+                provider=self.provider_name,
+                tokens_used=tokens_used,
+                cost=self._calculate_cost(tokens_used) if tokens_used else None,
+                metadata={
+                    "finish_reason": finish_reason,
+                    "response_id": response_id,
+                    "created": created,
+                    "streamed": True
+                }
+            ))
+            
+        except Exception as e:
+            logger.error(f"DeepSeek streaming call failed: {e}")
+            raise Exception(f"DeepSeek API error: {str(e)}")
+    
     def get_available_models(self) -> List[str]:
         """Get available DeepSeek models"""
         return [
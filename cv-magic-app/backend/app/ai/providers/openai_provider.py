@@ -5,8 +5,9 @@ This module implements the OpenAI provider for the AI service system.
 """
 
 import openai
-from typing import Dict, List, Optional, Any
-from app.ai.base_provider import BaseAIProvider, AIResponse
+from typing import AsyncIterator, Dict, List, Optional, Any
+from app.ai.base_provider import BaseAIProvider, AIResponse, AIStreamEvent
+from app.ai.http_pool import provider_pool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,8 +19,10 @@ class OpenAIProvider(BaseAIProvider):
     def __init__(self, api_key: str, model_name: str = "gpt-4o-mini"):
         super().__init__(api_key, model_name)
         # Increase timeout for nano models (GPT-5-nano) that may take longer to respond
-        timeout = 900.0 if model_name in ["gpt-5-nano"] or model_name.startswith("o3") else 60.0
-        self.client = openai.OpenAI(api_key=api_key, timeout=timeout)
+        self.timeout = 900.0 if model_name in ["gpt-5-nano"] or model_name.startswith("o3") else 60.0
+        # Async client is bound lazily to the shared connection pool of the running loop
+        self._async_client: Optional[openai.AsyncOpenAI] = None
+        self._async_http_client = None
     
     def _get_provider_name(self) -> str:
         """Return the provider name"""
@@ -34,8 +37,9 @@ class OpenAIProvider(BaseAIProvider):
                 return False
             
             # Try a simple API call to validate the key
-            # Use a lightweight endpoint instead of models.list()
-            response = self.client.chat.completions.create(
+            # Use a lightweight endpoint instead of models.list() (sync: validation runs outside the event loop)
+            client = openai.OpenAI(api_key=self.api_key, timeout=self.timeout)
+            response = client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": "test"}],
                 max_tokens=1
@@ -49,6 +53,55 @@ class OpenAIProvider(BaseAIProvider):
                 logger.error(f"Response: {e.response.text}")
             return False
     
+    def _get_async_client(self) -> openai.AsyncOpenAI:
+        """Return an async client that uses the pooled keep-alive connections"""
+        http_client = provider_pool.get_http_client(self.provider_name)
+        if self._async_client is None or self._async_http_client is not http_client:
+            self._async_client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                timeout=self.timeout,
+                http_client=http_client
+            )
+            self._async_http_client = http_client
+        return self._async_client
+    
+    def _build_request_params(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Prepare chat completion request parameters"""
+        messages = []
+        
+        # Add system prompt if provided
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        
+        # Add user prompt
+        messages.append({"role": "user", "content": prompt})
+        
+        # Map custom model names to actual OpenAI model names and set special parameters
+        actual_model = self.model_name
+        request_params = {
+            "model": actual_model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        
+        # Add service_tier for nano models (GPT-5-nano and O3 models)
+        if self.model_name in ["gpt-5-nano"] or self.model_name.startswith("o3"):
+            request_params["service_tier"] = "flex"
+        
+        if max_tokens:
+            request_params["max_tokens"] = max_tokens
+        
+        # Add any additional parameters
+        request_params.update(kwargs)
+        return request_params
+    
     async def generate_response(
         self, 
         prompt: str, 
@@ -60,35 +113,11 @@ class OpenAIProvider(BaseAIProvider):
         """Generate response using OpenAI"""
         
         try:
-            messages = []
-            
-            # Add system prompt if provided
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            
-            # Add user prompt
-            messages.append({"role": "user", "content": prompt})
-            
-            # Map custom model names to actual OpenAI model names and set special parameters
-            actual_model = self.model_name
-            request_params = {
-                "model": actual_model,
-                "messages": messages,
-                "temperature": temperature,
-            }
-            
-            # Add service_tier for nano models (GPT-5-nano and O3 models)
-            if self.model_name in ["gpt-5-nano"] or self.model_name.startswith("o3"):
-                request_params["service_tier"] = "flex"
-            
-            if max_tokens:
-                request_params["max_tokens"] = max_tokens
-            
-            # Add any additional parameters
-            request_params.update(kwargs)
+            request_params = self._build_request_params(prompt, system_prompt, temperature, max_tokens, **kwargs)
             
-            # Make API call
-            response = self.client.chat.completions.create(**request_params)
+            # Make API call without blocking the event loop
+            async with provider_pool.limit(self.provider_name):
+                response = await self._get_async_client().chat.completions.create(**request_params)
             
             # Extract response data
             content = response.choices[0].message.content
@@ -114,6 +143,59 @@ class OpenAIProvider(BaseAIProvider):
             logger.error(f"OpenAI API call failed: {e}")
             raise Exception(f"OpenAI API error: {str(e)}")
     
+    async def stream_response(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[AIStreamEvent]:
+        """Stream a response from OpenAI token by token"""
+        
+        try:
+            request_params = self._build_request_params(prompt, system_prompt, temperature, max_tokens, **kwargs)
+            request_params["stream"] = True
+            request_params["stream_options"] = {"include_usage": True}
+            
+            parts: List[str] = []
+            tokens_used = None
+            finish_reason = None
+            response_id = None
+            created = None
+            async with provider_pool.limit(self.provider_name):
+                stream = await self._get_async_client().chat.completions.create(**request_params)
+                async for chunk in stream:
+                    response_id = response_id or chunk.id
+                    created = created or chunk.created
+                    if chunk.usage:
+                        tokens_used = chunk.usage.total_tokens
+                    if not chunk.choices:
+                        continue
+                    choice = chunk.choices[0]
+                    finish_reason = choice.finish_reason or finish_reason
+                    if choice.delta and choice.delta.content:
+                        parts.append(choice.delta.content)
+                        yield AIStreamEvent(delta=choice.delta.content)
+            
+            yield AIStreamEvent(response=AIResponse(
+                content="".join(parts),
+                model=self.model_name,
+                provider=self.provider_name,
+                tokens_used=tokens_used,
+                cost=self._calculate_cost(tokens_used) if tokens_used else None,
+                metadata={
+                    "finish_reason": finish_reason,
+                    "response_id": response_id,
+                    "created": created,
+                    "streamed": True
+                }
+            ))
+            
+        except Exception as e:
+            logger.error(f"OpenAI streaming call failed: {e}")
+            raise Exception(f"OpenAI API error: {str(e)}")
+    
     def get_available_models(self) -> List[str]:
         """Get available OpenAI models"""
         return [
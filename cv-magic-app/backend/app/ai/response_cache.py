@@ -0,0 +1,224 @@
+"""
+LLM Response Cache
+
+This module provides a content-addressed cache for deterministic LLM calls.
+Entries are keyed on the calling user and API key, provider, model, system
+prompt, prompt and generation parameters, stored in SQLite, expired by TTL and evicted least-recently-used.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.ai.base_provider import AIResponse
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed LLM response cache with TTL expiry and LRU eviction.
+
+    Only deterministic requests (temperature 0) are cached, so identical
+    re-runs of an analysis stage return the stored completion without
+    spending tokens.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 5000, enabled: bool = True):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    tokens_used INTEGER,
+                    metadata TEXT,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_last_accessed ON llm_responses (last_accessed)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def is_cacheable(temperature: float, kwargs: Dict[str, Any]) -> bool:
+        """Only deterministic, non-streaming requests are safe to replay"""
+        return temperature == 0.0 and not kwargs.get("stream")
+
+    @staticmethod
+    def make_key(
+        owner: str,
+        provider: str,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+    ) -> str:
+        """Build the content address for a request, scoped to the caller that pays for it"""
+        payload = json.dumps(
+            {
+                "owner": owner,
+                "provider": provider,
+                "model": model,
+                "system_prompt": system_prompt or "",
+                "prompt": prompt,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "params": kwargs,
+            },
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, cache_key: str) -> Optional[AIResponse]:
+        """Return the cached response for a key, or None on miss or expiry"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT provider, model, content, tokens_used, metadata, created_at FROM llm_responses WHERE cache_key = ?",
+                    (cache_key,),
+                ).fetchone()
+                if row is None:
+                    self._stats["misses"] += 1
+                    return None
+                provider, model, content, tokens_used, metadata, created_at = row
+                if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                    conn.execute("DELETE FROM llm_responses WHERE cache_key = ?", (cache_key,))
+                    conn.commit()
+                    self._stats["expired"] += 1
+                    self._stats["misses"] += 1
+                    return None
+                conn.execute(
+                    "UPDATE llm_responses SET last_accessed = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                    (now, cache_key),
+                )
+                conn.commit()
+                self._stats["hits"] += 1
+        except Exception as e:
+            logger.warning(f"⚠️ [LLM_CACHE] Lookup failed, treating as miss: {e}")
+            return None
+
+        cached_metadata = json.loads(metadata) if metadata else {}
+        cached_metadata.update({"cached": True, "cache_key": cache_key, "original_tokens_used": tokens_used})
+        return AIResponse(
+            content=content,
+            model=model,
+            provider=provider,
+            tokens_used=0,
+            cost=0.0,
+            metadata=cached_metadata,
+        )
+
+    def set(self, cache_key: str, response: AIResponse):
+        """Store a response and evict least-recently-used entries beyond the size limit"""
+        if not self.enabled or not response.content:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO llm_responses
+                        (cache_key, provider, model, content, tokens_used, metadata, created_at, last_accessed, hit_count)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+                    """,
+                    (
+                        cache_key,
+                        response.provider,
+                        response.model,
+                        response.content,
+                        response.tokens_used,
+                        json.dumps(response.metadata, default=str),
+                        now,
+                        now,
+                    ),
+                )
+                self._stats["stores"] += 1
+                count = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+                if count > self.max_entries:
+                    overflow = count - self.max_entries
+                    conn.execute(
+                        "DELETE FROM llm_responses WHERE cache_key IN "
+                        "(SELECT cache_key FROM llm_responses ORDER BY last_accessed ASC LIMIT ?)",
+                        (overflow,),
+                    )
+                    self._stats["evictions"] += overflow
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ [LLM_CACHE] Failed to store response: {e}")
+
+    async def get_async(self, cache_key: str) -> Optional[AIResponse]:
+        """get for code on the event loop (the SQLite lookup does not block it)"""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self.get, cache_key)
+
+    async def set_async(self, cache_key: str, response: AIResponse):
+        """set for code on the event loop (the SQLite write does not block it)"""
+        if not self.enabled or not response.content:
+            return
+        await asyncio.to_thread(self.set, cache_key, response)
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM llm_responses")
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        try:
+            with self._lock:
+                stats["entries"] = self._connection().execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        except Exception:
+            stats["entries"] = None
+        return stats
+
+
+# Global LLM response cache instance
+llm_response_cache = LLMResponseCache(
+    db_path=settings.AI_RESPONSE_CACHE_PATH,
+    ttl_seconds=settings.AI_RESPONSE_CACHE_TTL_SECONDS,
+    max_entries=settings.AI_RESPONSE_CACHE_MAX_ENTRIES,
+    enabled=settings.AI_RESPONSE_CACHE_ENABLED,
+)
@@ -3,7 +3,7 @@ Application configuration settings
 """
 import os
 import json
-from typing import List
+from typing import List, Optional
 
 try:
     from pydantic_settings import BaseSettings
@@ -30,6 +30,13 @@ class Settings(BaseSettings):
     DATABASE_NAME: str = "cv_app"
     DATABASE_USER: str = "mahesh"
     DATABASE_PASSWORD: str = "password123"
+    DATABASE_POOL_SIZE: int = 10  # Per engine, per worker process
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800  # Reopen connections before server-side idle timeouts
+    DATABASE_POOL_TIMEOUT_SECONDS: int = 30
+    DATABASE_ASYNC_ENABLED: bool = True  # Async engine (asyncpg/aiosqlite) for event-loop code
+    DATABASE_SQLITE_LOCAL: bool = False  # Use a local SQLite file instead of DATABASE_URL (tests)
+    DATABASE_SQLITE_PATH: str = "cache/local.db"
     
     # Redis Configuration
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -42,6 +49,8 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_MINUTES: int = 1440  # 24 hours for better user experience
     JWT_REFRESH_EXPIRATION_DAYS: int = 30  # 30 days for refresh tokens
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000  # Verified tokens kept per worker
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = 300  # Re-verify at least this often (never past exp)
     
     # Development Settings
     DEVELOPMENT_MODE: bool = True  # Enable development features
@@ -102,6 +111,71 @@ class Settings(BaseSettings):
     # CLAUDE_API_KEY: str = ""        # Commented out - use dynamic API key management
     # DEEPSEEK_API_KEY: str = ""      # Commented out - use dynamic API key management
     
+    # Per-user API key cache (encrypted rows + short-lived decrypted keys)
+    API_KEY_CACHE_TTL_SECONDS: int = 300  # Bounds staleness across worker processes
+    API_KEY_PLAINTEXT_TTL_SECONDS: int = 60  # How long a decrypted key stays in memory
+    API_KEY_CACHE_MAX_USERS: int = 1000
+    
+    # AI provider HTTP pooling (shared per provider across users)
+    AI_HTTP_MAX_CONNECTIONS: int = 50
+    AI_HTTP_MAX_KEEPALIVE: int = 20
+    AI_MAX_CONCURRENT_REQUESTS: int = 10  # Per provider, per worker
+    
+    # LLM response cache (deterministic temperature=0 calls only)
+    AI_RESPONSE_CACHE_ENABLED: bool = True
+    AI_RESPONSE_CACHE_PATH: str = "cache/llm_response_cache.db"
+    AI_RESPONSE_CACHE_TTL_SECONDS: int = 604800  # 7 days
+    AI_RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    
+    # Background job queue (post-skill analysis pipeline)
+    JOB_QUEUE_PATH: str = "cache/job_queue.db"
+    JOB_QUEUE_WORKERS: int = 2  # Per worker process
+    JOB_QUEUE_MAX_RUNNING_PER_USER: int = 1
+    JOB_QUEUE_MAX_ATTEMPTS: int = 3
+    JOB_QUEUE_RETRY_BASE_SECONDS: float = 5.0
+    JOB_QUEUE_DRAIN_TIMEOUT_SECONDS: float = 30.0
+    
+    # Batch CV tailoring (runs on the job queue)
+    BATCH_TAILORING_MAX_CONCURRENT_PER_USER: int = 4
+    BATCH_TAILORING_MAX_CONCURRENT_PER_PROVIDER: int = 8  # Per worker process
+    
+    # Document text extraction (uploaded CV files)
+    DOCUMENT_EXTRACT_CACHE_DIR: str = "cache/document_text"
+    DOCUMENT_EXTRACT_CACHE_MAX_FILES: int = 500
+    DOCUMENT_EXTRACT_WORKERS: int = 2  # Process pool for multi-page PDFs; 0 extracts in-process
+    DOCUMENT_EXTRACT_PAGES_PER_CHUNK: int = 4
+    
+    # Structured CV parse cache (same CV text, prompt version and model)
+    CV_PARSE_CACHE_ENABLED: bool = True
+    CV_PARSE_CACHE_PATH: str = "cache/cv_parse_cache.db"
+    CV_PARSE_CACHE_TTL_SECONDS: int = 2592000  # 30 days
+    CV_PARSE_CACHE_MAX_ENTRIES: int = 2000
+    
+    # JD usage history (first-time vs repeat JD detection)
+    JD_USAGE_DB_PATH: str = "cache/jd_usage.db"
+    
+    # Job description fetcher
+    JOB_SCRAPER_CACHE_DIR: str = "cache/job_pages"
+    JOB_SCRAPER_CACHE_TTL_SECONDS: int = 86400  # Serve cached pages without revalidating for a day
+    JOB_SCRAPER_MAX_PER_HOST: int = 2
+    JOB_SCRAPER_MAX_CONNECTIONS: int = 20
+    JOB_SCRAPER_TIMEOUT_SECONDS: float = 30.0
+    JOB_SCRAPER_PARSE_WORKERS: int = 2  # Parser processes; 0 parses in a thread
+    
+    # Tailored CV PDF rendering
+    PDF_RENDER_CACHE_DIR: str = "cache/pdf_renders"
+    PDF_RENDER_CACHE_MAX_FILES: int = 200  # Least recently used renders are evicted beyond this
+    PDF_RENDER_WORKERS: int = 1  # Render processes; 0 renders in a thread
+    PDF_EXPORTS_KEEP_PER_COMPANY: int = 3  # Export PDFs kept per company in cvs/pdf_cvs
+    
+    # Bulk job ingestion
+    JOB_BATCH_MAX_ITEMS: int = 100
+    JOB_BATCH_EXTRACTION_CONCURRENCY: int = 5  # Concurrent LLM extractions per batch
+    
+    # Prompt template registry
+    PROMPT_HOT_RELOAD: Optional[bool] = None  # Recompile prompt files changed on disk; unset follows DEBUG
+    PROMPT_RELOAD_CHECK_SECONDS: float = 2.0
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -127,6 +201,9 @@ class Settings(BaseSettings):
                 self.ALLOWED_HEADERS = json.loads(self.ALLOWED_HEADERS)
             except json.JSONDecodeError:
                 self.ALLOWED_HEADERS = ["*"]
+        
+        if self.PROMPT_HOT_RELOAD is None:
+            self.PROMPT_HOT_RELOAD = self.DEBUG
     
     class Config:
         env_file = ".env"
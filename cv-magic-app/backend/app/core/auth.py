@@ -1,15 +1,22 @@
 """
 JWT token utilities and authentication helpers
 """
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
 import jwt
 from jwt.exceptions import InvalidTokenError
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from fastapi import HTTPException, status
 from app.config import settings
 from app.models.auth import TokenData, UserData
 import uuid
 
+auth_logger = logging.getLogger("app.auth")
+
 
 def create_access_token(user_data: Dict[str, Any]) -> str:
     """
@@ -116,6 +123,109 @@ def verify_token(token: str) -> TokenData:
         )
 
 
+def token_digest(token: str) -> str:
+    """SHA-256 of a token, safe to use as a cache key or in logs"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified access tokens and the users built from them.
+
+    Entries are keyed by token digest (the token itself is never stored) and
+    expire at the token's own exp, or after ttl_seconds if that comes first,
+    so a cached token is never accepted past its expiry.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, TokenData, UserData]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def get(self, digest: str) -> Optional[Tuple[TokenData, UserData]]:
+        """Cached verification result, or None if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            expires_at, token_data, user = entry
+            if time.time() >= expires_at:
+                del self._entries[digest]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(digest)
+            self._stats["hits"] += 1
+            return token_data, user
+
+    def put(self, digest: str, token_data: TokenData, user: UserData) -> None:
+        """Remember a verified token until its exp (capped by the TTL)"""
+        expires_at = min(token_data.exp.timestamp(), time.time() + self.ttl_seconds)
+        with self._lock:
+            self._entries[digest] = (expires_at, token_data, user)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, digest: str) -> None:
+        """Forget one token"""
+        with self._lock:
+            self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        """Forget every token"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), max_entries=self.max_entries)
+
+
+# Global verified token cache
+verified_token_cache = VerifiedTokenCache(
+    max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+def verify_token_cached(token: str) -> Tuple[TokenData, UserData]:
+    """
+    Verify a token, reusing the result of an earlier verification
+    
+    Args:
+        token: JWT token string
+        
+    Returns:
+        (TokenData, UserData) for the token
+        
+    Raises:
+        HTTPException: If token is invalid or expired
+    """
+    digest = token_digest(token)
+    cached = verified_token_cache.get(digest)
+    if cached is not None:
+        return cached
+
+    token_data = verify_token(token)
+    user = UserData(
+        id=token_data.user_id,
+        email=token_data.email,
+        name=token_data.email.split("@")[0] if token_data.email else "user",
+        created_at=datetime.now(timezone.utc),
+        is_active=True
+    )
+    verified_token_cache.put(digest, token_data, user)
+    if auth_logger.isEnabledFor(logging.DEBUG):
+        auth_logger.debug("auth verified", extra={"auth_event": "verified", "token_digest": digest[:12], "user_id": user.id})
+    return token_data, user
+
+
 def create_demo_user() -> UserData:
     """
     Create a demo user for development purposes (empty credentials login)
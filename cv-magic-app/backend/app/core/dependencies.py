@@ -2,10 +2,9 @@
 Authentication dependencies for FastAPI
 """
 from typing import Optional
-from datetime import datetime, timezone
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.auth import verify_token
+from app.core.auth import auth_logger, create_demo_user, token_digest, verify_token_cached
 from app.models.auth import TokenData, UserData
 
 # Security scheme for extracting Bearer tokens
@@ -28,27 +27,15 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     from app.config import settings
     
     try:
-        # Debug logging
-        token_preview = credentials.credentials[:20] + "..." if len(credentials.credentials) > 20 else credentials.credentials
-        print(f"Auth attempt with token: {token_preview}")
-        
-        # Verify the token
-        token_data = verify_token(credentials.credentials)
-        
-        # Build user object from token
-        user = UserData(
-            id=token_data.user_id,
-            email=token_data.email,
-            name=token_data.email.split("@")[0] if token_data.email else "user",
-            created_at=datetime.now(timezone.utc),
-            is_active=True
-        )
-        
-        print(f"✅ Auth successful for user: {user.email}")
+        # Verified tokens are cached by digest until their exp
+        _, user = verify_token_cached(credentials.credentials)
         return user
         
     except HTTPException as e:
-        print(f"❌ Auth failed: {e.detail}")
+        auth_logger.info(
+            f"❌ Auth failed: {e.detail}",
+            extra={"auth_event": "rejected", "token_digest": token_digest(credentials.credentials)[:12], "reason": e.detail},
+        )
         
         # In development mode, provide more helpful error messages
         if settings.DEVELOPMENT_MODE:
@@ -82,7 +69,7 @@ async def get_optional_user(credentials: Optional[HTTPAuthorizationCredentials]
         return None
     
     try:
-        token_data = verify_token(credentials.credentials)
+        token_data, _ = verify_token_cached(credentials.credentials)
         user = create_demo_user()
         user.id = token_data.user_id
         user.email = token_data.email
@@ -60,19 +60,14 @@ async def get_current_model(
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not authenticated")
 
         try:
-            from app.database import SessionLocal
             from app.services.user_model_service import user_model_service
             from app.ai.ai_service import ai_service
             
             # Initialize AI providers for this user (will use cache if available)
-            ai_service.initialize_for_user(current_user)
+            await ai_service.initialize_for_user_async(current_user)
             logger.info(f"✅ [MODEL_DEPENDENCY] AI providers initialized for user {current_user.email}")
             
-            db = SessionLocal()
-            try:
-                pref = user_model_service.get_user_model(db, str(current_user.id))
-            finally:
-                db.close()
+            pref = await user_model_service.get_user_model_async(str(current_user.id))
             if pref:
                 provider, model = pref
                 logger.info(f"🔍 [MODEL_DEPENDENCY] Found saved preference: {provider}/{model}")
@@ -1,19 +1,77 @@
 """
 Database configuration and connection management
+
+Two access paths share one database:
+- A synchronous engine (SessionLocal / get_database) for existing sync code
+- An async engine (AsyncSessionLocal / get_async_database / run_in_session)
+  for code running on the event loop, so queries never block it
+
+Pool size, overflow, recycle and timeout come from settings. With
+DATABASE_SQLITE_LOCAL enabled both engines use a local SQLite file instead of
+DATABASE_URL (for tests and offline development).
 """
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, TypeVar
+
 from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_database_url() -> str:
+    """Database URL in effect (the local SQLite file in SQLite local mode)"""
+    if settings.DATABASE_SQLITE_LOCAL:
+        if settings.DATABASE_SQLITE_PATH != ":memory:":
+            Path(settings.DATABASE_SQLITE_PATH).parent.mkdir(parents=True, exist_ok=True)
+        return f"sqlite:///{settings.DATABASE_SQLITE_PATH}"
+    return settings.DATABASE_URL
+
+
+def to_async_url(url: str) -> str:
+    """Same database URL with the asyncio driver (asyncpg / aiosqlite)"""
+    scheme, sep, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    """Pool settings for a URL; SQLite gets a thread-shareable connection setup instead"""
+    if url.startswith("sqlite"):
+        options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+        if ":memory:" in url or url.rstrip("/").endswith("sqlite:"):
+            # One shared connection, otherwise every session sees an empty database
+            options["poolclass"] = StaticPool
+        return options
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE_SECONDS,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": True,
+    }
+
+
+DATABASE_URL = get_database_url()
+
 # Create database engine
 engine = create_engine(
-    settings.DATABASE_URL,
+    DATABASE_URL,
     echo=settings.DEBUG,
-    pool_pre_ping=True
+    **_engine_options(DATABASE_URL)
 )
 
 # Create session factory
@@ -22,6 +80,29 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create base class for models
 Base = declarative_base()
 
+# Async engine, created on first use (None if disabled or the driver is missing)
+_async_engine = None
+AsyncSessionLocal = None
+# An in-memory SQLite database is private to its driver, so keep both paths on the sync one
+_async_unavailable = not settings.DATABASE_ASYNC_ENABLED or ":memory:" in DATABASE_URL
+
+
+def get_async_engine():
+    """The async engine, or None when async access is disabled or unavailable"""
+    global _async_engine, AsyncSessionLocal, _async_unavailable
+    if _async_engine is None and not _async_unavailable:
+        try:
+            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+            async_url = to_async_url(DATABASE_URL)
+            _async_engine = create_async_engine(async_url, echo=settings.DEBUG, **_engine_options(async_url))
+            AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+            logger.info(f"🗄️ [DATABASE] Async engine ready ({_async_engine.url.drivername})")
+        except Exception as e:
+            # Missing asyncpg/aiosqlite: callers fall back to the sync engine in a worker thread
+            _async_unavailable = True
+            logger.warning(f"⚠️ [DATABASE] Async engine unavailable, using worker threads: {e}")
+    return _async_engine
+
 
 def get_database():
     """Get database session"""
@@ -32,6 +113,70 @@ def get_database():
         db.close()
 
 
+async def get_async_database():
+    """
+    Get an async database session (FastAPI dependency)
+
+    Raises:
+        RuntimeError: If async database access is disabled or its driver is missing
+    """
+    if get_async_engine() is None:
+        raise RuntimeError("Async database access is not available")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@asynccontextmanager
+async def async_session() -> AsyncIterator[Any]:
+    """Async session as a context manager (see get_async_database)"""
+    if get_async_engine() is None:
+        raise RuntimeError("Async database access is not available")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _run_with_sync_session(fn: Callable[[Session], T], commit: bool) -> T:
+    db = SessionLocal()
+    try:
+        result = fn(db)
+        if commit:
+            db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_in_session(fn: Callable[[Session], T], commit: bool = False) -> T:
+    """
+    Run session-based code without blocking the event loop
+
+    fn receives a regular (sync-style) Session. On the async engine it runs
+    through AsyncSession.run_sync on the loop's own connection; without an
+    async driver it runs with a sync session in a worker thread.
+
+    Args:
+        fn: Function doing the queries; its return value is passed through
+        commit: Commit after fn returns (rolled back if it raises)
+
+    Returns:
+        Whatever fn returned
+    """
+    if get_async_engine() is None:
+        return await asyncio.to_thread(_run_with_sync_session, fn, commit)
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.run_sync(fn)
+            if commit:
+                await db.commit()
+            return result
+        except Exception:
+            await db.rollback()
+            raise
+
+
 def check_connection():
     """Check database connection"""
     try:
@@ -49,9 +194,16 @@ def create_tables():
     try:
         # Import all models here to ensure they are registered
         from app.models import user, cv, base, user_preferences, user_api_keys
-        
+
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Failed to create tables: {e}")
         raise e
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections of both engines (application shutdown)"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    engine.dispose()
@@ -30,6 +30,7 @@ from app.routes.enhanced_skills_analysis import router as enhanced_skills_router
 from app.routes.saved_jobs import router as saved_jobs_router  # Saved jobs routes
 from app.routes.api_keys import router as api_keys_router  # API key management routes
 from app.routes.ingest_files import router as ingest_router  # Ingestion routes
+from app.routes.pipeline_jobs import router as pipeline_jobs_router  # Background job status routes
 
 # Import dependencies
 from app.core.model_dependency import get_current_model
@@ -85,10 +86,43 @@ async def lifespan(app: FastAPI):
     # User directories will be created on-demand when users log in
     logger.info("✅ User directories will be created on-demand during login")
     
+    # Compile prompt templates once, before the first request needs them
+    from app.ai.prompt_registry import prompt_registry
+    prompt_registry.load_all()
+    
+    # Start background job workers (post-skill analysis pipeline)
+    from app.services.job_queue import job_queue
+    job_queue.start()
+    
     yield
     
     # Shutdown
     logger.info("⏹️ Shutting down CV Management API...")
+    
+    # Let running pipeline jobs finish; unfinished ones resume on next start
+    await job_queue.drain(timeout=settings.JOB_QUEUE_DRAIN_TIMEOUT_SECONDS)
+    
+    # Close pooled AI provider connections
+    from app.ai.http_pool import provider_pool
+    await provider_pool.aclose()
+    
+    # Close the job page fetcher's connection pool and parser processes
+    from app.services.job_scraper import job_page_fetcher
+    await job_page_fetcher.aclose()
+    
+    # Stop the PDF render and document extraction processes
+    from app.tailored_cv.services.pdf_render_service import pdf_render_service
+    pdf_render_service.shutdown()
+    from app.services.document_text_extractor import document_text_extractor
+    document_text_extractor.shutdown()
+    
+    # Persist batched JD cache usage counters
+    from app.services.jd_cache_manager import jd_cache_manager
+    jd_cache_manager.flush_usage()
+    
+    # Close pooled database connections
+    from app.database import dispose_engines
+    await dispose_engines()
 
 
 # Create FastAPI application
@@ -121,6 +155,10 @@ app.add_middleware(
     expose_headers=["*"],  # Expose all headers
 )
 
+# Public endpoints that don't need auth (not logged by the auth middleware)
+PUBLIC_ENDPOINTS = frozenset({"/api/auth/login", "/api/auth/register", "/api/auth/refresh-session", "/api/quick-login", "/health", "/api/info", "/api/ai/health", "/api/tailored-cv/save-edited"})
+
+
 # Add authentication debugging middleware
 @app.middleware("http")
 async def auth_debug_middleware(request: Request, call_next):
@@ -136,14 +174,10 @@ async def auth_debug_middleware(request: Request, call_next):
         return response
     
     path = request.url.path
-    auth_header = request.headers.get("authorization")
-    
-    # Define public endpoints that don't need auth
-    public_endpoints = ["/api/auth/login", "/api/auth/register", "/api/auth/refresh-session", "/api/quick-login", "/health", "/api/info", "/api/ai/health", "/api/tailored-cv/save-edited"]
     
-    # Only log auth attempts for protected API routes
-    if path.startswith("/api/") and path not in public_endpoints:
-        if not auth_header:
+    # Only log auth attempts for protected API routes (skip the work entirely unless debugging)
+    if logger.isEnabledFor(logging.DEBUG) and path.startswith("/api/") and path not in PUBLIC_ENDPOINTS:
+        if not request.headers.get("authorization"):
             logger.debug(f"❌ No auth header on {request.method} {path}")
         else:
             logger.debug(f"🔑 Auth attempt on {request.method} {path}")
@@ -151,7 +185,7 @@ async def auth_debug_middleware(request: Request, call_next):
     response = await call_next(request)
     
     # Log auth failures only for non-public endpoints
-    if response.status_code == 403 and path not in public_endpoints:
+    if response.status_code == 403 and path not in PUBLIC_ENDPOINTS:
         logger.warning(f"🚫 Auth failed (403) for {request.method} {path}")
     
     return response
@@ -187,6 +221,7 @@ app.include_router(cv_tailoring_router, prefix="/api")  # CV tailoring routes
 app.include_router(saved_jobs_router)  # Saved jobs routes
 app.include_router(api_keys_router)  # API key management routes
 app.include_router(ingest_router)  # Ingestion routes
+app.include_router(pipeline_jobs_router)  # Background job status routes
 
 
 # Root endpoint
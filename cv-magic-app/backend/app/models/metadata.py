@@ -5,7 +5,7 @@ Pipeline metadata and file registry models
 from datetime import datetime
 from typing import Optional
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Boolean, Text, ForeignKey, BigInteger, UniqueConstraint, Index
+    Column, Integer, String, DateTime, Boolean, Text, ForeignKey, BigInteger, UniqueConstraint, Index, JSON
 )
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import JSONB
@@ -63,7 +63,7 @@ class AnalysisRun(Base):
     model_used = Column(String(100), nullable=True)
     started_at = Column(DateTime, default=func.now())
     completed_at = Column(DateTime, nullable=True)
-    meta_json = Column(JSONB, nullable=True)
+    meta_json = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
 
     source_file_id = Column(Integer, ForeignKey("company_files.id"), nullable=True)
     output_file_id = Column(Integer, ForeignKey("company_files.id"), nullable=True)
@@ -15,6 +15,25 @@ import base64
 import os
 
 
+def derive_encryption_key(user_id: str) -> bytes:
+    """Fernet key for a user, derived from the user ID and the server secret"""
+    secret = os.getenv("API_KEY_ENCRYPTION_SECRET", "default-secret-change-in-production")
+    user_specific_secret = f"{secret}-{user_id}"
+    
+    # Generate a consistent key from the user-specific secret
+    return base64.urlsafe_b64encode(user_specific_secret.encode()[:32].ljust(32, b'0'))
+
+
+def decrypt_api_key(user_id: str, encrypted_key: str) -> str:
+    """Decrypt a stored API key without needing a database row"""
+    try:
+        fernet = Fernet(derive_encryption_key(user_id))
+        encrypted_data = base64.urlsafe_b64decode(encrypted_key.encode())
+        return fernet.decrypt(encrypted_data).decode()
+    except Exception as e:
+        raise ValueError(f"Failed to decrypt API key: {e}")
+
+
 class UserAPIKey(Base):
     """User-specific API key model with encryption"""
     
@@ -50,12 +69,7 @@ class UserAPIKey(Base):
     def _get_encryption_key(self) -> bytes:
         """Get or create encryption key for this user"""
         # Use user-specific encryption key derived from user ID and a secret
-        secret = os.getenv("API_KEY_ENCRYPTION_SECRET", "default-secret-change-in-production")
-        user_specific_secret = f"{secret}-{self.user_id}"
-        
-        # Generate a consistent key from the user-specific secret
-        key = base64.urlsafe_b64encode(user_specific_secret.encode()[:32].ljust(32, b'0'))
-        return key
+        return derive_encryption_key(self.user_id)
     
     def _encrypt_key(self, api_key: str) -> str:
         """Encrypt the API key"""
@@ -69,14 +83,7 @@ class UserAPIKey(Base):
     
     def _decrypt_key(self) -> str:
         """Decrypt the API key"""
-        try:
-            key = self._get_encryption_key()
-            fernet = Fernet(key)
-            encrypted_data = base64.urlsafe_b64decode(self.encrypted_key.encode())
-            decrypted = fernet.decrypt(encrypted_data)
-            return decrypted.decode()
-        except Exception as e:
-            raise ValueError(f"Failed to decrypt API key: {e}")
+        return decrypt_api_key(self.user_id, self.encrypted_key)
     
     def _hash_key(self, api_key: str) -> str:
         """Hash the API key for validation"""
@@ -12,10 +12,9 @@ from typing import Dict, List, Optional, Any
 from pydantic import BaseModel
 from app.ai.ai_service import ai_service
 from app.core.dependencies import get_current_user
-from app.database import get_database
-from sqlalchemy.orm import Session
 from app.core.model_dependency import get_current_model
 from app.models.auth import UserData
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -208,28 +207,23 @@ async def get_current_model_config(
     """
     try:
         from app.services.user_model_service import user_model_service
-        from app.database import SessionLocal
         
-        db = SessionLocal()
-        try:
-            # Get user's saved model preference
-            model_pref = user_model_service.get_user_model(db, str(current_user.id))
-            
-            if model_pref:
-                provider, model = model_pref
-                return {
-                    "current_provider": provider,
-                    "current_model": model,
-                    "has_configuration": True
-                }
-            else:
-                return {
-                    "current_provider": None,
-                    "current_model": None,
-                    "has_configuration": False
-                }
-        finally:
-            db.close()
+        # Get user's saved model preference
+        model_pref = await user_model_service.get_user_model_async(str(current_user.id))
+        
+        if model_pref:
+            provider, model = model_pref
+            return {
+                "current_provider": provider,
+                "current_model": model,
+                "has_configuration": True
+            }
+        else:
+            return {
+                "current_provider": None,
+                "current_model": None,
+                "has_configuration": False
+            }
             
     except Exception as e:
         logger.error(f"Failed to get current model configuration for user {current_user.email}: {e}")
@@ -241,20 +235,18 @@ async def get_current_model_config(
 @router.post("/switch-model")
 async def switch_model(
     request: ModelSwitchRequest,
-    current_user: UserData = Depends(get_current_user),
-    db: Session = Depends(get_database)
+    current_user: UserData = Depends(get_current_user)
 ):
     """
     Switch the current AI model (alias for set-current-model for Flutter compatibility)
     """
-    return await set_current_model(request, current_user, db)
+    return await set_current_model(request, current_user)
 
 
 @router.post("/set-current-model")
 async def set_current_model(
     request: ModelSwitchRequest,
-    current_user: UserData = Depends(get_current_user),
-    db: Session = Depends(get_database)
+    current_user: UserData = Depends(get_current_user)
 ):
     """
     Persist per-user selected provider+model. The frontend should call this on login or when switching.
@@ -263,7 +255,7 @@ async def set_current_model(
         from app.services.user_model_service import user_model_service
         
         # Initialize AI service for this user
-        ai_service.initialize_for_user(current_user)
+        await ai_service.initialize_for_user_async(current_user)
         logger.info(f"✅ [AI_SWITCH] AI providers initialized for user {current_user.email}")
         
         if not hasattr(request, "model") or not request.model:
@@ -310,7 +302,7 @@ async def set_current_model(
             )
 
         # Persist for the user
-        user_model_service.set_user_model(db, str(current_user.id), provider, model_name)
+        await user_model_service.set_user_model_async(str(current_user.id), provider, model_name)
         logger.info(f"✅ [AI_SWITCH] Successfully switched to {provider}/{model_name} for user {current_user.email}")
 
         return {
@@ -511,16 +503,24 @@ async def ai_health_check():
         }
 
 
+@router.get("/cache-stats")
+async def get_cache_stats(current_user: UserData = Depends(get_current_user)):
+    """
+    Get LLM response cache statistics (hits, misses, evictions, size)
+    """
+    # The cache size is a SQLite COUNT; keep it off the event loop
+    return await asyncio.to_thread(ai_service.get_cache_stats)
+
+
 @router.get("/user-model-preference")
 async def get_user_model_preference(
-    current_user: UserData = Depends(get_current_user),
-    db: Session = Depends(get_database)
+    current_user: UserData = Depends(get_current_user)
 ):
     """Get the user's saved model preference"""
     try:
         from app.services.user_model_service import user_model_service
         
-        pref = user_model_service.get_user_model(db, str(current_user.id))
+        pref = await user_model_service.get_user_model_async(str(current_user.id))
         if pref:
             provider, model = pref
             return {
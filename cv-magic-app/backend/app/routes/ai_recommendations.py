@@ -18,6 +18,7 @@ from app.core.dependencies import get_current_user
 from app.models.auth import UserData
 from app.utils.user_path_utils import get_user_base_path
 from app.utils.timestamp_utils import TimestampUtils
+from app.utils.sse import sse_response
 
 logger = logging.getLogger(__name__)
 
@@ -436,3 +437,38 @@ async def generate_ai_recommendation_and_tailor_cv(company: str, current_user: U
                 "company": company
             }
         )
+
+
+@router.post("/ai-recommendations/generate/{company}/stream")
+async def stream_ai_recommendation_generation(
+    company: str,
+    force_regenerate: bool = True,
+    current_user: UserData = Depends(get_current_user)
+):
+    """
+    Generate AI recommendation (and the follow-up tailored CV) as Server-Sent Events
+    
+    `token` frames carry the model output as it is generated, `status` frames
+    mark stage changes (recommendation generation, tailoring attempts), and the
+    final `complete` frame reports whether generation succeeded. Results are
+    saved even if the client disconnects.
+    
+    Args:
+        company: Company name
+        force_regenerate: Regenerate even if an up-to-date recommendation exists
+    """
+    generator = AIRecommendationGenerator(user_email=current_user.email)
+
+    async def _job(emitter):
+        success = await generator.generate_ai_recommendation(
+            company, force_regenerate=force_regenerate, stream=emitter
+        )
+        info = generator.get_ai_recommendation_info(company) if success else None
+        return {
+            "success": success,
+            "company": company,
+            "ai_recommendation_info": info
+        }
+
+    logger.info(f"📡 [AI_RECOMMENDATIONS] Streaming AI recommendation generation for: {company}")
+    return sse_response(_job)
@@ -119,28 +119,23 @@ async def _set_user_api_key_internal(request: APIKeyRequest, current_user: UserD
             
             # Auto-set default model preference if user doesn't have one
             try:
-                from app.database import SessionLocal
                 from app.services.user_model_service import user_model_service
                 
-                db = SessionLocal()
-                try:
-                    existing_pref = user_model_service.get_user_model(db, str(current_user.id))
-                    if not existing_pref:
-                        # User doesn't have a model preference, set default for this provider
-                        default_models = {
-                            "openai": "gpt-3.5-turbo",
-                            "anthropic": "claude-3-haiku-20240307", 
-                            "deepseek": "deepseek-chat"
-                        }
-                        default_model = default_models.get(request.provider, "gpt-3.5-turbo")
-                        
-                        # Set the default model preference
-                        user_model_service.set_user_model(db, str(current_user.id), request.provider, default_model)
-                        logger.info(f"🎯 [API_KEYS] Auto-set default model preference: {request.provider}/{default_model} for user {current_user.email}")
-                    else:
-                        logger.info(f"ℹ️ [API_KEYS] User {current_user.email} already has model preference: {existing_pref[0]}/{existing_pref[1]}")
-                finally:
-                    db.close()
+                existing_pref = await user_model_service.get_user_model_async(str(current_user.id))
+                if not existing_pref:
+                    # User doesn't have a model preference, set default for this provider
+                    default_models = {
+                        "openai": "gpt-3.5-turbo",
+                        "anthropic": "claude-3-haiku-20240307", 
+                        "deepseek": "deepseek-chat"
+                    }
+                    default_model = default_models.get(request.provider, "gpt-3.5-turbo")
+                    
+                    # Set the default model preference
+                    await user_model_service.set_user_model_async(str(current_user.id), request.provider, default_model)
+                    logger.info(f"🎯 [API_KEYS] Auto-set default model preference: {request.provider}/{default_model} for user {current_user.email}")
+                else:
+                    logger.info(f"ℹ️ [API_KEYS] User {current_user.email} already has model preference: {existing_pref[0]}/{existing_pref[1]}")
             except Exception as e:
                 logger.warning(f"⚠️ [API_KEYS] Failed to set default model preference: {e}")
                 
@@ -30,7 +30,7 @@ async def process_cv_content(cv_id: str):
             return
         
         # Extract text
-        result = cv_processor.extract_text_from_file(file_path)
+        result = await cv_processor.extract_text_from_file_async(file_path)
         
         if result['success']:
             # Update CV with extracted content
@@ -16,7 +16,7 @@ from app.services.cv_jd_matching import (
     match_and_save_cv_jd
 )
 from app.services.jd_analysis import load_jd_analysis
-from app.core.auth import verify_token
+from app.core.auth import verify_token_cached
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +49,7 @@ async def match_cv_against_jd(
     """
     try:
         # Verify authentication
-        verify_token(credentials.credentials)
+        verify_token_cached(credentials.credentials)
         
         logger.info(f"🔍 Starting CV-JD matching for company: {company_name}")
         
@@ -103,7 +103,7 @@ async def get_cv_jd_match_results(
     """
     try:
         # Verify authentication
-        verify_token(credentials.credentials)
+        verify_token_cached(credentials.credentials)
         
         logger.info(f"📂 Loading CV-JD match results for company: {company_name}")
         
@@ -155,7 +155,7 @@ async def get_cv_jd_matching_status(
     """
     try:
         # Verify authentication
-        verify_token(credentials.credentials)
+        verify_token_cached(credentials.credentials)
         
         logger.info(f"📊 Checking CV-JD matching status for company: {company_name}")
         
@@ -250,7 +250,7 @@ async def get_match_percentage(
     """
     try:
         # Verify authentication
-        verify_token(credentials.credentials)
+        verify_token_cached(credentials.credentials)
         
         logger.info(f"📊 Getting match percentage for company: {company_name}")
         
@@ -315,7 +315,7 @@ async def delete_cv_jd_match_results(
     """
     try:
         # Verify authentication
-        verify_token(credentials.credentials)
+        verify_token_cached(credentials.credentials)
         
         logger.info(f"🗑️ Deleting CV-JD match results for company: {company_name}")
         
@@ -127,7 +127,7 @@ async def get_cv_content(
             raise HTTPException(status_code=404, detail="CV file not found")
         
         # Extract text using improved processor (fast operation)
-        result = cv_processor.extract_text_from_file(file_path)
+        result = await cv_processor.extract_text_from_file_async(file_path)
         
         if not result['success']:
             raise HTTPException(
@@ -267,7 +267,7 @@ async def get_cv_preview(
             raise HTTPException(status_code=404, detail="CV file not found")
         
         # Extract text
-        result = cv_processor.extract_text_from_file(file_path)
+        result = await cv_processor.extract_text_from_file_async(file_path)
         
         if not result['success']:
             raise HTTPException(
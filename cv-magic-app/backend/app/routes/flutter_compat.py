@@ -147,7 +147,7 @@ async def get_cv_content_flutter(filename: str):
             )
         
         # Extract text using improved processor
-        result = cv_processor.extract_text_from_file(file_path)
+        result = await cv_processor.extract_text_from_file_async(file_path)
         
         if not result['success']:
             return JSONResponse(
@@ -200,7 +200,7 @@ async def get_cv_preview_flutter(filename: str, limit: int = 500):
             )
         
         # Extract text
-        result = cv_processor.extract_text_from_file(file_path)
+        result = await cv_processor.extract_text_from_file_async(file_path)
         
         if not result['success']:
             return JSONResponse(
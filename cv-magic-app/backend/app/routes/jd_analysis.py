@@ -14,7 +14,7 @@ from fastapi import APIRouter, Request, HTTPException, Depends
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
-from app.core.auth import verify_token
+from app.core.auth import verify_token_cached
 from app.services.jd_analysis import JDAnalyzer, JDAnalysisResult, analyze_and_save_company_jd, load_jd_analysis
 from app.utils.timestamp_utils import TimestampUtils
 from app.ai.ai_service import ai_service
@@ -67,7 +67,7 @@ async def analyze_jd_endpoint(
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -202,7 +202,7 @@ async def get_jd_analysis(
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -291,7 +291,7 @@ async def get_jd_keywords(
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -372,7 +372,7 @@ async def get_jd_analysis_status(
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -453,7 +453,7 @@ async def delete_jd_analysis(
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -526,7 +526,7 @@ async def get_technical_skills(
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -605,7 +605,7 @@ async def get_soft_skills(
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -684,7 +684,7 @@ async def get_experience_requirements(
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -764,7 +764,7 @@ async def get_domain_knowledge(
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -841,7 +841,7 @@ async def get_categorized_skills(
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
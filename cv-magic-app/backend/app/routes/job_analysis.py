@@ -2,9 +2,11 @@ from fastapi import APIRouter, HTTPException, Request, Depends
 from fastapi.responses import JSONResponse
 from typing import Dict, Any, Optional
 
+from ..config import settings
 from ..services.job_extraction_service import JobExtractionService
 from ..core.dependencies import get_current_user
 from ..models.auth import UserData
+from ..utils.sse import sse_response
 
 router = APIRouter(prefix="/api/job-analysis", tags=["Job Analysis"])
 
@@ -71,6 +73,62 @@ async def extract_and_save_job(request: Request, current_user: UserData = Depend
         raise HTTPException(status_code=500, detail=f"Error processing job analysis: {str(e)}")
 
 
+@router.post("/extract-and-save/batch")
+async def extract_and_save_jobs_batch(request: Request, current_user: UserData = Depends(get_current_user)):
+    """
+    Extract and save many job postings at once, streaming progress as Server-Sent Events.
+    
+    Request body:
+    {
+        "items": [
+            {"job_url": "job posting URL"},
+            {"job_description": "job description text", "job_url": "optional URL"}
+        ],
+        "job_urls": ["optional shorthand for URL-only items"]
+    }
+    
+    Events:
+    - status: {"index": 0, "status": "fetched" | "extracted" | "saved" | "duplicate" | "failed", ...}
+    - complete: {"total": N, "saved": n, "duplicates": d, "failed": f, "items": [...]}
+    """
+    data = await request.json()
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Request body must be an object")
+    items = data.get("items") or []
+    job_urls = data.get("job_urls") or []
+    if not isinstance(items, list) or not isinstance(job_urls, list):
+        raise HTTPException(status_code=400, detail="items and job_urls must be lists")
+    if not all(isinstance(url, str) for url in job_urls):
+        raise HTTPException(status_code=400, detail="Each job_urls entry must be a string")
+    items = items + [{"job_url": url} for url in job_urls]
+    
+    if not items:
+        raise HTTPException(status_code=400, detail="No job postings provided")
+    if len(items) > settings.JOB_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.JOB_BATCH_MAX_ITEMS} job postings per batch")
+    if not all(
+        isinstance(item, dict)
+        and all(isinstance(item.get(field), (str, type(None))) for field in ("job_url", "job_description"))
+        for item in items
+    ):
+        raise HTTPException(status_code=400, detail="Each item must be an object with job_url and/or job_description strings")
+    
+    # Extract auth token from request headers
+    auth_token = request.headers.get("authorization", "").replace("Bearer ", "")
+    user_job_extraction_service = JobExtractionService(user_email=current_user.email)
+    
+    async def _job(emitter):
+        return await user_job_extraction_service.save_job_analyses_batch(
+            items,
+            auth_token=auth_token if auth_token else None,
+            user=current_user,
+            on_progress=emitter.status,
+            max_concurrency=settings.JOB_BATCH_EXTRACTION_CONCURRENCY
+        )
+    
+    return sse_response(_job)
+
+
 @router.get("/list")
 async def list_analyzed_jobs(current_user: UserData = Depends(get_current_user)):
     """
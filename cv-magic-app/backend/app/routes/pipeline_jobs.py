@@ -0,0 +1,68 @@
+"""
+Pipeline Jobs API Routes
+
+Status endpoints for background jobs run by the job queue
+(e.g. the post-skill analysis pipeline).
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import JSONResponse
+
+from app.core.dependencies import get_current_user
+from app.models.auth import UserData
+from app.services.job_queue import job_queue
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/pipeline-jobs", tags=["Pipeline Jobs"])
+
+
+async def _get_owned_job(job_id: str, current_user: UserData) -> dict:
+    job = await asyncio.to_thread(job_queue.get_job, job_id)
+    if not job or job["user_email"] != current_user.email:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return job
+
+
+@router.get("")
+async def list_pipeline_jobs(
+    status: Optional[str] = None,
+    limit: int = 50,
+    current_user: UserData = Depends(get_current_user)
+):
+    """List the current user's most recent background jobs."""
+    jobs = await asyncio.to_thread(job_queue.list_jobs, current_user.email, status=status, limit=max(1, min(limit, 200)))
+    return JSONResponse(content={
+        "success": True,
+        "jobs": jobs,
+        "total": len(jobs)
+    })
+
+
+@router.get("/stats")
+async def get_pipeline_job_stats(current_user: UserData = Depends(get_current_user)):
+    """The current user's job counts per status, and worker state."""
+    stats = await asyncio.to_thread(job_queue.get_stats, current_user.email)
+    return JSONResponse(content={"success": True, **stats})
+
+
+@router.get("/{job_id}")
+async def get_pipeline_job(job_id: str, current_user: UserData = Depends(get_current_user)):
+    """Get status, attempts, per-stage progress and result of a background job."""
+    return JSONResponse(content={"success": True, "job": await _get_owned_job(job_id, current_user)})
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_pipeline_job(job_id: str, current_user: UserData = Depends(get_current_user)):
+    """Cancel a job that has not started running yet."""
+    job = await _get_owned_job(job_id, current_user)
+    if not await asyncio.to_thread(job_queue.cancel, job_id):
+        return JSONResponse(
+            status_code=409,
+            content={"success": False, "error": f"Job is {job['status']} and can no longer be cancelled"}
+        )
+    logger.info(f"🛑 [JOB_QUEUE] Job {job_id} cancelled by {current_user.email}")
+    return JSONResponse(content={"success": True, "job_id": job_id, "status": "cancelled"})
@@ -3,7 +3,9 @@ Saved Jobs API Routes
 
 Endpoints for managing saved job data.
 """
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Depends, Query
 from fastapi.responses import JSONResponse
 from typing import Dict, Optional
 from datetime import datetime
@@ -15,15 +17,21 @@ from app.models.auth import UserData
 router = APIRouter(prefix="/api/jobs", tags=["Saved Jobs"])
 
 @router.get("/saved")
-async def get_saved_jobs(current_user: UserData = Depends(get_current_user)):
-    """Get all saved jobs."""
+async def get_saved_jobs(
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    current_user: UserData = Depends(get_current_user)
+):
+    """Get saved jobs; pass offset/limit to page through them."""
     try:
         service = SavedJobsService(current_user.email)
-        jobs = service.get_all_jobs()
+        jobs = await asyncio.to_thread(service.get_all_jobs, offset=offset, limit=limit)
         return JSONResponse(content={
             "success": True,
             "jobs": jobs,
-            "total": len(jobs),
+            "total": await asyncio.to_thread(service.count_jobs),
+            "offset": offset,
+            "limit": limit,
             "timestamp": datetime.utcnow().isoformat()
         })
     except Exception as e:
@@ -34,7 +42,7 @@ async def get_job_by_url(job_url: str, current_user: UserData = Depends(get_curr
     """Get a specific job by its URL."""
     try:
         service = SavedJobsService(current_user.email)
-        job = service.get_job_by_url(job_url)
+        job = await asyncio.to_thread(service.get_job_by_url, job_url)
         if job:
             return JSONResponse(content={
                 "success": True,
@@ -65,7 +73,7 @@ async def save_job(job_data: Dict, current_user: UserData = Depends(get_current_
             )
 
         service = SavedJobsService(current_user.email)
-        success = service.save_new_job(job_data)
+        success = await asyncio.to_thread(service.save_new_job, job_data)
         if success:
             return JSONResponse(content={
                 "success": True,
@@ -88,7 +96,7 @@ async def delete_job(job_url: str, current_user: UserData = Depends(get_current_
     """Delete a saved job."""
     try:
         service = SavedJobsService(current_user.email)
-        success = service.delete_job(job_url)
+        success = await asyncio.to_thread(service.delete_job, job_url)
         if success:
             return JSONResponse(content={
                 "success": True,
@@ -110,7 +118,7 @@ async def clear_all_jobs(current_user: UserData = Depends(get_current_user)):
     """Clear all saved jobs."""
     try:
         service = SavedJobsService(current_user.email)
-        success = service.clear_all_jobs()
+        success = await asyncio.to_thread(service.clear_all_jobs)
         if success:
             return JSONResponse(content={
                 "success": True,
@@ -13,18 +13,18 @@ from fastapi import APIRouter, Request, Depends, HTTPException
 from app.exceptions import TailoredCVNotFoundError
 from fastapi.responses import JSONResponse
 
-from app.core.auth import verify_token
+from app.core.auth import verify_token_cached
 from app.core.dependencies import get_current_user
 from app.models.auth import UserData
-from app.core.model_dependency import get_current_model
+from app.core.model_dependency import get_current_model, get_request_model, request_model
 from app.services.skill_extraction import skill_extraction_service
 from app.services.cv_content_service import CVContentService
 from app.services.skills_analysis_config import skills_analysis_config_service
 from app.services.skill_extraction.prompt_templates import get_prompt as get_skill_prompt
 from app.services.skill_extraction.response_parser import SkillExtractionParser
 from app.services.skill_extraction.result_saver import SkillExtractionResultSaver
+from app.services.skill_extraction.match_summary import CATEGORIES as MATCH_CATEGORIES, SkillsMatchSummary
 from app.ai.ai_service import ai_service
-from app.services.jd_analysis import analyze_and_save_company_jd
 from app.services.cv_jd_matching import match_and_save_cv_jd
 from app.services.context_aware_analysis_pipeline import ContextAwareAnalysisPipeline
 from app.unified_latest_file_selector import get_selector_for_user
@@ -35,6 +35,11 @@ import json
 import re
 from app.utils.timestamp_utils import TimestampUtils
 from app.utils.user_path_utils import get_user_base_path
+from app.utils.single_flight import pipeline_single_flight
+from app.utils.artifact_index import artifact_index
+from app.utils.run_artifacts import pipeline_artifacts
+from app.services.job_queue import JobContext, job_queue
+from app.services.saved_jobs_store import get_saved_jobs_store
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["Skills Analysis"])
@@ -169,8 +174,6 @@ def _find_company_in_existing_folders(jd_text: str, user_email: str) -> Optional
 def _validate_required_analysis_files(company_name: str, user_email: Optional[str] = None) -> Optional[str]:
     """Validate that required analysis files exist for the company under the user-scoped path"""
     try:
-        from app.utils.timestamp_utils import TimestampUtils
-        from app.utils.user_path_utils import get_user_base_path
         
         if not user_email:
             raise ValueError("User authentication required for file operations")
@@ -203,69 +206,16 @@ def _validate_required_analysis_files(company_name: str, user_email: Optional[st
         return f"Error validating required files: {str(e)}"
 
 
-def _extract_match_rates_from_content(content: str) -> dict:
-    """Extract match rates from preextracted comparison content"""
-    rates = {
-        "technical_skills": 0,
-        "soft_skills": 0,
-        "domain_keywords": 0,
-        "overall": 0
+def _summarize_preextracted_entry(entry: dict) -> dict:
+    """Latest preextracted comparison entry with its match summary and rates"""
+    summary = SkillsMatchSummary.from_entry(entry)
+    return {
+        "timestamp": entry.get("timestamp"),
+        "model_used": entry.get("model_used"),
+        "raw_content": entry.get("content", ""),
+        "match_summary": summary.to_dict() if summary else None,
+        "match_rates": summary.match_rates() if summary else dict.fromkeys((*MATCH_CATEGORIES, "overall"), 0)
     }
-    
-    try:
-        # Extract overall match rate (new format)
-        overall_match = re.search(r"Match Rate:\s*(\d+(?:\.\d+)?)%", content)
-        if overall_match:
-            rates["overall"] = int(float(overall_match.group(1)))
-        
-        # Extract from table format
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            if "Category" in line and "Match Rate" in line:
-                # Found header, check next lines for data
-                for j in range(i+1, min(i+10, len(lines))):
-                    data_line = lines[j].strip()
-                    if data_line:
-                        # Try to parse table row
-                        parts = [p.strip() for p in data_line.split()]
-                        if len(parts) >= 6:  # Category, CV Total, JD Total, Matched, Missing, Match Rate
-                            try:
-                                category = parts[0].lower()
-                                match_rate = float(parts[-1]) if parts[-1].replace('.', '').isdigit() else 0
-                                
-                                if "technical" in category:
-                                    rates["technical_skills"] = int(match_rate)
-                                elif "soft" in category:
-                                    rates["soft_skills"] = int(match_rate)
-                                elif "domain" in category:
-                                    rates["domain_keywords"] = int(match_rate)
-                            except:
-                                pass
-        
-        # Legacy format support
-        if rates["technical_skills"] == 0:
-            tech_match = re.search(r"Technical Skills Match Rate:\s*(\d+)%", content)
-            if tech_match:
-                rates["technical_skills"] = int(tech_match.group(1))
-        
-        if rates["soft_skills"] == 0:
-            soft_match = re.search(r"Soft Skills Match Rate:\s*(\d+)%", content)
-            if soft_match:
-                rates["soft_skills"] = int(soft_match.group(1))
-        
-        if rates["domain_keywords"] == 0:
-            domain_match = re.search(r"Domain Keywords Match Rate:\s*(\d+)%", content)
-            if domain_match:
-                rates["domain_keywords"] = int(domain_match.group(1))
-        
-        # If overall not found, calculate it
-        if rates["overall"] == 0 and any([rates["technical_skills"], rates["soft_skills"], rates["domain_keywords"]]):
-            rates["overall"] = int((rates["technical_skills"] + rates["soft_skills"] + rates["domain_keywords"]) / 3)
-    
-    except Exception as e:
-        logger.warning(f"Failed to extract match rates: {e}")
-    
-    return rates
 
 
 def _detect_most_recent_company(user_email: str) -> Optional[str]:
@@ -274,7 +224,6 @@ def _detect_most_recent_company(user_email: str) -> Optional[str]:
     Returns the company folder name or None if not found.
     """
     try:
-        from app.utils.user_path_utils import get_user_base_path
         base_path = get_user_base_path(user_email)
         if not base_path.exists():
             return None
@@ -283,7 +232,6 @@ def _detect_most_recent_company(user_email: str) -> Optional[str]:
         for d in base_path.iterdir():
             if d.is_dir() and d.name != "Unknown_Company":
                 # Check for timestamped files first, then fallback to non-timestamped
-                from app.utils.timestamp_utils import TimestampUtils
                 has_job_info = TimestampUtils.find_latest_timestamped_file(d, "job_info", "json") or list(d.glob("job_info_*.json"))
                 has_jd_original = TimestampUtils.find_latest_timestamped_file(d, "jd_original", "json") or (d / "jd_original.json").exists()
                 if has_job_info or has_jd_original:
@@ -298,21 +246,133 @@ def _detect_most_recent_company(user_email: str) -> Optional[str]:
         return None
 
 
-def _schedule_post_skill_pipeline(company_name: Optional[str], token_data=None):
-    """Fire-and-forget JD analysis and CV–JD match pipeline for the given company."""
+def _jd_result_data(jd_result_obj) -> dict:
+    """JD analysis result as the dict CV–JD matching takes (and keys single-flight on)"""
+    return jd_result_obj.model_dump() if hasattr(jd_result_obj, 'model_dump') else jd_result_obj.__dict__
+
+
+def _cv_txt_for_matching(user_email: str, company: str) -> Optional[str]:
+    """CV TXT used for CV–JD matching: the latest tailored CV, else the latest CV across all"""
+    company_dir = get_user_base_path(user_email) / "applied_companies" / company
+    preferred_txt = None
+    if company_dir.exists():
+        preferred_txt = artifact_index.latest(company_dir, f"{company}_tailored_cv_*.txt", order="mtime")
+    if preferred_txt:
+        return str(preferred_txt)
+    cv_context = get_selector_for_user(user_email).get_latest_cv_across_all(company)
+    return str(cv_context.txt_path) if cv_context and cv_context.txt_path else None
+
+
+def _jd_file_identity(base_dir: Path, company: str) -> Optional[tuple]:
+    """Path, mtime and size of the JD file JD analysis reads, or None if there is none"""
+    company_dir = base_dir / "applied_companies" / company
+    jd_file = TimestampUtils.find_latest_timestamped_file(company_dir, "jd_original", "json") or (company_dir / "jd_original.json")
+    try:
+        stat = jd_file.stat()
+    except OSError:
+        return None
+    return (str(jd_file), stat.st_mtime_ns, stat.st_size)
+
+
+async def _run_jd_analysis_stage(user_email: str, company: str, base_dir: Path):
+    """Force-refresh JD analysis, sharing one in-flight run per user/company/JD file."""
+    from app.services.jd_analysis.jd_analyzer import JDAnalyzer
+
+    async def _analyze():
+        analyzer = JDAnalyzer(user_email=user_email)
+        return await analyzer.analyze_and_save_company_jd(company, force_refresh=True, base_path=str(base_dir))
+
+    # A run started after the JD was replaced must not join one analysing the old JD
+    jd_identity = _jd_file_identity(base_dir, company)
+    key = pipeline_single_flight.make_key(user_email, company, "jd_analysis", jd_identity)
+    return await pipeline_single_flight.do(key, _analyze)
+
+
+async def _run_cv_jd_matching_stage(user_email: str, company: str, cv_file_path: Optional[str] = None, jd_analysis_data=None):
+    """Force-refresh CV–JD matching, sharing one in-flight run per user/company/inputs."""
+    async def _match():
+        return await match_and_save_cv_jd(
+            company,
+            cv_file_path=cv_file_path,
+            force_refresh=True,
+            jd_analysis_data=jd_analysis_data,
+            user_email=user_email
+        )
+
+    # make_key hashes the inputs, so runs on a different CV or JD never share a result
+    key = pipeline_single_flight.make_key(user_email, company, "cv_jd_matching", cv_file_path, jd_analysis_data)
+    return await pipeline_single_flight.do(key, _match)
+
+
+async def _run_component_analysis_stage(user_email: str, company: str, cv_text: Optional[str] = None):
+    """Run component analysis + ATS, sharing one in-flight run per user/company/CV text."""
+    from app.services.ats.modular_ats_orchestrator import get_modular_ats_orchestrator
+
+    async def _analyze():
+        user_orchestrator = get_modular_ats_orchestrator(user_email=user_email)
+        return await user_orchestrator.run_component_analysis(company, cv_text=cv_text)
+
+    key = pipeline_single_flight.make_key(user_email, company, "component_analysis", cv_text)
+    return await pipeline_single_flight.do(key, _analyze)
+
+
+POST_SKILL_PIPELINE_JOB = "post_skill_pipeline"
+
+
+def _schedule_post_skill_pipeline(company_name: Optional[str], token_data=None) -> Optional[str]:
+    """Queue the post-skill pipeline (JD analysis through tailored CV) for the given company.
+
+    Returns:
+        The background job id (poll /api/pipeline-jobs/{job_id}), or None if nothing was queued
+    """
     if not company_name:
         logger.warning("⚠️ [PIPELINE] No company detected; skipping JD analysis & CV–JD matching.")
-        return
+        return None
 
-    logger.info(f"🚀 [PIPELINE] Scheduling JD analysis and CV–JD matching for '{company_name}'...")
+    user_email = getattr(token_data, 'email', None) if token_data else None
+    if not user_email:
+        logger.warning("⚠️ [PIPELINE] No authenticated user; skipping background pipeline.")
+        return None
+
+    logger.info(f"🚀 [PIPELINE] Queueing JD analysis and CV–JD matching for '{company_name}'...")
 
     try:
-        # Pass token_data to pipeline
-        asyncio.create_task(_run_pipeline(company_name, token_data))
+        # A still-queued run for the same user/company will pick up the newest files anyway.
+        # The worker has no request context, so carry the model the user picked with the job.
+        return job_queue.enqueue(
+            POST_SKILL_PIPELINE_JOB,
+            user_email,
+            {"company": company_name, "model": get_request_model()},
+            dedupe_key=f"{POST_SKILL_PIPELINE_JOB}:{user_email}:{company_name}"
+        )
     except Exception as e:
-        logger.warning(f"⚠️ [PIPELINE] Failed to schedule background pipeline: {e}")
+        logger.warning(f"⚠️ [PIPELINE] Failed to queue background pipeline: {e}")
+        return None
+
+
+async def _run_post_skill_pipeline_job(payload: dict, job: JobContext) -> dict:
+    """Job queue handler for the post-skill pipeline"""
+    from types import SimpleNamespace
+
+    # Run every AI stage on the model selected for the request that queued the job
+    model_token = request_model.set(payload.get("model"))
+    try:
+        # Stages hand their artifacts over in memory; files are flushed before the job completes
+        async with pipeline_artifacts(job.user_email, payload["company"]):
+            pipeline_results = await _run_pipeline(
+                payload["company"],
+                SimpleNamespace(email=job.user_email),
+                progress=lambda results: job.report_progress(stages=results)
+            )
+    finally:
+        request_model.reset(model_token)
+    # Every later stage depends on the JD analysis, so treat its failure as retryable
+    if not pipeline_results["jd_analysis"]:
+        raise RuntimeError(f"JD analysis failed for {payload['company']}")
+    return pipeline_results
+
 
-async def _run_pipeline(cname: str, token_data=None):
+async def _run_pipeline(cname: str, token_data=None, progress=None):
     pipeline_results = {
         "jd_analysis": False,
         "cv_jd_matching": False,
@@ -323,7 +383,6 @@ async def _run_pipeline(cname: str, token_data=None):
     }
     
     # Get user email and base directory first
-    from app.utils.user_path_utils import get_user_base_path
     user_email = getattr(token_data, 'email', None) if token_data else None
     if not user_email:
         raise ValueError("User authentication required for pipeline operations")
@@ -333,10 +392,8 @@ async def _run_pipeline(cname: str, token_data=None):
     try:
         company_dir = base_dir / "applied_companies" / cname
         logger.info(f"🔧 [PIPELINE] Starting JD analysis for {cname} (force_refresh=True)")
-        from app.services.jd_analysis.jd_analyzer import JDAnalyzer
-        _analyzer = JDAnalyzer(user_email=user_email)
-        jd_result_obj = await _analyzer.analyze_and_save_company_jd(cname, force_refresh=True, base_path=str(base_dir))
-        jd_result = jd_result_obj.model_dump() if hasattr(jd_result_obj, 'model_dump') else jd_result_obj.__dict__
+        jd_result_obj = await _run_jd_analysis_stage(user_email, cname, base_dir)
+        jd_result = _jd_result_data(jd_result_obj)
         saved_path = jd_result_obj.metadata.get("saved_path") if hasattr(jd_result_obj, 'metadata') and jd_result_obj.metadata else None
         logger.info(f"✅ [PIPELINE] JD analysis saved for {cname} at: {saved_path}")
         
@@ -350,8 +407,8 @@ async def _run_pipeline(cname: str, token_data=None):
             jd_text = jd_result.get('jd_text', '') or ''
             job_title = jd_result.get('job_title', '') or ''
             
-            # Record the JD usage
-            tracker.record_jd_usage(jd_url, jd_text, cname, job_title)
+            # Record the JD usage (a SQLite transaction, so off the loop)
+            await asyncio.to_thread(tracker.record_jd_usage, jd_url, jd_text, cname, job_title)
             logger.info(f"📝 [PIPELINE] JD usage recorded for {cname}")
         except Exception as e:
             logger.warning(f"⚠️ [PIPELINE] Failed to record JD usage: {e}")
@@ -360,30 +417,15 @@ async def _run_pipeline(cname: str, token_data=None):
     except Exception as e:
         logger.error(f"❌ [PIPELINE] JD analysis failed for {cname}: {e}")
         # Continue with next steps even if this fails
+    if progress:
+        progress(dict(pipeline_results))
 
     # Step 2: CV-JD Matching
     try:
         logger.info(f"🔧 [PIPELINE] Starting CV–JD matching for {cname}")
         # Prefer tailored CV if available; else fall back to dynamic latest
         try:
-            from app.utils.user_path_utils import get_user_base_path
-            user_email = getattr(token_data, 'email', None)
-            if not user_email:
-                raise ValueError("User authentication required for CV operations")
-            base_dir_local = get_user_base_path(user_email)
-            company_tailored_dir = base_dir_local / "applied_companies" / cname
-            preferred_txt = None
-            if company_tailored_dir.exists():
-                txt_candidates = list(company_tailored_dir.glob(f"{cname}_tailored_cv_*.txt"))
-                if txt_candidates:
-                    preferred_txt = max(txt_candidates, key=lambda p: p.stat().st_mtime)
-            cv_txt_path_for_match = str(preferred_txt) if preferred_txt else None
-            if not cv_txt_path_for_match:
-                # Use unified selector instead of missing dynamic_cv_selector
-                from app.unified_latest_file_selector import get_selector_for_user
-                user_selector = get_selector_for_user(user_email)
-                cv_context = user_selector.get_latest_cv_across_all(cname)
-                cv_txt_path_for_match = str(cv_context.txt_path) if cv_context and cv_context.txt_path else None
+            cv_txt_path_for_match = _cv_txt_for_matching(user_email, cname)
             if cv_txt_path_for_match:
                 logger.info(f"📄 [PIPELINE] CV–JD matching will use CV TXT: {cv_txt_path_for_match}")
         except Exception as _sel_err:
@@ -398,12 +440,11 @@ async def _run_pipeline(cname: str, token_data=None):
             jd_data_for_match = None
 
         # Force refresh so requirement bonus uses the newest match_counts
-        await match_and_save_cv_jd(
+        await _run_cv_jd_matching_stage(
+            user_email,
             cname,
             cv_file_path=cv_txt_path_for_match,
-            force_refresh=True,
-            jd_analysis_data=jd_data_for_match,
-            user_email=user_email
+            jd_analysis_data=jd_data_for_match
         )
         logger.info(f"✅ [PIPELINE] CV–JD match results saved for {cname}")
         pipeline_results["cv_jd_matching"] = True
@@ -413,15 +454,12 @@ async def _run_pipeline(cname: str, token_data=None):
         import traceback
         logger.error(f"[PIPELINE] CV-JD matching traceback: {traceback.format_exc()}")
         # Continue with component analysis even if matching fails
+    if progress:
+        progress(dict(pipeline_results))
 
     # Step 3: Component Analysis (includes ATS calculation) - Tailored-only via unified selector
     try:
         logger.info(f"🔍 [PIPELINE] Starting component analysis for {cname}")
-        from app.services.ats.modular_ats_orchestrator import get_modular_ats_orchestrator
-        from app.unified_latest_file_selector import get_selector_for_user
-        
-        # Create user-specific orchestrator
-        user_orchestrator = get_modular_ats_orchestrator(user_email=user_email)
         
         # Get latest CV context across tailored+original, log paths, then read content
         try:
@@ -446,12 +484,10 @@ async def _run_pipeline(cname: str, token_data=None):
             raise
         
         # Check if we have the minimum required files (JD + skills analysis must exist)
-        from app.utils.user_path_utils import get_user_base_path
         # This route requires authentication - user_email should be provided
         if not user_email:
             raise ValueError("User authentication required for file validation")
         base_dir = get_user_base_path(user_email)
-        from app.utils.timestamp_utils import TimestampUtils
         company_dir = base_dir / "applied_companies" / cname
         jd_file = TimestampUtils.find_latest_timestamped_file(company_dir, "jd_original", "json")
         if not jd_file:
@@ -464,7 +500,7 @@ async def _run_pipeline(cname: str, token_data=None):
         # We can run component analysis if we have CV text, JD, and skills analysis
         if cv_text_for_analysis and jd_file.exists() and skills_file.exists():
             logger.info(f"📄 [PIPELINE] Required files found, proceeding with component analysis")
-            component_result = await user_orchestrator.run_component_analysis(cname, cv_text=cv_text_for_analysis or None)
+            component_result = await _run_component_analysis_stage(user_email, cname, cv_text=cv_text_for_analysis or None)
             logger.info(f"✅ [PIPELINE] Component analysis completed for {cname}")
             pipeline_results["component_analysis"] = True
             
@@ -493,6 +529,8 @@ async def _run_pipeline(cname: str, token_data=None):
         logger.error(f"❌ [PIPELINE] Component analysis failed for {cname}: {component_error}")
         import traceback
         logger.error(f"[PIPELINE] Component analysis traceback: {traceback.format_exc()}")
+    if progress:
+        progress(dict(pipeline_results))
     
     # Step 4: Create Input Recommendation File (required for AI recommendation generation)
     try:
@@ -510,6 +548,8 @@ async def _run_pipeline(cname: str, token_data=None):
     except Exception as rec_error:
         logger.error(f"❌ [PIPELINE] Input recommendation creation failed for {cname}: {rec_error}")
         pipeline_results["input_recommendation"] = False
+    if progress:
+        progress(dict(pipeline_results))
     
     # Step 5: AI Recommendation Generation (if input recommendation was successful)
     if pipeline_results["input_recommendation"]:
@@ -532,6 +572,8 @@ async def _run_pipeline(cname: str, token_data=None):
     else:
         logger.info(f"⏭️ [PIPELINE] Skipping AI recommendation generation for {cname} (input recommendation failed)")
         pipeline_results["ai_recommendation"] = False
+    if progress:
+        progress(dict(pipeline_results))
     
     # Step 6: Tailored CV Generation (if AI recommendation was successful)
     if pipeline_results["ai_recommendation"]:
@@ -542,16 +584,14 @@ async def _run_pipeline(cname: str, token_data=None):
             cv_service = CVTailoringService(user_email=user_email)
             
             # Check if we have the required files for CV tailoring
-            from app.utils.user_path_utils import get_user_base_path
             base_dir = get_user_base_path(user_email)
             company_dir = base_dir / "applied_companies" / cname
             
             # Check for AI recommendation file
             ai_rec_file = None
             for pattern in [f"{cname}_ai_recommendation_*.json", f"{cname}_ai_recommendation.json"]:
-                files = list(company_dir.glob(pattern))
-                if files:
-                    ai_rec_file = max(files, key=lambda f: f.stat().st_mtime)
+                ai_rec_file = artifact_index.latest(company_dir, pattern, order="mtime")
+                if ai_rec_file:
                     break
             
             if ai_rec_file and ai_rec_file.exists():
@@ -560,9 +600,8 @@ async def _run_pipeline(cname: str, token_data=None):
                 # The AI recommendation generator should have already triggered CV tailoring
                 # Let's check if a tailored CV was created in the correct location
                 tailored_cv_dir = base_dir / "cvs" / "tailored"
-                tailored_cv_files = list(tailored_cv_dir.glob(f"{cname}_tailored_cv_*.txt"))
-                if tailored_cv_files:
-                    latest_tailored = max(tailored_cv_files, key=lambda f: f.stat().st_mtime)
+                latest_tailored = artifact_index.latest(tailored_cv_dir, f"{cname}_tailored_cv_*.txt", order="mtime")
+                if latest_tailored:
                     logger.info(f"✅ [PIPELINE] Tailored CV found: {latest_tailored}")
                     pipeline_results["tailored_cv"] = True
                 else:
@@ -588,6 +627,12 @@ async def _run_pipeline(cname: str, token_data=None):
         logger.info(f"   ❌ Failed: {failed_steps}")
     else:
         logger.info(f"   🎉 All steps completed successfully!")
+    if progress:
+        progress(dict(pipeline_results))
+    return pipeline_results
+
+
+job_queue.register(POST_SKILL_PIPELINE_JOB, _run_post_skill_pipeline_job)
 
 @router.post("/skill-extraction/analyze")
 async def analyze_skills(request: Request, current_user: UserData = Depends(get_current_user)):
@@ -646,14 +691,12 @@ async def analyze_skills(request: Request, current_user: UserData = Depends(get_
             token_data = getattr(request, 'user', None)
         except Exception:
             token_data = None
-        _schedule_post_skill_pipeline(company_name, token_data)
+        pipeline_job_id = await asyncio.to_thread(_schedule_post_skill_pipeline, company_name, token_data)
         
         # ALSO trigger job saving logic for the analyze endpoint
         try:
             import json
-            from datetime import datetime
             if company_name:
-                from app.utils.user_path_utils import get_user_base_path
                 try:
                     user_email = getattr(token_data, 'email', None)
                 except Exception:
@@ -663,41 +706,24 @@ async def analyze_skills(request: Request, current_user: UserData = Depends(get_
                 base_dir_local = get_user_base_path(user_email)
                 company_dir = base_dir_local / "applied_companies" / company_name
                 
-                # Check for job_info files and add to saved_jobs.json (same logic as preliminary_analysis)
-                job_info_files = list(company_dir.glob("job_info_*.json"))
-                if not job_info_files:
+                # Check for job_info files and add to saved jobs (same logic as preliminary_analysis)
+                latest_job_info_file = artifact_index.latest(company_dir, "job_info_*.json", order="mtime")
+                if not latest_job_info_file:
                     # Fallback to job_info.json (legacy format)
                     legacy_job_info = company_dir / "job_info.json"
                     if legacy_job_info.exists():
-                        job_info_files = [legacy_job_info]
+                        latest_job_info_file = legacy_job_info
                 
-                if job_info_files:
-                    # Use the most recent job_info file
-                    latest_job_info_file = max(job_info_files, key=lambda f: f.stat().st_mtime)
+                if latest_job_info_file:
                     
                     with open(latest_job_info_file, 'r', encoding='utf-8') as f:
                         job_metadata = json.load(f)
                     
-                    # Save to user-scoped saved jobs file
-                    saved_jobs_file = base_dir_local / "saved_jobs" / "saved_jobs.json"
-                    saved_jobs_file.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    if saved_jobs_file.exists():
-                        with open(saved_jobs_file, 'r', encoding='utf-8') as f:
-                            saved_jobs_data = json.load(f)
+                    # Save to the user's saved jobs store
+                    if await asyncio.to_thread(get_saved_jobs_store(user_email).add_if_absent, [job_metadata]):
+                        logger.info(f"✅ [JOBS] Added job to saved jobs: {job_metadata.get('job_title')} at {job_metadata.get('company_name')}")
                     else:
-                        saved_jobs_data = {"jobs": [], "last_updated": datetime.now().isoformat(), "total_jobs": 0}
-                    
-                    if not any(job.get("job_url") == job_metadata.get("job_url") for job in saved_jobs_data["jobs"]):
-                        saved_jobs_data["jobs"].append(job_metadata)
-                        saved_jobs_data["last_updated"] = datetime.now().isoformat()
-                        saved_jobs_data["total_jobs"] = len(saved_jobs_data["jobs"])
-                        
-                        with open(saved_jobs_file, 'w', encoding='utf-8') as f:
-                            json.dump(saved_jobs_data, f, indent=2, ensure_ascii=False)
-                        logger.info(f"✅ [JOBS] Added job to shared jobs file: {job_metadata.get('job_title')} at {job_metadata.get('company_name')}")
-                    else:
-                        logger.info(f"♻️ [JOBS] Job already exists in saved_jobs.json: {job_metadata.get('job_title')} at {job_metadata.get('company_name')}")
+                        logger.info(f"♻️ [JOBS] Job already saved: {job_metadata.get('job_title')} at {job_metadata.get('company_name')}")
         except Exception as e:
             logger.warning(f"⚠️ [JOBS] Failed to save job info: {e}")
         
@@ -705,6 +731,7 @@ async def analyze_skills(request: Request, current_user: UserData = Depends(get_
             "success": True,
             "message": "Skill extraction completed successfully",
             "config_used": config_name or "default",
+            "pipeline_job_id": pipeline_job_id,
             **result
         })
         
@@ -732,7 +759,7 @@ async def context_aware_analysis(
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -865,7 +892,7 @@ async def preliminary_analysis(
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -924,19 +951,16 @@ async def preliminary_analysis(
             logger.warning(f"⚠️ Skipping pre-check due to error: {e}")
         
         # NEW: Always use unified latest-across-all CV (tailored or original by newest timestamp)
-        from app.unified_latest_file_selector import get_selector_for_user
         try:
             # Create user-specific selector
             user_selector = get_selector_for_user(user_email)
             # Log JD URL if available via latest job_info for this company (once per analysis)
             try:
-                from app.utils.user_path_utils import get_user_base_path
                 from pathlib import Path as _Path
                 base_dir = get_user_base_path(user_email)
                 company_dir = base_dir / "applied_companies" / company_name
-                job_info_files = list(company_dir.glob("job_info_*.json"))
-                if job_info_files:
-                    latest_job_info = max(job_info_files, key=lambda f: f.stat().st_mtime)
+                latest_job_info = artifact_index.latest(company_dir, "job_info_*.json", order="mtime")
+                if latest_job_info:
                     import json as _json
                     with open(latest_job_info, 'r', encoding='utf-8') as _jf:
                         _job = _json.load(_jf)
@@ -1006,7 +1030,6 @@ async def preliminary_analysis(
 
             # If we have a company, ensure required files exist for the pipeline
             if company_name:
-                from app.utils.user_path_utils import get_user_base_path
                 # Use authenticated user's email for user-scoped path
                 try:
                     user_email = getattr(token_data, 'email', None)
@@ -1025,8 +1048,6 @@ async def preliminary_analysis(
             # Save JD content and job info to files
             try:
                 import json
-                from datetime import datetime
-                from app.utils.timestamp_utils import TimestampUtils
                 from app.services.job_extractor import extract_job_metadata
                 
                 # Check if JD file already exists
@@ -1048,46 +1069,29 @@ async def preliminary_analysis(
                         job_info_file = company_dir / f"job_info_{company_name}_{timestamp}.json"
                         with open(job_info_file, 'w', encoding='utf-8') as f:
                             json.dump(job_metadata, f, indent=2, ensure_ascii=False)
+                        artifact_index.record_write(job_info_file)
                         logger.info(f"💾 [PIPELINE] Job info saved to: {job_info_file}")
                 else:
                     logger.info(f"♻️ [PIPELINE] (preliminary-analysis) JD file already exists: {existing_jd}")
                 
-                # ALWAYS check for job_info files and add to saved_jobs.json (whether JD exists or not)
-                job_info_files = list(company_dir.glob("job_info_*.json"))
-                if not job_info_files:
+                # ALWAYS check for job_info files and add to saved jobs (whether JD exists or not)
+                latest_job_info_file = artifact_index.latest(company_dir, "job_info_*.json", order="mtime")
+                if not latest_job_info_file:
                     # Fallback to job_info.json (legacy format)
                     legacy_job_info = company_dir / "job_info.json"
                     if legacy_job_info.exists():
-                        job_info_files = [legacy_job_info]
+                        latest_job_info_file = legacy_job_info
                 
-                if job_info_files:
-                    # Use the most recent job_info file
-                    latest_job_info_file = max(job_info_files, key=lambda f: f.stat().st_mtime)
+                if latest_job_info_file:
                     
                     with open(latest_job_info_file, 'r', encoding='utf-8') as f:
                         job_metadata = json.load(f)
                     
-                    # Save to shared jobs file
-                    # Save jobs under the user-scoped cv-analysis path
-                    saved_jobs_file = base_dir / "saved_jobs" / "saved_jobs.json"
-                    saved_jobs_file.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    if saved_jobs_file.exists():
-                        with open(saved_jobs_file, 'r', encoding='utf-8') as f:
-                            saved_jobs_data = json.load(f)
+                    # Save to the user's saved jobs store
+                    if await asyncio.to_thread(get_saved_jobs_store(user_email).add_if_absent, [job_metadata]):
+                        logger.info(f"✅ [JOBS] Added job to saved jobs: {job_metadata.get('job_title')} at {job_metadata.get('company_name')}")
                     else:
-                        saved_jobs_data = {"jobs": [], "last_updated": datetime.now().isoformat(), "total_jobs": 0}
-                    
-                    if not any(job.get("job_url") == job_metadata.get("job_url") for job in saved_jobs_data["jobs"]):
-                        saved_jobs_data["jobs"].append(job_metadata)
-                        saved_jobs_data["last_updated"] = datetime.now().isoformat()
-                        saved_jobs_data["total_jobs"] = len(saved_jobs_data["jobs"])
-                        
-                        with open(saved_jobs_file, 'w', encoding='utf-8') as f:
-                            json.dump(saved_jobs_data, f, indent=2, ensure_ascii=False)
-                        logger.info(f"✅ [JOBS] Added job to shared jobs file: {job_metadata.get('job_title')} at {job_metadata.get('company_name')}")
-                    else:
-                        logger.info(f"♻️ [JOBS] Job already exists in saved_jobs.json: {job_metadata.get('job_title')} at {job_metadata.get('company_name')}")
+                        logger.info(f"♻️ [JOBS] Job already saved: {job_metadata.get('job_title')} at {job_metadata.get('company_name')}")
                 
             except Exception as e:
                 logger.warning(f"⚠️ [PIPELINE] (preliminary-analysis) failed to save JD and job info: {e}")
@@ -1096,7 +1100,6 @@ async def preliminary_analysis(
                 try:
                     import json
                     # Use unified selector instead of missing dynamic_cv_selector
-                    from app.unified_latest_file_selector import get_selector_for_user
                     user_selector = get_selector_for_user(user_email)
                     cv_context = user_selector.get_latest_cv_across_all(company_name)
                     cv_file = Path(cv_context.json_path) if cv_context and cv_context.json_path else None
@@ -1126,7 +1129,9 @@ async def preliminary_analysis(
                     logger.warning(f"⚠️ [PIPELINE] (preliminary-analysis) failed to save CV file: {e}")
 
             logger.info(f"🚀 [PIPELINE] (preliminary-analysis) scheduling for company: {company_name}")
-            _schedule_post_skill_pipeline(company_name, token_data)
+            pipeline_job_id = await asyncio.to_thread(_schedule_post_skill_pipeline, company_name, token_data)
+            if pipeline_job_id and isinstance(result, dict):
+                result["pipeline_job_id"] = pipeline_job_id
         except Exception as e:
             logger.warning(f"⚠️ [PIPELINE] (preliminary-analysis) failed to schedule: {e}")
         
@@ -1163,7 +1168,7 @@ async def get_cached_preliminary_analysis(request: Request):
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -1229,7 +1234,7 @@ async def get_preliminary_analysis_status(request: Request):
             )
         
         token = auth_header.replace("Bearer ", "")
-        token_data = verify_token(token)
+        token_data, _ = verify_token_cached(token)
         if not token_data:
             return JSONResponse(
                 status_code=401,
@@ -1288,14 +1293,12 @@ async def trigger_component_analysis(company: str, current_user: UserData = Depe
         logger.info(f"🔧 [MANUAL] Using dynamic CV: {latest_cv_paths['json_source']} folder")
         
         # Check if required files exist
-        from app.utils.user_path_utils import get_user_base_path
         user_email = current_user.email
         if not user_email:
             raise ValueError("User authentication required for analysis listing")
         base_dir = get_user_base_path(user_email)
         
         # Use timestamped files with fallback
-        from app.utils.timestamp_utils import TimestampUtils
         company_dir = base_dir / company
         jd_file = TimestampUtils.find_latest_timestamped_file(company_dir, "jd_original", "json")
         if not jd_file:
@@ -1357,52 +1360,24 @@ async def trigger_complete_pipeline(company: str, current_user: UserData = Depen
             "company": company,
             "steps": []
         }
+        jd_data_for_match = None
         
 # Step 1: JD Analysis
         try:
             logger.info(f"🔧 [MANUAL] Step 1: JD Analysis for {company}")
-            # Save job info to shared jobs file
-            from pathlib import Path
-            import json
-            from datetime import datetime
-
-            saved_jobs_file = get_user_base_path(current_user.email) / "saved_jobs" / "saved_jobs.json"
-            saved_jobs_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Create initial jobs file if it doesn't exist
-            if not saved_jobs_file.exists():
-                initial_data = {
-                    "jobs": [],
-                    "last_updated": datetime.utcnow().isoformat(),
-                    "total_jobs": 0
-                }
-                with open(saved_jobs_file, 'w', encoding='utf-8') as f:
-                    json.dump(initial_data, f, indent=2, ensure_ascii=False)
-
-            # Read current jobs
-            with open(saved_jobs_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Get job info from original JD file
+            # Save job info to the user's saved jobs store
             job_info_file = get_user_base_path(current_user.email) / "applied_companies" / company / "job_info.json"
             if job_info_file.exists():
                 with open(job_info_file, 'r', encoding='utf-8') as f:
                     job_info = json.load(f)
                     
-                    # Add job to jobs list if not already present
-                    if not any(job.get("job_url") == job_info.get("job_url") for job in data["jobs"]):
-                        data["jobs"].append(job_info)
-                        data["last_updated"] = datetime.utcnow().isoformat()
-                        data["total_jobs"] = len(data["jobs"])
-                        
-                        # Save updated jobs data
-                        with open(saved_jobs_file, 'w', encoding='utf-8') as f:
-                            json.dump(data, f, indent=2, ensure_ascii=False)
-                        logger.info(f"✅ [JOBS] Added job to shared jobs file: {job_info.get('job_title')} at {job_info.get('company_name')}")
+                # Add job to saved jobs if not already present
+                if await asyncio.to_thread(get_saved_jobs_store(current_user.email).add_if_absent, [job_info]):
+                    logger.info(f"✅ [JOBS] Added job to saved jobs: {job_info.get('job_title')} at {job_info.get('company_name')}")
 
-            from app.utils.user_path_utils import get_user_base_path
             base_dir = get_user_base_path(current_user.email)
-            await analyze_and_save_company_jd(company, force_refresh=True, base_path=str(base_dir))
+            jd_result_obj = await _run_jd_analysis_stage(current_user.email, company, base_dir)
+            jd_data_for_match = _jd_result_data(jd_result_obj)
             results["steps"].append({"step": "jd_analysis", "status": "success"})
         except Exception as e:
             logger.error(f"❌ [MANUAL] JD Analysis failed: {e}")
@@ -1411,7 +1386,13 @@ async def trigger_complete_pipeline(company: str, current_user: UserData = Depen
         # Step 2: CV-JD Matching
         try:
             logger.info(f"🔧 [MANUAL] Step 2: CV-JD Matching for {company}")
-            await match_and_save_cv_jd(company, cv_file_path=None, force_refresh=True, user_email=current_user.email)
+            # Same inputs as the queued pipeline, so a concurrent run of it is joined, not repeated
+            await _run_cv_jd_matching_stage(
+                current_user.email,
+                company,
+                cv_file_path=_cv_txt_for_matching(current_user.email, company),
+                jd_analysis_data=jd_data_for_match
+            )
             results["steps"].append({"step": "cv_jd_matching", "status": "success"})
         except Exception as e:
             logger.error(f"❌ [MANUAL] CV-JD Matching failed: {e}")
@@ -1420,9 +1401,8 @@ async def trigger_complete_pipeline(company: str, current_user: UserData = Depen
         # Step 3: Component Analysis (includes ATS calculation)
         try:
             logger.info(f"🔧 [MANUAL] Step 3: Component Analysis for {company}")
-            from app.services.ats.modular_ats_orchestrator import get_modular_ats_orchestrator
-            user_orchestrator = get_modular_ats_orchestrator(user_email=current_user.email)
-            component_result = await user_orchestrator.run_component_analysis(company)
+            cv_text = get_selector_for_user(current_user.email).get_cv_content_across_all(company)
+            component_result = await _run_component_analysis_stage(current_user.email, company, cv_text=cv_text or None)
             
             if isinstance(component_result, dict) and 'extracted_scores' in component_result:
                 results["steps"].append({
@@ -1562,7 +1542,6 @@ async def list_recommendation_files():
     try:
         from app.services.ats_recommendation_service import ATSRecommendationService
         
-        from app.utils.user_path_utils import get_user_base_path
         user_email = getattr(token_data, 'email', None)
         if not user_email:
             raise ValueError("User authentication required for recommendations listing")
@@ -1760,7 +1739,6 @@ async def generate_ai_recommendation(company: str, force_regenerate: bool = Fals
         logger.info(f"🤖 [API] Generating AI recommendation for: {company}")
         
         # Check if input recommendation file exists using user-specific path
-        from app.utils.user_path_utils import get_user_base_path
         user_base_path = get_user_base_path(current_user.email)
         input_file = user_base_path / "applied_companies" / company / f"{company}_input_recommendation.json"
         if not input_file.exists():
@@ -1958,7 +1936,6 @@ async def list_analysis_configs():
 async def list_companies_with_results():
     """List all companies that have analysis results"""
     try:
-        from app.utils.user_path_utils import get_user_base_path
         user_email = getattr(token_data, 'email', None)
         if not user_email:
             raise ValueError("User authentication required for companies listing")
@@ -1974,7 +1951,6 @@ async def list_companies_with_results():
         for company_dir in base_dir.iterdir():
             if company_dir.is_dir() and company_dir.name != "Unknown_Company":
                 # Use timestamped analysis file with fallback
-                from app.utils.timestamp_utils import TimestampUtils
                 analysis_file = TimestampUtils.find_latest_timestamped_file(company_dir, f"{company_dir.name}_skills_analysis", "json")
                 if not analysis_file:
                     analysis_file = company_dir / f"{company_dir.name}_skills_analysis.json"
@@ -2031,7 +2007,6 @@ async def get_analysis_results(company: str, request: Request = None):
         logger.info(f"📊 [API] Fetching analysis results for company: {company}")
         
         # Build file path using timestamped files
-        from app.utils.user_path_utils import get_user_base_path
         
         # Try to get user email from token, default to admin if not available
         user_email = None
@@ -2040,8 +2015,8 @@ async def get_analysis_results(company: str, request: Request = None):
                 auth_header = request.headers.get("authorization")
                 if auth_header and auth_header.startswith("Bearer "):
                     token = auth_header.replace("Bearer ", "")
-                    from app.core.auth import verify_token
-                    token_data = verify_token(token)
+                    from app.core.auth import verify_token_cached
+                    token_data, _ = verify_token_cached(token)
                     if token_data:
                         user_email = getattr(token_data, 'email', None)
             except Exception as e:
@@ -2058,7 +2033,6 @@ async def get_analysis_results(company: str, request: Request = None):
             pass
         
         # Use timestamped analysis file with fallback
-        from app.utils.timestamp_utils import TimestampUtils
         analysis_file = TimestampUtils.find_latest_timestamped_file(company_dir, f"{company}_skills_analysis", "json")
         if not analysis_file:
             analysis_file = company_dir / f"{company}_skills_analysis.json"
@@ -2112,14 +2086,7 @@ async def get_analysis_results(company: str, request: Request = None):
         latest_preextracted = None
         preextracted_entries = data.get("preextracted_comparison_entries", [])
         if preextracted_entries:
-            latest = preextracted_entries[-1]
-            content = latest.get("content", "")
-            latest_preextracted = {
-                "timestamp": latest.get("timestamp"),
-                "model_used": latest.get("model_used"),
-                "raw_content": content,
-                "match_rates": _extract_match_rates_from_content(content)
-            }
+            latest_preextracted = _summarize_preextracted_entry(preextracted_entries[-1])
 
         # Get latest component analysis
         latest_component = None
@@ -2152,16 +2119,7 @@ async def get_analysis_results(company: str, request: Request = None):
         # Get latest preextracted comparison
         preextracted_entries = data.get("preextracted_comparison_entries", [])
         if preextracted_entries:
-            latest = preextracted_entries[-1]
-            # Parse the content to extract match rates
-            content = latest.get("content", "")
-            result["preextracted_comparison"] = {
-                "timestamp": latest.get("timestamp"),
-                "model_used": latest.get("model_used"),
-                "raw_content": content,
-                # Extract match rates from content using regex
-                "match_rates": _extract_match_rates_from_content(content)
-            }
+            result["preextracted_comparison"] = _summarize_preextracted_entry(preextracted_entries[-1])
         
         # Get latest component analysis
         component_entries = data.get("component_analysis_entries", [])
@@ -2181,7 +2139,6 @@ async def get_analysis_results(company: str, request: Request = None):
         
         # Get AI recommendation content if available
         # Use timestamped AI recommendation file with fallback
-        from app.utils.timestamp_utils import TimestampUtils
         # company_dir already set to base_dir / "applied_companies" / company above
         # Try multiple naming patterns for AI recommendations
         ai_recommendation_file = TimestampUtils.find_latest_timestamped_file(company_dir, f"{company}_ai_recommendation", "json")
@@ -2342,7 +2299,6 @@ async def perform_preliminary_skills_analysis(
                 pass
         
         # Get AI service instance
-        from app.ai.ai_service import ai_service
         
         # Log current AI service status
         current_status = ai_service.get_current_status()
@@ -2513,8 +2469,6 @@ async def perform_preliminary_skills_analysis(
                 if file_params["auto_detect_company"]:
                     try:
                         from pathlib import Path
-                        from app.utils.user_path_utils import get_user_base_path
-                        from app.utils.timestamp_utils import TimestampUtils
                         import json
                         
                         # Use user-scoped path - require valid user email
@@ -2550,9 +2504,8 @@ async def perform_preliminary_skills_analysis(
                                     logger.info(f"🏢 [COMPANY_DETECTION] Using most recent company folder: {company_name}")
                                     
                                     # Also log the job_info content for debugging
-                                    job_info_files = list(most_recent_folder.glob("job_info_*.json"))
-                                    if job_info_files:
-                                        latest_job_info = max(job_info_files, key=lambda p: p.stat().st_mtime)
+                                    latest_job_info = artifact_index.latest(most_recent_folder, "job_info_*.json", order="mtime")
+                                    if latest_job_info:
                                         try:
                                             with open(latest_job_info, 'r', encoding='utf-8') as f:
                                                 job_data = json.load(f)
@@ -2698,8 +2651,8 @@ async def perform_preliminary_skills_analysis(
             }
 
             # Use centralized AI service with the exact provided prompt
-            from app.services.skill_extraction.preextracted_comparator import execute_skills_semantic_comparison
-            preextracted_output = await execute_skills_semantic_comparison(
+            from app.services.skill_extraction.preextracted_comparator import execute_skills_semantic_comparison_structured
+            preextracted_output, match_summary = await execute_skills_semantic_comparison_structured(
                 ai_service,
                 cv_skills=pre_cv_skills,
                 jd_skills=pre_jd_skills,
@@ -2716,7 +2669,8 @@ async def perform_preliminary_skills_analysis(
                 pre_file_path = result_saver.append_preextracted_comparison(
                   preextracted_output,
                   company_name or "Unknown_Company",
-                  result.get("saved_file_path")
+                  result.get("saved_file_path"),
+                  match_summary=match_summary.to_dict() if match_summary else None
                 )
                 if logging_params["enable_detailed_logging"]:
                     logger.info(f"📁 [PREEXTRACTED_COMPARISON] Results appended to: {pre_file_path}")
@@ -2728,6 +2682,7 @@ async def perform_preliminary_skills_analysis(
             # Include raw formatted analysis in response payload
             result["preextracted_skills_comparison"] = {
                 "raw_output": preextracted_output,
+                "match_summary": match_summary.to_dict() if match_summary else None,
                 "company_name": company_name
             }
 
@@ -14,6 +14,9 @@ from datetime import datetime
 
 from app.ai.ai_service import ai_service
 from app.ai.base_provider import AIResponse
+from app.ai.prompt_registry import RenderedPrompt, prompt_registry
+from app.utils.run_artifacts import artifact_exists, artifact_mtime, find_latest, load_json
+from app.utils.sse import StreamEmitter
 from app.utils.timestamp_utils import TimestampUtils
 
 # Import CV tailoring service with conditional import to avoid circular dependencies
@@ -38,13 +41,19 @@ class AIRecommendationGenerator:
         self.base_dir = get_user_base_path(user_email)
         self.prompt_dir = Path("/app/prompt")
     
-    async def generate_ai_recommendation(self, company: str, force_regenerate: bool = False) -> bool:
+    async def generate_ai_recommendation(
+        self,
+        company: str,
+        force_regenerate: bool = False,
+        stream: Optional[StreamEmitter] = None
+    ) -> bool:
         """
         Generate AI recommendation for a company using the centralized AI system
         
         Args:
             company: Company name
             force_regenerate: Force regeneration even if file exists
+            stream: Optional emitter receiving recommendation/tailoring tokens and stage updates
             
         Returns:
             True if successful, False otherwise
@@ -58,7 +67,7 @@ class AIRecommendationGenerator:
                 try:
                     company_dir = self.base_dir / "applied_companies" / company
                     # Find latest input recommendation (timestamped preferred)
-                    latest_input = TimestampUtils.find_latest_timestamped_file(
+                    latest_input = find_latest(
                         company_dir, f"{company}_input_recommendation", "json"
                     ) or (company_dir / f"{company}_input_recommendation.json")
 
@@ -67,7 +76,8 @@ class AIRecommendationGenerator:
                         company_dir, f"{company}_ai_recommendation", "json"
                     ) or (company_dir / f"{company}_ai_recommendation.json")
 
-                    latest_input_mtime = latest_input.stat().st_mtime if latest_input and latest_input.exists() else 0
+                    # The input file may still be pending write-behind within a pipeline run
+                    latest_input_mtime = artifact_mtime(latest_input) if latest_input else 0
                     latest_ai_mtime = latest_ai.stat().st_mtime if latest_ai and latest_ai.exists() else 0
 
                     # If an AI file exists and is newer or equal to input, we can skip;
@@ -76,6 +86,8 @@ class AIRecommendationGenerator:
                         logger.info(
                             f"🟢 [AI GENERATOR] Latest AI recommendation ({latest_ai.name}) is up-to-date vs input ({latest_input.name if latest_input else 'N/A'}); skipping regeneration"
                         )
+                        if stream:
+                            await stream.status(stage="up_to_date", company=company)
                         return True
                     else:
                         logger.info(
@@ -91,21 +103,23 @@ class AIRecommendationGenerator:
                 logger.warning(f"⚠️ [AI GENERATOR] Input recommendation may be outdated - consider regenerating input recommendation first")
             
             # Load the AI prompt
-            prompt_content = self._load_ai_prompt(company)
-            if not prompt_content:
+            prompt = self._load_ai_prompt(company)
+            if not prompt:
                 logger.error(f"Could not load AI prompt for {company}")
                 return False
             
             # Generate AI response using centralized AI system
             logger.info(f"🧠 [AI GENERATOR] Executing AI prompt for {company}")
-            ai_response = await self._execute_ai_prompt(prompt_content)
+            if stream:
+                await stream.status(stage="generating_recommendation", company=company)
+            ai_response = await self._execute_ai_prompt(prompt.text, stream=stream)
             
             if not ai_response:
                 logger.error(f"Failed to get AI response for {company}")
                 return False
             
             # Parse and structure the AI response
-            structured_response = self._structure_ai_response(ai_response, company)
+            structured_response = self._structure_ai_response(ai_response, company, prompt)
             
             # Save the structured response as JSON
             success = self._save_ai_recommendation(company, structured_response)
@@ -118,7 +132,7 @@ class AIRecommendationGenerator:
                 
                 # Automatically trigger CV tailoring after successful AI recommendation generation
                 try:
-                    cv_success = await self._trigger_cv_tailoring(company)
+                    cv_success = await self._trigger_cv_tailoring(company, stream=stream)
                     if cv_success:
                         logger.info(f"🎯 [AI GENERATOR] CV tailoring completed automatically for {company}")
                     else:
@@ -147,8 +161,7 @@ class AIRecommendationGenerator:
         company_dir = self.base_dir / "applied_companies" / company
         
         # Use timestamped file with fallback
-        from app.utils.timestamp_utils import TimestampUtils
-        input_file = TimestampUtils.find_latest_timestamped_file(company_dir, f"{company}_input_recommendation", "json")
+        input_file = find_latest(company_dir, f"{company}_input_recommendation", "json")
         if not input_file:
             input_file = company_dir / f"{company}_input_recommendation.json"
         
@@ -176,13 +189,13 @@ class AIRecommendationGenerator:
             
             # Get the input recommendation file
             input_file = self._get_input_recommendation_file_path(company)
-            if not input_file.exists():
+            if not artifact_exists(input_file):
                 logger.warning(f"⚠️ [AI GENERATOR] No input recommendation file found for {company}")
                 return True  # Assume fresh if no input recommendation found
             
             # Compare timestamps
             cv_mtime = cv_context.timestamp.timestamp() if cv_context.timestamp else 0
-            input_mtime = input_file.stat().st_mtime
+            input_mtime = artifact_mtime(input_file)
             
             if cv_mtime > input_mtime:
                 logger.warning(f"⚠️ [AI GENERATOR] CV is newer than input recommendation")
@@ -197,7 +210,7 @@ class AIRecommendationGenerator:
             logger.error(f"❌ [AI GENERATOR] Error checking CV freshness: {e}")
             return True  # Assume fresh on error to avoid blocking generation
     
-    def _load_ai_prompt(self, company: str) -> Optional[str]:
+    def _load_ai_prompt(self, company: str) -> Optional[RenderedPrompt]:
         """
         Generate AI prompt using the centralized template with company analysis data
         
@@ -205,49 +218,39 @@ class AIRecommendationGenerator:
             company: Company name
             
         Returns:
-            Generated prompt content or None if data not found
+            Rendered prompt (text and content hash) or None if data not found
         """
         try:
             # Load the input recommendation data for the company
             input_file = self._get_input_recommendation_file_path(company)
-            if not input_file.exists():
+            if not artifact_exists(input_file):
                 logger.error(f"Input recommendation file not found: {input_file}")
                 return None
             
             # Load analysis data
-            with open(input_file, 'r', encoding='utf-8') as f:
-                analysis_data = json.load(f)
-            
-            # Import the centralized prompt template using absolute path
-            import sys
-            import importlib.util
-            
-            template_path = self.prompt_dir / "ai_recommendation_prompt_template.py"
-            if not template_path.exists():
-                logger.error(f"AI recommendation template not found: {template_path}")
-                return None
+            analysis_data = load_json(input_file)
             
-            # Load the template module
-            spec = importlib.util.spec_from_file_location("ai_recommendation_prompt_template", template_path)
-            template_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(template_module)
+            # Render with the centralized template (compiled once by the prompt registry)
+            prompt = prompt_registry.render("ai_recommendation", company, analysis_data)
             
-            # Generate the prompt using the template
-            prompt_content = template_module.generate_ai_recommendation_prompt(company, analysis_data)
-            
-            logger.info(f"📋 [AI GENERATOR] Generated AI prompt for {company} using centralized template ({len(prompt_content)} characters)")
-            return prompt_content
+            logger.info(f"📋 [AI GENERATOR] Generated AI prompt for {company} using centralized template ({len(prompt.text)} characters, hash {prompt.content_hash[:12]})")
+            return prompt
                 
         except Exception as e:
             logger.error(f"Error generating AI prompt for {company}: {e}")
             return None
     
-    async def _execute_ai_prompt(self, prompt_content: str) -> Optional[AIResponse]:
+    async def _execute_ai_prompt(
+        self,
+        prompt_content: str,
+        stream: Optional[StreamEmitter] = None
+    ) -> Optional[AIResponse]:
         """
         Execute the AI prompt using the centralized AI system
         
         Args:
             prompt_content: The prompt to execute
+            stream: Optional emitter that receives response tokens as they are generated
             
         Returns:
             AIResponse object or None if failed
@@ -270,7 +273,8 @@ class AIRecommendationGenerator:
                 user=current_user,
                 system_prompt="You are an expert CV strategist and career consultant. Provide detailed, actionable recommendations in the exact format requested.",
                 temperature=0.0,  # Zero temperature for maximum consistency
-                max_tokens=4000   # Allow for detailed responses
+                max_tokens=4000,  # Allow for detailed responses
+                on_chunk=stream.token if stream else None
             )
             
             logger.info(f"🧠 [AI GENERATOR] AI response generated - Provider: {response.provider}, Model: {response.model}")
@@ -282,13 +286,19 @@ class AIRecommendationGenerator:
             logger.error(f"Error executing AI prompt: {e}")
             return None
     
-    def _structure_ai_response(self, ai_response: AIResponse, company: str) -> Dict[str, Any]:
+    def _structure_ai_response(
+        self,
+        ai_response: AIResponse,
+        company: str,
+        prompt: Optional[RenderedPrompt] = None
+    ) -> Dict[str, Any]:
         """
         Structure the AI response as JSON data
         
         Args:
             ai_response: Raw AI response
             company: Company name
+            prompt: The rendered prompt, whose hashes are recorded for cache keying
             
         Returns:
             Structured JSON data with recommendation content and metadata
@@ -305,7 +315,9 @@ class AIRecommendationGenerator:
             },
             "metadata": {
                 "content_length": len(ai_response.content),
-                "format_version": "1.0"
+                "format_version": "1.0",
+                "prompt_hash": prompt.content_hash if prompt else None,
+                "prompt_template_hash": prompt.template_hash if prompt else None
             }
         }
     
@@ -333,21 +345,15 @@ class AIRecommendationGenerator:
             
             file_size = output_file.stat().st_size / 1024
             logger.info(f"💾 [AI GENERATOR] Saved AI recommendation: {output_file} ({file_size:.1f}KB)")
-            # Register in DB (best-effort)
-            try:
-                from app.database import SessionLocal
-                from app.services.file_registry_service import FileRegistryService
-                db = SessionLocal()
-                try:
-                    registry = FileRegistryService.from_email(db, self.user_email)
-                    company_id = registry.upsert_company(company, display_name=company.replace('_', ' '))
-                    file_id = registry.register_file(company_id, "ai_recommendation", output_file, timestamp=timestamp)
-                    registry.record_analysis_run(company_id, kind="ai_reco", output_file_id=file_id)
-                    db.commit()
-                finally:
-                    db.close()
-            except Exception as reg_err:
-                logger.warning(f"⚠️ [DB] Failed to register AI recommendation: {reg_err}")
+            # Register in DB (best-effort, without blocking the event loop)
+            from app.services.file_registry_service import register_in_background
+
+            def _register(registry) -> None:
+                company_id = registry.upsert_company(company, display_name=company.replace('_', ' '))
+                file_id = registry.register_file(company_id, "ai_recommendation", output_file, timestamp=timestamp)
+                registry.record_analysis_run(company_id, kind="ai_reco", output_file_id=file_id)
+
+            register_in_background(self.user_email, _register, "AI recommendation")
             
             return True
             
@@ -607,12 +613,13 @@ class AIRecommendationGenerator:
             logger.error(f"Error in batch TXT to JSON conversion: {e}")
             return results
     
-    async def _trigger_cv_tailoring(self, company: str) -> bool:
+    async def _trigger_cv_tailoring(self, company: str, stream: Optional[StreamEmitter] = None) -> bool:
         """
         Automatically trigger CV tailoring after AI recommendations are generated
         
         Args:
             company: Company name that just had AI recommendations generated
+            stream: Optional emitter forwarded to the tailoring service
             
         Returns:
             True if CV tailoring was successful, False otherwise
@@ -642,7 +649,7 @@ class AIRecommendationGenerator:
             )
             
             # Process the CV tailoring
-            response = await cv_tailoring_service.tailor_cv(request)
+            response = await cv_tailoring_service.tailor_cv(request, stream=stream)
             
             if response.success:
                 # Save tailored CV to company-specific folder in applied_companies
@@ -12,6 +12,8 @@ from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+from app.services.skill_extraction.match_summary import SkillsMatchSummary
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,67 +76,24 @@ class ATSScoreCalculator:
         """
         Calculate match rates from preextracted comparison data
         
+        Args:
+            preextracted_data: {"match_summary": SkillsMatchSummary or its dict, "content": formatted text}
+        
         Returns:
             Tuple of (tech_rate, domain_rate, soft_rate, tech_missing, soft_missing, domain_missing)
         """
         try:
-            # Parse the comparison content to extract match data
-            content = preextracted_data.get("content", "")
-            
-            # Initialize default values
-            tech_rate = domain_rate = soft_rate = 0.0
-            tech_missing = soft_missing = domain_missing = 0
+            # Saved comparisons carry a typed summary; only older entries need their text parsed
+            summary = SkillsMatchSummary.from_dict(preextracted_data.get("match_summary"))
+            if summary is None:
+                summary = SkillsMatchSummary.from_text(preextracted_data.get("content", ""))
+            if summary is None:
+                logger.warning("[ATS] No match data in preextracted comparison")
+                return 0.0, 0.0, 0.0, 0, 0, 0
             
-            # Extract data from the structured content
-            lines = content.split('\n')
-            import re
-            
-            # Look for the table format with match rates
-            for line in lines:
-                # Parse table rows for match rates and missing counts
-                # Format: Category    CV Total  JD Total   Matched   Missing  Match Rate (%)
-                if "Technical Skills" in line and not "TECHNICAL SKILLS" in line:
-                    # Split by whitespace and get the values
-                    parts = line.split()
-                    if len(parts) >= 6:
-                        try:
-                            # The last value is the match rate
-                            tech_rate = float(parts[-1])
-                            # The second to last is missing count
-                            tech_missing = int(parts[-2])
-                        except (ValueError, IndexError):
-                            pass
-                
-                elif "Soft Skills" in line and not "SOFT SKILLS" in line:
-                    parts = line.split()
-                    if len(parts) >= 6:
-                        try:
-                            soft_rate = float(parts[-1])
-                            soft_missing = int(parts[-2])
-                        except (ValueError, IndexError):
-                            pass
-                
-                elif "Domain Keywords" in line and not "DOMAIN KEYWORDS" in line:
-                    parts = line.split()
-                    if len(parts) >= 6:
-                        try:
-                            domain_rate = float(parts[-1])
-                            domain_missing = int(parts[-2])
-                        except (ValueError, IndexError):
-                            pass
-                
-                # Also check for missing items in the detailed analysis section
-                elif "❌ MISSING FROM CV" in line:
-                    match = re.search(r'\((\d+) items\)', line)
-                    if match:
-                        count = int(match.group(1))
-                        # Determine which category based on context
-                        if "TECHNICAL" in content[max(0, content.find(line)-100):content.find(line)]:
-                            tech_missing = max(tech_missing, count)  # Use max in case we already parsed from table
-                        elif "SOFT" in content[max(0, content.find(line)-100):content.find(line)]:
-                            soft_missing = max(soft_missing, count)
-                        elif "DOMAIN" in content[max(0, content.find(line)-100):content.find(line)]:
-                            domain_missing = max(domain_missing, count)
+            tech, soft, domain = summary.technical_skills, summary.soft_skills, summary.domain_keywords
+            tech_rate, domain_rate, soft_rate = float(tech.match_rate), float(domain.match_rate), float(soft.match_rate)
+            tech_missing, soft_missing, domain_missing = tech.missing, soft.missing, domain.missing
             
             logger.info(f"[ATS] Match rates - Tech: {tech_rate}%, Domain: {domain_rate}%, Soft: {soft_rate}%")
             logger.info(f"[ATS] Missing counts - Tech: {tech_missing}, Domain: {domain_missing}, Soft: {soft_missing}")
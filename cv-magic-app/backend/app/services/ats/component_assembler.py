@@ -7,10 +7,10 @@ Assembles individual component analyses into a unified ATS analysis result.
 import asyncio
 import json
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, Optional
-from app.utils.timestamp_utils import TimestampUtils
+from app.utils.run_artifacts import artifact_exists, find_latest, load_json, load_text, save_json
 
 from app.services.ats.components import (
     SkillsAnalyzer,
@@ -24,6 +24,7 @@ from app.services.ats.components.batched_analyzer import BatchedAnalyzer
 from app.services.ats.requirement_bonus_calculator import RequirementBonusCalculator
 from app.services.jd_analysis.jd_analyzer import RequirementsExtractor
 from app.services.ats.ats_score_calculator import ATSScoreCalculator
+from app.ai.ai_service import ai_service, AIProviderHandle
 
 logger = logging.getLogger(__name__)
 
@@ -64,12 +65,10 @@ class ComponentAssembler:
         
         # Read content from the selected CV
         cv_file_path = cv_context.txt_path if cv_context.txt_path else cv_context.json_path
-        if not cv_file_path or not cv_file_path.exists():
+        cv_content = load_text(cv_file_path) if cv_file_path else None
+        if cv_content is None:
             raise FileNotFoundError(f"CV file not found: {cv_file_path}")
         
-        with open(cv_file_path, 'r', encoding='utf-8') as f:
-            cv_content = f.read()
-        
         if not cv_content:
             logger.error("❌ [COMPONENT_ASSEMBLER] Failed to get CV content")
             raise FileNotFoundError(f"Could not load CV content for company: {company_name}")
@@ -86,16 +85,15 @@ class ComponentAssembler:
     def _read_jd_text(self, company: str) -> str:
         """Read JD text for a specific company."""
         company_dir = self.base_dir / "applied_companies" / company
-        jd_json = TimestampUtils.find_latest_timestamped_file(company_dir, "jd_original", "json")
+        jd_json = find_latest(company_dir, "jd_original", "json")
         
         # Fallback to non-timestamped file if no timestamped file exists
         if not jd_json:
             jd_json = company_dir / "jd_original.json"
         
-        if not jd_json.exists():
+        data = load_json(jd_json)
+        if data is None:
             raise FileNotFoundError(f"JD text not found: {jd_json}")
-        with open(jd_json, "r", encoding="utf-8") as f:
-            data = json.load(f)
         text = (data.get("text") or "").strip()
         if not text:
             raise ValueError("JD text is empty")
@@ -104,19 +102,18 @@ class ComponentAssembler:
     def _read_matched_skills(self, company: str) -> str:
         """Read matched skills for a specific company."""
         company_dir = self.base_dir / "applied_companies" / company
-        match_file = TimestampUtils.find_latest_timestamped_file(company_dir, "cv_jd_match_results", "json")
+        match_file = find_latest(company_dir, "cv_jd_match_results", "json")
         
         # Fallback to non-timestamped file if no timestamped file exists
         if not match_file:
             match_file = company_dir / "cv_jd_match_results.json"
         
-        if not match_file.exists():
+        if not artifact_exists(match_file):
             logger.warning("[ASSEMBLER] Match results not found: %s", match_file)
             return "[]"
         
         try:
-            with open(match_file, "r", encoding="utf-8") as f:
-                md = json.load(f)
+            md = load_json(match_file)
             matched_req = md.get("matched_required_keywords", [])
             matched_pref = md.get("matched_preferred_keywords", [])
             return json.dumps({
@@ -130,17 +127,15 @@ class ComponentAssembler:
     def _calculate_requirement_bonus(self, company: str) -> Dict[str, Any]:
         """Calculate requirement bonus from CV-JD match results."""
         # Strictly use the per-user cv_jd_matching file pattern
-        from app.utils.timestamp_utils import TimestampUtils
         company_dir = self.base_dir / "applied_companies" / company
-        match_file = TimestampUtils.find_latest_timestamped_file(company_dir, f"{company}_cv_jd_matching", "json")
+        match_file = find_latest(company_dir, f"{company}_cv_jd_matching", "json")
         
         try:
-            if not match_file or not match_file.exists():
+            match_data = load_json(match_file) if match_file else None
+            if match_data is None:
                 raise FileNotFoundError(f"CV-JD matching file not found for bonus calculation: expected pattern '{company}_cv_jd_matching_<timestamp>.json' in {company_dir}")
             
             logger.info("[ASSEMBLER] Requirement bonus using match file: %s", match_file)
-            with open(match_file, "r", encoding="utf-8") as f:
-                match_data = json.load(f)
             
             # Check if match_counts already exists in the file
             if "match_counts" in match_data:
@@ -170,13 +165,31 @@ class ComponentAssembler:
             logger.error("[ASSEMBLER] Failed to calculate requirement bonus: %s", e)
             raise
 
+    def _resolve_provider(self) -> Optional[AIProviderHandle]:
+        """Resolve the request-scoped AI provider once for all component analyses."""
+        from app.models.auth import UserData
+        current_user = UserData(
+            id="pipeline_user",  # Use a placeholder ID for pipeline operations
+            email=self.user_email or "pipeline@system.com",
+            name=(self.user_email or "pipeline").split("@")[0],
+            created_at=datetime.now(timezone.utc),
+            is_active=True
+        )
+        try:
+            return ai_service.resolve_provider(current_user)
+        except Exception as e:
+            # Analyzers resolve (and report) the provider themselves when this fails
+            logger.warning("[ASSEMBLER] Could not resolve AI provider up front: %s", e)
+            return None
+
     async def _run_batched_component_analyses(self, cv_text: str, jd_text: str, matched_skills: str, company: str) -> Dict[str, Any]:
         """Run component analyses using batched approach (2 LLM calls instead of 5)."""
         logger.info("[ASSEMBLER] Starting batched component analyses (Performance Optimization)...")
         
         try:
             # Run batched analysis (2 LLM calls instead of 5)
-            batched_result = await self.batched_analyzer.analyze_all_batched(cv_text, jd_text, matched_skills, self.user_email)
+            provider = self._resolve_provider()
+            batched_result = await self.batched_analyzer.analyze_all_batched(cv_text, jd_text, matched_skills, self.user_email, provider)
             
             # Run bonus calculation in parallel
             bonus_task = asyncio.get_event_loop().run_in_executor(
@@ -209,12 +222,13 @@ class ComponentAssembler:
         """Run all component analyses in parallel."""
         logger.info("[ASSEMBLER] Starting parallel component analyses...")
         
-        # Run all analyses in parallel
-        skills_task = self.skills_analyzer.analyze(cv_text, jd_text, matched_skills, self.user_email)
-        experience_task = self.experience_analyzer.analyze(cv_text, jd_text, self.user_email)
-        industry_task = self.industry_analyzer.analyze(cv_text, jd_text, self.user_email)
-        seniority_task = self.seniority_analyzer.analyze(cv_text, jd_text, self.user_email)
-        technical_task = self.technical_analyzer.analyze(cv_text, jd_text, self.user_email)
+        # Run all analyses in parallel on one request-scoped provider
+        provider = self._resolve_provider()
+        skills_task = self.skills_analyzer.analyze(cv_text, jd_text, matched_skills, self.user_email, provider)
+        experience_task = self.experience_analyzer.analyze(cv_text, jd_text, self.user_email, provider)
+        industry_task = self.industry_analyzer.analyze(cv_text, jd_text, self.user_email, provider)
+        seniority_task = self.seniority_analyzer.analyze(cv_text, jd_text, self.user_email, provider)
+        technical_task = self.technical_analyzer.analyze(cv_text, jd_text, self.user_email, provider)
         
         # Run bonus calculation in parallel (synchronous but wrapped in asyncio)
         bonus_task = asyncio.get_event_loop().run_in_executor(
@@ -329,9 +343,8 @@ class ComponentAssembler:
     def _save_results(self, company: str, component_results: Dict[str, Any], scores: Dict[str, float]) -> None:
         """Save assembled results to the company's skills analysis file."""
         # Use timestamped analysis file with fallback
-        from app.utils.timestamp_utils import TimestampUtils
         company_dir = self.base_dir / "applied_companies" / company
-        file_path = TimestampUtils.find_latest_timestamped_file(company_dir, f"{company}_skills_analysis", "json")
+        file_path = find_latest(company_dir, f"{company}_skills_analysis", "json")
         if not file_path:
             file_path = company_dir / f"{company}_skills_analysis.json"
         
@@ -344,13 +357,9 @@ class ComponentAssembler:
         }
         
         # Read existing file or create new structure
-        if file_path.exists():
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    existing_data = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                existing_data = {}
-        else:
+        try:
+            existing_data = load_json(file_path) or {}
+        except json.JSONDecodeError:
             existing_data = {}
         
         # Ensure we have the right structure
@@ -361,17 +370,15 @@ class ComponentAssembler:
         existing_data["component_analysis_entries"].append(assembled_entry)
         
         # Save back to file
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(existing_data, f, indent=2, ensure_ascii=False)
+        save_json(file_path, existing_data)
         
         logger.info("[ASSEMBLER] Results saved to: %s", file_path)
 
     def _save_minimal_cv_results(self, company: str, minimal_results: Dict[str, Any]) -> None:
         """Save minimal CV results to the company's skills analysis file."""
         # Use timestamped analysis file with fallback
-        from app.utils.timestamp_utils import TimestampUtils
         company_dir = self.base_dir / "applied_companies" / company
-        file_path = TimestampUtils.find_latest_timestamped_file(company_dir, f"{company}_skills_analysis", "json")
+        file_path = find_latest(company_dir, f"{company}_skills_analysis", "json")
         if not file_path:
             file_path = company_dir / f"{company}_skills_analysis.json"
         
@@ -390,13 +397,9 @@ class ComponentAssembler:
         }
         
         # Read existing file or create new structure
-        if file_path.exists():
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    existing_data = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                existing_data = {}
-        else:
+        try:
+            existing_data = load_json(file_path) or {}
+        except json.JSONDecodeError:
             existing_data = {}
         
         # Ensure we have the right structure
@@ -407,8 +410,7 @@ class ComponentAssembler:
         existing_data["component_analysis_entries"].append(assembled_entry)
         
         # Save back to file
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(existing_data, f, indent=2, ensure_ascii=False)
+        save_json(file_path, existing_data)
         
         logger.info("[ASSEMBLER] Minimal CV results saved to: %s", file_path)
 
@@ -417,18 +419,15 @@ class ComponentAssembler:
         try:
             # Read preextracted comparison data
             # Use timestamped analysis file with fallback
-            from app.utils.timestamp_utils import TimestampUtils
             company_dir = self.base_dir / "applied_companies" / company
-            file_path = TimestampUtils.find_latest_timestamped_file(company_dir, f"{company}_skills_analysis", "json")
+            file_path = find_latest(company_dir, f"{company}_skills_analysis", "json")
             if not file_path:
                 file_path = company_dir / f"{company}_skills_analysis.json"
-            if not file_path.exists():
+            data = load_json(file_path)
+            if data is None:
                 logger.warning("[ASSEMBLER] Skills analysis file not found for ATS calculation")
                 return {"error": "Skills analysis file not found"}
             
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            
             # Get the latest preextracted comparison entry
             preextracted_entries = data.get("preextracted_comparison_entries", [])
             if not preextracted_entries:
@@ -436,7 +435,10 @@ class ComponentAssembler:
                 return {"error": "No preextracted comparison data"}
             
             latest_preextracted = preextracted_entries[-1]
-            preextracted_data = {"content": latest_preextracted.get("content", "")}
+            preextracted_data = {
+                "content": latest_preextracted.get("content", ""),
+                "match_summary": latest_preextracted.get("match_summary")
+            }
             
             # Calculate ATS score
             ats_breakdown = self.ats_calculator.calculate_ats_score(
@@ -482,8 +484,7 @@ class ComponentAssembler:
             data["ats_calculation_entries"].append(ats_result)
             
             # Save back to file
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            save_json(file_path, data)
             
             logger.info("[ASSEMBLER] ATS calculation completed. Score: %.1f/100 (%s)", 
                        ats_breakdown.final_ats_score, ats_breakdown.category_status)
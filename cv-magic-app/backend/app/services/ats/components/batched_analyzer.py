@@ -10,7 +10,7 @@ import logging
 import re
 from typing import Dict, Any, Optional
 
-from app.ai.ai_service import ai_service
+from app.ai.ai_service import ai_service, AIProviderHandle
 from .standardized_config import STANDARD_AI_PARAMS
 
 logger = logging.getLogger(__name__)
@@ -134,7 +134,7 @@ Guidelines:
             logger.error(f"[BATCHED] Content: {content[:500]}...")
             raise ValueError(f"Failed to parse LLM response: {str(e)}")
 
-    async def analyze_batch_1(self, cv_text: str, jd_text: str, matched_skills: str, user_email: str = None) -> Dict[str, Any]:
+    async def analyze_batch_1(self, cv_text: str, jd_text: str, matched_skills: str, user_email: str = None, provider: Optional[AIProviderHandle] = None) -> Dict[str, Any]:
         """Analyze Skills Relevance and Experience Alignment in a single call."""
         logger.info("[BATCHED] Requesting batch 1 analysis (Skills + Experience)...")
         
@@ -159,6 +159,7 @@ Guidelines:
             response = await ai_service.generate_response(
                 prompt=prompt,
                 user=current_user,
+                provider=provider,
                 system_prompt=STANDARD_AI_PARAMS["system_prompt"],
                 temperature=STANDARD_AI_PARAMS["temperature"],
                 max_tokens=STANDARD_AI_PARAMS["max_tokens"]
@@ -177,7 +178,7 @@ Guidelines:
             logger.error(f"[BATCHED] Batch 1 analysis failed: {e}")
             raise ValueError(f"Batch 1 analysis failed: {str(e)}")
 
-    async def analyze_batch_2(self, cv_text: str, jd_text: str, user_email: str = None) -> Dict[str, Any]:
+    async def analyze_batch_2(self, cv_text: str, jd_text: str, user_email: str = None, provider: Optional[AIProviderHandle] = None) -> Dict[str, Any]:
         """Analyze Industry Fit, Role Seniority, and Technical Depth in a single call."""
         logger.info("[BATCHED] Requesting batch 2 analysis (Industry + Seniority + Technical)...")
         
@@ -201,6 +202,7 @@ Guidelines:
             response = await ai_service.generate_response(
                 prompt=prompt,
                 user=current_user,
+                provider=provider,
                 system_prompt=STANDARD_AI_PARAMS["system_prompt"],
                 temperature=STANDARD_AI_PARAMS["temperature"],
                 max_tokens=STANDARD_AI_PARAMS["max_tokens"]
@@ -220,14 +222,14 @@ Guidelines:
             logger.error(f"[BATCHED] Batch 2 analysis failed: {e}")
             raise ValueError(f"Batch 2 analysis failed: {str(e)}")
 
-    async def analyze_all_batched(self, cv_text: str, jd_text: str, matched_skills: str, user_email: str = None) -> Dict[str, Any]:
+    async def analyze_all_batched(self, cv_text: str, jd_text: str, matched_skills: str, user_email: str = None, provider: Optional[AIProviderHandle] = None) -> Dict[str, Any]:
         """Analyze all components using batched approach (2 LLM calls instead of 5)."""
         logger.info("[BATCHED] Starting batched analysis (2 calls instead of 5)...")
         
         try:
-            # Run both batches in parallel
-            batch_1_task = self.analyze_batch_1(cv_text, jd_text, matched_skills, user_email)
-            batch_2_task = self.analyze_batch_2(cv_text, jd_text, user_email)
+            # Run both batches in parallel on the same request-scoped provider
+            batch_1_task = self.analyze_batch_1(cv_text, jd_text, matched_skills, user_email, provider)
+            batch_2_task = self.analyze_batch_2(cv_text, jd_text, user_email, provider)
             
             batch_1_result, batch_2_result = await asyncio.gather(
                 batch_1_task, batch_2_task, return_exceptions=True
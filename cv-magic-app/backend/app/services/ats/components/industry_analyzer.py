@@ -7,10 +7,10 @@ Handles LLM-based industry fit analysis for ATS scoring.
 import json
 import logging
 import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from app.ai.ai_service import ai_service
-from prompt.ats_industry_prompt import INDUSTRY_FIT_PROMPT
+from app.ai.ai_service import ai_service, AIProviderHandle
+from app.ai.prompt_registry import prompt_registry
 from .standardized_config import STANDARD_AI_PARAMS, validate_analysis_result
 
 logger = logging.getLogger(__name__)
@@ -20,7 +20,7 @@ class IndustryAnalyzer:
     """Analyzes industry fit using centralized AI service."""
 
     def __init__(self):
-        self.prompt_template = INDUSTRY_FIT_PROMPT
+        self.prompt_name = "ats_industry"
 
     def _clean_llm_response(self, content: str) -> str:
         """Conservative cleaner: strip code fences and slice to outermost braces only."""
@@ -81,7 +81,7 @@ class IndustryAnalyzer:
         logger.error("[INDUSTRY] Failed to parse LLM response. Raw: %s", raw_response[:400])
         raise ValueError("Industry analysis response not valid JSON")
 
-    async def analyze(self, cv_text: str, jd_text: str, user_email: str = None) -> Dict[str, Any]:
+    async def analyze(self, cv_text: str, jd_text: str, user_email: str = None, provider: Optional[AIProviderHandle] = None) -> Dict[str, Any]:
         """
         Analyze industry fit using LLM.
         
@@ -89,14 +89,16 @@ class IndustryAnalyzer:
             cv_text: CV content
             jd_text: Job description content
             user_email: User email for API key context
+            provider: Optional request-scoped provider handle resolved by the caller
             
         Returns:
             Dict containing industry analysis results
         """
-        prompt = self.prompt_template.format(
+        prompt = prompt_registry.render(
+            self.prompt_name,
             cv_text=cv_text[:5000],
             jd_text=jd_text[:3000]
-        )
+        ).text
 
         logger.info("[INDUSTRY] Requesting industry fit analysis...")
         try:
@@ -114,6 +116,7 @@ class IndustryAnalyzer:
             response = await ai_service.generate_response(
                 prompt=prompt, 
                 user=current_user,
+                provider=provider,
                 temperature=STANDARD_AI_PARAMS["temperature"], 
                 max_tokens=STANDARD_AI_PARAMS["max_tokens"],
                 system_prompt=STANDARD_AI_PARAMS["system_prompt"]
@@ -9,8 +9,8 @@ import logging
 import re
 from typing import Dict, Any, Optional
 
-from app.ai.ai_service import ai_service
-from prompt.ats_skills_relevance_prompt import SKILLS_RELEVANCE_PROMPT
+from app.ai.ai_service import ai_service, AIProviderHandle
+from app.ai.prompt_registry import prompt_registry
 from .standardized_config import STANDARD_AI_PARAMS, validate_analysis_result
 
 logger = logging.getLogger(__name__)
@@ -20,7 +20,7 @@ class SkillsAnalyzer:
     """Analyzes skills relevance using centralized AI service."""
 
     def __init__(self):
-        self.prompt_template = SKILLS_RELEVANCE_PROMPT
+        self.prompt_name = "ats_skills_relevance"
 
     def _clean_llm_response(self, content: str) -> str:
         """Conservative cleaner: strip code fences and slice to outermost braces only."""
@@ -135,7 +135,7 @@ class SkillsAnalyzer:
         logger.warning("[SKILLS] Using fallback response due to parsing failure")
         return fallback_response
 
-    async def analyze(self, cv_text: str, jd_text: str, matched_skills: str, user_email: str = None) -> Dict[str, Any]:
+    async def analyze(self, cv_text: str, jd_text: str, matched_skills: str, user_email: str = None, provider: Optional[AIProviderHandle] = None) -> Dict[str, Any]:
         """
         Analyze skills relevance using LLM.
         
@@ -144,15 +144,17 @@ class SkillsAnalyzer:
             jd_text: Job description content
             matched_skills: JSON string of matched skills
             user_email: User email for API key context
+            provider: Optional request-scoped provider handle resolved by the caller
             
         Returns:
             Dict containing skills analysis results
         """
-        prompt = self.prompt_template.format(
+        prompt = prompt_registry.render(
+            self.prompt_name,
             cv_text=cv_text[:5000],  # Limit to avoid token overflow
             jd_text=jd_text[:3000],
             matched_skills=matched_skills
-        )
+        ).text
 
         logger.info("[SKILLS] Requesting skills relevance analysis...")
         try:
@@ -170,6 +172,7 @@ class SkillsAnalyzer:
             response = await ai_service.generate_response(
                 prompt=prompt, 
                 user=current_user,
+                provider=provider,
                 temperature=STANDARD_AI_PARAMS["temperature"], 
                 max_tokens=STANDARD_AI_PARAMS["max_tokens"],
                 system_prompt=STANDARD_AI_PARAMS["system_prompt"]
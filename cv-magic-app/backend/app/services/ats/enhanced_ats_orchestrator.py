@@ -18,6 +18,7 @@ from ..requirements.centralized_requirements_extractor import CentralizedRequire
 from ..matching.enhanced_skills_matcher import EnhancedSkillsMatcher, SkillAnalysis
 from ..matching.industry_alignment_scorer import IndustryAlignmentScorer, IndustryAlignment  
 from .ats_score_calculator import ATSScoreCalculator, ATSScoreBreakdown
+from ..skill_extraction.match_summary import CategoryMatch, SkillsMatchSummary
 
 logger = logging.getLogger(__name__)
 
@@ -287,15 +288,17 @@ class EnhancedATSOrchestrator:
             # Step 5: Calculate ATS score
             logger.info("[Enhanced ATS] Step 5: ATS score calculation")
             
-            # Prepare mock preextracted data (normally from previous analysis)
-            preextracted_data = {
-                "content": f"Technical Skills Match Rate: {skills_analysis.get('technical', type('', (), {'match_rate': 0})).match_rate * 100:.0f}%\\n" +
-                          f"Soft Skills Match Rate: {skills_analysis.get('soft', type('', (), {'match_rate': 0})).match_rate * 100:.0f}%\\n" +
-                          f"Domain Keywords Match Rate: {skills_analysis.get('domain', type('', (), {'match_rate': 0})).match_rate * 100:.0f}%\\n" +
-                          f"MISSING FROM CV - Technical: {len(skills_analysis.get('technical', type('', (), {'missing_skills': []})).missing_skills)} items\\n" +
-                          f"MISSING FROM CV - Soft: {len(skills_analysis.get('soft', type('', (), {'missing_skills': []})).missing_skills)} items\\n" +
-                          f"MISSING FROM CV - Domain: {len(skills_analysis.get('domain', type('', (), {'missing_skills': []})).missing_skills)} items"
-            }
+            # Match summary from the skills matching above (normally from the preextracted comparison)
+            match_summary = SkillsMatchSummary(source="enhanced_matcher")
+            for category, key in (("technical_skills", "technical"), ("soft_skills", "soft"), ("domain_keywords", "domain")):
+                analysis = skills_analysis.get(key)
+                if analysis is not None:
+                    setattr(match_summary, category, CategoryMatch(
+                        matched=len(analysis.matched_skills),
+                        missing=len(analysis.missing_skills),
+                        match_rate=round(analysis.match_rate * 100)
+                    ))
+            preextracted_data = {"match_summary": match_summary}
             
             # Extract scores for ATS calculation
             extracted_scores = {
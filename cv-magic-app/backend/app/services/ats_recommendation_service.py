@@ -11,6 +11,7 @@ from typing import Dict, Any, Optional, List
 from pathlib import Path
 from datetime import datetime
 from app.utils.timestamp_utils import TimestampUtils
+from app.utils.run_artifacts import artifact_exists, find_latest, load_json, save_json, save_text, when_persisted
 
 logger = logging.getLogger(__name__)
 
@@ -40,19 +41,17 @@ class ATSRecommendationService:
             company_dir = self.base_dir / "applied_companies" / company
             
             # Use timestamped analysis file with fallback
-            from app.utils.timestamp_utils import TimestampUtils
-            analysis_file = TimestampUtils.find_latest_timestamped_file(company_dir, f"{company}_skills_analysis", "json")
+            analysis_file = find_latest(company_dir, f"{company}_skills_analysis", "json")
             if not analysis_file:
                 analysis_file = company_dir / f"{company}_skills_analysis.json"
             
             # Check if analysis file exists
-            if not analysis_file.exists():
+            if not artifact_exists(analysis_file):
                 logger.error(f"Skills analysis file not found: {analysis_file}")
                 return None
             
             # Read the analysis file
-            with open(analysis_file, 'r', encoding='utf-8') as f:
-                analysis_data = json.load(f)
+            analysis_data = load_json(analysis_file)
             
             # Extract comprehensive analysis data
             recommendation_data = {}
@@ -273,30 +272,24 @@ class ATSRecommendationService:
             timestamp = TimestampUtils.get_timestamp()
             recommendation_file = company_dir / f"{company}_input_recommendation_{timestamp}.json"
             
-            # Ensure the company directory exists
-            company_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Save the recommendation file
-            with open(recommendation_file, 'w', encoding='utf-8') as f:
-                json.dump(recommendation_data, f, indent=2)
+            # Save the recommendation file (handed over in memory inside a pipeline run)
+            save_json(recommendation_file, recommendation_data)
             
             logger.info(f"Successfully created recommendation file: {recommendation_file}")
 
-            # Register in DB (best-effort)
-            try:
-                from app.database import SessionLocal
-                from app.services.file_registry_service import FileRegistryService
-                db = SessionLocal()
-                try:
-                    registry = FileRegistryService.from_email(db, self.user_email)
+            # Register in DB (best-effort) once the file is on disk, so size/hash are real.
+            # The callback runs inline on the event loop outside a pipeline run, so never block here.
+            def _register_input_recommendation() -> None:
+                from app.services.file_registry_service import register_in_background
+
+                def _register(registry) -> None:
                     company_id = registry.upsert_company(company, display_name=company.replace('_', ' '))
                     file_id = registry.register_file(company_id, "input_recommendation", recommendation_file, timestamp=timestamp)
                     registry.record_analysis_run(company_id, kind="input_reco", output_file_id=file_id)
-                    db.commit()
-                finally:
-                    db.close()
-            except Exception as reg_err:
-                logger.warning(f"⚠️ [DB] Failed to register input recommendation: {reg_err}")
+
+                register_in_background(self.user_email, _register, "input recommendation")
+
+            when_persisted(recommendation_file, _register_input_recommendation)
             
             # Create the AI recommendation prompt file in company directory
             try:
@@ -305,8 +298,7 @@ class ATSRecommendationService:
                 
                 # Save prompt to company directory
                 prompt_file = company_dir / f"{company}_prompt_recommendation.py"
-                with open(prompt_file, 'w', encoding='utf-8') as f:
-                    f.write(prompt_content)
+                save_text(prompt_file, prompt_content)
                     
                 logger.info(f"Successfully created AI recommendation prompt: {prompt_file}")
                 
@@ -21,6 +21,9 @@ from app.services.cv_jd_matching.cv_jd_matcher import CVJDMatcher
 from app.services.jd_analysis.jd_analyzer import JDAnalyzer
 from app.services.job_extraction_service import JobExtractionService
 from app.ai.ai_service import ai_service
+from app.utils.run_artifacts import pipeline_artifacts
+from app.utils.stage_graph import StageGraph
+from app.utils.user_path_utils import get_user_base_path
 from app.services.ats.component_assembler import ComponentAssembler
 from app.services.ats_recommendation_service import ATSRecommendationService
 from app.services.ai_recommendation_generator import AIRecommendationGenerator
@@ -74,6 +77,7 @@ class AnalysisResults:
         self.ai_recommendations: Dict = {}
         self.tailored_cv_path: Optional[str] = None
         self.processing_time: float = 0.0
+        self.stage_timings: Dict[str, Dict[str, Any]] = {}
         self.steps_completed: List[str] = []
         self.steps_skipped: List[str] = []
         self.errors: List[str] = []
@@ -96,6 +100,7 @@ class AnalysisResults:
                 'tailored_cv_path': self.tailored_cv_path
             },
             'processing_time': self.processing_time,
+            'stage_timings': self.stage_timings,
             'steps_completed': self.steps_completed,
             'steps_skipped': self.steps_skipped,
             'errors': self.errors,
@@ -108,8 +113,16 @@ class ContextAwareAnalysisPipeline:
     Main pipeline orchestrator with context awareness
     """
     
+    # Stages whose failure ends the run, with the error recorded for each
+    REQUIRED_STAGE_ERRORS = {
+        "jd_analysis": "JD analysis failed",
+        "cv_skills": "CV skills extraction failed",
+        "cv_jd_matching": "CV-JD matching failed",
+    }
+    
     def __init__(self, user_email: str):
         self.user_email = user_email
+        self.base_dir = get_user_base_path(user_email)
         # Initialize services with user context
         self.skill_extraction_service = SkillExtractionService()
         self.cv_jd_matcher = CVJDMatcher(user_email=user_email)
@@ -159,57 +172,32 @@ class ContextAwareAnalysisPipeline:
             cv_context = user_selector.get_latest_cv_for_company(company, jd_url, "")
             context.cv_context = cv_context
             
-            # Record JD usage for tracking
-            from app.services.jd_usage_tracker import jd_usage_tracker
-            # Provide fallback text if no URL is available
-            jd_text_fallback = f"JD for {company}" if not jd_url else ""
-            
-            logger.info(f"🔍 [CONTEXT_AWARE_PIPELINE] Recording JD usage:")
-            logger.info(f"- jd_url: {jd_url}")
-            logger.info(f"- jd_text_fallback: {jd_text_fallback}")
-            logger.info(f"- company: {company}")
-            
-            jd_usage_tracker.record_jd_usage(jd_url, jd_text_fallback, company, "")
-            
             if not cv_context.exists:
                 results.errors.append(f"No CV found for company: {company}")
                 return results
             
             logger.info(f"📄 [CONTEXT_AWARE_PIPELINE] Using {cv_context.file_type} CV - {cv_context.json_path}")
             
-            # Step 3: JD Analysis (with caching)
-            jd_data = await self._handle_jd_analysis(context, results)
-            if not jd_data:
-                results.errors.append("JD analysis failed")
+            # Steps 3-9 run as a dependency graph: JD usage recording, JD analysis,
+            # CV skills extraction and CV loading are independent and run concurrently;
+            # each later stage starts as soon as its inputs are ready
+            graph = self._build_stage_graph(context, results, include_tailoring)
+            async with pipeline_artifacts(self.user_email, company):
+                stage_runs = await graph.run()
+            results.stage_timings = {name: run.to_dict() for name, run in stage_runs.items()}
+            
+            if "tailored_cv" in stage_runs:
+                results.tailored_cv_path = stage_runs["tailored_cv"].output
+            
+            failed_required = [
+                message for name, message in self.REQUIRED_STAGE_ERRORS.items()
+                if stage_runs[name].status != "succeeded"
+            ]
+            if failed_required:
+                results.errors.extend(failed_required)
+                results.processing_time = (datetime.now() - start_time).total_seconds()
                 return results
             
-            # Step 4: CV Skills Extraction (always fresh for rerun)
-            cv_skills = await self._extract_cv_skills(context, results)
-            if not cv_skills:
-                results.errors.append("CV skills extraction failed")
-                return results
-            
-            # Step 5: CV-JD Matching (always recalculated)
-            cv_jd_matching = await self._perform_cv_jd_matching(context, cv_skills, jd_data, results)
-            if not cv_jd_matching:
-                results.errors.append("CV-JD matching failed")
-                return results
-            
-            # Step 6: Component Analysis
-            component_analysis = await self._run_component_analysis(context, results)
-            
-            # Step 7: ATS Recommendations
-            ats_recommendations = await self._generate_ats_recommendations(context, results)
-            
-            # Step 8: AI Recommendations (optional for reruns)
-            if include_tailoring or not is_rerun:
-                ai_recommendations = await self._generate_ai_recommendations(context, results)
-                
-                # Step 9: CV Tailoring (if AI recommendations successful)
-                if ai_recommendations and include_tailoring:
-                    tailored_cv_path = await self._generate_tailored_cv(context, results)
-                    results.tailored_cv_path = tailored_cv_path
-            
             # Finalize results
             results.success = True
             results.processing_time = (datetime.now() - start_time).total_seconds()
@@ -226,6 +214,83 @@ class ContextAwareAnalysisPipeline:
             results.processing_time = (datetime.now() - start_time).total_seconds()
             return results
     
+    def _build_stage_graph(
+        self,
+        context: AnalysisContext,
+        results: AnalysisResults,
+        include_tailoring: bool
+    ) -> StageGraph:
+        """
+        Describe the analysis stages and their data dependencies
+        
+        jd_analysis ─┐
+        cv_skills ───┴─> cv_jd_matching ─> component_analysis (+ cv_text) ─> ats_recommendations
+            ─> ai_recommendations ─> tailored_cv
+        
+        record_jd_usage and cv_text have no dependencies. Component analysis
+        reads the saved CV-JD matching file, and ATS recommendations read the
+        component/ATS entries it writes, so those stages stay ordered.
+        """
+        graph = StageGraph("context_aware_pipeline")
+        
+        async def record_jd_usage(_inputs):
+            from app.services.jd_usage_tracker import JDUsageTracker
+            # Record after CV selection so this run's selection still sees a first-time JD
+            jd_text_fallback = f"JD for {context.company}" if not context.jd_url else ""
+            logger.info(f"🔍 [CONTEXT_AWARE_PIPELINE] Recording JD usage: jd_url={context.jd_url}, company={context.company}")
+            tracker = JDUsageTracker(self.user_email)
+            await asyncio.to_thread(tracker.record_jd_usage, context.jd_url, jd_text_fallback, context.company, "")
+            return True
+        
+        async def jd_analysis(_inputs):
+            return await self._handle_jd_analysis(context, results)
+        
+        async def cv_skills(_inputs):
+            return await self._extract_cv_skills(context, results)
+        
+        async def cv_text(_inputs):
+            return await asyncio.to_thread(self._read_selected_cv_text, context)
+        
+        async def cv_jd_matching(inputs):
+            return await self._perform_cv_jd_matching(context, inputs["cv_skills"], inputs["jd_analysis"], results)
+        
+        async def component_analysis(inputs):
+            return await self._run_component_analysis(context, results, cv_text=inputs["cv_text"])
+        
+        async def ats_recommendations(_inputs):
+            return await self._generate_ats_recommendations(context, results)
+        
+        async def ai_recommendations(_inputs):
+            return await self._generate_ai_recommendations(context, results)
+        
+        async def tailored_cv(_inputs):
+            return await self._generate_tailored_cv(context, results)
+        
+        graph.add("record_jd_usage", record_jd_usage)
+        graph.add("jd_analysis", jd_analysis, required=True)
+        graph.add("cv_skills", cv_skills, required=True)
+        graph.add("cv_text", cv_text)
+        graph.add("cv_jd_matching", cv_jd_matching, depends_on=["jd_analysis", "cv_skills"], required=True)
+        graph.add("component_analysis", component_analysis, depends_on=["cv_jd_matching"], after=["cv_text"])
+        graph.add("ats_recommendations", ats_recommendations, after=["component_analysis"])
+        
+        # AI Recommendations (optional for reruns), then CV tailoring if they succeeded
+        if include_tailoring or not context.is_rerun:
+            graph.add("ai_recommendations", ai_recommendations, after=["ats_recommendations"])
+            if include_tailoring:
+                graph.add("tailored_cv", tailored_cv, depends_on=["ai_recommendations"])
+        
+        return graph
+    
+    def _read_selected_cv_text(self, context: AnalysisContext) -> Optional[str]:
+        """Read the selected CV once so component analysis does not re-select and re-read it"""
+        cv_file_path = context.cv_context.txt_path if context.cv_context.txt_path else context.cv_context.json_path
+        if not cv_file_path or not Path(cv_file_path).exists():
+            return None
+        with open(cv_file_path, 'r', encoding='utf-8') as f:
+            cv_content = f.read()
+        return cv_content if cv_content.strip() else None
+    
     async def _extract_cv_skills_from_path(self, cv_path: str, jd_url: str, user_id: int, force_refresh: bool = False) -> Dict[str, Any]:
         """Extract CV skills from a specific file path"""
         try:
@@ -261,6 +326,16 @@ class ContextAwareAnalysisPipeline:
             }}
             """
             
+            from app.models.auth import UserData
+            from datetime import timezone
+            user = UserData(
+                id=str(user_id),
+                email=self.user_email,
+                name=self.user_email.split("@")[0] if self.user_email else "user",
+                created_at=datetime.now(timezone.utc),
+                is_active=True
+            )
+            
             cv_response = await ai_service.generate_response(
                 prompt=cv_prompt,
                 user=user,
@@ -483,12 +558,19 @@ class ContextAwareAnalysisPipeline:
             results.errors.append(f"CV-JD matching error: {str(e)}")
             return None
     
-    async def _run_component_analysis(self, context: AnalysisContext, results: AnalysisResults) -> Optional[Dict[str, Any]]:
-        """Run component analysis"""
+    async def _run_component_analysis(
+        self,
+        context: AnalysisContext,
+        results: AnalysisResults,
+        cv_text: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Run component analysis, reusing the already loaded CV text when available"""
         try:
             logger.info("🔧 [CONTEXT_AWARE_PIPELINE] Running component analysis")
             
-            component_result = await self.component_assembler.assemble_analysis(context.company, jd_url=context.jd_url)
+            component_result = await self.component_assembler.assemble_analysis(
+                context.company, cv_text=cv_text, jd_url=context.jd_url
+            )
             
             results.component_analysis = component_result
             results.steps_completed.append("component_analysis")
@@ -15,6 +15,7 @@ from datetime import datetime
 from app.ai.ai_service import ai_service
 from app.ai.base_provider import AIResponse
 from app.utils.timestamp_utils import TimestampUtils
+from app.utils.run_artifacts import artifact_exists, find_latest, load_json, save_json
 from .cv_jd_matching_prompt import get_cv_jd_matching_prompts
 
 logger = logging.getLogger(__name__)
@@ -154,22 +155,21 @@ class CVJDMatcher:
         
         company_dir = Path(base_path) / "applied_companies" / company_name
         # Try to find timestamped file with company name pattern first
-        analysis_file = TimestampUtils.find_latest_timestamped_file(company_dir, f"{company_name}_jd_analysis", "json")
+        analysis_file = find_latest(company_dir, f"{company_name}_jd_analysis", "json")
         
         # Fallback to old pattern without company name if not found
         if not analysis_file:
-            analysis_file = TimestampUtils.find_latest_timestamped_file(company_dir, "jd_analysis", "json")
+            analysis_file = find_latest(company_dir, "jd_analysis", "json")
         
         # Fallback to non-timestamped file if still not found
         if not analysis_file:
             analysis_file = company_dir / f"{company_name}_jd_analysis.json"
         
-        if not analysis_file.exists():
+        if not artifact_exists(analysis_file):
             raise FileNotFoundError(f"JD analysis file not found: {analysis_file}")
         
         try:
-            with open(analysis_file, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            data = load_json(analysis_file)
             logger.info(f"📂 Loaded JD analysis from: {analysis_file}")
             return data
         except Exception as e:
@@ -457,11 +457,10 @@ class CVJDMatcher:
         paths = get_user_company_analysis_paths(self.user_email, company_name)
         timestamp = TimestampUtils.get_timestamp()
         result_file = paths["cv_jd_matching"](timestamp)
-        result_file.parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            with open(result_file, 'w', encoding='utf-8') as file:
-                json.dump(result.to_dict(), file, indent=2, ensure_ascii=False)
+            # Inside a pipeline run the result is handed to later stages in memory
+            save_json(result_file, result.to_dict())
             
             logger.info(f"💾 Saved CV-JD match results to: {result_file}")
             return str(result_file)
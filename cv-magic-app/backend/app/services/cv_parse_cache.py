@@ -0,0 +1,168 @@
+"""
+CV Parse Cache
+
+Content-addressed cache of structured CV parses.
+
+Entries are keyed on the SHA-256 of the CV text, the parser prompt version and
+the provider/model that parsed it, stored in SQLite (shared by all workers
+and kept across restarts), expired by TTL and evicted least-recently-used.
+Re-uploading or re-processing an unchanged CV therefore returns the stored
+parse without an LLM call.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def cv_text_hash(cv_text: str) -> str:
+    """Cache address of a CV text"""
+    return hashlib.sha256(cv_text.encode("utf-8")).hexdigest()
+
+
+class CVParseCache:
+    """SQLite-backed structured CV parse cache with TTL expiry and LRU eviction"""
+
+    def __init__(self, db_path: str, ttl_seconds: int = 30 * 24 * 3600, max_entries: int = 2000, enabled: bool = True):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cv_parses (
+                    content_hash TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    parsed TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (content_hash, prompt_version, model)
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cv_parses_last_accessed ON cv_parses (last_accessed)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, content_hash: str, prompt_version: str, model: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Cached parse for a CV text, or None on miss or expiry
+
+        Args:
+            content_hash: cv_text_hash() of the CV text
+            prompt_version: Parser prompt version the parse was made with
+            model: "provider:model" that parsed it; None takes the most recent parse by any model
+        """
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                query = "SELECT model, parsed, created_at FROM cv_parses WHERE content_hash = ? AND prompt_version = ?"
+                params = [content_hash, prompt_version]
+                if model is not None:
+                    query += " AND model = ?"
+                    params.append(model)
+                if self.ttl_seconds:
+                    query += " AND created_at >= ?"
+                    params.append(now - self.ttl_seconds)
+                row = conn.execute(query + " ORDER BY created_at DESC LIMIT 1", params).fetchone()
+                if row is None:
+                    self._stats["misses"] += 1
+                    return None
+                conn.execute(
+                    "UPDATE cv_parses SET last_accessed = ?, hit_count = hit_count + 1 "
+                    "WHERE content_hash = ? AND prompt_version = ? AND model = ?",
+                    (now, content_hash, prompt_version, row[0]),
+                )
+                conn.commit()
+                self._stats["hits"] += 1
+        except Exception as e:
+            logger.warning(f"⚠️ [CV_PARSE_CACHE] Lookup failed, treating as miss: {e}")
+            return None
+        return json.loads(row[1])
+
+    def set(self, content_hash: str, prompt_version: str, model: str, parsed: Dict[str, Any]) -> None:
+        """Store a parse, drop expired ones and evict least-recently-used entries beyond the size limit"""
+        if not self.enabled:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO cv_parses
+                        (content_hash, prompt_version, model, parsed, created_at, last_accessed, hit_count)
+                    VALUES (?, ?, ?, ?, ?, ?, 0)
+                    """,
+                    (content_hash, prompt_version, model, json.dumps(parsed, ensure_ascii=False, default=str), now, now),
+                )
+                self._stats["stores"] += 1
+                if self.ttl_seconds:
+                    expired = conn.execute("DELETE FROM cv_parses WHERE created_at < ?", (now - self.ttl_seconds,)).rowcount
+                    self._stats["expired"] += expired
+                count = conn.execute("SELECT COUNT(*) FROM cv_parses").fetchone()[0]
+                if count > self.max_entries:
+                    overflow = count - self.max_entries
+                    conn.execute(
+                        "DELETE FROM cv_parses WHERE rowid IN "
+                        "(SELECT rowid FROM cv_parses ORDER BY last_accessed ASC LIMIT ?)",
+                        (overflow,),
+                    )
+                    self._stats["evictions"] += overflow
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ [CV_PARSE_CACHE] Failed to store parse: {e}")
+
+    def clear(self) -> None:
+        """Remove every cached parse"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM cv_parses")
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["enabled"] = self.enabled
+        try:
+            with self._lock:
+                stats["entries"] = self._connection().execute("SELECT COUNT(*) FROM cv_parses").fetchone()[0]
+        except Exception:
+            stats["entries"] = None
+        return stats
+
+
+# Global CV parse cache instance
+cv_parse_cache = CVParseCache(
+    db_path=settings.CV_PARSE_CACHE_PATH,
+    ttl_seconds=settings.CV_PARSE_CACHE_TTL_SECONDS,
+    max_entries=settings.CV_PARSE_CACHE_MAX_ENTRIES,
+    enabled=settings.CV_PARSE_CACHE_ENABLED,
+)
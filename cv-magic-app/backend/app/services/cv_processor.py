@@ -5,6 +5,8 @@ import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from app.services.document_text_extractor import document_text_extractor
+
 logger = logging.getLogger(__name__)
 
 
@@ -12,96 +14,12 @@ class CVProcessor:
     """Simple CV processor for basic text extraction"""
     
     def extract_text_from_file(self, file_path: Path) -> Dict[str, Any]:
-        """Extract text from a CV file"""
-        try:
-            if file_path.suffix.lower() == '.pdf':
-                return self._extract_from_pdf(file_path)
-            elif file_path.suffix.lower() == '.docx':
-                return self._extract_from_docx(file_path)
-            elif file_path.suffix.lower() == '.txt':
-                return self._extract_from_txt(file_path)
-            else:
-                return {
-                    'success': False,
-                    'error': f'Unsupported file type: {file_path.suffix}',
-                    'text': '',
-                    'word_count': 0
-                }
-        except Exception as e:
-            logger.error(f"Error extracting text from {file_path}: {e}")
-            return {
-                'success': False,
-                'error': str(e),
-                'text': '',
-                'word_count': 0
-            }
-    
-    def _extract_from_pdf(self, file_path: Path) -> Dict[str, Any]:
-        """Extract text from PDF file"""
-        try:
-            import PyPDF2
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                
-                return {
-                    'success': True,
-                    'text': text.strip(),
-                    'word_count': len(text.split()),
-                    'file_type': 'pdf'
-                }
-        except ImportError:
-            return {
-                'success': False,
-                'error': 'PyPDF2 not available',
-                'text': '',
-                'word_count': 0
-            }
-    
-    def _extract_from_docx(self, file_path: Path) -> Dict[str, Any]:
-        """Extract text from DOCX file"""
-        try:
-            from docx import Document
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            return {
-                'success': True,
-                'text': text.strip(),
-                'word_count': len(text.split()),
-                'file_type': 'docx'
-            }
-        except ImportError:
-            return {
-                'success': False,
-                'error': 'python-docx not available',
-                'text': '',
-                'word_count': 0
-            }
+        """Extract text from a CV file (blocking; cached by file content)"""
+        return document_text_extractor.extract(file_path)
     
-    def _extract_from_txt(self, file_path: Path) -> Dict[str, Any]:
-        """Extract text from TXT file"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-            
-            return {
-                'success': True,
-                'text': text.strip(),
-                'word_count': len(text.split()),
-                'file_type': 'txt'
-            }
-        except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'text': '',
-                'word_count': 0
-            }
+    async def extract_text_from_file_async(self, file_path: Path) -> Dict[str, Any]:
+        """Extract text from a CV file without blocking the event loop"""
+        return await document_text_extractor.extract_async(file_path)
     
     def get_text_preview(self, text: str, max_length: int = 200) -> str:
         """Get a preview of the text"""
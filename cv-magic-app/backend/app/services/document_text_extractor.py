@@ -0,0 +1,325 @@
+"""
+Document Text Extractor
+
+One text extraction engine for uploaded CVs (PDF, DOCX, TXT).
+
+- PDF pages are streamed one at a time with PyPDF2; a page whose text looks
+  layout-damaged (empty, glued words, unmapped glyphs) is re-extracted with
+  pdfplumber
+- Multi-page PDFs are split into page ranges extracted in a spawn process
+  pool (or in-process with 0 workers)
+- Results are cached by file content hash in a directory of JSON files, so a
+  re-uploaded or re-read file is not parsed again; the least recently used
+  results are evicted
+- extract_async() runs everything off the event loop, and concurrent
+  requests for the same file share one extraction
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever extraction output changes, so cached results are not reused
+EXTRACTOR_VERSION = "1"
+
+_CID_RE = re.compile(r"\(cid:\d+\)")
+
+
+def file_sha256(file_path: Path) -> str:
+    """Content hash of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _needs_layout_fallback(text: str) -> bool:
+    """Whether PyPDF2's text for a page looks layout-damaged"""
+    stripped = text.strip()
+    if len(stripped) < 20:
+        return True
+    if _CID_RE.search(stripped):
+        return True
+    words = stripped.split()
+    # Columns and tight kerning make PyPDF2 glue words together
+    return sum(len(word) for word in words) / len(words) > 15
+
+
+def _iter_pdf_page_range(file_path: str, start: int, stop: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Stream the text of pages [start, stop) of a PDF, one page at a time
+
+    Yields:
+        (text, method) per page, method being "pypdf2" or "pdfplumber"
+    """
+    import PyPDF2
+
+    plumber_pdf = None
+    try:
+        with open(file_path, "rb") as f:
+            reader = PyPDF2.PdfReader(f)
+            end = len(reader.pages) if stop is None else min(stop, len(reader.pages))
+            for index in range(start, end):
+                try:
+                    text = reader.pages[index].extract_text() or ""
+                except Exception as e:
+                    logger.warning(f"⚠️ [DOC_EXTRACT] PyPDF2 failed on page {index + 1}: {e}")
+                    text = ""
+                method = "pypdf2"
+                if _needs_layout_fallback(text):
+                    try:
+                        if plumber_pdf is None:
+                            import pdfplumber
+                            plumber_pdf = pdfplumber.open(file_path)
+                        plumber_text = plumber_pdf.pages[index].extract_text() or ""
+                        if plumber_text.strip() and (
+                            not _needs_layout_fallback(plumber_text) or len(plumber_text.strip()) > len(text.strip())
+                        ):
+                            text, method = plumber_text, "pdfplumber"
+                    except ImportError:
+                        pass
+                    except Exception as e:
+                        logger.warning(f"⚠️ [DOC_EXTRACT] pdfplumber failed on page {index + 1}: {e}")
+                yield text, method
+    finally:
+        if plumber_pdf is not None:
+            plumber_pdf.close()
+
+
+def _extract_pdf_page_range(file_path: str, start: int, stop: int) -> List[Tuple[str, str]]:
+    """Text and method of pages [start, stop) of a PDF (runs in pool workers)"""
+    return list(_iter_pdf_page_range(file_path, start, stop))
+
+
+def iter_pdf_pages(file_path: Path) -> Iterator[Tuple[int, str]]:
+    """Stream (page number, text) from a PDF one page at a time, in-process"""
+    for number, (text, _) in enumerate(_iter_pdf_page_range(str(file_path), 0), start=1):
+        yield number, text
+
+
+def _pdf_page_count(file_path: Path) -> int:
+    import PyPDF2
+
+    with open(file_path, "rb") as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
+
+def _result(text: str, file_type: str, **extra: Any) -> Dict[str, Any]:
+    text = text.strip()
+    return {"success": True, "text": text, "word_count": len(text.split()), "file_type": file_type, **extra}
+
+
+def _failure(error: str) -> Dict[str, Any]:
+    return {"success": False, "error": error, "text": "", "word_count": 0}
+
+
+class DocumentTextExtractor:
+    """
+    File-hash cached text extraction with a process pool for multi-page PDFs.
+
+    Cached results are JSON files named {sha256}_{suffix}.json holding the
+    extraction result, so any worker process can reuse them.
+    """
+
+    def __init__(self, cache_dir: str, max_cached: int = 500, workers: int = 2, pages_per_chunk: int = 4):
+        self.cache_dir = Path(cache_dir)
+        self.max_cached = max_cached
+        self.workers = workers
+        self.pages_per_chunk = max(1, pages_per_chunk)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._single_flight = SingleFlight("document_extract_single_flight")
+        self._stats = {"cache_hits": 0, "extractions": 0, "pool_extractions": 0, "layout_fallback_pages": 0, "evictions": 0}
+
+    def _cache_path(self, digest: str, suffix: str) -> Path:
+        # The suffix picks the extractor, so identical bytes under another extension are a different result
+        return self.cache_dir / f"{digest}_{suffix.lstrip('.')}.json"
+
+    def _lookup(self, digest: str, suffix: str) -> Optional[Dict[str, Any]]:
+        """Cached result for a file hash and type, marked as recently used"""
+        path = self._cache_path(digest, suffix)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if cached.get("extractor_version") != EXTRACTOR_VERSION:
+            return None
+        self._stats["cache_hits"] += 1
+        return cached["result"]
+
+    def _store(self, digest: str, suffix: str, result: Dict[str, Any]) -> None:
+        path = self._cache_path(digest, suffix)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"extractor_version": EXTRACTOR_VERSION, "result": result}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️ [DOC_EXTRACT] Failed to cache extraction: {e}")
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop the least recently used results beyond max_cached, and unreadable {sha256}.json entries"""
+        with self._lock:
+            try:
+                entries = sorted(self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+            except OSError:
+                return
+            # Entries from before the suffix was part of the name are never looked up again
+            legacy = [path for path in entries if "_" not in path.stem]
+            entries = [path for path in entries if "_" in path.stem]
+            for path in legacy + entries[: max(0, len(entries) - self.max_cached)]:
+                try:
+                    path.unlink()
+                    self._stats["evictions"] += 1
+                except OSError:
+                    pass
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: forking a process that runs an event loop and threads is unsafe
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _extract_pdf(self, file_path: Path) -> Dict[str, Any]:
+        try:
+            page_count = _pdf_page_count(file_path)
+        except ImportError:
+            return _failure("PyPDF2 not available")
+
+        ranges = [(start, min(start + self.pages_per_chunk, page_count)) for start in range(0, page_count, self.pages_per_chunk)]
+        pool = self._get_pool() if len(ranges) > 1 else None
+        chunks: Optional[List[List[Tuple[str, str]]]] = None
+        if pool is not None:
+            try:
+                futures = [pool.submit(_extract_pdf_page_range, str(file_path), start, stop) for start, stop in ranges]
+                chunks = [future.result() for future in futures]
+                self._stats["pool_extractions"] += 1
+            except BrokenProcessPool:
+                logger.warning("⚠️ [DOC_EXTRACT] Extraction pool broke; recreating it and extracting in-process")
+                with self._pool_lock:
+                    self._pool = None
+        if chunks is None:
+            chunks = [_extract_pdf_page_range(str(file_path), start, stop) for start, stop in ranges]
+
+        pages = [page for chunk in chunks for page in chunk]
+        fallback_pages = sum(1 for _, method in pages if method == "pdfplumber")
+        self._stats["layout_fallback_pages"] += fallback_pages
+        return _result("\n".join(text for text, _ in pages), "pdf", pages=page_count, layout_fallback_pages=fallback_pages)
+
+    @staticmethod
+    def _extract_docx(file_path: Path) -> Dict[str, Any]:
+        try:
+            from docx import Document
+        except ImportError:
+            return _failure("python-docx not available")
+        doc = Document(file_path)
+        return _result("\n".join(paragraph.text for paragraph in doc.paragraphs), "docx")
+
+    @staticmethod
+    def _extract_txt(file_path: Path) -> Dict[str, Any]:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return _result(f.read(), "txt")
+
+    def _extract_uncached(self, file_path: Path) -> Dict[str, Any]:
+        suffix = file_path.suffix.lower()
+        if suffix == ".pdf":
+            result = self._extract_pdf(file_path)
+        elif suffix == ".docx":
+            result = self._extract_docx(file_path)
+        elif suffix == ".txt":
+            result = self._extract_txt(file_path)
+        else:
+            return _failure(f"Unsupported file type: {file_path.suffix}")
+        self._stats["extractions"] += 1
+        return result
+
+    def _extract_with_digest(self, file_path: Path, digest: str) -> Dict[str, Any]:
+        suffix = file_path.suffix.lower()
+        cached = self._lookup(digest, suffix)
+        if cached is not None:
+            return {**cached, "cached": True}
+        try:
+            result = self._extract_uncached(file_path)
+        except Exception as e:
+            logger.error(f"Error extracting text from {file_path}: {e}")
+            return _failure(str(e))
+        if result["success"]:
+            self._store(digest, suffix, result)
+            logger.info(f"📄 [DOC_EXTRACT] Extracted {file_path.name}: {len(result['text'])} chars")
+        return {**result, "cached": False}
+
+    def extract(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Extract text from a document, reusing the cached result for identical content
+
+        Blocks the calling thread; use extract_async on the event loop.
+
+        Returns:
+            Dict with success, text, word_count and file_type (plus pages and
+            layout_fallback_pages for PDFs, and whether it was cached), or
+            success False with an error
+        """
+        file_path = Path(file_path)
+        try:
+            digest = file_sha256(file_path)
+        except OSError as e:
+            logger.error(f"Error extracting text from {file_path}: {e}")
+            return _failure(str(e))
+        return self._extract_with_digest(file_path, digest)
+
+    async def extract_async(self, file_path: Path) -> Dict[str, Any]:
+        """extract() without blocking the event loop; concurrent calls for the same content share one extraction"""
+        file_path = Path(file_path)
+        try:
+            digest = await asyncio.to_thread(file_sha256, file_path)
+        except OSError as e:
+            logger.error(f"Error extracting text from {file_path}: {e}")
+            return _failure(str(e))
+        key = SingleFlight.make_key("document_extract", digest, file_path.suffix.lower())
+        result = await self._single_flight.do(key, lambda: asyncio.to_thread(self._extract_with_digest, file_path, digest))
+        return dict(result)
+
+    def shutdown(self) -> None:
+        """Shut down the extraction pool"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache hit, extraction, fallback and eviction counters"""
+        return dict(self._stats)
+
+
+# Global document text extractor instance
+document_text_extractor = DocumentTextExtractor(
+    cache_dir=settings.DOCUMENT_EXTRACT_CACHE_DIR,
+    max_cached=settings.DOCUMENT_EXTRACT_CACHE_MAX_FILES,
+    workers=settings.DOCUMENT_EXTRACT_WORKERS,
+    pages_per_chunk=settings.DOCUMENT_EXTRACT_PAGES_PER_CHUNK,
+)
@@ -134,7 +134,7 @@ class EnhancedCVUploadService:
             logger.info(f"CV file saved: {cv_file.filename} ({len(file_content)} bytes)")
             
             # Extract text content
-            extraction_result = self._extract_text_content(file_path)
+            extraction_result = await self._extract_text_content(file_path)
             if not extraction_result["success"]:
                 raise HTTPException(status_code=500, detail=f"Text extraction failed: {extraction_result['error']}")
             
@@ -199,7 +199,7 @@ class EnhancedCVUploadService:
                 raise HTTPException(status_code=404, detail="CV file not found")
             
             # Extract text content
-            extraction_result = self._extract_text_content(file_path)
+            extraction_result = await self._extract_text_content(file_path)
             if not extraction_result["success"]:
                 raise HTTPException(status_code=500, detail=f"Text extraction failed: {extraction_result['error']}")
             
@@ -354,10 +354,10 @@ class EnhancedCVUploadService:
         
         return {"valid": True}
 
-    def _extract_text_content(self, file_path: Path) -> Dict[str, Any]:
+    async def _extract_text_content(self, file_path: Path) -> Dict[str, Any]:
         """Extract text content from CV file"""
         try:
-            result = self.cv_processor.extract_text_from_file(file_path)
+            result = await self.cv_processor.extract_text_from_file_async(file_path)
             
             if result['success']:
                 logger.info(f"Text extracted successfully: {len(result['text'])} characters")
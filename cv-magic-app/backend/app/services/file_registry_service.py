@@ -1,10 +1,19 @@
+import asyncio
 import hashlib
+import logging
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Optional, Set, Tuple, TypeVar
 from sqlalchemy.orm import Session
 
 from app.models.metadata import Company, CompanyFile, AnalysisRun, CVVersion
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Registrations scheduled from sync code running on the event loop (kept referenced until done)
+_background_registrations: Set[asyncio.Task] = set()
+
 
 class FileRegistryService:
     def __init__(self, db: Session, user_id: str):
@@ -20,6 +29,27 @@ class FileRegistryService:
         # Store user_id as string to align with metadata tables
         return cls(db=db, user_id=str(user.id))
 
+    @classmethod
+    def run_for_user(cls, user_email: str, fn: Callable[["FileRegistryService"], T]) -> T:
+        """Run fn with a registry for the user in its own session and commit (blocking)"""
+        from app.database import SessionLocal
+        db = SessionLocal()
+        try:
+            result = fn(cls.from_email(db, user_email))
+            db.commit()
+            return result
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @classmethod
+    async def run_for_user_async(cls, user_email: str, fn: Callable[["FileRegistryService"], T]) -> T:
+        """run_for_user for code on the event loop (the queries do not block it)"""
+        from app.database import run_in_session
+        return await run_in_session(lambda db: fn(cls.from_email(db, user_email)), commit=True)
+
     def _sha256(self, file_path: Path) -> Optional[str]:
         try:
             h = hashlib.sha256()
@@ -112,3 +142,38 @@ class FileRegistryService:
         return run.id
 
 
+
+
+def register_in_background(user_email: str, fn: Callable[[FileRegistryService], object], label: str) -> None:
+    """
+    Best-effort registration that never blocks the caller's event loop
+
+    From sync code running on the loop, fn is scheduled on the async database
+    path; without a running loop it runs right away.
+
+    Args:
+        user_email: Owner of the files
+        fn: Registration work, given a FileRegistryService
+        label: What is being registered (for the warning if it fails)
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if loop is None:
+        try:
+            FileRegistryService.run_for_user(user_email, fn)
+        except Exception as reg_err:
+            logger.warning(f"⚠️ [DB] Failed to register {label}: {reg_err}")
+        return
+
+    async def _register() -> None:
+        try:
+            await FileRegistryService.run_for_user_async(user_email, fn)
+        except Exception as reg_err:
+            logger.warning(f"⚠️ [DB] Failed to register {label}: {reg_err}")
+
+    task = loop.create_task(_register())
+    _background_registrations.add(task)
+    task.add_done_callback(_background_registrations.discard)
@@ -16,7 +16,7 @@ import hashlib
 from app.ai.ai_service import ai_service
 from app.ai.base_provider import AIResponse
 from app.utils.timestamp_utils import TimestampUtils
-from .jd_analysis_prompt import get_jd_analysis_prompts
+from app.ai.prompt_registry import prompt_registry
 
 logger = logging.getLogger(__name__)
 
@@ -432,7 +432,8 @@ class JDAnalyzer:
             Exception: If analysis fails
         """
         try:
-            system_prompt, user_prompt = get_jd_analysis_prompts(jd_text)
+            system_prompt = prompt_registry.text("jd_analysis_system")
+            user_prompt = prompt_registry.render("jd_analysis_user", job_description=jd_text).text
             
             # Create user object from stored user_email
             from app.models.auth import UserData
@@ -3,13 +3,26 @@ Job Description Cache Manager
 
 This service manages caching and reuse of JD analysis data to avoid redundant AI calls
 when the same JD URL is analyzed multiple times (especially during "Run ATS Test Again").
+
+Storage layout per company folder:
+- {company}_jd_cache_{timestamp}.json: snapshot, written only when the analysis changes
+- {company}_jd_cache_usage.jsonl: append-only usage counters, flushed in batches
+
+Recently used snapshots are kept in an in-memory LRU tier, so a cache hit does not
+touch the disk. compact() folds the usage log back into the latest snapshot and
+removes superseded snapshots.
 """
 
 import logging
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Optional, List, Any, Tuple
 from datetime import datetime
+from app.utils.artifact_index import artifact_index
 from app.utils.timestamp_utils import TimestampUtils
 
 logger = logging.getLogger(__name__)
@@ -56,11 +69,31 @@ class JDCacheManager:
     Manages caching and reuse of JD analysis data based on URL comparison
     """
     
-    def __init__(self, cv_analysis_base_path: str = None):
+    def __init__(
+        self,
+        cv_analysis_base_path: str = None,
+        max_memory_entries: int = 128,
+        flush_interval_seconds: float = 60.0,
+        flush_every_hits: int = 25,
+        compact_after_flushes: int = 50,
+    ):
         if cv_analysis_base_path is None:
             cv_analysis_base_path = "cv-analysis"
-        
+
         self.base_path = Path(cv_analysis_base_path)
+        self.max_memory_entries = max_memory_entries
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flush_every_hits = flush_every_hits
+        self.compact_after_flushes = compact_after_flushes
+
+        # Hot tier: company -> (snapshot path, data), least recently used first
+        self._memory: "OrderedDict[str, Tuple[Path, JDCacheData]]" = OrderedDict()
+        # Usage not yet written to disk: company -> {'snapshot', 'uses', 'last_used'}
+        self._pending_usage: Dict[str, Dict[str, Any]] = {}
+        self._log_lines_since_compact: Dict[str, int] = {}
+        self._pending_hits = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
         logger.info(f"🗄️ [JD_CACHE_MANAGER] Initialized with base path: {self.base_path}")
     
     def should_reuse_jd_analysis(self, jd_url: str, company: str) -> bool:
@@ -110,10 +143,10 @@ class JDCacheManager:
         try:
             cached_data = self._load_latest_jd_cache(company)
             if cached_data and cached_data.cache_valid:
-                # Mark as used
+                # Mark as used; counters are persisted by the next batched flush
                 cached_data.mark_used()
                 self._update_cache_usage(company, cached_data)
-                
+
                 logger.info(f"✅ [JD_CACHE_MANAGER] Retrieved cached JD data for {company}")
                 logger.info(f"📊 [JD_CACHE_MANAGER] Cache usage count: {cached_data.use_count}")
                 return cached_data
@@ -227,32 +260,78 @@ class JDCacheManager:
                 'error': str(e)
             }
     
+    def _usage_log_path(self, company: str) -> Path:
+        return self.base_path / company / f"{company}_jd_cache_usage.jsonl"
+
+    def _latest_snapshot_path(self, company: str) -> Optional[Path]:
+        company_dir = self.base_path / company
+        if not company_dir.exists():
+            return None
+        return TimestampUtils.find_latest_timestamped_file(company_dir, f"{company}_jd_cache", "json")
+
+    def _remember(self, company: str, snapshot: Path, cache_data: JDCacheData):
+        """Put an entry in the memory tier, evicting the least recently used company"""
+        with self._lock:
+            self._memory[company] = (snapshot, cache_data)
+            self._memory.move_to_end(company)
+            while len(self._memory) > self.max_memory_entries:
+                evicted, _ = self._memory.popitem(last=False)
+                # Usage of an evicted entry stays in _pending_usage until the next flush
+                logger.debug(f"🗄️ [JD_CACHE_MANAGER] Evicted {evicted} from memory tier")
+
+    def _read_usage_log(self, company: str, snapshot_name: str) -> Tuple[int, str]:
+        """Sum usage recorded in the append-only log for one snapshot"""
+        uses, last_used = 0, ''
+        log_path = self._usage_log_path(company)
+        if not log_path.exists():
+            return uses, last_used
+        with open(log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn write from a crashed process
+                if record.get('snapshot') != snapshot_name:
+                    continue
+                uses += int(record.get('uses', 0))
+                last_used = max(last_used, record.get('last_used', ''))
+        return uses, last_used
+
     def _load_latest_jd_cache(self, company: str) -> Optional[JDCacheData]:
-        """Load the latest JD cache data for a company"""
+        """Load the latest JD cache data for a company, from memory when still current"""
         try:
-            company_dir = self.base_path / company
-            if not company_dir.exists():
-                return None
-            
-            # Find latest JD cache file
-            cache_file = TimestampUtils.find_latest_timestamped_file(
-                company_dir, f"{company}_jd_cache", "json"
-            )
-            
+            cache_file = self._latest_snapshot_path(company)
             if not cache_file or not cache_file.exists():
+                with self._lock:
+                    self._memory.pop(company, None)
                 return None
-            
+
+            with self._lock:
+                entry = self._memory.get(company)
+                if entry is not None and entry[0] == cache_file:
+                    self._memory.move_to_end(company)
+                    return entry[1]
+
+            # Snapshot changed on disk (or first access): persist our counters for the old one first
+            self.flush_usage(company)
+
             with open(cache_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            
-            return JDCacheData(data)
+
+            cache_data = JDCacheData(data)
+            uses, last_used = self._read_usage_log(company, cache_file.name)
+            cache_data.use_count += uses
+            cache_data.last_used = max(cache_data.last_used, last_used)
+
+            self._remember(company, cache_file, cache_data)
+            return cache_data
             
         except Exception as e:
             logger.error(f"❌ [JD_CACHE_MANAGER] Error loading JD cache for {company}: {e}")
             return None
     
     def _save_jd_cache(self, company: str, cache_data: JDCacheData) -> bool:
-        """Save JD cache data to file"""
+        """Save a new JD cache snapshot; only called when the cached analysis itself changes"""
         try:
             company_dir = self.base_path / company
             company_dir.mkdir(parents=True, exist_ok=True)
@@ -263,6 +342,12 @@ class JDCacheManager:
             
             with open(cache_file, 'w', encoding='utf-8') as f:
                 json.dump(cache_data.to_dict(), f, indent=2, ensure_ascii=False)
+            artifact_index.record_write(cache_file)
+
+            with self._lock:
+                # The snapshot already carries the current counters
+                self._pending_usage.pop(company, None)
+            self._remember(company, cache_file, cache_data)
             
             logger.info(f"💾 [JD_CACHE_MANAGER] Saved JD cache to: {cache_file}")
             return True
@@ -272,15 +357,73 @@ class JDCacheManager:
             return False
     
     def _update_cache_usage(self, company: str, cache_data: JDCacheData) -> bool:
-        """Update cache usage statistics"""
+        """Record a cache hit in memory and flush counters once the batch is due"""
         try:
-            # Save updated cache data with new usage stats
-            return self._save_jd_cache(company, cache_data)
+            with self._lock:
+                entry = self._memory.get(company)
+                if entry is None:
+                    return False
+                pending = self._pending_usage.setdefault(
+                    company, {'snapshot': entry[0].name, 'uses': 0, 'last_used': ''}
+                )
+                pending['uses'] += 1
+                pending['last_used'] = cache_data.last_used
+                self._pending_hits += 1
+                due = (
+                    self._pending_hits >= self.flush_every_hits
+                    or time.monotonic() - self._last_flush >= self.flush_interval_seconds
+                )
+
+            if due:
+                self.flush_usage()
+            return True
             
         except Exception as e:
             logger.error(f"❌ [JD_CACHE_MANAGER] Error updating cache usage for {company}: {e}")
             return False
+
+    def flush_usage(self, company: Optional[str] = None) -> int:
+        """
+        Append pending usage counters to each company's usage log
+
+        Args:
+            company: Only flush this company (default: all companies)
+
+        Returns:
+            Number of companies flushed
+        """
+        with self._lock:
+            if company is None:
+                batch = self._pending_usage
+                self._pending_usage = {}
+                self._pending_hits = 0
+                self._last_flush = time.monotonic()
+            else:
+                pending = self._pending_usage.pop(company, None)
+                batch = {company: pending} if pending else {}
+
+        to_compact = []
+        for name, pending in batch.items():
+            try:
+                log_path = self._usage_log_path(name)
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(pending, ensure_ascii=False) + "\n")
+                with self._lock:
+                    count = self._log_lines_since_compact.get(name, 0) + 1
+                    self._log_lines_since_compact[name] = count
+                if count >= self.compact_after_flushes:
+                    to_compact.append(name)
+            except Exception as e:
+                logger.error(f"❌ [JD_CACHE_MANAGER] Error flushing cache usage for {name}: {e}")
+
+        if batch:
+            logger.info(f"💾 [JD_CACHE_MANAGER] Flushed usage counters for {len(batch)} companies")
+        for name in to_compact:
+            self.compact(name)
+        return len(batch)
     
+
     def _calculate_cache_age_hours(self, cached_at: str) -> float:
         """Calculate cache age in hours"""
         try:
@@ -328,12 +471,54 @@ class JDCacheManager:
             logger.error(f"❌ [JD_CACHE_MANAGER] Error listing cached companies: {e}")
             return []
     
+    def compact(self, company: str) -> Dict[str, Any]:
+        """
+        Fold the usage log into the latest snapshot and remove superseded snapshots
+
+        Args:
+            company: Company name
+
+        Returns:
+            Compaction statistics for the company
+        """
+        stats = {'company': company, 'files_removed': 0, 'usage_folded': False}
+        self.flush_usage(company)
+
+        company_dir = self.base_path / company
+        latest = self._latest_snapshot_path(company)
+        if latest is None:
+            return stats
+
+        cache_data = self._load_latest_jd_cache(company)
+        log_path = self._usage_log_path(company)
+        if cache_data is not None and log_path.exists():
+            # Rewrite the latest snapshot in place so its name (and the memory tier key) stays valid
+            tmp_path = latest.with_name(latest.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache_data.to_dict(), f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, latest)
+            log_path.unlink()
+            stats['usage_folded'] = True
+
+        for cache_file in TimestampUtils.find_all_timestamped_files(company_dir, f"{company}_jd_cache", "json"):
+            if cache_file == latest:
+                continue
+            cache_file.unlink()
+            stats['files_removed'] += 1
+            logger.info(f"🗑️ [JD_CACHE_MANAGER] Removed old cache: {cache_file}")
+
+        artifact_index.record_write(latest)
+        with self._lock:
+            self._log_lines_since_compact.pop(company, None)
+        return stats
+
     def cleanup_old_cache(self, max_age_hours: int = 168) -> Dict[str, Any]:  # Default: 7 days
         """
-        Clean up old cache files
-        
+        Compact the cache of every company whose latest snapshot is older than max_age_hours
+
         Args:
             max_age_hours: Maximum age in hours before cache is considered old
+                (0 compacts every company)
             
         Returns:
             Cleanup statistics
@@ -345,27 +530,17 @@ class JDCacheManager:
                 'errors': []
             }
             
+            self.flush_usage()
             companies = self.list_all_cached_companies()
             
             for company_info in companies:
                 cleanup_stats['companies_checked'] += 1
                 
-                if company_info.get('age_hours', 0) > max_age_hours:
+                if company_info.get('age_hours', 0) >= max_age_hours:
+                    company = company_info['company']
                     try:
-                        company = company_info['company']
-                        company_dir = self.base_path / company
-                        
-                        # Find all cache files for this company
-                        cache_files = TimestampUtils.find_all_timestamped_files(
-                            company_dir, f"{company}_jd_cache", "json"
-                        )
-                        
-                        # Remove old cache files (keep the latest one)
-                        for cache_file in cache_files[1:]:  # Skip the first (latest) file
-                            cache_file.unlink()
-                            cleanup_stats['files_removed'] += 1
-                            logger.info(f"🗑️ [JD_CACHE_MANAGER] Removed old cache: {cache_file}")
-                            
+                        result = self.compact(company)
+                        cleanup_stats['files_removed'] += result['files_removed']
                     except Exception as e:
                         cleanup_stats['errors'].append(f"Error cleaning {company}: {str(e)}")
             
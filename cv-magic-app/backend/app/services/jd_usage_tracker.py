@@ -3,74 +3,262 @@ JD Usage Tracker
 
 This service tracks which job descriptions have been used before to ensure
 that first-time JD usage always uses the original CV.
+
+Usage is kept in one SQLite table keyed by (user, jd_hash) with an in-memory
+read-through cache:
+- Each user's rows are loaded once; first-time-usage checks are then answered
+  from memory
+- The cache is dropped whenever another connection (worker process) commits,
+  detected through SQLite's data_version counter, so checks stay correct
+  across concurrent pipelines
+- Recording a use is one IMMEDIATE transaction, so concurrent increments are
+  never lost
+- A user's legacy jd_usage_history.json is imported the first time it is read
 """
 
+import hashlib
 import json
 import logging
-from pathlib import Path
-from typing import Dict, Set, Optional
+import sqlite3
+import threading
 from datetime import datetime
-import hashlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+GLOBAL_USER = ""  # Key for usage recorded without a user
 
-class JDUsageTracker:
+
+class JDUsageStore:
     """
-    Tracks JD usage history to determine if a JD has been used before
+    JD usage rows of all users, with a per-user in-memory cache
     """
-    
-    def __init__(self, user_email: str = None):
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._cache: Dict[str, Dict[str, Dict[str, Any]]] = {}  # user -> jd_hash -> usage_info
+        self._data_version: Optional[int] = None
+        self._stats = {"hits": 0, "loads": 0, "invalidations": 0, "writes": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jd_usage (
+                    user_email TEXT NOT NULL,
+                    jd_hash TEXT NOT NULL,
+                    jd_url TEXT,
+                    jd_text_preview TEXT,
+                    company TEXT,
+                    job_title TEXT,
+                    first_used TEXT NOT NULL,
+                    last_used TEXT NOT NULL,
+                    usage_count INTEGER NOT NULL DEFAULT 0,
+                    companies_used_with TEXT NOT NULL DEFAULT '[]',
+                    PRIMARY KEY (user_email, jd_hash)
+                )
+                """
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS jd_usage_imports (user_email TEXT PRIMARY KEY, imported_at TEXT)")
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _row_to_info(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "jd_url": row["jd_url"],
+            "jd_text_preview": row["jd_text_preview"],
+            "company": row["company"],
+            "job_title": row["job_title"],
+            "first_used": row["first_used"],
+            "last_used": row["last_used"],
+            "usage_count": row["usage_count"],
+            "companies_used_with": json.loads(row["companies_used_with"]),
+        }
+
+    def _validate_cache(self, conn: sqlite3.Connection) -> None:
+        """Drop cached rows if another connection committed since they were read"""
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            if self._cache:
+                self._stats["invalidations"] += 1
+            self._cache.clear()
+            self._data_version = version
+
+    def _user_rows(self, user_email: str) -> Dict[str, Dict[str, Any]]:
+        """Cached usage rows of a user (call with the lock held)"""
+        conn = self._connection()
+        self._validate_cache(conn)
+        rows = self._cache.get(user_email)
+        if rows is not None:
+            self._stats["hits"] += 1
+            return rows
+        self._import_legacy_json(conn, user_email)
+        rows = {
+            row["jd_hash"]: self._row_to_info(row)
+            for row in conn.execute("SELECT * FROM jd_usage WHERE user_email = ?", (user_email,))
+        }
+        self._cache[user_email] = rows
+        self._stats["loads"] += 1
+        return rows
+
+    def _import_legacy_json(self, conn: sqlite3.Connection, user_email: str) -> None:
+        """Copy a user's jd_usage_history.json into the table, once"""
+        if conn.execute("SELECT 1 FROM jd_usage_imports WHERE user_email = ?", (user_email,)).fetchone():
+            return
         if user_email:
             from app.utils.user_path_utils import get_user_base_path
-            self.base_path = get_user_base_path(user_email)
+            legacy_file = get_user_base_path(user_email) / "jd_usage_history.json"
         else:
-            self.base_path = Path("cv-analysis")
-        
-        self.usage_file = self.base_path / "jd_usage_history.json"
-        
-        # Ensure directory exists
-        self.usage_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        self._usage_data = self._load_usage_data()
-    
-    def _load_usage_data(self) -> Dict[str, Dict]:
-        """Load JD usage history from file"""
-        if not self.usage_file.exists():
-            return {
-                "jd_usage": {},  # jd_hash -> usage_info
-                "last_updated": datetime.now().isoformat(),
-                "version": "1.0"
-            }
-        
-        try:
-            with open(self.usage_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.info(f"📊 [JD_TRACKER] Loaded JD usage history: {len(data.get('jd_usage', {}))} entries")
-                return data
-        except Exception as e:
-            logger.error(f"❌ [JD_TRACKER] Error loading usage data: {e}")
-            return {
-                "jd_usage": {},
-                "last_updated": datetime.now().isoformat(),
-                "version": "1.0"
-            }
-    
-    def _save_usage_data(self):
-        """Save JD usage history to file"""
+            legacy_file = Path("cv-analysis") / "jd_usage_history.json"
+        entries: Dict[str, Dict[str, Any]] = {}
+        if legacy_file.exists():
+            try:
+                with open(legacy_file, "r", encoding="utf-8") as f:
+                    entries = json.load(f).get("jd_usage", {})
+            except Exception as e:
+                logger.error(f"❌ [JD_TRACKER] Could not read legacy {legacy_file}: {e}")
+                return  # Retry on next load rather than marking the import done
+        now = datetime.now().isoformat()
+        conn.execute("BEGIN IMMEDIATE")
         try:
-            self.usage_data["last_updated"] = datetime.now().isoformat()
-            with open(self.usage_file, 'w', encoding='utf-8') as f:
-                json.dump(self.usage_data, f, indent=2, ensure_ascii=False)
-            logger.info(f"💾 [JD_TRACKER] Saved JD usage history")
-        except Exception as e:
-            logger.error(f"❌ [JD_TRACKER] Error saving usage data: {e}")
-    
+            for jd_hash, info in entries.items():
+                conn.execute(
+                    """
+                    INSERT OR IGNORE INTO jd_usage
+                        (user_email, jd_hash, jd_url, jd_text_preview, company, job_title,
+                         first_used, last_used, usage_count, companies_used_with)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        user_email, jd_hash, info.get("jd_url"), info.get("jd_text_preview"),
+                        info.get("company"), info.get("job_title"),
+                        info.get("first_used") or now, info.get("last_used") or now,
+                        info.get("usage_count", 1), json.dumps(info.get("companies_used_with", [])),
+                    ),
+                )
+            conn.execute("INSERT OR REPLACE INTO jd_usage_imports (user_email, imported_at) VALUES (?, ?)", (user_email, now))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if entries:
+            logger.info(f"📥 [JD_TRACKER] Imported {len(entries)} JD usage entries from {legacy_file}")
+
+    def get(self, user_email: str, jd_hash: str) -> Optional[Dict[str, Any]]:
+        """Usage info of one JD, or None if it was never used"""
+        with self._lock:
+            info = self._user_rows(user_email).get(jd_hash)
+            return dict(info) if info is not None else None
+
+    def contains(self, user_email: str, jd_hash: str) -> bool:
+        """Whether the user has used this JD before"""
+        with self._lock:
+            return jd_hash in self._user_rows(user_email)
+
+    def all_for_user(self, user_email: str) -> Dict[str, Dict[str, Any]]:
+        """Every JD the user has used, by hash"""
+        with self._lock:
+            return {jd_hash: dict(info) for jd_hash, info in self._user_rows(user_email).items()}
+
+    def record(
+        self,
+        user_email: str,
+        jd_hash: str,
+        jd_url: str = "",
+        jd_text_preview: str = "",
+        company: str = "",
+        job_title: str = "",
+    ) -> Dict[str, Any]:
+        """
+        Record one use of a JD, atomically
+
+        Returns:
+            The updated usage info
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            # Make sure legacy history is in the table before incrementing on top of it
+            self._user_rows(user_email)
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT companies_used_with FROM jd_usage WHERE user_email = ? AND jd_hash = ?",
+                    (user_email, jd_hash),
+                ).fetchone()
+                if row is None:
+                    conn.execute(
+                        """
+                        INSERT INTO jd_usage
+                            (user_email, jd_hash, jd_url, jd_text_preview, company, job_title,
+                             first_used, last_used, usage_count, companies_used_with)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?)
+                        """,
+                        (user_email, jd_hash, jd_url, jd_text_preview, company, job_title,
+                         now, now, json.dumps([company] if company else [])),
+                    )
+                else:
+                    companies = json.loads(row["companies_used_with"])
+                    if company and company not in companies:
+                        companies.append(company)
+                    conn.execute(
+                        """
+                        UPDATE jd_usage SET last_used = ?, usage_count = usage_count + 1, companies_used_with = ?
+                        WHERE user_email = ? AND jd_hash = ?
+                        """,
+                        (now, json.dumps(companies), user_email, jd_hash),
+                    )
+                updated = conn.execute(
+                    "SELECT * FROM jd_usage WHERE user_email = ? AND jd_hash = ?", (user_email, jd_hash)
+                ).fetchone()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            # Our own commits do not bump data_version, so keep the cache in step by hand
+            info = self._row_to_info(updated)
+            self._cache.setdefault(user_email, {})[jd_hash] = info
+            self._stats["writes"] += 1
+            return dict(info)
+
+    def clear_user(self, user_email: str) -> None:
+        """Remove every usage row of a user"""
+        with self._lock:
+            self._user_rows(user_email)
+            self._connection().execute("DELETE FROM jd_usage WHERE user_email = ?", (user_email,))
+            self._cache[user_email] = {}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache hit, load, invalidation and write counters"""
+        with self._lock:
+            return dict(self._stats, cached_users=len(self._cache))
+
+
+class JDUsageTracker:
+    """
+    Tracks JD usage history to determine if a JD has been used before
+    """
+
+    def __init__(self, user_email: str = None, store: Optional[JDUsageStore] = None):
+        self.user_email = user_email or GLOBAL_USER
+        self.store = store or jd_usage_store
+
     @property
-    def usage_data(self) -> Dict[str, Dict]:
-        """Get current usage data"""
-        return self._usage_data
-    
+    def usage_data(self) -> Dict[str, Any]:
+        """Current usage data, in the layout of the legacy JSON file"""
+        return {"jd_usage": self.store.all_for_user(self.user_email), "version": "2.0"}
+
     def _generate_jd_hash(self, jd_url: str, jd_text: str = "") -> str:
         """
         Generate a unique hash for JD identification
@@ -84,43 +272,39 @@ class JDUsageTracker:
             identifier = jd_text.strip()
         else:
             raise ValueError("Either jd_url or jd_text must be provided")
-        
+
         # Generate hash
         return hashlib.md5(identifier.encode('utf-8')).hexdigest()
-    
+
     def is_jd_first_time_usage(self, jd_url: str, jd_text: str = "") -> bool:
         """
         Check if this JD is being used for the first time
-        
+
         Args:
             jd_url: Job description URL
             jd_text: Job description text (fallback if no URL)
-            
+
         Returns:
             True if this is first-time usage, False if JD has been used before
         """
         try:
             jd_hash = self._generate_jd_hash(jd_url, jd_text)
-            
-            if jd_hash in self.usage_data.get("jd_usage", {}):
-                usage_info = self.usage_data["jd_usage"][jd_hash]
-                usage_count = usage_info.get("usage_count", 0)
-                logger.info(f"🔍 [JD_TRACKER] JD hash {jd_hash[:8]}... found with {usage_count} previous uses")
-                # If JD hash exists in usage data, it has been used before (not first time)
+
+            if self.store.contains(self.user_email, jd_hash):
+                logger.info(f"🔍 [JD_TRACKER] JD hash {jd_hash[:8]}... has been used before")
                 return False
-            else:
-                logger.info(f"🆕 [JD_TRACKER] JD hash {jd_hash[:8]}... not found - first time usage")
-                return True
-                
+            logger.info(f"🆕 [JD_TRACKER] JD hash {jd_hash[:8]}... not found - first time usage")
+            return True
+
         except Exception as e:
             logger.error(f"❌ [JD_TRACKER] Error checking JD usage: {e}")
             # Default to first-time usage on error
             return True
-    
+
     def record_jd_usage(self, jd_url: str, jd_text: str = "", company: str = "", job_title: str = ""):
         """
         Record that a JD has been used
-        
+
         Args:
             jd_url: Job description URL
             jd_text: Job description text
@@ -128,75 +312,53 @@ class JDUsageTracker:
             job_title: Job title
         """
         try:
-            logger.info(f"🔍 [JD_TRACKER] Recording JD usage:")
-            logger.info(f"- jd_url: {jd_url}")
-            logger.info(f"- jd_text length: {len(jd_text) if jd_text else 0}")
-            logger.info(f"- company: {company}")
-            logger.info(f"- job_title: {job_title}")
-            
             jd_hash = self._generate_jd_hash(jd_url, jd_text)
-            logger.info(f"- Generated JD hash: {jd_hash}")
-            current_time = datetime.now().isoformat()
-            
-            if jd_hash not in self.usage_data["jd_usage"]:
-                # First time recording this JD
-                self.usage_data["jd_usage"][jd_hash] = {
-                    "jd_url": jd_url,
-                    "jd_text_preview": jd_text[:200] if jd_text else "",
-                    "company": company,
-                    "job_title": job_title,
-                    "first_used": current_time,
-                    "last_used": current_time,
-                    "usage_count": 1,
-                    "companies_used_with": [company] if company else []
-                }
+            info = self.store.record(
+                self.user_email,
+                jd_hash,
+                jd_url=jd_url,
+                jd_text_preview=jd_text[:200] if jd_text else "",
+                company=company,
+                job_title=job_title,
+            )
+            if info["usage_count"] == 1:
                 logger.info(f"📝 [JD_TRACKER] Recorded first usage of JD hash {jd_hash[:8]}... for {company}")
             else:
-                # Update existing record
-                usage_info = self.usage_data["jd_usage"][jd_hash]
-                usage_info["last_used"] = current_time
-                usage_info["usage_count"] = usage_info.get("usage_count", 0) + 1
-                
-                # Add company to list if not already there
-                if company and company not in usage_info.get("companies_used_with", []):
-                    usage_info["companies_used_with"].append(company)
-                
-                logger.info(f"📝 [JD_TRACKER] Updated usage count for JD hash {jd_hash[:8]}... to {usage_info['usage_count']}")
-            
-            # Save the updated data
-            self._save_usage_data()
-            
+                logger.info(f"📝 [JD_TRACKER] Updated usage count for JD hash {jd_hash[:8]}... to {info['usage_count']}")
+
         except Exception as e:
             logger.error(f"❌ [JD_TRACKER] Error recording JD usage: {e}")
-    
+
     def get_jd_usage_info(self, jd_url: str, jd_text: str = "") -> Optional[Dict]:
         """
         Get usage information for a JD
-        
+
         Args:
             jd_url: Job description URL
             jd_text: Job description text
-            
+
         Returns:
             Usage information dict or None if not found
         """
         try:
             jd_hash = self._generate_jd_hash(jd_url, jd_text)
-            return self.usage_data.get("jd_usage", {}).get(jd_hash)
+            return self.store.get(self.user_email, jd_hash)
         except Exception as e:
             logger.error(f"❌ [JD_TRACKER] Error getting JD usage info: {e}")
             return None
-    
+
     def get_all_used_jds(self) -> Dict[str, Dict]:
         """Get all JDs that have been used before"""
-        return self.usage_data.get("jd_usage", {})
-    
+        return self.store.all_for_user(self.user_email)
+
     def clear_usage_history(self):
         """Clear all JD usage history (for testing/reset)"""
-        self.usage_data["jd_usage"] = {}
-        self._save_usage_data()
+        self.store.clear_user(self.user_email)
         logger.info("🗑️ [JD_TRACKER] Cleared JD usage history")
 
 
+# Global JD usage store (shared by all trackers in this process)
+jd_usage_store = JDUsageStore(settings.JD_USAGE_DB_PATH)
+
 # Global singleton instance
 jd_usage_tracker = JDUsageTracker()
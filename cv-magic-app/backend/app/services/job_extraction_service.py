@@ -1,11 +1,13 @@
 import os
 import json
 import re
+import asyncio
+import hashlib
 import httpx
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
-from pathlib import Path
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+from app.utils.artifact_index import artifact_index
 from app.utils.timestamp_utils import TimestampUtils
 
 logger = logging.getLogger(__name__)
@@ -17,13 +19,12 @@ class JobExtractionService:
         from app.utils.user_path_utils import get_user_base_path
         self.user_email = user_email
         self.cv_analysis_dir = get_user_base_path(user_email)
-        self.prompt_file = Path("prompt/job_extraction_prompt.txt")
     
     def _load_prompt(self) -> str:
-        """Load the job extraction prompt from file"""
+        """Load the job extraction prompt from the prompt registry"""
         try:
-            with open(self.prompt_file, 'r', encoding='utf-8') as f:
-                return f.read()
+            from app.ai.prompt_registry import prompt_registry
+            return prompt_registry.text("job_extraction")
         except FileNotFoundError:
             # Fallback prompt if file not found
             return self._get_fallback_prompt()
@@ -530,83 +531,218 @@ TEXT TO ANALYZE:
             if "error" in job_info:
                 return job_info
             
-            # Create company slug for folder name
-            company_slug = self._create_company_slug(job_info["company_name"])
+            result, job_info_data = self._write_job_files(job_info, job_description, job_url, TimestampUtils.get_timestamp())
             
-            # Create company-specific directory under applied_companies subfolder
-            company_dir = self.cv_analysis_dir / "applied_companies" / company_slug
-            company_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Save job_info JSON file with timestamp
-            timestamp = TimestampUtils.get_timestamp()
-            job_info_file = company_dir / f"job_info_{company_slug}_{timestamp}.json"
-            job_info_data = job_info.copy()
-            job_info_data["extracted_at"] = datetime.now().isoformat()
-            if job_url:
-                job_info_data["job_url"] = job_url
-            
-            with open(job_info_file, 'w', encoding='utf-8') as f:
-                json.dump(job_info_data, f, indent=2, ensure_ascii=False)
-            
-            # Save original job description as JSON file with timestamp
-            jd_original_file = company_dir / f"jd_original_{timestamp}.json"
-            with open(jd_original_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "company": job_info['company_name'],
-                    "job_title": job_info['job_title'],
-                    "extracted_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    "length_chars": len(job_description),
-                    "job_url": job_url,
-                    "text": job_description
-                }, f, ensure_ascii=False, indent=2)
-            
-            # Save to shared saved_jobs.json file
+            # Save to the user's saved jobs
             try:
-                from app.utils.user_path_utils import get_user_saved_jobs_path
-                saved_jobs_file = get_user_saved_jobs_path(self.user_email)
-                saved_jobs_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                if saved_jobs_file.exists():
-                    with open(saved_jobs_file, 'r', encoding='utf-8') as f:
-                        saved_jobs_data = json.load(f)
-                else:
-                    saved_jobs_data = {"jobs": [], "last_updated": datetime.now().isoformat(), "total_jobs": 0}
-                
-                # Check if job already exists (by job_url or company_name + job_title)
-                job_exists = False
-                for existing_job in saved_jobs_data["jobs"]:
-                    if (existing_job.get("job_url") == job_url and job_url) or \
-                       (existing_job.get("company_name") == job_info["company_name"] and 
-                        existing_job.get("job_title") == job_info["job_title"]):
-                        job_exists = True
-                        break
-                
-                if not job_exists:
-                    saved_jobs_data["jobs"].append(job_info_data)
-                    saved_jobs_data["last_updated"] = datetime.now().isoformat()
-                    saved_jobs_data["total_jobs"] = len(saved_jobs_data["jobs"])
-                    
-                    with open(saved_jobs_file, 'w', encoding='utf-8') as f:
-                        json.dump(saved_jobs_data, f, indent=2, ensure_ascii=False)
-                    logger.info(f"✅ [JOB_EXTRACTION] Added job to shared jobs file: {job_info.get('job_title')} at {job_info.get('company_name')}")
-                else:
-                    logger.info(f"♻️ [JOB_EXTRACTION] Job already exists in saved_jobs.json: {job_info.get('job_title')} at {job_info.get('company_name')}")
+                await asyncio.to_thread(self._add_to_saved_jobs, [job_info_data])
             except Exception as e:
-                logger.warning(f"⚠️ [JOB_EXTRACTION] Failed to save job to shared jobs file: {e}")
+                logger.warning(f"⚠️ [JOB_EXTRACTION] Failed to add job to saved jobs: {e}")
             
-            return {
-                "success": True,
-                "company_slug": company_slug,
-                "company_name": job_info["company_name"],
-                "job_title": job_info["job_title"],
-                "job_info_file": str(job_info_file),
-                "jd_original_file": str(jd_original_file),
-                "extracted_info": job_info
-            }
+            return result
             
         except Exception as e:
             return {"error": f"Failed to save job analysis: {str(e)}"}
     
+    def _write_job_files(self, job_info: Dict[str, Any], job_description: str, job_url: Optional[str], timestamp: str):
+        """
+        Write the job_info and jd_original files for one extracted job
+        
+        Args:
+            job_info: Extracted job information
+            job_description: The job description text
+            job_url: Optional job posting URL
+            timestamp: Timestamp used in both file names (batches prefix it with a sequence number)
+            
+        Returns:
+            Tuple of (save result for the API, job_info data for saved jobs)
+        """
+        # Create company slug for folder name
+        company_slug = self._create_company_slug(job_info["company_name"])
+        
+        # Create company-specific directory under applied_companies subfolder
+        company_dir = self.cv_analysis_dir / "applied_companies" / company_slug
+        company_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Save job_info JSON file with timestamp
+        job_info_file = company_dir / f"job_info_{company_slug}_{timestamp}.json"
+        job_info_data = job_info.copy()
+        job_info_data["extracted_at"] = datetime.now().isoformat()
+        if job_url:
+            job_info_data["job_url"] = job_url
+        
+        with open(job_info_file, 'w', encoding='utf-8') as f:
+            json.dump(job_info_data, f, indent=2, ensure_ascii=False)
+        artifact_index.record_write(job_info_file)
+        
+        # Save original job description as JSON file with timestamp
+        jd_original_file = company_dir / f"jd_original_{timestamp}.json"
+        with open(jd_original_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "company": job_info['company_name'],
+                "job_title": job_info['job_title'],
+                "extracted_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "length_chars": len(job_description),
+                "job_url": job_url,
+                "text": job_description
+            }, f, ensure_ascii=False, indent=2)
+        
+        result = {
+            "success": True,
+            "company_slug": company_slug,
+            "company_name": job_info["company_name"],
+            "job_title": job_info["job_title"],
+            "job_info_file": str(job_info_file),
+            "jd_original_file": str(jd_original_file),
+            "extracted_info": job_info
+        }
+        return result, job_info_data
+    
+    def _add_to_saved_jobs(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        Add jobs to the user's saved jobs in one transaction
+        
+        Args:
+            jobs: job_info data of the jobs to add
+            
+        Returns:
+            Number of jobs added (jobs with a known URL or company + title are skipped)
+        """
+        from app.services.saved_jobs_store import get_saved_jobs_store
+        # Extracted postings carry no stable URL when pasted, so company + title identify them too
+        added = get_saved_jobs_store(self.user_email).add_if_absent(jobs, match_title=True)
+        logger.info(f"✅ [JOB_EXTRACTION] Added {added} of {len(jobs)} job(s) to saved jobs")
+        return added
+    
+    async def save_job_analyses_batch(
+        self,
+        items: List[Dict[str, Any]],
+        auth_token: Optional[str] = None,
+        user: Any = None,
+        on_progress: Optional[Callable[..., Awaitable[None]]] = None,
+        max_concurrency: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Extract and save many job postings at once
+        
+        URLs are fetched concurrently, duplicates are dropped by normalized URL
+        and by content hash, extraction runs with at most max_concurrency
+        concurrent LLM calls, and saved jobs are added in one transaction at the end.
+        
+        Args:
+            items: [{"job_url": ..., "job_description": ...}], either field optional
+            auth_token: Optional authentication token for AI API calls
+            user: Current user for AI API key context
+            on_progress: Optional async callback receiving index=..., status=... per item update
+            max_concurrency: Maximum concurrent extractions
+            
+        Returns:
+            Summary counts and the per-item results in input order
+        """
+        from app.services.job_scraper import normalize_job_url, scrape_job_description_async
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        
+        async def _report(index: int, status: str, **data: Any) -> None:
+            if status in ("saved", "duplicate", "failed"):
+                results[index] = {"index": index, "status": status, **data}
+            if on_progress:
+                await on_progress(index=index, status=status, **data)
+        
+        # Drop repeated URLs before fetching anything
+        seen_urls: Dict[str, int] = {}
+        pending = []
+        for index, item in enumerate(items):
+            job_url = (item.get("job_url") or "").strip() or None
+            job_description = (item.get("job_description") or "").strip()
+            if not job_url and not job_description:
+                await _report(index, "failed", error="Item needs a job_url or a job_description")
+                continue
+            if job_url:
+                url_key = normalize_job_url(job_url)
+                if url_key in seen_urls:
+                    await _report(index, "duplicate", duplicate_of=seen_urls[url_key], job_url=job_url)
+                    continue
+                seen_urls[url_key] = index
+            pending.append((index, job_url, job_description))
+        
+        async def _fetch(index: int, job_url: Optional[str], job_description: str) -> str:
+            if job_description:
+                return job_description
+            text = await scrape_job_description_async(job_url)
+            if text.startswith("Error") or text.startswith("Unexpected error") or len(text.strip()) < 10:
+                raise ValueError(text or "No job description found at the provided URL")
+            await _report(index, "fetched", job_url=job_url, length=len(text))
+            return text
+        
+        fetched = await asyncio.gather(*(_fetch(*entry) for entry in pending), return_exceptions=True)
+        
+        # Different URLs can serve the same posting: dedupe on the text itself
+        seen_hashes: Dict[str, int] = {}
+        to_extract = []
+        for (index, job_url, _), text in zip(pending, fetched):
+            if isinstance(text, Exception):
+                await _report(index, "failed", job_url=job_url, error=str(text))
+                continue
+            content_hash = hashlib.sha256(" ".join(text.split()).lower().encode("utf-8")).hexdigest()
+            if content_hash in seen_hashes:
+                await _report(index, "duplicate", duplicate_of=seen_hashes[content_hash], job_url=job_url)
+                continue
+            seen_hashes[content_hash] = index
+            to_extract.append((index, job_url, text))
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _extract(index: int, job_description: str) -> Dict[str, Any]:
+            async with semaphore:
+                job_info = await self.extract_job_information(job_description, auth_token, user)
+            if "error" in job_info:
+                raise ValueError(job_info["error"])
+            await _report(index, "extracted", company_name=job_info.get("company_name"), job_title=job_info.get("job_title"))
+            return job_info
+        
+        extracted = await asyncio.gather(*(_extract(index, text) for index, _, text in to_extract), return_exceptions=True)
+        
+        # Jobs of one company saved in the same second would share file names: number them within
+        # this call, keeping the real timestamp last so "latest" lookups still order by it
+        timestamp = TimestampUtils.get_timestamp()
+        sequence = 0
+        written = []
+        for (index, job_url, text), job_info in zip(to_extract, extracted):
+            if isinstance(job_info, Exception):
+                await _report(index, "failed", job_url=job_url, error=str(job_info))
+                continue
+            sequence += 1
+            file_stamp = f"{sequence:03d}_{timestamp}"
+            try:
+                result, job_info_data = await asyncio.to_thread(self._write_job_files, job_info, text, job_url, file_stamp)
+            except Exception as e:
+                await _report(index, "failed", job_url=job_url, error=f"Failed to save job analysis: {e}")
+                continue
+            written.append((index, result, job_info_data))
+        
+        added_to_saved_jobs = 0
+        if written:
+            try:
+                added_to_saved_jobs = await asyncio.to_thread(self._add_to_saved_jobs, [data for _, _, data in written])
+            except Exception as e:
+                logger.warning(f"⚠️ [JOB_EXTRACTION] Failed to add batch to saved jobs: {e}")
+        for index, result, _ in written:
+            await _report(index, "saved", **{k: v for k, v in result.items() if k != "success"})
+        
+        statuses = [result["status"] for result in results if result]
+        summary = {
+            "success": True,
+            "total": len(items),
+            "saved": statuses.count("saved"),
+            "duplicates": statuses.count("duplicate"),
+            "failed": statuses.count("failed"),
+            "added_to_saved_jobs": added_to_saved_jobs,
+            "items": results
+        }
+        logger.info(f"📦 [JOB_EXTRACTION] Batch import: {summary['saved']} saved, {summary['duplicates']} duplicates, {summary['failed']} failed of {len(items)}")
+        return summary
+    
     def list_analyzed_jobs(self) -> Dict[str, Any]:
         """List all analyzed jobs in the cv-analysis directory"""
         try:
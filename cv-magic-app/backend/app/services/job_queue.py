@@ -0,0 +1,555 @@
+"""
+Background Job Queue
+
+SQLite-backed job queue for long-running background work such as the
+post-skill analysis pipeline.
+
+- Bounded worker pool per process, so bursts of analyses cannot oversubscribe
+  LLM quotas
+- Per-user fairness: a user may only hold a limited number of running jobs,
+  and the least recently served user's oldest job is claimed first
+- Retries with exponential backoff for jobs whose handler raises
+- Jobs survive restarts; running jobs whose heartbeat went stale (crashed
+  worker) are put back on the queue
+- Graceful drain on shutdown: stop claiming, wait for running jobs, requeue
+  whatever did not finish in time
+- SQLite calls made by the workers, heartbeat and progress reporting run in a
+  thread via asyncio.to_thread; async callers should do the same for the
+  public methods
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any], "JobContext"], Awaitable[Any]]
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class JobContext:
+    """Per-attempt handle passed to a job handler"""
+
+    def __init__(self, queue: "JobQueue", job_id: str, user_email: str, attempt: int):
+        self._queue = queue
+        self.job_id = job_id
+        self.user_email = user_email
+        self.attempt = attempt
+        self._pending: Optional[Dict[str, Any]] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    def report_progress(self, **progress: Any) -> None:
+        """
+        Persist a progress snapshot visible through the status endpoints
+
+        On the event loop the write happens in a thread; snapshots reported
+        while one is being written collapse into the newest.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._queue._update_progress(self.job_id, progress)
+            return
+        self._pending = progress
+        if self._writer is None or self._writer.done():
+            self._writer = loop.create_task(self._write_pending())
+
+    async def _write_pending(self) -> None:
+        while self._pending is not None:
+            progress, self._pending = self._pending, None
+            await asyncio.to_thread(self._queue._update_progress, self.job_id, progress)
+
+    async def flush(self) -> None:
+        """Wait until the last reported snapshot is stored"""
+        if self._writer is not None:
+            await asyncio.gather(self._writer, return_exceptions=True)
+
+
+class JobQueue:
+    """
+    Persistent job queue with a bounded pool of asyncio workers.
+
+    Handlers are registered per job kind and receive the JSON payload the job
+    was enqueued with plus a JobContext for progress reporting.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        workers: int = 2,
+        max_running_per_user: int = 1,
+        max_attempts: int = 3,
+        retry_base_seconds: float = 5.0,
+        retry_max_seconds: float = 300.0,
+        heartbeat_seconds: float = 30.0,
+        stale_after_seconds: float = 120.0,
+        poll_seconds: float = 1.0,
+        retention_seconds: int = 7 * 24 * 3600,
+    ):
+        self.db_path = Path(db_path)
+        self.workers = workers
+        self.max_running_per_user = max_running_per_user
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_after_seconds = stale_after_seconds
+        self.poll_seconds = poll_seconds
+        self.retention_seconds = retention_seconds
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._running: Dict[str, asyncio.Task] = {}
+        self._accepting = False
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    user_email TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    dedupe_key TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    run_after REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    heartbeat_at REAL,
+                    worker_id TEXT,
+                    progress TEXT,
+                    result TEXT,
+                    error TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status_run_after ON jobs (status, run_after)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_user_status ON jobs (user_email, status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs (dedupe_key, status)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Register the coroutine that executes jobs of a given kind"""
+        self._handlers[kind] = handler
+
+    def _wake(self) -> None:
+        """Wake an idle worker; safe to call from any thread"""
+        if self._wakeup is None or self._loop is None:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._wakeup.set()
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Loop already closed; the next start() polls the queue anyway
+            pass
+
+    def enqueue(
+        self,
+        kind: str,
+        user_email: str,
+        payload: Dict[str, Any],
+        dedupe_key: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+    ) -> str:
+        """
+        Persist a job and wake a worker
+
+        Args:
+            kind: Registered handler name
+            user_email: Owner of the job (used for fairness and access checks)
+            payload: JSON-serializable handler arguments
+            dedupe_key: If a job with this key is still queued, return it instead of adding another
+            max_attempts: Override the queue-wide retry budget
+
+        Returns:
+            The job id
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            if dedupe_key:
+                row = conn.execute(
+                    "SELECT job_id FROM jobs WHERE dedupe_key = ? AND status = ? LIMIT 1",
+                    (dedupe_key, QUEUED),
+                ).fetchone()
+                if row is not None:
+                    logger.info(f"🔗 [JOB_QUEUE] Reusing queued job {row['job_id']} for {kind}")
+                    return row["job_id"]
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                """
+                INSERT INTO jobs (job_id, kind, user_email, payload, status, dedupe_key, max_attempts, run_after, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    job_id,
+                    kind,
+                    user_email,
+                    json.dumps(payload, default=str, ensure_ascii=False),
+                    QUEUED,
+                    dedupe_key,
+                    max_attempts or self.max_attempts,
+                    now,
+                    now,
+                ),
+            )
+            conn.commit()
+        logger.info(f"📥 [JOB_QUEUE] Enqueued {kind} job {job_id} for {user_email}")
+        self._wake()
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's status record, or None if unknown"""
+        with self._lock:
+            row = self._connection().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row_to_dict(row) if row is not None else None
+
+    def list_jobs(self, user_email: str, status: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return a user's most recent jobs, optionally filtered by status"""
+        query = "SELECT * FROM jobs WHERE user_email = ?"
+        params: List[Any] = [user_email]
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._connection().execute(query, params).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet"""
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE job_id = ? AND status = ?",
+                (CANCELLED, time.time(), job_id, QUEUED),
+            )
+            conn.commit()
+        return cursor.rowcount == 1
+
+    def get_stats(self, user_email: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return job counts per status and this process's worker state
+
+        With user_email, counts cover only that user's jobs and the per-process
+        running count (which spans all users) is left out.
+        """
+        with self._lock:
+            if user_email is None:
+                rows = self._connection().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+            else:
+                rows = self._connection().execute(
+                    "SELECT status, COUNT(*) AS n FROM jobs WHERE user_email = ? GROUP BY status", (user_email,)
+                ).fetchall()
+        stats = {
+            "counts": {row["status"]: row["n"] for row in rows},
+            "workers": len(self._worker_tasks),
+            "accepting": self._accepting,
+        }
+        if user_email is None:
+            stats["running_here"] = len(self._running)
+        return stats
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        for field in ("payload", "progress", "result"):
+            if job.get(field):
+                try:
+                    job[field] = json.loads(job[field])
+                except (TypeError, ValueError):
+                    pass
+        job.pop("dedupe_key", None)
+        job.pop("worker_id", None)
+        return job
+
+    def _claim_next(self) -> Optional[sqlite3.Row]:
+        """Atomically move the fairest eligible job from queued to running"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            # Users with fewer running jobs first, then the least recently served user,
+            # then the oldest job; users at their running cap are skipped entirely
+            candidates = conn.execute(
+                """
+                SELECT j.job_id FROM jobs j
+                WHERE j.status = ? AND j.run_after <= ?
+                  AND (SELECT COUNT(*) FROM jobs r WHERE r.user_email = j.user_email AND r.status = ?) < ?
+                ORDER BY
+                  (SELECT COUNT(*) FROM jobs r WHERE r.user_email = j.user_email AND r.status = ?) ASC,
+                  COALESCE((SELECT MAX(s.started_at) FROM jobs s WHERE s.user_email = j.user_email), 0) ASC,
+                  j.created_at ASC
+                LIMIT 5
+                """,
+                (QUEUED, now, RUNNING, self.max_running_per_user, RUNNING),
+            ).fetchall()
+            for candidate in candidates:
+                cursor = conn.execute(
+                    """
+                    UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, heartbeat_at = ?, worker_id = ?
+                    WHERE job_id = ? AND status = ?
+                    """,
+                    (RUNNING, now, now, self.worker_id, candidate["job_id"], QUEUED),
+                )
+                if cursor.rowcount == 1:
+                    conn.commit()
+                    return conn.execute("SELECT * FROM jobs WHERE job_id = ?", (candidate["job_id"],)).fetchone()
+            conn.commit()
+        return None
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE job_id = ?",
+                (status, time.time(), json.dumps(result, default=str) if result is not None else None, error, job_id),
+            )
+            conn.commit()
+
+    def _retry_later(self, job_id: str, attempt: int, error: str) -> float:
+        delay = min(self.retry_max_seconds, self.retry_base_seconds * (2 ** (attempt - 1)))
+        delay *= random.uniform(0.8, 1.2)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "UPDATE jobs SET status = ?, run_after = ?, error = ?, worker_id = NULL WHERE job_id = ?",
+                (QUEUED, time.time() + delay, error, job_id),
+            )
+            conn.commit()
+        return delay
+
+    def _requeue(self, job_id: str) -> None:
+        """Return an interrupted job to the queue without charging the attempt"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0), run_after = ?, worker_id = NULL WHERE job_id = ?",
+                (QUEUED, time.time(), job_id),
+            )
+            conn.commit()
+
+    def _update_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "UPDATE jobs SET progress = ?, heartbeat_at = ? WHERE job_id = ?",
+                    (json.dumps(progress, default=str), time.time(), job_id),
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ [JOB_QUEUE] Failed to record progress for {job_id}: {e}")
+
+    def _heartbeat(self, ids: List[str]) -> None:
+        if not ids:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "UPDATE jobs SET heartbeat_at = ? WHERE job_id = ? AND worker_id = ?",
+                [(time.time(), job_id, self.worker_id) for job_id in ids],
+            )
+            conn.commit()
+
+    def _maintenance(self) -> None:
+        """Requeue jobs orphaned by dead workers and prune old finished jobs"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            stale_before = now - self.stale_after_seconds
+            # A job that keeps killing its worker must not be reclaimed forever
+            exhausted = conn.execute(
+                """
+                UPDATE jobs SET status = ?, finished_at = ?, worker_id = NULL,
+                    error = 'Worker stopped responding on the final attempt'
+                WHERE status = ? AND COALESCE(heartbeat_at, started_at, 0) < ? AND attempts >= max_attempts
+                """,
+                (FAILED, now, RUNNING, stale_before),
+            ).rowcount
+            orphaned = conn.execute(
+                """
+                UPDATE jobs SET status = ?, run_after = ?, worker_id = NULL
+                WHERE status = ? AND COALESCE(heartbeat_at, started_at, 0) < ?
+                """,
+                (QUEUED, now, RUNNING, stale_before),
+            ).rowcount
+            if self.retention_seconds:
+                conn.execute(
+                    "DELETE FROM jobs WHERE status IN (?, ?, ?) AND finished_at < ?",
+                    (SUCCEEDED, FAILED, CANCELLED, now - self.retention_seconds),
+                )
+            conn.commit()
+        if exhausted:
+            logger.error(f"❌ [JOB_QUEUE] Failed {exhausted} job(s) whose worker died on their final attempt")
+        if orphaned:
+            logger.warning(f"♻️ [JOB_QUEUE] Requeued {orphaned} job(s) with stale heartbeats")
+            self._wake()
+
+    async def _heartbeat_loop(self) -> None:
+        while self._accepting:
+            try:
+                await asyncio.to_thread(self._heartbeat, list(self._running))
+                await asyncio.to_thread(self._maintenance)
+            except Exception as e:
+                logger.warning(f"⚠️ [JOB_QUEUE] Heartbeat failed: {e}")
+            await asyncio.sleep(self.heartbeat_seconds)
+
+    async def _execute(self, row: sqlite3.Row) -> None:
+        job_id, kind, attempt = row["job_id"], row["kind"], row["attempts"]
+        handler = self._handlers.get(kind)
+        if handler is None:
+            logger.error(f"❌ [JOB_QUEUE] No handler registered for job kind '{kind}'")
+            await asyncio.to_thread(self._finish, job_id, FAILED, error=f"No handler registered for job kind '{kind}'")
+            return
+
+        logger.info(f"▶️ [JOB_QUEUE] Running {kind} job {job_id} (attempt {attempt}/{row['max_attempts']})")
+        context = JobContext(self, job_id, row["user_email"], attempt)
+        try:
+            result = await handler(json.loads(row["payload"]), context)
+            await context.flush()
+        except asyncio.CancelledError:
+            logger.warning(f"⏸️ [JOB_QUEUE] Job {job_id} interrupted; returning it to the queue")
+            await asyncio.to_thread(self._requeue, job_id)
+            raise
+        except Exception as e:
+            await context.flush()
+            error = f"{type(e).__name__}: {e}"
+            if attempt < row["max_attempts"]:
+                delay = await asyncio.to_thread(self._retry_later, job_id, attempt, error)
+                logger.warning(f"🔁 [JOB_QUEUE] Job {job_id} failed ({error}); retrying in {delay:.0f}s")
+            else:
+                await asyncio.to_thread(self._finish, job_id, FAILED, error=error)
+                logger.error(f"❌ [JOB_QUEUE] Job {job_id} failed permanently after {attempt} attempt(s): {error}")
+            return
+
+        await asyncio.to_thread(self._finish, job_id, SUCCEEDED, result=result)
+        logger.info(f"✅ [JOB_QUEUE] Job {job_id} succeeded")
+
+    async def _worker_loop(self, index: int) -> None:
+        while self._accepting:
+            # Clear before polling so a wakeup arriving during the poll is not lost
+            self._wakeup.clear()
+            try:
+                row = await asyncio.to_thread(self._claim_next)
+            except Exception as e:
+                logger.error(f"❌ [JOB_QUEUE] Worker {index} failed to poll the queue: {e}")
+                row = None
+
+            if row is not None and not self._accepting:
+                # Drain started while this worker was polling; leave the job for the next start
+                await asyncio.to_thread(self._requeue, row["job_id"])
+                break
+
+            if row is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._execute(row))
+            self._running[row["job_id"]] = task
+            try:
+                # Shield so drain can decide whether to wait for or cancel the job
+                await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.done():
+                    raise
+            except Exception as e:
+                logger.error(f"❌ [JOB_QUEUE] Worker {index} crashed running {row['job_id']}: {e}")
+            finally:
+                self._running.pop(row["job_id"], None)
+            # Let other users' jobs get a turn before this worker polls again
+            self._wakeup.set()
+
+    def start(self) -> None:
+        """Start the worker pool on the running event loop"""
+        if self._worker_tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._accepting = True
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        self._worker_tasks = [asyncio.create_task(self._worker_loop(i)) for i in range(self.workers)]
+        logger.info(f"🚀 [JOB_QUEUE] Started {self.workers} worker(s) ({self.worker_id})")
+
+    async def drain(self, timeout: float = 30.0) -> None:
+        """
+        Stop claiming new jobs and wait for running ones to finish
+
+        Jobs still running after the timeout are cancelled and returned to the
+        queue, so they resume on the next start.
+        """
+        if not self._worker_tasks:
+            return
+        self._accepting = False
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+        running = list(self._running.values())
+        if running:
+            logger.info(f"⏳ [JOB_QUEUE] Draining {len(running)} running job(s) (timeout {timeout:.0f}s)")
+            _, pending = await asyncio.wait(running, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                logger.warning(f"⏹️ [JOB_QUEUE] Requeued {len(pending)} unfinished job(s)")
+
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._heartbeat_task, return_exceptions=True)
+            self._heartbeat_task = None
+        logger.info("✅ [JOB_QUEUE] Drained")
+
+
+# Global job queue instance
+job_queue = JobQueue(
+    db_path=settings.JOB_QUEUE_PATH,
+    workers=settings.JOB_QUEUE_WORKERS,
+    max_running_per_user=settings.JOB_QUEUE_MAX_RUNNING_PER_USER,
+    max_attempts=settings.JOB_QUEUE_MAX_ATTEMPTS,
+    retry_base_seconds=settings.JOB_QUEUE_RETRY_BASE_SECONDS,
+)
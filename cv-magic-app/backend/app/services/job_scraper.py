@@ -2,7 +2,85 @@ import requests
 from bs4 import BeautifulSoup
 import re
 import asyncio
-from typing import Optional
+import hashlib
+import json
+import logging
+import importlib.util
+import multiprocessing
+import os
+import tempfile
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from app.config import settings
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Parser backend for BeautifulSoup
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+
+def _request_headers(url: str) -> Dict[str, str]:
+    """Browser-like request headers, with the extra ones Seek expects"""
+    headers = {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/91.0.4472.124 Safari/537.36"
+        ),
+    }
+    
+    # Add Seek-specific headers
+    if 'seek.com.au' in url:
+        headers["Referer"] = "https://www.seek.com.au/"
+        headers["Sec-Fetch-Dest"] = "document"
+        headers["Sec-Fetch-Mode"] = "navigate"
+        headers["Sec-Fetch-Site"] = "same-origin"
+    return headers
+
+
+def _parse_job_page(url: str, html: str) -> str:
+    """
+    Parse a job page with the site-specific extractor.
+    
+    Top-level (picklable) so it can run in the parser process pool.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    if 'ethicaljobs.com.au' in url:
+        return scrape_ethicaljobs(soup)
+    elif 'seek.com.au' in url:
+        return scrape_seek(soup)
+    else:
+        return scrape_generic(soup)
+
+
+def _scrape_external_context(url: str, external_context: Optional[list]) -> Optional[str]:
+    """Extract the job description from caller-supplied page content, if it has enough of it"""
+    if not external_context:
+        return None
+    combined_content = []
+    for doc in external_context:
+        if isinstance(doc, dict) and doc.get('source', {}).get('id') == url:
+            content = doc.get('content', '')
+            if content and isinstance(content, str):
+                combined_content.append(content)
+    
+    if combined_content:
+        # Combine all content sections and clean up
+        combined_text = ' '.join(combined_content)
+        result = _parse_job_page(url, combined_text)
+        if result and len(result.strip()) > 100:
+            return result
+    return None
+
 
 def scrape_job_description(url: str, external_context: list = None) -> str:
     """
@@ -17,62 +95,16 @@ def scrape_job_description(url: str, external_context: list = None) -> str:
     """
     try:
         # First try to extract from external context if available
-        if external_context:
-            combined_content = []
-            for doc in external_context:
-                if isinstance(doc, dict) and doc.get('source', {}).get('id') == url:
-                    content = doc.get('content', '')
-                    if content and isinstance(content, str):
-                        combined_content.append(content)
-            
-            if combined_content:
-                # Combine all content sections and clean up
-                combined_text = ' '.join(combined_content)
-                # Create a soup object from the combined text for consistent processing
-                soup = BeautifulSoup(combined_text, 'html.parser')
-                # Use site-specific extraction
-                if 'ethicaljobs.com.au' in url:
-                    result = scrape_ethicaljobs(soup)
-                    if result and len(result.strip()) > 100:
-                        return result
-                elif 'seek.com.au' in url:
-                    result = scrape_seek(soup)
-                    if result and len(result.strip()) > 100:
-                        return result
-                else:
-                    result = scrape_generic(soup)
-                    if result and len(result.strip()) > 100:
-                        return result
+        result = _scrape_external_context(url, external_context)
+        if result:
+            return result
         
         # If no valid content from external context, try scraping the URL
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/91.0.4472.124 Safari/537.36"
-            ),
-        }
-        
-        # Add Seek-specific headers
-        if 'seek.com.au' in url:
-            headers["Referer"] = "https://www.seek.com.au/"
-            headers["Sec-Fetch-Dest"] = "document"
-            headers["Sec-Fetch-Mode"] = "navigate"
-            headers["Sec-Fetch-Site"] = "same-origin"
-
         # Add timeout to prevent hanging requests
-        response = requests.get(url, headers=headers, timeout=30)
+        response = requests.get(url, headers=_request_headers(url), timeout=30)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Site-specific extraction
-        if 'ethicaljobs.com.au' in url:
-            return scrape_ethicaljobs(soup)
-        elif 'seek.com.au' in url:
-            return scrape_seek(soup)
-        else:
-            return scrape_generic(soup)
+        return _parse_job_page(url, response.text)
 
     except requests.exceptions.Timeout:
         return f"Error: Request timed out while fetching job description from {url}"
@@ -668,19 +700,285 @@ def final_cleanup(text: str) -> str:
     return text
 
 
-async def scrape_job_description_async(url: str, external_context: list = None) -> str:
+def _atomic_write_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class JobPageCache:
+    """
+    On-disk cache of fetched job pages, keyed by URL.
+    
+    Each entry keeps the raw HTML, the validators needed for a conditional
+    re-fetch (ETag / Last-Modified) and the parsed job description, so a
+    saved job can be re-analysed without refetching or reparsing the page.
+    """
+    
+    def __init__(self, cache_dir: str, ttl_seconds: int = 24 * 3600):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+    
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.html", self.cache_dir / f"{key}.json"
+    
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached metadata (validators, parsed text, fetch time) for a URL"""
+        _, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("url") == url else None
+    
+    def load_html(self, url: str) -> Optional[str]:
+        """Cached raw HTML for a URL"""
+        html_path, _ = self._paths(url)
+        try:
+            return html_path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+    
+    def is_fresh(self, meta: Dict[str, Any]) -> bool:
+        """Whether an entry can be served without revalidating with the site"""
+        return time.time() - meta.get("fetched_at", 0) < self.ttl_seconds
+    
+    def store(self, url: str, html: Optional[str], meta: Dict[str, Any]) -> None:
+        """Write an entry; html=None keeps the cached page (after a 304)"""
+        html_path, meta_path = self._paths(url)
+        if html is not None:
+            _atomic_write_text(html_path, html)
+        _atomic_write_text(meta_path, json.dumps(dict(meta, url=url), ensure_ascii=False))
+
+
+class _LoopClients:
+    """HTTP client and per-host limiters owned by a single event loop"""
+    
+    def __init__(self):
+        self.client: Optional[httpx.AsyncClient] = None
+        self.host_limits: Dict[str, asyncio.Semaphore] = {}
+
+
+class JobPageFetcher:
+    """
+    Async job description fetcher.
+    
+    - one pooled keep-alive httpx client per event loop
+    - at most `max_per_host` concurrent requests to any one site
+    - conditional re-fetches (If-None-Match / If-Modified-Since) against the page cache
+    - HTML parsing in a process pool, off the event loop and the GIL
+    - concurrent requests for the same URL share one fetch
+    """
+    
+    def __init__(
+        self,
+        cache: JobPageCache,
+        max_per_host: int = 2,
+        max_connections: int = 20,
+        timeout: float = 30.0,
+        parse_workers: int = 2,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.cache = cache
+        self.max_per_host = max_per_host
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.parse_workers = parse_workers
+        self.transport = transport  # e.g. httpx.MockTransport as a local HTTP stand-in
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients]" = weakref.WeakKeyDictionary()
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._single_flight = SingleFlight("job_page_single_flight")
+        self._stats = {"cache_hits": 0, "revalidated": 0, "fetched": 0, "parsed": 0}
+    
+    def _loop_clients(self) -> _LoopClients:
+        loop = asyncio.get_running_loop()
+        clients = self._loops.get(loop)
+        if clients is None:
+            clients = _LoopClients()
+            self._loops[loop] = clients
+        if clients.client is None or clients.client.is_closed:
+            clients.client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 10.0)),
+                follow_redirects=True,
+                transport=self.transport,
+            )
+        return clients
+    
+    def _host_limit(self, clients: _LoopClients, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        semaphore = clients.host_limits.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_per_host)
+            clients.host_limits[host] = semaphore
+        return semaphore
+    
+    async def _parse(self, url: str, html: str) -> str:
+        loop = asyncio.get_running_loop()
+        self._stats["parsed"] += 1
+        if self.parse_workers <= 0:
+            return await asyncio.to_thread(_parse_job_page, url, html)
+        if self._parse_pool is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        pool = self._parse_pool
+        try:
+            return await loop.run_in_executor(pool, _parse_job_page, url, html)
+        except BrokenProcessPool:
+            logger.warning("⚠️ [JOB_SCRAPER] Parser pool broke; recreating it and parsing in a thread")
+            # Concurrent parses see the same broken pool; only the first replaces it
+            if self._parse_pool is pool:
+                self._parse_pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+            return await asyncio.to_thread(_parse_job_page, url, html)
+    
+    async def fetch(self, url: str, force_refresh: bool = False) -> str:
+        """
+        Job description text for a URL, served from cache when possible
+        
+        Args:
+            url: The URL of the job posting
+            force_refresh: Revalidate with the site even if the cached entry is fresh
+            
+        Returns:
+            Extracted job description text
+            
+        Raises:
+            httpx.HTTPError: If the page cannot be fetched
+        """
+        meta = await asyncio.to_thread(self.cache.load, url)
+        if meta and meta.get("text") and not force_refresh and self.cache.is_fresh(meta):
+            self._stats["cache_hits"] += 1
+            return meta["text"]
+        return await self._single_flight.do(SingleFlight.make_key("job_page", url), lambda: self._fetch_and_parse(url, meta))
+    
+    async def _fetch_and_parse(self, url: str, meta: Optional[Dict[str, Any]]) -> str:
+        headers = _request_headers(url)
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        
+        clients = self._loop_clients()
+        async with self._host_limit(clients, url):
+            response = await clients.client.get(url, headers=headers)
+        
+        if response.status_code == 304 and meta:
+            # Page unchanged: reuse the parsed text (or reparse the cached HTML)
+            self._stats["revalidated"] += 1
+            text = meta.get("text")
+            html = None
+            if not text:
+                html = await asyncio.to_thread(self.cache.load_html, url)
+                if html is None:
+                    # Cache lost its page; fetch it unconditionally
+                    return await self._fetch_and_parse(url, None)
+                text = await self._parse(url, html)
+            await asyncio.to_thread(self.cache.store, url, None, dict(meta, text=text, fetched_at=time.time()))
+            return text
+        
+        response.raise_for_status()
+        self._stats["fetched"] += 1
+        html = response.text
+        text = await self._parse(url, html)
+        entry = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            # Extraction failures are reparsed next time rather than served from cache
+            "text": None if text.startswith("Error") else text,
+        }
+        await asyncio.to_thread(self.cache.store, url, html, entry)
+        return text
+    
+    async def aclose(self) -> None:
+        """Close the running loop's client and shut down the parser pool"""
+        clients = self._loops.pop(asyncio.get_running_loop(), None)
+        if clients and clients.client is not None:
+            await clients.client.aclose()
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
+            self._parse_pool = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache hit, revalidation, fetch and parse counters"""
+        return dict(self._stats)
+
+
+# Global job page fetcher instance
+job_page_fetcher = JobPageFetcher(
+    cache=JobPageCache(settings.JOB_SCRAPER_CACHE_DIR, ttl_seconds=settings.JOB_SCRAPER_CACHE_TTL_SECONDS),
+    max_per_host=settings.JOB_SCRAPER_MAX_PER_HOST,
+    max_connections=settings.JOB_SCRAPER_MAX_CONNECTIONS,
+    timeout=settings.JOB_SCRAPER_TIMEOUT_SECONDS,
+    parse_workers=settings.JOB_SCRAPER_PARSE_WORKERS,
+)
+
+
+async def scrape_job_description_async(url: str, external_context: list = None, force_refresh: bool = False) -> str:
     """
-    Async wrapper for job description scraping.
+    Async job description scraping with pooled connections and a page cache.
     
     Args:
         url: The URL of the job posting
         external_context: Optional list of external context documents
+        force_refresh: Revalidate the page with the site even if it was fetched recently
         
     Returns:
         Extracted job description text
     """
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, lambda: scrape_job_description(url, external_context))
+    try:
+        if external_context:
+            result = await asyncio.to_thread(_scrape_external_context, url, external_context)
+            if result:
+                return result
+        return await job_page_fetcher.fetch(url, force_refresh=force_refresh)
+    except httpx.TimeoutException:
+        return f"Error: Request timed out while fetching job description from {url}"
+    except httpx.ConnectError:
+        return f"Error: Connection failed while fetching job description from {url}"
+    except httpx.HTTPError as e:
+        return f"Error fetching job description: {str(e)}"
+    except Exception as e:
+        return f"Unexpected error while scraping job description: {str(e)}"
+
+
+_TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "trk", "trackingid", "refid", "ref", "tracking_id"}
+
+
+def normalize_job_url(url: str) -> str:
+    """
+    Canonical form of a job URL for de-duplication.
+    
+    Lowercases scheme and host, drops default ports, fragments, tracking
+    parameters (utm_*, gclid, ...) and trailing slashes, and sorts the
+    remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not (scheme == "http" and parts.port == 80) and not (scheme == "https" and parts.port == 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
 
 
 def is_valid_job_url(url: str) -> bool:
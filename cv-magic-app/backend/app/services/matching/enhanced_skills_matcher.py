@@ -14,6 +14,17 @@ from dataclasses import dataclass
 from enum import Enum
 import re
 
+from app.services.matching.skill_knowledge_base import (
+    SOFT_SKILLS_MAP,
+    TECHNICAL_SKILLS_MAP,
+    INDUSTRY_DOMAIN_CLUSTERS,
+    LEARNABLE_SKILLS,
+    SOFT_SKILLS_EQUIVALENTS,
+    TECHNICAL_SKILLS_EQUIVALENTS,
+    INDUSTRY_DOMAIN_INDEX,
+    LEARNABLE_SOURCE_INDEX,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,181 +66,29 @@ class EnhancedSkillsMatcher:
         self._initialize_transferable_mappings()
     
     def _initialize_skill_mappings(self):
-        """Initialize semantic skill equivalence mappings"""
-        
-        # Soft Skills Semantic Equivalence
-        self.soft_skills_map = {
-            # Organization & Planning
-            "organized": ["organised", "task management", "time management", "planning", "project planning", "workflow management"],
-            "task management": ["organized", "organised", "multitasking", "prioritization", "time management"],
-            "time management": ["organized", "organised", "task management", "scheduling", "planning"],
-            "multitasking": ["task management", "organized", "juggling priorities", "parallel processing"],
-            "prioritization": ["task management", "organized", "decision making", "strategic thinking"],
-            
-            # Communication
-            "communication": ["written communication", "verbal communication", "presentation", "public speaking", "interpersonal skills"],
-            "presentation": ["public speaking", "communication", "stakeholder engagement", "reporting"],
-            "stakeholder engagement": ["communication", "relationship building", "client management", "presentation"],
-            "collaboration": ["teamwork", "cross-functional collaboration", "partnership", "cooperation"],
-            "teamwork": ["collaboration", "team player", "cross-functional collaboration"],
-            
-            # Leadership & Management
-            "leadership": ["team leadership", "people management", "mentoring", "coaching", "strategic leadership"],
-            "management": ["people management", "team management", "leadership", "supervision"],
-            "mentoring": ["coaching", "leadership", "training", "knowledge transfer"],
-            "coaching": ["mentoring", "leadership", "training", "development"],
-            
-            # Problem Solving & Analysis
-            "problem solving": ["analytical thinking", "troubleshooting", "critical thinking", "solution design"],
-            "analytical thinking": ["problem solving", "data analysis", "critical thinking", "research"],
-            "critical thinking": ["analytical thinking", "problem solving", "decision making", "evaluation"],
-            "research": ["analytical thinking", "investigation", "data gathering", "analysis"],
-            
-            # Adaptability & Learning
-            "adaptability": ["flexibility", "change management", "learning agility", "resilience"],
-            "flexibility": ["adaptability", "change management", "agility", "versatility"],
-            "learning agility": ["adaptability", "continuous learning", "quick learner", "upskilling"],
-            "continuous learning": ["learning agility", "professional development", "upskilling", "growth mindset"]
-        }
-        
-        # Technical Skills Semantic Equivalence
-        self.technical_skills_map = {
-            # Programming Languages
-            "javascript": ["js", "node.js", "nodejs", "ecmascript"],
-            "typescript": ["ts", "javascript", "js"],
-            "python": ["py", "python3", "django", "flask", "fastapi"],
-            
-            # Data & Analytics
-            "excel": ["microsoft excel", "spreadsheets", "vba", "pivot tables", "vlookup"],
-            "vba": ["excel", "microsoft excel", "excel automation", "macros"],
-            "sql": ["mysql", "postgresql", "database", "queries", "data analysis"],
-            "data analysis": ["analytics", "data analytics", "statistical analysis", "sql", "excel"],
-            "tableau": ["data visualization", "dashboard", "reporting", "analytics"],
-            "power bi": ["powerbi", "data visualization", "dashboard", "microsoft bi"],
-            
-            # Cloud & Infrastructure
-            "aws": ["amazon web services", "cloud computing", "ec2", "s3"],
-            "azure": ["microsoft azure", "cloud computing", "cloud services"],
-            "docker": ["containerization", "containers", "devops"],
-            "kubernetes": ["k8s", "container orchestration", "devops"],
-            
-            # Frameworks & Libraries
-            "react": ["reactjs", "javascript", "frontend", "ui development"],
-            "angular": ["angularjs", "typescript", "frontend", "spa"],
-            "django": ["python", "web framework", "backend"],
-            "flask": ["python", "web framework", "microservices"],
-            
-            # Tools & Platforms
-            "git": ["version control", "source control", "github", "gitlab"],
-            "github": ["git", "version control", "collaboration", "code repository"],
-            "jira": ["project management", "issue tracking", "agile", "scrum"],
-            "confluence": ["documentation", "wiki", "knowledge management"],
-        }
+        """Attach the shared semantic skill equivalence mappings"""
+        self.soft_skills_map = SOFT_SKILLS_MAP
+        self.technical_skills_map = TECHNICAL_SKILLS_MAP
     
     def _initialize_domain_clusters(self):
-        """Initialize domain clusters for related field matching"""
-        
-        self.domain_clusters = {
-            "data_and_analytics": [
-                "data science", "data analysis", "data analytics", "business intelligence", 
-                "machine learning", "ai", "artificial intelligence", "statistics", 
-                "quantitative analysis", "data engineering", "big data", "data visualization"
-            ],
-            "software_development": [
-                "software engineering", "web development", "full stack development", 
-                "frontend development", "backend development", "mobile development",
-                "application development", "programming", "coding", "software design"
-            ],
-            "cloud_and_devops": [
-                "cloud computing", "devops", "infrastructure", "system administration",
-                "site reliability engineering", "platform engineering", "automation",
-                "containerization", "microservices", "cicd"
-            ],
-            "project_management": [
-                "project management", "program management", "agile", "scrum", "kanban",
-                "product management", "delivery management", "pmo", "portfolio management"
-            ],
-            "finance_and_accounting": [
-                "finance", "accounting", "financial analysis", "investment", "banking",
-                "financial planning", "budgeting", "treasury", "risk management", "audit"
-            ],
-            "marketing_and_sales": [
-                "marketing", "digital marketing", "sales", "business development",
-                "customer acquisition", "lead generation", "brand management", "advertising"
-            ],
-            "nonprofit_and_social": [
-                "nonprofit", "non-profit", "ngo", "fundraising", "social impact",
-                "community development", "humanitarian", "charity", "philanthropy"
-            ],
-            "consulting_and_strategy": [
-                "consulting", "strategy", "business strategy", "management consulting",
-                "strategic planning", "transformation", "change management"
-            ]
-        }
+        """Attach the shared domain clusters for related field matching"""
+        self.domain_clusters = INDUSTRY_DOMAIN_CLUSTERS
     
     def _initialize_transferable_mappings(self):
-        """Initialize transferable and learnable skill mappings"""
-        
-        self.transferable_skills = {
-            # Excel experience suggests VBA capability
-            "vba": {
-                "source_skills": ["excel", "microsoft excel", "spreadsheet automation", "macros"],
-                "learnability": 0.8,  # High - if you know Excel well, VBA is learnable
-                "description": "VBA is learnable with strong Excel background"
-            },
-            
-            # SQL knowledge suggests database skills
-            "database administration": {
-                "source_skills": ["sql", "mysql", "postgresql", "database design"],
-                "learnability": 0.7,
-                "description": "Database administration builds on SQL knowledge"
-            },
-            
-            # Programming language transferability
-            "typescript": {
-                "source_skills": ["javascript", "java", "c#", "programming"],
-                "learnability": 0.9,  # Very high for JS developers
-                "description": "TypeScript is highly learnable for JavaScript developers"
-            },
-            
-            "python": {
-                "source_skills": ["java", "c++", "c#", "javascript", "programming"],
-                "learnability": 0.8,
-                "description": "Python is learnable for experienced programmers"
-            },
-            
-            # Cloud platform transferability
-            "azure": {
-                "source_skills": ["aws", "google cloud", "cloud computing"],
-                "learnability": 0.7,
-                "description": "Cloud platforms share similar concepts"
-            },
-            
-            "aws": {
-                "source_skills": ["azure", "google cloud", "cloud computing"],
-                "learnability": 0.7,
-                "description": "Cloud platforms share similar concepts"
-            },
-            
-            # Project management tools
-            "jira": {
-                "source_skills": ["asana", "trello", "monday.com", "project management"],
-                "learnability": 0.9,
-                "description": "Project management tools have similar workflows"
-            }
-        }
+        """Attach the shared transferable and learnable skill mappings"""
+        self.transferable_skills = LEARNABLE_SKILLS
     
     def _find_semantic_matches(self, cv_skill: str, jd_skills: List[str], skill_type: SkillType) -> List[SkillMatch]:
         """Find semantic matches for a CV skill against JD skills"""
         matches = []
         cv_skill_lower = cv_skill.lower().strip()
         
-        # Choose appropriate mapping
+        # Choose appropriate mapping (precompiled lowercase equivalence sets)
         skill_map = {}
         if skill_type == SkillType.SOFT:
-            skill_map = self.soft_skills_map
+            skill_map = SOFT_SKILLS_EQUIVALENTS
         elif skill_type == SkillType.TECHNICAL:
-            skill_map = self.technical_skills_map
+            skill_map = TECHNICAL_SKILLS_EQUIVALENTS
         
         # Check for exact matches first
         for jd_skill in jd_skills:
@@ -249,8 +108,7 @@ class EnhancedSkillsMatcher:
             
             # Check if CV skill maps to JD skill
             if cv_skill_lower in skill_map:
-                equivalent_skills = [s.lower() for s in skill_map[cv_skill_lower]]
-                if jd_skill_lower in equivalent_skills:
+                if jd_skill_lower in skill_map[cv_skill_lower]:
                     matches.append(SkillMatch(
                         cv_skill=cv_skill,
                         jd_skill=jd_skill,
@@ -261,8 +119,7 @@ class EnhancedSkillsMatcher:
             
             # Check if JD skill maps to CV skill
             if jd_skill_lower in skill_map:
-                equivalent_skills = [s.lower() for s in skill_map[jd_skill_lower]]
-                if cv_skill_lower in equivalent_skills:
+                if cv_skill_lower in skill_map[jd_skill_lower]:
                     matches.append(SkillMatch(
                         cv_skill=cv_skill,
                         jd_skill=jd_skill,
@@ -281,11 +138,7 @@ class EnhancedSkillsMatcher:
             cv_domain_lower = cv_domain.lower().strip()
             
             # Find which cluster the CV domain belongs to
-            cv_cluster = None
-            for cluster_name, domains in self.domain_clusters.items():
-                if any(cv_domain_lower in domain.lower() or domain.lower() in cv_domain_lower for domain in domains):
-                    cv_cluster = cluster_name
-                    break
+            cv_cluster = INDUSTRY_DOMAIN_INDEX.first_group(cv_domain_lower)
             
             if cv_cluster:
                 # Check if any JD domains are in the same cluster
@@ -304,8 +157,7 @@ class EnhancedSkillsMatcher:
                         continue
                     
                     # Cluster match
-                    if any(jd_domain_lower in domain.lower() or domain.lower() in jd_domain_lower 
-                          for domain in self.domain_clusters[cv_cluster]):
+                    if cv_cluster in INDUSTRY_DOMAIN_INDEX.related_groups(jd_domain_lower):
                         matches.append(SkillMatch(
                             cv_skill=cv_domain,
                             jd_skill=jd_domain,
@@ -320,6 +172,8 @@ class EnhancedSkillsMatcher:
         """Find transferable/learnable skills"""
         matches = []
         cv_skills_lower = [skill.lower().strip() for skill in cv_skills]
+        # Source skills related (by substring either way) to each CV skill
+        cv_related_sources = [(cv_skill, LEARNABLE_SOURCE_INDEX.related_terms(cv_skill.lower())) for cv_skill in cv_skills]
         
         for missing_skill in missing_jd_skills:
             missing_skill_lower = missing_skill.lower().strip()
@@ -330,8 +184,9 @@ class EnhancedSkillsMatcher:
                 # Check if candidate has any source skills
                 source_matches = []
                 for source_skill in transfer_info["source_skills"]:
-                    for cv_skill in cv_skills:
-                        if source_skill.lower() in cv_skill.lower() or cv_skill.lower() in source_skill.lower():
+                    source_lower = source_skill.lower()
+                    for cv_skill, related_sources in cv_related_sources:
+                        if source_lower in related_sources:
                             source_matches.append(cv_skill)
                 
                 if source_matches:
@@ -14,6 +14,13 @@ from dataclasses import dataclass
 from enum import Enum
 import numpy as np
 
+from app.services.matching.skill_knowledge_base import (
+    INDUSTRY_CLUSTERS,
+    SKILL_TRANSFERABILITY,
+    INDUSTRY_KEYWORDS,
+    SKILL_TRANSFERABILITY_INDEX,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,50 +50,8 @@ class IndustryAlignmentScorer:
         self._initialize_skill_transferability_maps()
     
     def _initialize_industry_clusters(self):
-        """Define industry clusters and their characteristics"""
-        
-        self.industry_clusters = {
-            "technology": {
-                "domains": ["software", "tech", "saas", "cloud", "ai", "data", "cybersecurity", "fintech"],
-                "core_skills": ["programming", "system design", "agile", "problem solving", "innovation"],
-                "culture": ["fast-paced", "innovation-focused", "data-driven", "collaborative"]
-            },
-            "finance": {
-                "domains": ["banking", "investment", "insurance", "accounting", "financial services"],
-                "core_skills": ["financial analysis", "risk management", "compliance", "attention to detail"],
-                "culture": ["regulated", "conservative", "precision-focused", "hierarchy"]
-            },
-            "consulting": {
-                "domains": ["management consulting", "strategy", "advisory", "professional services"],
-                "core_skills": ["analytical thinking", "communication", "problem solving", "client management"],
-                "culture": ["client-focused", "results-driven", "travel-heavy", "deadline-oriented"]
-            },
-            "healthcare": {
-                "domains": ["medical", "pharmaceutical", "biotech", "health services"],
-                "core_skills": ["scientific knowledge", "compliance", "patient care", "precision"],
-                "culture": ["regulated", "mission-driven", "evidence-based", "collaborative"]
-            },
-            "nonprofit": {
-                "domains": ["charity", "ngo", "social impact", "fundraising", "humanitarian"],
-                "core_skills": ["mission alignment", "stakeholder management", "resource optimization"],
-                "culture": ["mission-driven", "resource-conscious", "impact-focused", "collaborative"]
-            },
-            "government": {
-                "domains": ["public sector", "policy", "defense", "civil service"],
-                "core_skills": ["policy knowledge", "compliance", "stakeholder management", "process adherence"],
-                "culture": ["regulated", "hierarchical", "process-focused", "stability-oriented"]
-            },
-            "education": {
-                "domains": ["academic", "university", "k-12", "training", "research"],
-                "core_skills": ["knowledge transfer", "research", "communication", "curriculum design"],
-                "culture": ["knowledge-focused", "collaborative", "long-term thinking", "mission-driven"]
-            },
-            "retail_consumer": {
-                "domains": ["retail", "consumer goods", "e-commerce", "marketing", "brand management"],
-                "core_skills": ["customer focus", "marketing", "operations", "brand management"],
-                "culture": ["customer-centric", "fast-paced", "competitive", "results-driven"]
-            }
-        }
+        """Attach the shared industry clusters and their characteristics"""
+        self.industry_clusters = INDUSTRY_CLUSTERS
     
     def _initialize_transition_matrices(self):
         """Define realistic transition difficulty between industries"""
@@ -177,43 +142,24 @@ class IndustryAlignmentScorer:
         }
     
     def _initialize_skill_transferability_maps(self):
-        """Define which skills transfer well between industries"""
-        
-        self.skill_transferability = {
-            # High transferability skills (work in most industries)
-            "high_transfer": [
-                "leadership", "management", "communication", "problem solving",
-                "analytical thinking", "project management", "teamwork", "adaptability",
-                "strategic thinking", "decision making", "negotiation", "presentation"
-            ],
-            
-            # Medium transferability skills (work in related industries)
-            "medium_transfer": [
-                "data analysis", "research", "process improvement", "quality assurance",
-                "stakeholder management", "budget management", "compliance", "training"
-            ],
-            
-            # Low transferability skills (industry-specific)
-            "low_transfer": [
-                "programming", "software development", "clinical knowledge", "regulatory expertise",
-                "financial modeling", "accounting", "medical procedures", "legal knowledge"
-            ]
-        }
+        """Attach the shared map of skills that transfer well between industries"""
+        self.skill_transferability = SKILL_TRANSFERABILITY
     
     def _classify_industry(self, job_description: str, company_info: str = "") -> str:
         """Classify industry based on job description and company info"""
         
         text = (job_description + " " + company_info).lower()
         
-        # Score each industry cluster based on keyword matches
+        # Score each industry cluster based on keyword matches (single pass over the text)
+        found = INDUSTRY_KEYWORDS.find_all(text)
         industry_scores = {}
         for industry, cluster_info in self.industry_clusters.items():
             score = 0
             for domain in cluster_info["domains"]:
-                if domain in text:
+                if domain in found:
                     score += 2
             for skill in cluster_info["core_skills"]:
-                if skill in text:
+                if skill in found:
                     score += 1
             industry_scores[industry] = score
         
@@ -232,14 +178,14 @@ class IndustryAlignmentScorer:
         target_domains = self.industry_clusters[target_industry]["domains"]
         target_skills = self.industry_clusters[target_industry]["core_skills"]
         
-        cv_text = " ".join(cv_experience).lower()
+        found = INDUSTRY_KEYWORDS.find_all(" ".join(cv_experience).lower())
         
         # Calculate domain overlap
-        domain_matches = sum(1 for domain in target_domains if domain in cv_text)
+        domain_matches = sum(1 for domain in target_domains if domain in found)
         domain_score = (domain_matches / len(target_domains)) * 100
         
         # Calculate skill overlap
-        skill_matches = sum(1 for skill in target_skills if skill in cv_text)
+        skill_matches = sum(1 for skill in target_skills if skill in found)
         skill_score = (skill_matches / len(target_skills)) * 100
         
         # Weighted average (domains more important)
@@ -261,15 +207,13 @@ class IndustryAlignmentScorer:
         for skill in cv_skills:
             skill_lower = skill.lower()
             
-            # Determine transferability level
-            if any(skill_lower in ht_skill or ht_skill in skill_lower 
-                  for ht_skill in self.skill_transferability["high_transfer"]):
+            # Determine transferability level (first matching tier wins)
+            level = SKILL_TRANSFERABILITY_INDEX.first_group(skill_lower)
+            if level == "high_transfer":
                 transferability_scores.append(100)
-            elif any(skill_lower in mt_skill or mt_skill in skill_lower 
-                    for mt_skill in self.skill_transferability["medium_transfer"]):
+            elif level == "medium_transfer":
                 transferability_scores.append(70)
-            elif any(skill_lower in lt_skill or lt_skill in skill_lower 
-                    for lt_skill in self.skill_transferability["low_transfer"]):
+            elif level == "low_transfer":
                 transferability_scores.append(30)
             else:
                 transferability_scores.append(50)  # Unknown skill, moderate score
@@ -288,12 +232,12 @@ class IndustryAlignmentScorer:
         target_cluster = self.industry_clusters.get(target_industry, {})
         target_domains = target_cluster.get("domains", [])
         
-        cv_text = " ".join(cv_experience).lower()
+        found = INDUSTRY_KEYWORDS.find_all(" ".join(cv_experience).lower())
         
         # Calculate direct experience relevance
         relevant_experience_count = 0
         for domain in target_domains:
-            if domain in cv_text:
+            if domain in found:
                 relevant_experience_count += 1
         
         direct_relevance = (relevant_experience_count / len(target_domains)) * 100 if target_domains else 0
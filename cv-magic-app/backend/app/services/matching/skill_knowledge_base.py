@@ -0,0 +1,552 @@
+"""
+Skill Knowledge Base
+
+Static skill, domain and industry tables shared by the matching services,
+compiled once at import time into reverse indexes so lookups cost time
+proportional to the query term rather than to the size of the table.
+
+- Pre-extracted comparator: SEMANTIC_SKILL_MAPPING, DOMAIN_CLUSTERS, TRANSFERABLE_SKILLS
+- EnhancedSkillsMatcher: SOFT_SKILLS_MAP, TECHNICAL_SKILLS_MAP, INDUSTRY_DOMAIN_CLUSTERS, LEARNABLE_SKILLS
+- IndustryAlignmentScorer: INDUSTRY_CLUSTERS, SKILL_TRANSFERABILITY
+"""
+
+from typing import Dict, Set
+
+from app.utils.term_index import AhoCorasick, TermIndex
+
+
+# SEMANTIC SKILL MAPPING for improved matching accuracy
+SEMANTIC_SKILL_MAPPING = {
+    # Soft Skills Equivalents - FIXED MATCHING
+    "communication": [
+        "communication",
+        "communication skills",
+        "interpersonal skills",
+        "verbal communication",
+        "written communication",
+        "presentation skills"
+    ],
+    "leadership": [
+        "leadership",
+        "team leadership",
+        "mentoring",
+        "course facilitation",
+        "student engagement",
+        "team management"
+    ],
+    "teamwork": [
+        "teamwork",
+        "collaboration",
+        "collaborative",
+        "team collaboration",
+        "cross-functional collaboration"
+    ],
+    "collaboration": [
+        "collaboration",
+        "teamwork",
+        "collaborative",
+        "team collaboration",
+        "cross-functional collaboration"
+    ],
+    "problem-solving": [
+        "problem-solving",
+        "problem solving",
+        "analytical thinking",
+        "critical thinking",
+        "troubleshooting",
+        "solution-oriented"
+    ],
+    "organised": [
+        "organised",
+        "organized",
+        "manage and prioritise multiple tasks",
+        "task management", 
+        "time management",
+        "prioritization",
+        "manage multiple tasks",
+        "priority management"
+    ],
+    "project management": [
+        "project management",
+        "manage multiple projects", 
+        "task prioritization",
+        "deliver multiple projects",
+        "project coordination",
+        "task management",
+        "manage and prioritise multiple tasks",
+        "time management",
+        "manage multiple tasks"
+    ],
+    "detail-oriented": [
+        "detail-oriented",
+        "detail oriented",
+        "attention to detail",
+        "accuracy",
+        "precision",
+        "99% accuracy",
+        "data integrity",
+        "quality assurance"
+    ],
+    "motivated": [
+        "motivated",
+        "self-motivated",
+        "proactive",
+        "self-driven",
+        "initiative",
+        "enthusiastic",
+        "dynamic"
+    ],
+    "stakeholder management": [
+        "stakeholder management",
+        "stakeholder engagement",
+        "work with stakeholders",
+        "stakeholder interaction",
+        "business stakeholder collaboration",
+        "collaboration",
+        "interpersonal skills"
+    ],
+    "adaptability": [
+        "adaptability",
+        "adaptable",
+        "flexible",
+        "dynamic environments",
+        "diverse industries",
+        "cross-functional"
+    ],
+    
+    # Technical Skills Equivalents - IMPROVED MATCHING
+    "sql": [
+        "sql",
+        "database management",
+        "database querying",
+        "relational databases",
+        "postgresql",
+        "mysql"
+    ],
+    "excel": [
+        "excel",
+        "spreadsheets",
+        "microsoft excel"
+    ],
+    "power bi": [
+        "power bi",
+        "business intelligence",
+        "data visualization",
+        "dashboard creation",
+        "reporting"
+    ],
+    "tableau": [
+        "tableau",
+        "data visualization",
+        "dashboard creation",
+        "business intelligence"
+    ],
+    "vba": [
+        "vba",
+        "visual basic for applications",
+        "excel vba",
+        "macro programming"
+    ],
+    "data analysis": [
+        "data analysis",
+        "data analytics",
+        "analytics",
+        "statistical analysis"
+    ],
+    "data mining": [
+        "data mining",
+        "pattern recognition",
+        "knowledge discovery"
+    ],
+    "data modeling": [
+        "data modeling",
+        "data science",
+        "machine learning",
+        "statistical modeling"
+    ],
+    "data segmentation": [
+        "data segmentation",
+        "customer segmentation",
+        "segmentation strategies"
+    ],
+    "data warehousing": [
+        "data warehousing",
+        "data warehouse",
+        "etl",
+        "data storage"
+    ],
+    "database management": [
+        "database management",
+        "sql",
+        "relational databases",
+        "postgresql",
+        "mysql"
+    ],
+    "extracting data": [
+        "extracting data",
+        "data extraction",
+        "sql",
+        "database querying",
+        "data retrieval"
+    ],
+    "querying": [
+        "querying",
+        "sql",
+        "database querying",
+        "data retrieval"
+    ],
+    "relational databases": [
+        "relational databases",
+        "sql",
+        "database management",
+        "postgresql",
+        "mysql"
+    ],
+    "report creation": [
+        "report creation",
+        "reporting",
+        "data visualization",
+        "dashboard creation",
+        "power bi",
+        "tableau"
+    ],
+    "spreadsheets": [
+        "spreadsheets",
+        "excel",
+        "microsoft excel"
+    ],
+    
+    # Domain Keywords Equivalents
+    "evidence-based decision making": [
+        "data-driven decision making",
+        "data-driven projects",
+        "analytical decision making"
+    ],
+    "multi-channel communication": [
+        "communication strategies",
+        "stakeholder communication",
+        "integrated communication"
+    ]
+}
+
+# DOMAIN CLUSTERS for related field matching
+DOMAIN_CLUSTERS = {
+    "data_analytics_cluster": [
+        "business intelligence",
+        "data science", 
+        "analytics",
+        "data analysis",
+        "data visualization",
+        "dashboard creation",
+        "data analytics",
+        "statistical analysis"
+    ],
+    "database_cluster": [
+        "data warehouse",
+        "relational databases", 
+        "database management",
+        "sql databases",
+        "sql",
+        "data storage"
+    ],
+    "marketing_cluster": [
+        "direct marketing",
+        "campaign outcomes",
+        "marketing analytics",
+        "customer segmentation",
+        "segmentation strategies"
+    ],
+    "reporting_cluster": [
+        "reporting",
+        "dashboard creation",
+        "data visualization",
+        "power bi",
+        "tableau",
+        "insights delivery"
+    ]
+}
+
+# TRANSFERABLE SKILLS assessment
+TRANSFERABLE_SKILLS = {
+    "vba": {
+        "base_skills": ["excel", "spreadsheets", "formulas"],
+        "difficulty": "easy",
+        "time_to_learn": "2-4 weeks",
+        "note": "VBA is commonly learned by Excel users"
+    },
+    "tableau": {
+        "base_skills": ["power bi", "data visualization", "dashboard creation"],
+        "difficulty": "medium", 
+        "time_to_learn": "1-2 months",
+        "note": "Similar BI tools, transferable skills"
+    },
+    "data warehouse": {
+        "base_skills": ["sql", "database", "relational databases"],
+        "difficulty": "medium",
+        "time_to_learn": "2-3 months", 
+        "note": "SQL experience provides foundation"
+    },
+    "segmentation strategies": {
+        "base_skills": ["data analysis", "statistical analysis", "analytics"],
+        "difficulty": "easy",
+        "time_to_learn": "3-6 weeks",
+        "note": "Data analysis skills transfer to segmentation"
+    }
+}
+
+# Soft skills semantic equivalence (EnhancedSkillsMatcher)
+SOFT_SKILLS_MAP = {
+    # Organization & Planning
+    "organized": ["organised", "task management", "time management", "planning", "project planning", "workflow management"],
+    "task management": ["organized", "organised", "multitasking", "prioritization", "time management"],
+    "time management": ["organized", "organised", "task management", "scheduling", "planning"],
+    "multitasking": ["task management", "organized", "juggling priorities", "parallel processing"],
+    "prioritization": ["task management", "organized", "decision making", "strategic thinking"],
+
+    # Communication
+    "communication": ["written communication", "verbal communication", "presentation", "public speaking", "interpersonal skills"],
+    "presentation": ["public speaking", "communication", "stakeholder engagement", "reporting"],
+    "stakeholder engagement": ["communication", "relationship building", "client management", "presentation"],
+    "collaboration": ["teamwork", "cross-functional collaboration", "partnership", "cooperation"],
+    "teamwork": ["collaboration", "team player", "cross-functional collaboration"],
+
+    # Leadership & Management
+    "leadership": ["team leadership", "people management", "mentoring", "coaching", "strategic leadership"],
+    "management": ["people management", "team management", "leadership", "supervision"],
+    "mentoring": ["coaching", "leadership", "training", "knowledge transfer"],
+    "coaching": ["mentoring", "leadership", "training", "development"],
+
+    # Problem Solving & Analysis
+    "problem solving": ["analytical thinking", "troubleshooting", "critical thinking", "solution design"],
+    "analytical thinking": ["problem solving", "data analysis", "critical thinking", "research"],
+    "critical thinking": ["analytical thinking", "problem solving", "decision making", "evaluation"],
+    "research": ["analytical thinking", "investigation", "data gathering", "analysis"],
+
+    # Adaptability & Learning
+    "adaptability": ["flexibility", "change management", "learning agility", "resilience"],
+    "flexibility": ["adaptability", "change management", "agility", "versatility"],
+    "learning agility": ["adaptability", "continuous learning", "quick learner", "upskilling"],
+    "continuous learning": ["learning agility", "professional development", "upskilling", "growth mindset"]
+}
+
+# Technical skills semantic equivalence (EnhancedSkillsMatcher)
+TECHNICAL_SKILLS_MAP = {
+    # Programming Languages
+    "javascript": ["js", "node.js", "nodejs", "ecmascript"],
+    "typescript": ["ts", "javascript", "js"],
+    "python": ["py", "python3", "django", "flask", "fastapi"],
+
+    # Data & Analytics
+    "excel": ["microsoft excel", "spreadsheets", "vba", "pivot tables", "vlookup"],
+    "vba": ["excel", "microsoft excel", "excel automation", "macros"],
+    "sql": ["mysql", "postgresql", "database", "queries", "data analysis"],
+    "data analysis": ["analytics", "data analytics", "statistical analysis", "sql", "excel"],
+    "tableau": ["data visualization", "dashboard", "reporting", "analytics"],
+    "power bi": ["powerbi", "data visualization", "dashboard", "microsoft bi"],
+
+    # Cloud & Infrastructure
+    "aws": ["amazon web services", "cloud computing", "ec2", "s3"],
+    "azure": ["microsoft azure", "cloud computing", "cloud services"],
+    "docker": ["containerization", "containers", "devops"],
+    "kubernetes": ["k8s", "container orchestration", "devops"],
+
+    # Frameworks & Libraries
+    "react": ["reactjs", "javascript", "frontend", "ui development"],
+    "angular": ["angularjs", "typescript", "frontend", "spa"],
+    "django": ["python", "web framework", "backend"],
+    "flask": ["python", "web framework", "microservices"],
+
+    # Tools & Platforms
+    "git": ["version control", "source control", "github", "gitlab"],
+    "github": ["git", "version control", "collaboration", "code repository"],
+    "jira": ["project management", "issue tracking", "agile", "scrum"],
+    "confluence": ["documentation", "wiki", "knowledge management"],
+}
+
+# Domain clusters for related field matching (EnhancedSkillsMatcher)
+INDUSTRY_DOMAIN_CLUSTERS = {
+    "data_and_analytics": [
+        "data science", "data analysis", "data analytics", "business intelligence", 
+        "machine learning", "ai", "artificial intelligence", "statistics", 
+        "quantitative analysis", "data engineering", "big data", "data visualization"
+    ],
+    "software_development": [
+        "software engineering", "web development", "full stack development", 
+        "frontend development", "backend development", "mobile development",
+        "application development", "programming", "coding", "software design"
+    ],
+    "cloud_and_devops": [
+        "cloud computing", "devops", "infrastructure", "system administration",
+        "site reliability engineering", "platform engineering", "automation",
+        "containerization", "microservices", "cicd"
+    ],
+    "project_management": [
+        "project management", "program management", "agile", "scrum", "kanban",
+        "product management", "delivery management", "pmo", "portfolio management"
+    ],
+    "finance_and_accounting": [
+        "finance", "accounting", "financial analysis", "investment", "banking",
+        "financial planning", "budgeting", "treasury", "risk management", "audit"
+    ],
+    "marketing_and_sales": [
+        "marketing", "digital marketing", "sales", "business development",
+        "customer acquisition", "lead generation", "brand management", "advertising"
+    ],
+    "nonprofit_and_social": [
+        "nonprofit", "non-profit", "ngo", "fundraising", "social impact",
+        "community development", "humanitarian", "charity", "philanthropy"
+    ],
+    "consulting_and_strategy": [
+        "consulting", "strategy", "business strategy", "management consulting",
+        "strategic planning", "transformation", "change management"
+    ]
+}
+
+# Transferable and learnable skills (EnhancedSkillsMatcher)
+LEARNABLE_SKILLS = {
+    # Excel experience suggests VBA capability
+    "vba": {
+        "source_skills": ["excel", "microsoft excel", "spreadsheet automation", "macros"],
+        "learnability": 0.8,  # High - if you know Excel well, VBA is learnable
+        "description": "VBA is learnable with strong Excel background"
+    },
+
+    # SQL knowledge suggests database skills
+    "database administration": {
+        "source_skills": ["sql", "mysql", "postgresql", "database design"],
+        "learnability": 0.7,
+        "description": "Database administration builds on SQL knowledge"
+    },
+
+    # Programming language transferability
+    "typescript": {
+        "source_skills": ["javascript", "java", "c#", "programming"],
+        "learnability": 0.9,  # Very high for JS developers
+        "description": "TypeScript is highly learnable for JavaScript developers"
+    },
+
+    "python": {
+        "source_skills": ["java", "c++", "c#", "javascript", "programming"],
+        "learnability": 0.8,
+        "description": "Python is learnable for experienced programmers"
+    },
+
+    # Cloud platform transferability
+    "azure": {
+        "source_skills": ["aws", "google cloud", "cloud computing"],
+        "learnability": 0.7,
+        "description": "Cloud platforms share similar concepts"
+    },
+
+    "aws": {
+        "source_skills": ["azure", "google cloud", "cloud computing"],
+        "learnability": 0.7,
+        "description": "Cloud platforms share similar concepts"
+    },
+
+    # Project management tools
+    "jira": {
+        "source_skills": ["asana", "trello", "monday.com", "project management"],
+        "learnability": 0.9,
+        "description": "Project management tools have similar workflows"
+    }
+}
+
+# Industry clusters and their characteristics (IndustryAlignmentScorer)
+INDUSTRY_CLUSTERS = {
+    "technology": {
+        "domains": ["software", "tech", "saas", "cloud", "ai", "data", "cybersecurity", "fintech"],
+        "core_skills": ["programming", "system design", "agile", "problem solving", "innovation"],
+        "culture": ["fast-paced", "innovation-focused", "data-driven", "collaborative"]
+    },
+    "finance": {
+        "domains": ["banking", "investment", "insurance", "accounting", "financial services"],
+        "core_skills": ["financial analysis", "risk management", "compliance", "attention to detail"],
+        "culture": ["regulated", "conservative", "precision-focused", "hierarchy"]
+    },
+    "consulting": {
+        "domains": ["management consulting", "strategy", "advisory", "professional services"],
+        "core_skills": ["analytical thinking", "communication", "problem solving", "client management"],
+        "culture": ["client-focused", "results-driven", "travel-heavy", "deadline-oriented"]
+    },
+    "healthcare": {
+        "domains": ["medical", "pharmaceutical", "biotech", "health services"],
+        "core_skills": ["scientific knowledge", "compliance", "patient care", "precision"],
+        "culture": ["regulated", "mission-driven", "evidence-based", "collaborative"]
+    },
+    "nonprofit": {
+        "domains": ["charity", "ngo", "social impact", "fundraising", "humanitarian"],
+        "core_skills": ["mission alignment", "stakeholder management", "resource optimization"],
+        "culture": ["mission-driven", "resource-conscious", "impact-focused", "collaborative"]
+    },
+    "government": {
+        "domains": ["public sector", "policy", "defense", "civil service"],
+        "core_skills": ["policy knowledge", "compliance", "stakeholder management", "process adherence"],
+        "culture": ["regulated", "hierarchical", "process-focused", "stability-oriented"]
+    },
+    "education": {
+        "domains": ["academic", "university", "k-12", "training", "research"],
+        "core_skills": ["knowledge transfer", "research", "communication", "curriculum design"],
+        "culture": ["knowledge-focused", "collaborative", "long-term thinking", "mission-driven"]
+    },
+    "retail_consumer": {
+        "domains": ["retail", "consumer goods", "e-commerce", "marketing", "brand management"],
+        "core_skills": ["customer focus", "marketing", "operations", "brand management"],
+        "culture": ["customer-centric", "fast-paced", "competitive", "results-driven"]
+    }
+}
+
+# Which skills transfer well between industries (IndustryAlignmentScorer)
+SKILL_TRANSFERABILITY = {
+    # High transferability skills (work in most industries)
+    "high_transfer": [
+        "leadership", "management", "communication", "problem solving",
+        "analytical thinking", "project management", "teamwork", "adaptability",
+        "strategic thinking", "decision making", "negotiation", "presentation"
+    ],
+
+    # Medium transferability skills (work in related industries)
+    "medium_transfer": [
+        "data analysis", "research", "process improvement", "quality assurance",
+        "stakeholder management", "budget management", "compliance", "training"
+    ],
+
+    # Low transferability skills (industry-specific)
+    "low_transfer": [
+        "programming", "software development", "clinical knowledge", "regulatory expertise",
+        "financial modeling", "accounting", "medical procedures", "legal knowledge"
+    ]
+}
+
+
+# =============================================================================
+# Compiled indexes
+# =============================================================================
+
+# Pre-extracted comparator
+SEMANTIC_EQUIVALENTS_INDEX = TermIndex(SEMANTIC_SKILL_MAPPING)
+SEMANTIC_KEYS_INDEX = TermIndex({key: [key] for key in SEMANTIC_SKILL_MAPPING})
+DOMAIN_CLUSTERS_INDEX = TermIndex(DOMAIN_CLUSTERS)
+TRANSFERABLE_BASE_INDEX = TermIndex({skill: info["base_skills"] for skill, info in TRANSFERABLE_SKILLS.items()})
+
+# EnhancedSkillsMatcher
+SOFT_SKILLS_EQUIVALENTS: Dict[str, Set[str]] = {
+    skill: {s.lower() for s in equivalents} for skill, equivalents in SOFT_SKILLS_MAP.items()
+}
+TECHNICAL_SKILLS_EQUIVALENTS: Dict[str, Set[str]] = {
+    skill: {s.lower() for s in equivalents} for skill, equivalents in TECHNICAL_SKILLS_MAP.items()
+}
+INDUSTRY_DOMAIN_INDEX = TermIndex({
+    cluster: [domain.lower() for domain in domains] for cluster, domains in INDUSTRY_DOMAIN_CLUSTERS.items()
+})
+LEARNABLE_SOURCE_INDEX = TermIndex({
+    skill: [source.lower() for source in info["source_skills"]] for skill, info in LEARNABLE_SKILLS.items()
+})
+
+# IndustryAlignmentScorer
+INDUSTRY_KEYWORDS = AhoCorasick(
+    term
+    for cluster in INDUSTRY_CLUSTERS.values()
+    for term in cluster["domains"] + cluster["core_skills"]
+)
+SKILL_TRANSFERABILITY_INDEX = TermIndex(SKILL_TRANSFERABILITY)
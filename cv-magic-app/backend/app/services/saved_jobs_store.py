@@ -0,0 +1,220 @@
+"""
+Saved Jobs Store
+
+SQLite-backed store for a user's saved jobs, replacing whole-file
+read-modify-write of saved_jobs.json.
+
+- One row per job, keyed by job URL (or company + title for pasted jobs
+  without a URL), so lookups and upserts are indexed instead of O(total jobs)
+- Upserts run in a single IMMEDIATE transaction, so concurrent requests and
+  worker processes cannot lose each other's writes
+- Insertion order is kept, and listing is paginated
+- An existing saved_jobs.json is imported once, the first time the store opens
+- Calls are blocking; async code runs them with asyncio.to_thread
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+logger = logging.getLogger(__name__)
+
+
+def _job_key(job: Dict[str, Any]) -> str:
+    job_url = job.get("job_url")
+    if job_url:
+        return job_url
+    return f"title:{job.get('company_name') or ''}|{job.get('job_title') or ''}"
+
+
+class SavedJobsStore:
+    """Saved jobs of one user in a SQLite database next to the legacy JSON file"""
+
+    def __init__(self, db_path: Path, legacy_json_path: Optional[Path] = None):
+        self.db_path = Path(db_path)
+        self.legacy_json_path = legacy_json_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS saved_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_key TEXT NOT NULL UNIQUE,
+                    job_url TEXT,
+                    company_name TEXT,
+                    job_title TEXT,
+                    data TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_saved_jobs_company_title ON saved_jobs (company_name, job_title)")
+            conn.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn = conn
+            self._import_legacy_json(conn)
+        return self._conn
+
+    def _import_legacy_json(self, conn: sqlite3.Connection) -> None:
+        """Copy jobs from saved_jobs.json into the table, once"""
+        if conn.execute("SELECT 1 FROM store_meta WHERE key = 'legacy_imported'").fetchone():
+            return
+        jobs: List[Dict[str, Any]] = []
+        if self.legacy_json_path and self.legacy_json_path.exists():
+            try:
+                with open(self.legacy_json_path, "r", encoding="utf-8") as f:
+                    jobs = json.load(f).get("jobs", [])
+            except Exception as e:
+                logger.error(f"❌ [SAVED_JOBS] Could not read legacy {self.legacy_json_path}: {e}")
+                return  # Retry on next open rather than marking the import done
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for job in jobs:
+                if isinstance(job, dict):
+                    self._upsert_row(conn, job, merge=True)
+            conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('legacy_imported', ?)", (str(time.time()),))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if jobs:
+            logger.info(f"📥 [SAVED_JOBS] Imported {len(jobs)} job(s) from {self.legacy_json_path}")
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        return json.loads(row["data"])
+
+    def _upsert_row(self, conn: sqlite3.Connection, job: Dict[str, Any], merge: bool) -> bool:
+        """Insert or update one job inside an open transaction; returns True if it was new"""
+        job = jsonable_encoder(job)
+        key = _job_key(job)
+        now = time.time()
+        existing = conn.execute("SELECT data FROM saved_jobs WHERE job_key = ?", (key,)).fetchone()
+        if existing is not None:
+            data = json.loads(existing["data"]) if merge else {}
+            data.update(job)
+            conn.execute(
+                "UPDATE saved_jobs SET data = ?, company_name = ?, job_title = ?, updated_at = ? WHERE job_key = ?",
+                (json.dumps(data, ensure_ascii=False), data.get("company_name"), data.get("job_title"), now, key),
+            )
+            return False
+        conn.execute(
+            """
+            INSERT INTO saved_jobs (job_key, job_url, company_name, job_title, data, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (key, job.get("job_url"), job.get("company_name"), job.get("job_title"),
+             json.dumps(job, ensure_ascii=False), now, now),
+        )
+        return True
+
+    def upsert(self, job: Dict[str, Any]) -> bool:
+        """
+        Save a job, merging into an existing entry with the same URL
+
+        Returns:
+            True if the job was new, False if an existing entry was updated
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                created = self._upsert_row(conn, job, merge=True)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return created
+
+    def add_if_absent(self, jobs: Iterable[Dict[str, Any]], match_title: bool = False) -> int:
+        """
+        Add jobs not already saved under the same URL
+
+        Args:
+            jobs: Jobs to add
+            match_title: Also skip jobs whose company and title match a saved job
+
+        Returns:
+            Number of jobs added
+        """
+        added = 0
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for job in jobs:
+                    # job_key is the URL when there is one, and it is UNIQUE (so indexed)
+                    if conn.execute("SELECT 1 FROM saved_jobs WHERE job_key = ?", (_job_key(job),)).fetchone():
+                        continue
+                    if match_title and conn.execute(
+                        "SELECT 1 FROM saved_jobs WHERE company_name = ? AND job_title = ?",
+                        (job.get("company_name"), job.get("job_title")),
+                    ).fetchone():
+                        continue
+                    if self._upsert_row(conn, job, merge=False):
+                        added += 1
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def get(self, job_url: str) -> Optional[Dict[str, Any]]:
+        """Job saved under a URL, or None"""
+        with self._lock:
+            row = self._connection().execute("SELECT data FROM saved_jobs WHERE job_key = ?", (job_url,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Saved jobs in the order they were first saved"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT data FROM saved_jobs ORDER BY id LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def count(self) -> int:
+        """Number of saved jobs"""
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM saved_jobs").fetchone()[0]
+
+    def delete(self, job_url: str) -> bool:
+        """Remove the job saved under a URL; True if one was removed"""
+        with self._lock:
+            cursor = self._connection().execute("DELETE FROM saved_jobs WHERE job_key = ?", (job_url,))
+        return cursor.rowcount > 0
+
+    def clear(self) -> None:
+        """Remove every saved job"""
+        with self._lock:
+            self._connection().execute("DELETE FROM saved_jobs")
+
+
+_stores: Dict[str, SavedJobsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_saved_jobs_store(user_email: str) -> SavedJobsStore:
+    """The (process-wide) saved jobs store of a user"""
+    with _stores_lock:
+        store = _stores.get(user_email)
+        if store is None:
+            from app.utils.user_path_utils import get_user_saved_jobs_db_path, get_user_saved_jobs_path
+            store = SavedJobsStore(get_user_saved_jobs_db_path(user_email), get_user_saved_jobs_path(user_email))
+            _stores[user_email] = store
+        return store
@@ -22,7 +22,6 @@ try:
     from app.services.skill_analysis.skill_analysis_file_selector import skill_analysis_file_selector  # type: ignore
 except Exception:
     skill_analysis_file_selector = None  # type: ignore
-from .prompt_templates import SkillExtractionPrompts
 from .response_parser import SkillExtractionParser
 
 logger = logging.getLogger(__name__)
@@ -32,7 +31,6 @@ class EnhancedSkillExtractionService:
     """Enhanced service for skill extraction with proper file selection and version tracking"""
     
     def __init__(self):
-        self.prompts = SkillExtractionPrompts()
         self.parser = SkillExtractionParser()
         self.file_selector = skill_analysis_file_selector
     
@@ -7,16 +7,65 @@ Provides intelligent skill matching capabilities including:
 - Skill hierarchy understanding
 - Fuzzy string matching
 - Domain-aware skill relationships
+
+Synonym, hierarchy and domain tables are precompiled into reverse and token
+indexes at construction time. Character-count vectors give a batched NumPy
+upper bound on SequenceMatcher.ratio() (its quick_ratio), so the exact
+SequenceMatcher score is only computed for pairs that can pass a threshold.
 """
 
 import logging
 import re
+from collections import defaultdict
 from typing import Dict, List, Set, Tuple, Optional
 from difflib import SequenceMatcher
 from dataclasses import dataclass
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+FUZZY_MATCH_THRESHOLD = 0.85
+SYNONYM_FUZZY_THRESHOLD = 0.9
+DOMAIN_FUZZY_THRESHOLD = 0.8
+SEMANTIC_MATCH_THRESHOLD = 0.7
+
+# Characters are bucketed into a fixed-width count vector; collisions can only
+# raise the bound, never lower it, so filtering on it stays exact
+_CHAR_BUCKETS = 128
+_BOUND_CHUNK_CELLS = 4_000_000
+_MAX_MEMO_ENTRIES = 10000
+
+
+def _char_counts(strings: List[str]) -> np.ndarray:
+    """Character-count vectors (one row per string)"""
+    counts = np.zeros((len(strings), _CHAR_BUCKETS), dtype=np.int32)
+    for row, text in enumerate(strings):
+        for ch in text:
+            counts[row, ord(ch) % _CHAR_BUCKETS] += 1
+    return counts
+
+
+def _quick_ratio_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Upper bound of SequenceMatcher(None, x, y).ratio() for every row pair of a and b
+
+    This is difflib's quick_ratio(): matched characters can never exceed the
+    multiset intersection of both strings.
+    """
+    bounds = np.empty((a.shape[0], b.shape[0]), dtype=np.float64)
+    if bounds.size == 0:
+        return bounds
+    b_lengths = b.sum(axis=1)
+    step = max(1, _BOUND_CHUNK_CELLS // (b.shape[0] * _CHAR_BUCKETS))
+    for start in range(0, a.shape[0], step):
+        chunk = a[start:start + step]
+        common = np.minimum(chunk[:, None, :], b[None, :, :]).sum(axis=2)
+        lengths = chunk.sum(axis=1)[:, None] + b_lengths[None, :]
+        # difflib treats two empty strings as identical
+        bounds[start:start + step] = np.where(lengths > 0, 2.0 * common / np.maximum(lengths, 1), 1.0)
+    return bounds
+
 @dataclass
 class SkillMatch:
     """Represents a match between CV and JD skills"""
@@ -33,6 +82,36 @@ class EnhancedSkillMatcher:
         self.skill_synonyms = self._build_skill_synonyms()
         self.skill_hierarchies = self._build_skill_hierarchies()
         self.domain_mappings = self._build_domain_mappings()
+        self._compile_indexes()
+    
+    def _compile_indexes(self):
+        """Precompute reverse lookups and character vectors for the static tables"""
+        self._normalized_cache: Dict[str, str] = {}
+        self._synonym_cache: Dict[str, Set[str]] = {}
+        self._domain_cache: Dict[str, frozenset] = {}
+        
+        # Reverse synonym map: term -> position of the first synonym set containing it
+        self._synonym_sets: List[Set[str]] = list(self.skill_synonyms.values())
+        self._synonym_member_index: Dict[str, int] = {}
+        synonym_terms: List[str] = []
+        self._synonym_term_owner: List[int] = []
+        for position, synonyms in enumerate(self._synonym_sets):
+            for synonym in synonyms:
+                self._synonym_member_index.setdefault(synonym, position)
+                synonym_terms.append(self.normalize_skill(synonym))
+                self._synonym_term_owner.append(position)
+        self._synonym_terms = synonym_terms
+        self._synonym_term_counts = _char_counts(synonym_terms)
+        
+        # Domain terms, flattened with the domain they belong to
+        domain_terms: List[str] = []
+        self._domain_term_owner: List[str] = []
+        for domain, skills in self.domain_mappings.items():
+            for skill in skills:
+                domain_terms.append(self.normalize_skill(skill))
+                self._domain_term_owner.append(domain)
+        self._domain_terms = domain_terms
+        self._domain_term_counts = _char_counts(domain_terms)
     
     def _build_skill_synonyms(self) -> Dict[str, Set[str]]:
         """Build a comprehensive skill synonym database"""
@@ -132,11 +211,18 @@ class EnhancedSkillMatcher:
     
     def normalize_skill(self, skill: str) -> str:
         """Normalize skill for comparison"""
+        cached = self._normalized_cache.get(skill)
+        if cached is not None:
+            return cached
         normalized = skill.lower().strip()
         # Remove common variations
         normalized = re.sub(r'[^\w\s+#.]', ' ', normalized)  # Keep +, #, . for tech skills
         normalized = re.sub(r'\s+', ' ', normalized)
-        return normalized.strip()
+        normalized = normalized.strip()
+        if len(self._normalized_cache) >= _MAX_MEMO_ENTRIES:
+            self._normalized_cache.clear()
+        self._normalized_cache[skill] = normalized
+        return normalized
     
     def fuzzy_similarity(self, skill1: str, skill2: str) -> float:
         """Calculate fuzzy string similarity between skills"""
@@ -144,6 +230,16 @@ class EnhancedSkillMatcher:
         s2 = self.normalize_skill(skill2)
         return SequenceMatcher(None, s1, s2).ratio()
     
+    def _fuzzy_hits(self, normalized: str, terms: List[str], term_counts: np.ndarray, threshold: float) -> List[int]:
+        """Indexes of terms whose SequenceMatcher ratio with normalized exceeds threshold"""
+        if not terms:
+            return []
+        bounds = _quick_ratio_matrix(_char_counts([normalized]), term_counts)[0]
+        return [
+            i for i in np.flatnonzero(bounds > threshold).tolist()
+            if SequenceMatcher(None, normalized, terms[i]).ratio() > threshold
+        ]
+    
     def find_synonyms(self, skill: str) -> Set[str]:
         """Find all synonyms for a given skill"""
         normalized_skill = self.normalize_skill(skill)
@@ -152,12 +248,23 @@ class EnhancedSkillMatcher:
         if normalized_skill in self.skill_synonyms:
             return self.skill_synonyms[normalized_skill]
         
-        # Check if skill appears in any synonym set
-        for key, synonyms in self.skill_synonyms.items():
-            if normalized_skill in synonyms or any(self.fuzzy_similarity(normalized_skill, syn) > 0.9 for syn in synonyms):
-                return synonyms
+        cached = self._synonym_cache.get(normalized_skill)
+        if cached is not None:
+            return cached
+        
+        # First synonym set that contains the skill, exactly or fuzzily
+        positions = [
+            self._synonym_term_owner[i]
+            for i in self._fuzzy_hits(normalized_skill, self._synonym_terms, self._synonym_term_counts, SYNONYM_FUZZY_THRESHOLD)
+        ]
+        if normalized_skill in self._synonym_member_index:
+            positions.append(self._synonym_member_index[normalized_skill])
+        result = self._synonym_sets[min(positions)] if positions else {normalized_skill}
         
-        return {normalized_skill}
+        if len(self._synonym_cache) >= _MAX_MEMO_ENTRIES:
+            self._synonym_cache.clear()
+        self._synonym_cache[normalized_skill] = result
+        return result
     
     def find_hierarchical_matches(self, cv_skill: str, jd_skill: str) -> Optional[Tuple[str, float]]:
         """Check if CV skill implies JD skill through hierarchy"""
@@ -186,13 +293,46 @@ class EnhancedSkillMatcher:
     def match_skills(self, cv_skills: List[str], jd_skills: List[str]) -> List[SkillMatch]:
         """Find all possible matches between CV and JD skills"""
         matches = []
+        if not cv_skills or not jd_skills:
+            return matches
+        
+        cv_norms = [self.normalize_skill(skill) for skill in cv_skills]
+        jd_norms = [self.normalize_skill(skill) for skill in jd_skills]
+        fuzzy_bounds = _quick_ratio_matrix(_char_counts(jd_norms), _char_counts(cv_norms))
         
-        for jd_skill in jd_skills:
+        # Inverted indexes over the CV side
+        cv_by_norm: Dict[str, List[int]] = defaultdict(list)
+        cv_by_token: Dict[str, List[int]] = defaultdict(list)
+        cv_by_synonym: Dict[str, List[int]] = defaultdict(list)
+        cv_with_hierarchy: List[int] = []
+        for i, (cv_skill, cv_norm) in enumerate(zip(cv_skills, cv_norms)):
+            cv_by_norm[cv_norm].append(i)
+            for token in set(cv_norm.split()):
+                cv_by_token[token].append(i)
+            for synonym in self.find_synonyms(cv_skill):
+                cv_by_synonym[synonym].append(i)
+            if cv_norm in self.skill_hierarchies:
+                cv_with_hierarchy.append(i)
+        
+        for j, (jd_skill, jd_norm) in enumerate(zip(jd_skills, jd_norms)):
+            # Only CV skills that can pass one of the match stages are evaluated
+            candidates = set(np.flatnonzero(fuzzy_bounds[j] > FUZZY_MATCH_THRESHOLD).tolist())
+            candidates.update(cv_by_norm.get(jd_norm, ()))
+            candidates.update(cv_by_synonym.get(jd_norm, ()))
+            for synonym in self.find_synonyms(jd_skill):
+                candidates.update(cv_by_norm.get(synonym, ()))
+            candidates.update(cv_with_hierarchy)
+            for implied in self.skill_hierarchies.get(jd_norm, ()):
+                candidates.update(cv_by_norm.get(implied, ()))
+            # Domain overlap alone contributes at most 0.7, so a semantic match needs a shared word
+            for token in set(jd_norm.split()):
+                candidates.update(cv_by_token.get(token, ()))
+            
             best_match = None
             best_confidence = 0.0
             
-            for cv_skill in cv_skills:
-                match_result = self._evaluate_skill_match(cv_skill, jd_skill)
+            for i in sorted(candidates):
+                match_result = self._evaluate_skill_match(cv_skills[i], jd_skill, fuzzy_bound=fuzzy_bounds[j, i])
                 if match_result and match_result.confidence > best_confidence:
                     best_match = match_result
                     best_confidence = match_result.confidence
@@ -202,8 +342,15 @@ class EnhancedSkillMatcher:
         
         return matches
     
-    def _evaluate_skill_match(self, cv_skill: str, jd_skill: str) -> Optional[SkillMatch]:
-        """Evaluate if two skills match and return match details"""
+    def _evaluate_skill_match(self, cv_skill: str, jd_skill: str, fuzzy_bound: Optional[float] = None) -> Optional[SkillMatch]:
+        """
+        Evaluate if two skills match and return match details
+        
+        Args:
+            cv_skill: Skill from the CV
+            jd_skill: Skill from the job description
+            fuzzy_bound: Precomputed upper bound of the fuzzy score, used to skip SequenceMatcher
+        """
         cv_norm = self.normalize_skill(cv_skill)
         jd_norm = self.normalize_skill(jd_skill)
         
@@ -246,8 +393,11 @@ class EnhancedSkillMatcher:
             )
         
         # 4. Fuzzy match (for spelling variations, etc.)
-        fuzzy_score = self.fuzzy_similarity(cv_skill, jd_skill)
-        if fuzzy_score > 0.85:  # High similarity threshold
+        if fuzzy_bound is not None and fuzzy_bound <= FUZZY_MATCH_THRESHOLD:
+            fuzzy_score = 0.0
+        else:
+            fuzzy_score = self.fuzzy_similarity(cv_skill, jd_skill)
+        if fuzzy_score > FUZZY_MATCH_THRESHOLD:  # High similarity threshold
             return SkillMatch(
                 jd_skill=jd_skill,
                 cv_skill=cv_skill,
@@ -258,7 +408,7 @@ class EnhancedSkillMatcher:
         
         # 5. Semantic match (broader context)
         semantic_score = self._calculate_semantic_similarity(cv_skill, jd_skill)
-        if semantic_score > 0.7:
+        if semantic_score > SEMANTIC_MATCH_THRESHOLD:
             return SkillMatch(
                 jd_skill=jd_skill,
                 cv_skill=cv_skill,
@@ -275,16 +425,8 @@ class EnhancedSkillMatcher:
         jd_norm = self.normalize_skill(jd_skill)
         
         # Check if skills appear in same domain
-        shared_domains = 0
-        total_domains = 0
-        
-        for domain, skills in self.domain_mappings.items():
-            total_domains += 1
-            cv_in_domain = cv_norm in skills or any(self.fuzzy_similarity(cv_norm, s) > 0.8 for s in skills)
-            jd_in_domain = jd_norm in skills or any(self.fuzzy_similarity(jd_norm, s) > 0.8 for s in skills)
-            
-            if cv_in_domain and jd_in_domain:
-                shared_domains += 1
+        shared_domains = len(self._skill_domains(cv_norm) & self._skill_domains(jd_norm))
+        total_domains = len(self.domain_mappings)
         
         # Base semantic score from domain overlap
         domain_score = shared_domains / max(total_domains, 1) if total_domains > 0 else 0
@@ -295,6 +437,22 @@ class EnhancedSkillMatcher:
         word_overlap = len(cv_words.intersection(jd_words)) / len(cv_words.union(jd_words))
         
         return (domain_score * 0.7) + (word_overlap * 0.3)
+    
+    def _skill_domains(self, normalized_skill: str) -> frozenset:
+        """Domains a normalized skill belongs to, exactly or fuzzily"""
+        cached = self._domain_cache.get(normalized_skill)
+        if cached is not None:
+            return cached
+        
+        domains = {domain for domain, skills in self.domain_mappings.items() if normalized_skill in skills}
+        for i in self._fuzzy_hits(normalized_skill, self._domain_terms, self._domain_term_counts, DOMAIN_FUZZY_THRESHOLD):
+            domains.add(self._domain_term_owner[i])
+        
+        result = frozenset(domains)
+        if len(self._domain_cache) >= _MAX_MEMO_ENTRIES:
+            self._domain_cache.clear()
+        self._domain_cache[normalized_skill] = result
+        return result
 
 
 # Global instance for easy access
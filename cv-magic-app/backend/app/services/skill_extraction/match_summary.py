@@ -0,0 +1,201 @@
+"""
+Skills Match Summary
+
+Typed per-category result of a pre-extracted skills comparison.
+
+The comparator builds it from its JSON result and it is saved next to the
+formatted text in each preextracted_comparison_entries item (as
+"match_summary"), so the ATS calculator and the routes read match rates and
+missing counts directly instead of scraping the text table. from_text()
+recovers a summary from the text for entries saved before the summary
+existed and for the text-mode fallback.
+"""
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+SUMMARY_SCHEMA_VERSION = 1
+
+CATEGORIES = ("technical_skills", "soft_skills", "domain_keywords")
+
+# Labels used by the formatted comparison text
+_TABLE_LABELS = {"Technical Skills": "technical_skills", "Soft Skills": "soft_skills", "Domain Keywords": "domain_keywords"}
+_SECTION_LABELS = {"TECHNICAL SKILLS": "technical_skills", "SOFT SKILLS": "soft_skills", "DOMAIN KEYWORDS": "domain_keywords"}
+
+_OVERALL_RATE_RE = re.compile(r"Match Rate:\s*(\d+(?:\.\d+)?)%")
+_MISSING_ITEMS_RE = re.compile(r"\((\d+) items\)")
+_LEGACY_RATE_RE = re.compile(r"(Technical Skills|Soft Skills|Domain Keywords) Match Rate:\s*(\d+)%")
+
+
+def _rate(matched: int, total: int) -> int:
+    return round((matched / total) * 100) if total > 0 else 0
+
+
+@dataclass
+class CategoryMatch:
+    """Match counts of one skill category"""
+    cv_total: int = 0
+    jd_total: int = 0
+    matched: int = 0
+    missing: int = 0
+    match_rate: float = 0.0
+
+
+@dataclass
+class SkillsMatchSummary:
+    """Match counts and rates per category and overall"""
+    technical_skills: CategoryMatch = field(default_factory=CategoryMatch)
+    soft_skills: CategoryMatch = field(default_factory=CategoryMatch)
+    domain_keywords: CategoryMatch = field(default_factory=CategoryMatch)
+    jd_total: int = 0
+    matched: int = 0
+    missing: int = 0
+    match_rate: float = 0.0
+    source: str = "json"  # "json" (comparator result) or "text" (parsed from formatted text)
+
+    def category(self, name: str) -> CategoryMatch:
+        return getattr(self, name)
+
+    @classmethod
+    def from_comparison(
+        cls,
+        json_result: Dict[str, Any],
+        cv_skills: Dict[str, list],
+        jd_skills: Dict[str, list],
+    ) -> "SkillsMatchSummary":
+        """
+        Summary of a comparator JSON result
+
+        CV/JD totals count the raw extracted skills, so they agree with the
+        initial extraction; category rates are matched / (matched + missing)
+        and the overall rate is matched / raw JD total.
+        """
+        summary = cls(source="json")
+        for name in CATEGORIES:
+            section = json_result.get(name) or {}
+            matched = len(section.get("matched", []))
+            missing = len(section.get("missing", []))
+            setattr(summary, name, CategoryMatch(
+                cv_total=len(cv_skills.get(name, [])),
+                jd_total=len(jd_skills.get(name, [])),
+                matched=matched,
+                missing=missing,
+                match_rate=_rate(matched, matched + missing),
+            ))
+            summary.matched += matched
+            summary.missing += missing
+            summary.jd_total += len(jd_skills.get(name, []))
+        summary.match_rate = round((summary.matched / max(summary.jd_total, 1)) * 100)
+        return summary
+
+    @classmethod
+    def from_text(cls, content: str) -> Optional["SkillsMatchSummary"]:
+        """
+        Summary parsed from formatted comparison text (one pass over the lines)
+
+        Returns:
+            The summary, or None if the text has no recognizable rates
+        """
+        if not content:
+            return None
+        summary = cls(source="text")
+        found = False
+        overall: Optional[float] = None
+        section: Optional[str] = None
+
+        for line in content.splitlines():
+            stripped = line.strip()
+            if overall is None:
+                overall_match = _OVERALL_RATE_RE.match(stripped)
+                if overall_match:
+                    overall = float(overall_match.group(1))
+                    continue
+
+            if stripped.startswith("🔹"):
+                section = next((key for label, key in _SECTION_LABELS.items() if label in stripped), None)
+                continue
+
+            if "❌ MISSING FROM CV" in stripped and section:
+                missing_match = _MISSING_ITEMS_RE.search(stripped)
+                if missing_match:
+                    stats = summary.category(section)
+                    stats.missing = max(stats.missing, int(missing_match.group(1)))
+                continue
+
+            label = next((label for label in _TABLE_LABELS if stripped.startswith(label)), None)
+            if label is None:
+                continue
+            legacy = _LEGACY_RATE_RE.match(stripped)
+            stats = summary.category(_TABLE_LABELS[label])
+            if legacy:
+                if not stats.match_rate:
+                    stats.match_rate = float(legacy.group(2))
+                    found = True
+                continue
+            # Table row: Category  CV Total  JD Total  Matched  Missing  Match Rate (%)
+            parts = stripped[len(label):].split()
+            if len(parts) >= 5:
+                try:
+                    stats.cv_total, stats.jd_total, stats.matched, stats.missing = (int(p) for p in parts[-5:-1])
+                    stats.match_rate = float(parts[-1])
+                    found = True
+                except ValueError:
+                    pass
+
+        if not found and overall is None:
+            return None
+        for name in CATEGORIES:
+            stats = summary.category(name)
+            summary.jd_total += stats.jd_total
+            summary.matched += stats.matched
+            summary.missing += stats.missing
+        if overall is None:
+            overall = int(sum(summary.category(name).match_rate for name in CATEGORIES) / len(CATEGORIES))
+        summary.match_rate = overall
+        return summary
+
+    @classmethod
+    def from_dict(cls, data: Any) -> Optional["SkillsMatchSummary"]:
+        """Summary from its saved form (an instance is returned as is; None if unusable)"""
+        if isinstance(data, cls):
+            return data
+        if not isinstance(data, dict) or not isinstance(data.get("categories"), dict):
+            return None
+        summary = cls(source=data.get("source", "json"))
+        for name in CATEGORIES:
+            stats = data["categories"].get(name) or {}
+            setattr(summary, name, CategoryMatch(**{
+                key: stats[key] for key in CategoryMatch.__dataclass_fields__ if key in stats
+            }))
+        overall = data.get("overall") or {}
+        summary.jd_total = overall.get("jd_total", 0)
+        summary.matched = overall.get("matched", 0)
+        summary.missing = overall.get("missing", 0)
+        summary.match_rate = overall.get("match_rate", 0.0)
+        return summary
+
+    @classmethod
+    def from_entry(cls, entry: Dict[str, Any]) -> Optional["SkillsMatchSummary"]:
+        """Summary of a saved preextracted comparison entry (parsing the text of older entries)"""
+        return cls.from_dict(entry.get("match_summary")) or cls.from_text(entry.get("content", ""))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-compatible form saved with the comparison entry"""
+        return {
+            "schema_version": SUMMARY_SCHEMA_VERSION,
+            "source": self.source,
+            "categories": {name: asdict(self.category(name)) for name in CATEGORIES},
+            "overall": {
+                "jd_total": self.jd_total,
+                "matched": self.matched,
+                "missing": self.missing,
+                "match_rate": self.match_rate,
+            },
+        }
+
+    def match_rates(self) -> Dict[str, int]:
+        """Integer match rates per category and overall (the routes' match_rates shape)"""
+        rates = {name: int(self.category(name).match_rate) for name in CATEGORIES}
+        rates["overall"] = int(self.match_rate)
+        return rates
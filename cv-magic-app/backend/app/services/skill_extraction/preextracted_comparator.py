@@ -9,6 +9,7 @@ This module exposes both text and JSON comparison modes:
 - run_comparison(ai_service, cv_skills, jd_skills, ...) -> str (legacy)
 - build_json_prompt(cv_skills, jd_skills) -> str (strict JSON schema)
 - run_comparison_json(ai_service, cv_skills, jd_skills, ...) -> Dict (strict JSON)
+- execute_skills_semantic_comparison_structured(...) -> (str, SkillsMatchSummary)
 
 JSON mode adds normalization, truncation guards, and a deterministic output
 schema suitable for programmatic reuse while preserving the legacy output
@@ -16,311 +17,41 @@ for the frontend.
 """
 
 import logging
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 import json
 import re
 
-logger = logging.getLogger(__name__)
+from app.services.skill_extraction.match_summary import SkillsMatchSummary
 
-# SEMANTIC SKILL MAPPING for improved matching accuracy
-SEMANTIC_SKILL_MAPPING = {
-    # Soft Skills Equivalents - FIXED MATCHING
-    "communication": [
-        "communication",
-        "communication skills",
-        "interpersonal skills",
-        "verbal communication",
-        "written communication",
-        "presentation skills"
-    ],
-    "leadership": [
-        "leadership",
-        "team leadership",
-        "mentoring",
-        "course facilitation",
-        "student engagement",
-        "team management"
-    ],
-    "teamwork": [
-        "teamwork",
-        "collaboration",
-        "collaborative",
-        "team collaboration",
-        "cross-functional collaboration"
-    ],
-    "collaboration": [
-        "collaboration",
-        "teamwork",
-        "collaborative",
-        "team collaboration",
-        "cross-functional collaboration"
-    ],
-    "problem-solving": [
-        "problem-solving",
-        "problem solving",
-        "analytical thinking",
-        "critical thinking",
-        "troubleshooting",
-        "solution-oriented"
-    ],
-    "organised": [
-        "organised",
-        "organized",
-        "manage and prioritise multiple tasks",
-        "task management", 
-        "time management",
-        "prioritization",
-        "manage multiple tasks",
-        "priority management"
-    ],
-    "project management": [
-        "project management",
-        "manage multiple projects", 
-        "task prioritization",
-        "deliver multiple projects",
-        "project coordination",
-        "task management",
-        "manage and prioritise multiple tasks",
-        "time management",
-        "manage multiple tasks"
-    ],
-    "detail-oriented": [
-        "detail-oriented",
-        "detail oriented",
-        "attention to detail",
-        "accuracy",
-        "precision",
-        "99% accuracy",
-        "data integrity",
-        "quality assurance"
-    ],
-    "motivated": [
-        "motivated",
-        "self-motivated",
-        "proactive",
-        "self-driven",
-        "initiative",
-        "enthusiastic",
-        "dynamic"
-    ],
-    "stakeholder management": [
-        "stakeholder management",
-        "stakeholder engagement",
-        "work with stakeholders",
-        "stakeholder interaction",
-        "business stakeholder collaboration",
-        "collaboration",
-        "interpersonal skills"
-    ],
-    "adaptability": [
-        "adaptability",
-        "adaptable",
-        "flexible",
-        "dynamic environments",
-        "diverse industries",
-        "cross-functional"
-    ],
-    
-    # Technical Skills Equivalents - IMPROVED MATCHING
-    "sql": [
-        "sql",
-        "database management",
-        "database querying",
-        "relational databases",
-        "postgresql",
-        "mysql"
-    ],
-    "excel": [
-        "excel",
-        "spreadsheets",
-        "microsoft excel"
-    ],
-    "power bi": [
-        "power bi",
-        "business intelligence",
-        "data visualization",
-        "dashboard creation",
-        "reporting"
-    ],
-    "tableau": [
-        "tableau",
-        "data visualization",
-        "dashboard creation",
-        "business intelligence"
-    ],
-    "vba": [
-        "vba",
-        "visual basic for applications",
-        "excel vba",
-        "macro programming"
-    ],
-    "data analysis": [
-        "data analysis",
-        "data analytics",
-        "analytics",
-        "statistical analysis"
-    ],
-    "data mining": [
-        "data mining",
-        "pattern recognition",
-        "knowledge discovery"
-    ],
-    "data modeling": [
-        "data modeling",
-        "data science",
-        "machine learning",
-        "statistical modeling"
-    ],
-    "data segmentation": [
-        "data segmentation",
-        "customer segmentation",
-        "segmentation strategies"
-    ],
-    "data warehousing": [
-        "data warehousing",
-        "data warehouse",
-        "etl",
-        "data storage"
-    ],
-    "database management": [
-        "database management",
-        "sql",
-        "relational databases",
-        "postgresql",
-        "mysql"
-    ],
-    "extracting data": [
-        "extracting data",
-        "data extraction",
-        "sql",
-        "database querying",
-        "data retrieval"
-    ],
-    "querying": [
-        "querying",
-        "sql",
-        "database querying",
-        "data retrieval"
-    ],
-    "relational databases": [
-        "relational databases",
-        "sql",
-        "database management",
-        "postgresql",
-        "mysql"
-    ],
-    "report creation": [
-        "report creation",
-        "reporting",
-        "data visualization",
-        "dashboard creation",
-        "power bi",
-        "tableau"
-    ],
-    "spreadsheets": [
-        "spreadsheets",
-        "excel",
-        "microsoft excel"
-    ],
-    
-    # Domain Keywords Equivalents
-    "evidence-based decision making": [
-        "data-driven decision making",
-        "data-driven projects",
-        "analytical decision making"
-    ],
-    "multi-channel communication": [
-        "communication strategies",
-        "stakeholder communication",
-        "integrated communication"
-    ]
-}
-
-# DOMAIN CLUSTERS for related field matching
-DOMAIN_CLUSTERS = {
-    "data_analytics_cluster": [
-        "business intelligence",
-        "data science", 
-        "analytics",
-        "data analysis",
-        "data visualization",
-        "dashboard creation",
-        "data analytics",
-        "statistical analysis"
-    ],
-    "database_cluster": [
-        "data warehouse",
-        "relational databases", 
-        "database management",
-        "sql databases",
-        "sql",
-        "data storage"
-    ],
-    "marketing_cluster": [
-        "direct marketing",
-        "campaign outcomes",
-        "marketing analytics",
-        "customer segmentation",
-        "segmentation strategies"
-    ],
-    "reporting_cluster": [
-        "reporting",
-        "dashboard creation",
-        "data visualization",
-        "power bi",
-        "tableau",
-        "insights delivery"
-    ]
-}
-
-# TRANSFERABLE SKILLS assessment
-TRANSFERABLE_SKILLS = {
-    "vba": {
-        "base_skills": ["excel", "spreadsheets", "formulas"],
-        "difficulty": "easy",
-        "time_to_learn": "2-4 weeks",
-        "note": "VBA is commonly learned by Excel users"
-    },
-    "tableau": {
-        "base_skills": ["power bi", "data visualization", "dashboard creation"],
-        "difficulty": "medium", 
-        "time_to_learn": "1-2 months",
-        "note": "Similar BI tools, transferable skills"
-    },
-    "data warehouse": {
-        "base_skills": ["sql", "database", "relational databases"],
-        "difficulty": "medium",
-        "time_to_learn": "2-3 months", 
-        "note": "SQL experience provides foundation"
-    },
-    "segmentation strategies": {
-        "base_skills": ["data analysis", "statistical analysis", "analytics"],
-        "difficulty": "easy",
-        "time_to_learn": "3-6 weeks",
-        "note": "Data analysis skills transfer to segmentation"
-    }
-}
+from app.services.matching.skill_knowledge_base import (
+    SEMANTIC_SKILL_MAPPING,
+    TRANSFERABLE_SKILLS,
+    SEMANTIC_EQUIVALENTS_INDEX,
+    SEMANTIC_KEYS_INDEX,
+    DOMAIN_CLUSTERS_INDEX,
+    TRANSFERABLE_BASE_INDEX,
+)
+
+logger = logging.getLogger(__name__)
 
 
 def find_semantic_matches(cv_skills: List[str], jd_requirement: str) -> Tuple[bool, str, str]:
     """Find semantic matches between CV skills and JD requirements"""
     jd_normalized = jd_requirement.lower().strip()
+    # Mapping keys whose equivalents overlap each CV skill
+    cv_keys = [(cv_skill, SEMANTIC_EQUIVALENTS_INDEX.related_groups(cv_skill.lower().strip())) for cv_skill in cv_skills]
     
     # Check direct equivalents in semantic mapping
     if jd_normalized in SEMANTIC_SKILL_MAPPING:
-        for cv_skill in cv_skills:
-            cv_normalized = cv_skill.lower().strip()
-            for equivalent in SEMANTIC_SKILL_MAPPING[jd_normalized]:
-                if equivalent in cv_normalized or cv_normalized in equivalent:
-                    return True, cv_skill, "semantic match"
+        for cv_skill, keys in cv_keys:
+            if jd_normalized in keys:
+                return True, cv_skill, "semantic match"
     
     # Check reverse mapping - CV skill mapped to JD requirement
-    for cv_skill in cv_skills:
-        cv_normalized = cv_skill.lower().strip()
-        for key, equivalents in SEMANTIC_SKILL_MAPPING.items():
-            if any(equiv in cv_normalized or cv_normalized in equiv for equiv in equivalents):
-                if key in jd_normalized or jd_normalized in key:
-                    return True, cv_skill, "reverse semantic match"
+    jd_keys = set(SEMANTIC_KEYS_INDEX.related_groups(jd_normalized))
+    for cv_skill, keys in cv_keys:
+        if any(key in jd_keys for key in keys):
+            return True, cv_skill, "reverse semantic match"
     
     return False, "", ""
 
@@ -328,15 +59,21 @@ def find_semantic_matches(cv_skills: List[str], jd_requirement: str) -> Tuple[bo
 def find_domain_matches(cv_domains: List[str], jd_requirement: str) -> Tuple[bool, str, str]:
     """Find matches within domain clusters"""
     jd_normalized = jd_requirement.lower().strip()
-    
-    for cluster_name, cluster_terms in DOMAIN_CLUSTERS.items():
-        if any(term in jd_normalized or jd_normalized in term for term in cluster_terms):
-            # Check if CV has any other terms from the same cluster
-            for cv_domain in cv_domains:
-                cv_normalized = cv_domain.lower().strip()
-                if any(term in cv_normalized or cv_normalized in term for term in cluster_terms):
-                    if cv_normalized != jd_normalized:  # Don't match identical
-                        return True, cv_domain, f"domain cluster match ({cluster_name})"
+    jd_clusters = DOMAIN_CLUSTERS_INDEX.related_groups(jd_normalized)
+    if not jd_clusters:
+        return False, "", ""
+    
+    cv_entries = []
+    for cv_domain in cv_domains:
+        cv_normalized = cv_domain.lower().strip()
+        cv_entries.append((cv_domain, cv_normalized, set(DOMAIN_CLUSTERS_INDEX.related_groups(cv_normalized))))
+    
+    for cluster_name in jd_clusters:
+        # Check if CV has any other terms from the same cluster
+        for cv_domain, cv_normalized, cv_clusters in cv_entries:
+            if cluster_name in cv_clusters:
+                if cv_normalized != jd_normalized:  # Don't match identical
+                    return True, cv_domain, f"domain cluster match ({cluster_name})"
     
     return False, "", ""
 
@@ -351,15 +88,14 @@ def assess_transferable_skill(missing_skill: str, cv_skills: List[str]) -> Tuple
         # Check if CV has base skills
         for cv_skill in cv_skills:
             cv_normalized = cv_skill.lower().strip()
-            for base_skill in transfer_info["base_skills"]:
-                if base_skill in cv_normalized or cv_normalized in base_skill:
-                    return True, {
-                        "base_skill": cv_skill,
-                        "missing_skill": missing_skill,
-                        "difficulty": transfer_info["difficulty"],
-                        "time_to_learn": transfer_info["time_to_learn"],
-                        "note": transfer_info["note"]
-                    }
+            if missing_normalized in TRANSFERABLE_BASE_INDEX.related_groups(cv_normalized):
+                return True, {
+                    "base_skill": cv_skill,
+                    "missing_skill": missing_skill,
+                    "difficulty": transfer_info["difficulty"],
+                    "time_to_learn": transfer_info["time_to_learn"],
+                    "note": transfer_info["note"]
+                }
     
     return False, {}
 
@@ -567,6 +303,25 @@ Return only this formatted analysis.
 
 async def execute_skills_semantic_comparison(ai_service, cv_skills: Dict[str, list], jd_skills: Dict[str, list], user: Any, temperature: float = 0.0, max_tokens: int = 3000) -> str:
     """Execute the comparison prompt using the centralized AI service and return formatted text."""
+    text, _ = await execute_skills_semantic_comparison_structured(ai_service, cv_skills, jd_skills, user, temperature, max_tokens)
+    return text
+
+
+async def execute_skills_semantic_comparison_structured(
+    ai_service,
+    cv_skills: Dict[str, list],
+    jd_skills: Dict[str, list],
+    user: Any,
+    temperature: float = 0.0,
+    max_tokens: int = 3000
+) -> Tuple[str, Optional[SkillsMatchSummary]]:
+    """
+    Execute the comparison and return the formatted text with its match summary.
+
+    Returns:
+        (formatted text, summary) - the summary comes from the JSON result, or is
+        parsed from the text in text-mode fallback (None if it has no rates)
+    """
     try:
         # Use JSON mode for consistent structured output
         json_result = await execute_skills_comparison_with_json_output(ai_service, cv_skills, jd_skills, user, temperature, max_tokens)
@@ -592,10 +347,11 @@ async def execute_skills_semantic_comparison(ai_service, cv_skills: Dict[str, li
                     temperature=temperature,
                     max_tokens=max_tokens
                 )
-                return response.content
+                return response.content, SkillsMatchSummary.from_text(response.content)
         
         # Convert JSON result to formatted text for backward compatibility
-        return _format_json_to_text(json_result, cv_skills, jd_skills)
+        summary = SkillsMatchSummary.from_comparison(json_result, cv_skills, jd_skills)
+        return _format_json_to_text(json_result, cv_skills, jd_skills, summary), summary
         
     except Exception as e:
         # Fallback to original text-based comparison if JSON fails
@@ -607,7 +363,7 @@ async def execute_skills_semantic_comparison(ai_service, cv_skills: Dict[str, li
             temperature=temperature,
             max_tokens=max_tokens
         )
-        return response.content
+        return response.content, SkillsMatchSummary.from_text(response.content)
 
 
 # -------------------------
@@ -1050,68 +806,34 @@ def _validate_comparison_results(json_result: Dict[str, Any], cv_skills: Dict[st
         return False
 
 
-def _format_json_to_text(json_result: Dict[str, Any], cv_skills: Dict[str, list], jd_skills: Dict[str, list]) -> str:
+def _format_json_to_text(
+    json_result: Dict[str, Any],
+    cv_skills: Dict[str, list],
+    jd_skills: Dict[str, list],
+    summary: Optional[SkillsMatchSummary] = None
+) -> str:
     """Convert JSON comparison result to formatted text output for backward compatibility."""
     
     # CRITICAL FIX: Use RAW skills for counts to match initial extraction numbers
     # Do NOT deduplicate here as it causes count mismatches with initial extraction
-    cv_raw_counts = {
-        'technical_skills': len(cv_skills.get('technical_skills', [])),
-        'soft_skills': len(cv_skills.get('soft_skills', [])),
-        'domain_keywords': len(cv_skills.get('domain_keywords', []))
-    }
-    
-    jd_raw_counts = {
-        'technical_skills': len(jd_skills.get('technical_skills', [])),
-        'soft_skills': len(jd_skills.get('soft_skills', [])),
-        'domain_keywords': len(jd_skills.get('domain_keywords', []))
-    }
-    
-    cv_total = cv_raw_counts['technical_skills'] + cv_raw_counts['soft_skills'] + cv_raw_counts['domain_keywords']
-    jd_total = jd_raw_counts['technical_skills'] + jd_raw_counts['soft_skills'] + jd_raw_counts['domain_keywords']
-    
-    # Calculate match statistics
-    total_matched = 0
-    total_missing = 0
-    
-    for category in ['technical_skills', 'soft_skills', 'domain_keywords']:
-        if category in json_result:
-            total_matched += len(json_result[category].get('matched', []))
-            total_missing += len(json_result[category].get('missing', []))
-    
-    # Calculate match rate as matched / total_requirements
-    match_rate = round((total_matched / max(jd_total, 1)) * 100)
-    
-    # Calculate match rates for each category correctly
-    tech_matched = len(json_result.get('technical_skills', {}).get('matched', []))
-    tech_missing = len(json_result.get('technical_skills', {}).get('missing', []))
-    tech_total = tech_matched + tech_missing
-    tech_rate = round((tech_matched / max(tech_total, 1)) * 100) if tech_total > 0 else 0
-    
-    soft_matched = len(json_result.get('soft_skills', {}).get('matched', []))
-    soft_missing = len(json_result.get('soft_skills', {}).get('missing', []))
-    soft_total = soft_matched + soft_missing
-    soft_rate = round((soft_matched / max(soft_total, 1)) * 100) if soft_total > 0 else 0
-    
-    domain_matched = len(json_result.get('domain_keywords', {}).get('matched', []))
-    domain_missing = len(json_result.get('domain_keywords', {}).get('missing', []))
-    domain_total = domain_matched + domain_missing
-    domain_rate = round((domain_matched / max(domain_total, 1)) * 100) if domain_total > 0 else 0
+    if summary is None:
+        summary = SkillsMatchSummary.from_comparison(json_result, cv_skills, jd_skills)
+    tech, soft, domain = summary.technical_skills, summary.soft_skills, summary.domain_keywords
 
     # Build formatted output using RAW counts to match initial extraction
     output = f"""🎯 OVERALL SUMMARY
 ----------------------------------------
-Total Requirements: {jd_total}
-Matched: {total_matched}
-Missing: {total_missing}
-Match Rate: {match_rate}%
+Total Requirements: {summary.jd_total}
+Matched: {summary.matched}
+Missing: {summary.missing}
+Match Rate: {summary.match_rate}%
 
 📊 SUMMARY TABLE
 --------------------------------------------------------------------------------
 Category              CV Total  JD Total   Matched   Missing  Match Rate (%)
-Technical Skills            {cv_raw_counts['technical_skills']:2d}         {jd_raw_counts['technical_skills']:2d}         {tech_matched:2d}         {tech_missing:2d}           {tech_rate:2d}
-Soft Skills                  {cv_raw_counts['soft_skills']:2d}         {jd_raw_counts['soft_skills']:2d}         {soft_matched:2d}         {soft_missing:2d}           {soft_rate:2d}
-Domain Keywords             {cv_raw_counts['domain_keywords']:2d}         {jd_raw_counts['domain_keywords']:2d}         {domain_matched:2d}         {domain_missing:2d}           {domain_rate:2d}
+Technical Skills            {tech.cv_total:2d}         {tech.jd_total:2d}         {tech.matched:2d}         {tech.missing:2d}           {tech.match_rate:2d}
+Soft Skills                  {soft.cv_total:2d}         {soft.jd_total:2d}         {soft.matched:2d}         {soft.missing:2d}           {soft.match_rate:2d}
+Domain Keywords             {domain.cv_total:2d}         {domain.jd_total:2d}         {domain.matched:2d}         {domain.missing:2d}           {domain.match_rate:2d}
 
 🧠 DETAILED AI ANALYSIS
 --------------------------------------------------------------------------------"""
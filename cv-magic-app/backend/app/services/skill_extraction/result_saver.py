@@ -710,7 +710,13 @@ class SkillExtractionResultSaver:
             logger.error(f"❌ Failed to append analyze match: {str(e)}")
             raise e
 
-    def append_preextracted_comparison(self, raw_analysis: str, company_name: str, saved_file_path: Optional[str] = None) -> str:
+    def append_preextracted_comparison(
+        self,
+        raw_analysis: str,
+        company_name: str,
+        saved_file_path: Optional[str] = None,
+        match_summary: Optional[Dict] = None
+    ) -> str:
         """
         Append pre-extracted skills comparison output to the existing log file.
         Mirrors the analyze-match append behavior to keep a single consolidated log.
@@ -719,6 +725,7 @@ class SkillExtractionResultSaver:
             raw_analysis: The raw formatted comparison text
             company_name: Company name for file path
             saved_file_path: Optional path to an existing file to append to
+            match_summary: SkillsMatchSummary.to_dict() of the comparison, saved with the text
         
         Returns:
             str: Path to the updated file
@@ -781,11 +788,14 @@ class SkillExtractionResultSaver:
                 if "preextracted_comparison_entries" not in data:
                     data["preextracted_comparison_entries"] = []
                 current_model = get_request_model() or "unknown"
-                data["preextracted_comparison_entries"].append({
+                entry = {
                     "timestamp": timestamp,
                     "model_used": current_model,
                     "content": raw_analysis
-                })
+                }
+                if match_summary is not None:
+                    entry["match_summary"] = match_summary
+                data["preextracted_comparison_entries"].append(entry)
                 with open(file_path, 'w', encoding='utf-8') as f:
                     json.dump(data, f, ensure_ascii=False, indent=2)
             except Exception as e:
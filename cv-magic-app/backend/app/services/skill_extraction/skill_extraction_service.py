@@ -17,7 +17,7 @@ from app.models.cv import CV, JobApplication
 from app.services.cv_processor import cv_processor
 from app.services.job_scraper import scrape_job_description_async
 from app.ai.ai_service import ai_service
-from .prompt_templates import SkillExtractionPrompts
+from app.ai.prompt_registry import prompt_registry
 from .response_parser import SkillExtractionParser
 from .result_saver import result_saver
 
@@ -27,7 +27,6 @@ class SkillExtractionService:
     """Main service for skill extraction with caching and AI integration"""
     
     def __init__(self):
-        self.prompts = SkillExtractionPrompts()
         self.parser = SkillExtractionParser()
     
     async def analyze_skills(
@@ -127,7 +126,7 @@ class SkillExtractionService:
                 return None
             
             # Extract text from file
-            extraction_result = cv_processor.extract_text_from_file(file_path)
+            extraction_result = await cv_processor.extract_text_from_file_async(file_path)
             
             if not extraction_result['success']:
                 logger.error(f"❌ Failed to extract CV text: {extraction_result['error']}")
@@ -241,8 +240,8 @@ class SkillExtractionService:
         # Extract skills using AI
         logger.info("🤖 Extracting CV skills using AI service")
         
-        prompt = self.prompts.get_skill_extraction_template("CV", cv_text)
-        system_prompt = self.prompts.get_system_prompt("CV")
+        prompt = prompt_registry.render("skill_extraction", "CV", cv_text).text
+        system_prompt = prompt_registry.render("skill_extraction_system", "CV").text
         
         # Call AI service
         ai_response = await ai_service.generate_response(
@@ -296,8 +295,8 @@ class SkillExtractionService:
         # Extract skills using AI
         logger.info("🤖 Extracting JD skills using AI service")
         
-        prompt = self.prompts.get_skill_extraction_template("Job Description", jd_text)
-        system_prompt = self.prompts.get_system_prompt("Job Description")
+        prompt = prompt_registry.render("skill_extraction", "Job Description", jd_text).text
+        system_prompt = prompt_registry.render("skill_extraction_system", "Job Description").text
         
         # Call AI service
         ai_response = await ai_service.generate_response(
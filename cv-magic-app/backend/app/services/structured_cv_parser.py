@@ -3,8 +3,12 @@ LLM-Based Structured CV Parser
 
 This service uses the centralized AI system to parse CV content from original_cv.txt
 into a structured JSON format (original_cv.json) with comprehensive sections and metadata.
+Parses are cached by content hash, prompt version and model (see cv_parse_cache).
 """
 
+import asyncio
+import copy
+import hashlib
 import logging
 import json
 import os
@@ -13,15 +17,27 @@ from typing import Dict, Any, Optional, List, Union
 from pathlib import Path
 
 from ..ai.ai_service import ai_service
+from ..utils.single_flight import SingleFlight
+from .cv_parse_cache import cv_parse_cache, cv_text_hash
 
 logger = logging.getLogger(__name__)
 
+PARSER_SYSTEM_PROMPT = "You are an expert CV parser that preserves original content structure. Your primary goal is to maintain the exact formatting, bullet points, and descriptions as they appear in the original CV while organizing them into the specified JSON structure. Do NOT break down, summarize, or restructure the original content - preserve it exactly as written."
+
 
 class LLMStructuredCVParser:
     """LLM-based parser for converting CV text into structured format"""
 
     def __init__(self):
         self.default_structure = self._get_default_structure()
+        self.prompt_version = self._get_prompt_version()
+        self._parse_single_flight = SingleFlight("cv_parse_single_flight")
+    
+    def _get_prompt_version(self) -> str:
+        """Parsing version plus a hash of the prompts, so editing either invalidates cached parses"""
+        prompts = f"{PARSER_SYSTEM_PROMPT}\n{self._create_parsing_prompt('')}"
+        digest = hashlib.sha256(prompts.encode("utf-8")).hexdigest()[:16]
+        return f"{self.default_structure['metadata']['parsing_version']}:{digest}"
         
     def _get_default_structure(self) -> Dict[str, Any]:
         """Get the default CV structure with empty values"""
@@ -122,22 +138,46 @@ class LLMStructuredCVParser:
             return empty_structure
 
     async def _parse_with_llm(self, cv_text: str, user: Any = None) -> Dict[str, Any]:
-        """Use LLM to parse CV text into structured format"""
+        """Use LLM to parse CV text into structured format, reusing a cached parse of the same text"""
+        content_hash = cv_text_hash(cv_text)
+        if not user:
+            # No user means no model to resolve, but a parse of the same text by any model still applies
+            cached = await asyncio.to_thread(cv_parse_cache.get, content_hash, self.prompt_version, None)
+            if cached is not None:
+                logger.info(f"⚡ [CV_PARSE_CACHE] Hit for {content_hash[:12]} (no user, any model)")
+                return cached
+            logger.error("❌ [STRUCTURED_CV_PARSER] No user provided for AI service call")
+            raise ValueError("User context is required for AI operations")
+        
+        provider = ai_service.resolve_provider(user)
+        model_key = f"{provider.provider_name}:{provider.model_name}"
+        cached = await asyncio.to_thread(cv_parse_cache.get, content_hash, self.prompt_version, model_key)
+        if cached is not None:
+            logger.info(f"⚡ [CV_PARSE_CACHE] Hit for {content_hash[:12]} ({model_key})")
+            return cached
+        
+        async def _parse() -> Dict[str, Any]:
+            structured_cv = await self._parse_uncached(cv_text, user, provider)
+            await asyncio.to_thread(cv_parse_cache.set, content_hash, self.prompt_version, model_key, structured_cv)
+            return structured_cv
+        
+        # Concurrent uploads of the same CV share one LLM call; each caller gets its own copy
+        key = SingleFlight.make_key(content_hash, self.prompt_version, model_key)
+        return copy.deepcopy(await self._parse_single_flight.do(key, _parse))
+
+    async def _parse_uncached(self, cv_text: str, user: Any, provider: Any) -> Dict[str, Any]:
+        """Parse CV text with the LLM (no cache)"""
         try:
             # Create the parsing prompt
             parsing_prompt = self._create_parsing_prompt(cv_text)
             
-            # Get response from AI service
-            if not user:
-                logger.error("❌ [STRUCTURED_CV_PARSER] No user provided for AI service call")
-                raise ValueError("User context is required for AI operations")
-                
             ai_response = await ai_service.generate_response(
                 prompt=parsing_prompt,
                 user=user,
-                system_prompt="You are an expert CV parser that preserves original content structure. Your primary goal is to maintain the exact formatting, bullet points, and descriptions as they appear in the original CV while organizing them into the specified JSON structure. Do NOT break down, summarize, or restructure the original content - preserve it exactly as written.",
+                system_prompt=PARSER_SYSTEM_PROMPT,
                 max_tokens=4000,
-                temperature=0.0
+                temperature=0.0,
+                provider=provider
             )
             
             # Parse the JSON response
@@ -146,9 +186,9 @@ class LLMStructuredCVParser:
                 
                 # Validate and merge with default structure
                 structured_cv = self._merge_with_default_structure(parsed_data)
-                structured_cv["metadata"]["ai_model_used"] = ai_service.current_model
+                structured_cv["metadata"]["ai_model_used"] = provider.model_name
                 
-                logger.info(f"Successfully parsed CV using {ai_service.current_model}")
+                logger.info(f"Successfully parsed CV using {provider.model_name}")
                 return structured_cv
                 
             except json.JSONDecodeError as e:
@@ -158,7 +198,7 @@ class LLMStructuredCVParser:
                 if json_match:
                     parsed_data = json.loads(json_match)
                     structured_cv = self._merge_with_default_structure(parsed_data)
-                    structured_cv["metadata"]["ai_model_used"] = ai_service.current_model
+                    structured_cv["metadata"]["ai_model_used"] = provider.model_name
                     return structured_cv
                 else:
                     raise e
@@ -327,7 +367,8 @@ Return ONLY the JSON object with preserved original content.
 
     def _merge_with_default_structure(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
         """Merge parsed data with default structure to ensure completeness"""
-        structured_cv = self.default_structure.copy()
+        # Deep copy: nested defaults (e.g. metadata.parsing_notes) must not be shared between parses
+        structured_cv = copy.deepcopy(self.default_structure)
         
         # Recursively merge the structures
         def merge_dict(default: Dict, parsed: Dict) -> Dict:
@@ -6,18 +6,58 @@ with encryption for security.
 """
 
 import logging
+import threading
+import time
 from typing import Dict, Optional, Any, Tuple, List
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
-from app.database import get_database
-from app.models.user_api_keys import UserAPIKey
+from app.config import settings
+from app.database import get_database, run_in_session
+from app.models.user_api_keys import UserAPIKey, decrypt_api_key
 from app.models.auth import UserData
 
 logger = logging.getLogger(__name__)
 
 
+class CachedAPIKey:
+    """
+    Session-independent snapshot of one user_api_keys row.
+    
+    Holds the key encrypted as stored; the decrypted value is kept only for
+    a fixed time after it was decrypted, however often it is used meanwhile.
+    """
+    
+    __slots__ = ("user_id", "provider", "encrypted_key", "is_valid", "last_validated", "created_at",
+                 "_plaintext", "_plaintext_expires")
+    
+    def __init__(self, row: UserAPIKey):
+        self.user_id = row.user_id
+        self.provider = row.provider
+        self.encrypted_key = row.encrypted_key
+        self.is_valid = bool(row.is_valid)
+        self.last_validated = row.last_validated
+        self.created_at = row.created_at
+        self._plaintext: Optional[str] = None
+        self._plaintext_expires = 0.0
+    
+    def get_api_key(self, plaintext_ttl: float) -> str:
+        """Decrypted API key, decrypting again once the short-lived copy expired"""
+        now = time.monotonic()
+        plaintext = self._plaintext
+        if plaintext is None or now >= self._plaintext_expires:
+            plaintext = decrypt_api_key(self.user_id, self.encrypted_key)
+            self._plaintext_expires = now + plaintext_ttl
+            self._plaintext = plaintext
+        return plaintext
+    
+    def drop_plaintext(self, now: float) -> None:
+        """Forget the decrypted key if it is past its lifetime"""
+        if self._plaintext is not None and now >= self._plaintext_expires:
+            self._plaintext = None
+
+
 class UserAPIKeyManager:
     """
     Manages user-specific API keys with encryption and database persistence.
@@ -30,8 +70,137 @@ class UserAPIKeyManager:
     - Provider-specific key management
     """
     
-    def __init__(self):
+    def __init__(self, cache_ttl: float = 300.0, plaintext_ttl: float = 60.0, max_cached_users: int = 1000):
         self._valid_providers = ['openai', 'anthropic', 'deepseek']
+        self.cache_ttl = cache_ttl
+        self.plaintext_ttl = plaintext_ttl
+        self.max_cached_users = max_cached_users
+        # user_id -> (loaded_at, provider -> CachedAPIKey), oldest load first
+        self._cache: Dict[str, Tuple[float, Dict[str, CachedAPIKey]]] = {}
+        # user_id -> sequence number of the user's last invalidation; a load only caches if
+        # no invalidation happened meanwhile. Entries of users with nothing cached are folded
+        # into _generation_floor, so the dict stays as small as the cache.
+        self._generations: Dict[str, int] = {}
+        self._generation_floor = 0
+        self._invalidation_seq = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "loads": 0, "invalidations": 0, "evictions": 0}
+    
+    def _purge_expired(self, now: float) -> None:
+        """Drop expired users and every expired decrypted key; call with the lock held"""
+        expired = [user_id for user_id, (loaded_at, _) in self._cache.items() if now - loaded_at >= self.cache_ttl]
+        for user_id in expired:
+            del self._cache[user_id]
+        for _, keys in self._cache.values():
+            for key in keys.values():
+                key.drop_plaintext(now)
+        for user_id in [user_id for user_id in self._generations if user_id not in self._cache]:
+            # Raising the floor makes any load that started before this invalidation skip caching
+            self._generation_floor = max(self._generation_floor, self._generations.pop(user_id))
+    
+    def _cached_keys(self, user_id: str) -> Optional[Dict[str, CachedAPIKey]]:
+        """A user's cached keys if still fresh"""
+        with self._lock:
+            self._purge_expired(time.monotonic())
+            cached = self._cache.get(user_id)
+            if cached is None:
+                return None
+            self._stats["hits"] += 1
+            return cached[1]
+    
+    @staticmethod
+    def _query_keys(db: Session, user_id: str) -> Dict[str, CachedAPIKey]:
+        """All of a user's key rows in one query, as session-independent snapshots"""
+        rows = db.query(UserAPIKey).filter(UserAPIKey.user_id == user_id).all()
+        return {row.provider: CachedAPIKey(row) for row in rows}
+    
+    def _generation(self, user_id: str) -> int:
+        with self._lock:
+            return self._generations.get(user_id, self._generation_floor)
+    
+    def _store_keys(self, user_id: str, generation: int, loaded_at: float, keys: Dict[str, CachedAPIKey]) -> None:
+        """Cache a load, unless the user's keys were invalidated while it ran (it may be stale)"""
+        with self._lock:
+            self._stats["loads"] += 1
+            self._purge_expired(time.monotonic())
+            if self._generations.get(user_id, self._generation_floor) == generation:
+                self._cache.pop(user_id, None)
+                self._cache[user_id] = (loaded_at, keys)
+                while len(self._cache) > self.max_cached_users:
+                    del self._cache[next(iter(self._cache))]
+                    self._stats["evictions"] += 1
+    
+    def _user_keys(self, user: UserData) -> Dict[str, CachedAPIKey]:
+        """
+        All of a user's keys, loaded with one query and cached for cache_ttl
+        
+        Raises:
+            Exception: If the database query fails (nothing is cached then)
+        """
+        user_id = str(user.id)
+        keys = self._cached_keys(user_id)
+        if keys is not None:
+            return keys
+        
+        generation = self._generation(user_id)
+        loaded_at = time.monotonic()
+        keys = {}
+        for db in get_database():
+            keys = self._query_keys(db, user_id)
+        self._store_keys(user_id, generation, loaded_at, keys)
+        return keys
+    
+    async def _user_keys_async(self, user: UserData) -> Dict[str, CachedAPIKey]:
+        """_user_keys for code on the event loop (the query does not block it)"""
+        user_id = str(user.id)
+        keys = self._cached_keys(user_id)
+        if keys is not None:
+            return keys
+        
+        generation = self._generation(user_id)
+        loaded_at = time.monotonic()
+        keys = await run_in_session(lambda db: self._query_keys(db, user_id))
+        self._store_keys(user_id, generation, loaded_at, keys)
+        return keys
+    
+    def invalidate(self, user: UserData) -> None:
+        """Drop a user's cached keys (after any write to their rows)"""
+        user_id = str(user.id)
+        with self._lock:
+            self._invalidation_seq += 1
+            self._generations[user_id] = self._invalidation_seq
+            if self._cache.pop(user_id, None) is not None:
+                self._stats["invalidations"] += 1
+    
+    def get_all_api_key_info(self, user: UserData) -> Dict[str, CachedAPIKey]:
+        """
+        Key info (including validation status) for every provider the user has a key for
+        
+        Args:
+            user: User data
+            
+        Returns:
+            Dict of provider -> CachedAPIKey; empty on error
+        """
+        try:
+            return dict(self._user_keys(user))
+        except Exception as e:
+            logger.error(f"Failed to load API keys for user {user.email}: {e}")
+            return {}
+    
+    async def get_all_api_key_info_async(self, user: UserData) -> Dict[str, CachedAPIKey]:
+        """get_all_api_key_info for code on the event loop; also warms the cache for sync lookups"""
+        try:
+            return dict(await self._user_keys_async(user))
+        except Exception as e:
+            logger.error(f"Failed to load API keys for user {user.email}: {e}")
+            return {}
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Cache hit/load/invalidation counters"""
+        with self._lock:
+            self._purge_expired(time.monotonic())
+            return dict(self._stats, cached_users=len(self._cache))
     
     def set_api_key(self, user: UserData, provider: str, api_key: str) -> Tuple[bool, str]:
         """
@@ -68,6 +237,7 @@ class UserAPIKeyManager:
                     # Update existing key
                     existing_key.update_api_key(api_key)
                     db.commit()
+                    self.invalidate(user)
                     logger.info(f"Updated API key for user {user.email} and provider {provider}")
                     return True, f"API key updated for {provider}"
                 else:
@@ -79,6 +249,7 @@ class UserAPIKeyManager:
                     )
                     db.add(new_key)
                     db.commit()
+                    self.invalidate(user)
                     logger.info(f"Created new API key for user {user.email} and provider {provider}")
                     return True, f"API key set for {provider}"
             
@@ -103,17 +274,10 @@ class UserAPIKeyManager:
             str: The API key if available, None otherwise
         """
         try:
-            user_id = str(user.id)
-            
-            for db in get_database():
-                user_key = db.query(UserAPIKey).filter(
-                    UserAPIKey.user_id == user_id,
-                    UserAPIKey.provider == provider
-                ).first()
-                
-                if user_key:
-                    return user_key.get_api_key()
-                return None
+            user_key = self._user_keys(user).get(provider)
+            if user_key:
+                return user_key.get_api_key(self.plaintext_ttl)
+            return None
                 
         except Exception as e:
             logger.error(f"Failed to get API key for user {user.email} and provider {provider}: {e}")
@@ -123,7 +287,7 @@ class UserAPIKeyManager:
         """Check if API key exists for a user and provider"""
         return self.get_api_key(user, provider) is not None
     
-    def get_api_key_info(self, user: UserData, provider: str) -> Optional[UserAPIKey]:
+    def get_api_key_info(self, user: UserData, provider: str) -> Optional[CachedAPIKey]:
         """
         Get API key info (including validation status) for a specific user and provider
         
@@ -132,19 +296,11 @@ class UserAPIKeyManager:
             provider: The AI provider
             
         Returns:
-            UserAPIKey object if found, None otherwise
+            CachedAPIKey snapshot if found, None otherwise
         """
         try:
-            user_id = str(user.id)
+            return self._user_keys(user).get(provider)
             
-            for db in get_database():
-                user_key = db.query(UserAPIKey).filter(
-                    UserAPIKey.user_id == user_id,
-                    UserAPIKey.provider == provider
-                ).first()
-                
-                return user_key
-                
         except Exception as e:
             logger.error(f"Failed to get API key info for user {user.email} and provider {provider}: {e}")
             return None
@@ -223,6 +379,7 @@ class UserAPIKeyManager:
                 if user_key:
                     user_key.mark_as_valid()
                     db.commit()
+                    self.invalidate(user)
                     
         except Exception as e:
             logger.error(f"Failed to mark key as valid: {e}")
@@ -241,6 +398,7 @@ class UserAPIKeyManager:
                 if user_key:
                     user_key.mark_as_invalid()
                     db.commit()
+                    self.invalidate(user)
                     
         except Exception as e:
             logger.error(f"Failed to mark key as invalid: {e}")
@@ -256,37 +414,31 @@ class UserAPIKeyManager:
             Dict: Status information for all providers
         """
         try:
-            user_id = str(user.id)
             status_data = {}
             
-            for db in get_database():
-                user_keys = db.query(UserAPIKey).filter(
-                    UserAPIKey.user_id == user_id
-                ).all()
-                
-                # Create a map of provider -> key info
-                key_map = {key.provider: key for key in user_keys}
-                
-                # Check status for all valid providers
-                for provider in self._valid_providers:
-                    if provider in key_map:
-                        key_info = key_map[provider]
-                        status_data[provider] = {
-                            'has_api_key': True,
-                            'is_valid': key_info.is_valid,
-                            'last_validated': key_info.last_validated.isoformat() if key_info.last_validated else None,
-                            'created_at': key_info.created_at.isoformat() if key_info.created_at else None
-                        }
-                    else:
-                        status_data[provider] = {
-                            'has_api_key': False,
-                            'is_valid': False,
-                            'last_validated': None,
-                            'created_at': None
-                        }
-                
-                return status_data
-                
+            # Map of provider -> key info
+            key_map = self._user_keys(user)
+            
+            # Check status for all valid providers
+            for provider in self._valid_providers:
+                if provider in key_map:
+                    key_info = key_map[provider]
+                    status_data[provider] = {
+                        'has_api_key': True,
+                        'is_valid': key_info.is_valid,
+                        'last_validated': key_info.last_validated.isoformat() if key_info.last_validated else None,
+                        'created_at': key_info.created_at.isoformat() if key_info.created_at else None
+                    }
+                else:
+                    status_data[provider] = {
+                        'has_api_key': False,
+                        'is_valid': False,
+                        'last_validated': None,
+                        'created_at': None
+                    }
+            
+            return status_data
+            
         except Exception as e:
             logger.error(f"Failed to get provider status for user {user.email}: {e}")
             return {}
@@ -314,6 +466,7 @@ class UserAPIKeyManager:
                 if user_key:
                     db.delete(user_key)
                     db.commit()
+                    self.invalidate(user)
                     logger.info(f"Removed API key for user {user.email} and provider {provider}")
                     return True, f"API key removed for {provider}"
                 else:
@@ -345,6 +498,7 @@ class UserAPIKeyManager:
                     db.delete(key)
                 
                 db.commit()
+                self.invalidate(user)
                 logger.info(f"Cleared all API keys for user {user.email}")
                 return True, "All API keys cleared"
                 
@@ -354,4 +508,8 @@ class UserAPIKeyManager:
 
 
 # Global instance
-user_api_key_manager = UserAPIKeyManager()
+user_api_key_manager = UserAPIKeyManager(
+    cache_ttl=settings.API_KEY_CACHE_TTL_SECONDS,
+    plaintext_ttl=settings.API_KEY_PLAINTEXT_TTL_SECONDS,
+    max_cached_users=settings.API_KEY_CACHE_MAX_USERS,
+)
@@ -5,6 +5,7 @@ Service for persisting and retrieving per-user selected AI provider and model.
 import logging
 from typing import Optional, Tuple
 from sqlalchemy.orm import Session
+from app.database import run_in_session
 from app.models.user_preferences import UserModelPreference
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,14 @@ class UserModelService:
             db.add(pref)
         db.commit()
 
+    async def get_user_model_async(self, user_id: str) -> Optional[Tuple[str, str]]:
+        """get_user_model for code on the event loop (does not block it)"""
+        return await run_in_session(lambda db: self.get_user_model(db, user_id))
+
+    async def set_user_model_async(self, user_id: str, provider: str, model: str) -> None:
+        """set_user_model for code on the event loop (does not block it)"""
+        await run_in_session(lambda db: self.set_user_model(db, user_id, provider, model))
+
 
 user_model_service = UserModelService()
 
@@ -238,4 +238,5 @@ class ProcessingStatus(BaseModel):
     progress: int = Field(..., description="Progress percentage")
     current_step: str = Field(..., description="Current processing step")
     estimated_completion: Optional[datetime] = Field(None, description="Estimated completion time")
-    message: Optional[str] = Field(None, description="Status message")
\ No newline at end of file
+    message: Optional[str] = Field(None, description="Status message")
+    companies: Optional[Dict[str, Dict[str, Any]]] = Field(None, description="Per-company status and results of a batch")
\ No newline at end of file
@@ -5,15 +5,17 @@ FastAPI routes for CV tailoring functionality including CV optimization,
 company recommendations management, and tailored CV generation.
 """
 
+import asyncio
 import json
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, File, UploadFile, Query, Request
+from fastapi import APIRouter, HTTPException, Depends, File, UploadFile, Query, Request
 from fastapi.responses import JSONResponse, FileResponse
 
 from app.core.dependencies import get_current_user
+from app.core.model_dependency import get_current_model
 from app.models.user import User
 from app.tailored_cv.models.cv_models import (
     OriginalCV, RecommendationAnalysis, TailoredCV,
@@ -22,6 +24,9 @@ from app.tailored_cv.models.cv_models import (
     ProcessingStatus, CVValidationResult
 )
 from app.tailored_cv.services.cv_tailoring_service import CVTailoringService
+from app.tailored_cv.services.batch_tailoring_service import enqueue_batch_tailoring, get_batch_status as read_batch_status
+from app.utils.artifact_index import artifact_index
+from app.utils.sse import StreamEmitter, sse_response
 
 logger = logging.getLogger(__name__)
 
@@ -168,22 +173,13 @@ async def get_available_companies(
         )
 
 
-@router.post("/tailor-with-real-data/{company}")
-async def tailor_cv_with_real_data(
+async def _tailor_with_real_data(
     company: str,
-    custom_instructions: Optional[str] = None,
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Tailor CV using real data from cv-analysis folder
-    
-    This endpoint loads the original CV and AI recommendation from the cv-analysis folder
-    for the specified company and generates a tailored CV, saving it as tailored_cv.json.
-    
-    Args:
-        company: Company name (e.g., "Australia_for_UNHCR", "Google")
-        custom_instructions: Optional custom instructions for tailoring
-    """
+    custom_instructions: Optional[str],
+    current_user: User,
+    stream: Optional[StreamEmitter] = None
+) -> CVTailoringResponse:
+    """Load real CV/recommendation data for a company, tailor the CV and save it"""
     try:
         logger.info(f"🎯 CV tailoring with real data for user {current_user.id} - {company}")
         
@@ -214,7 +210,7 @@ async def tailor_cv_with_real_data(
             )
             
             # Process the CV tailoring
-            response = await cv_tailoring_service.tailor_cv(request)
+            response = await cv_tailoring_service.tailor_cv(request, stream=stream)
             
             # Save tailored CV to cv-analysis folder - no fallback, fail if saving fails
             if response.success:
@@ -241,6 +237,50 @@ async def tailor_cv_with_real_data(
         )
 
 
+@router.post("/tailor-with-real-data/{company}")
+async def tailor_cv_with_real_data(
+    company: str,
+    custom_instructions: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Tailor CV using real data from cv-analysis folder
+    
+    This endpoint loads the original CV and AI recommendation from the cv-analysis folder
+    for the specified company and generates a tailored CV, saving it as tailored_cv.json.
+    
+    Args:
+        company: Company name (e.g., "Australia_for_UNHCR", "Google")
+        custom_instructions: Optional custom instructions for tailoring
+    """
+    return await _tailor_with_real_data(company, custom_instructions, current_user)
+
+
+@router.post("/tailor-with-real-data/{company}/stream")
+async def stream_tailor_cv_with_real_data(
+    company: str,
+    custom_instructions: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Streaming variant of /tailor-with-real-data/{company}
+    
+    Returns Server-Sent Events: `token` frames carry the tailored CV text as the
+    model generates it, `status` frames report the current stage and attempt,
+    and a final `complete` frame carries the same CVTailoringResponse as the
+    non-streaming endpoint (or an `error` frame). The tailored CV is saved even
+    if the client disconnects mid-stream.
+    
+    Args:
+        company: Company name (e.g., "Australia_for_UNHCR", "Google")
+        custom_instructions: Optional custom instructions for tailoring
+    """
+    return sse_response(
+        lambda emitter: _tailor_with_real_data(company, custom_instructions, current_user, stream=emitter),
+        lambda response: response.model_dump(mode="json")
+    )
+
+
 @router.get("/available-companies")
 async def get_available_companies_list(
     current_user: User = Depends(get_current_user)
@@ -415,15 +455,15 @@ async def download_tailored_cv(
 async def batch_tailor_cv(
     original_cv: OriginalCV,
     company_names: List[str],
-    background_tasks: BackgroundTasks,
     data_folder: str = Query(..., description="Path to data folder"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    current_model: str = Depends(get_current_model)
 ):
     """
     Batch tailor CV for multiple companies
     
-    Processes the same CV against multiple company recommendations in the background.
-    Returns immediately with a task ID for tracking progress.
+    Processes the same CV against multiple company recommendations in the background,
+    several companies at a time. Returns immediately with a task ID for tracking progress.
     """
     try:
         logger.info(f"🔄 Batch tailoring for user {current_user.id}, companies: {company_names}")
@@ -443,14 +483,12 @@ async def batch_tailor_cv(
                 detail=f"Company folders not found: {missing_companies}"
             )
         
-        # Generate task ID
-        task_id = f"batch_{current_user.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        # Add background task
-        background_tasks.add_task(
-            _process_batch_tailoring,
-            task_id,
-            original_cv,
+        # Queue the batch; its job id is the task ID
+        task_id = await asyncio.to_thread(
+            enqueue_batch_tailoring,
+            current_user.email,
+            str(current_user.id),
+            original_cv.model_dump(mode="json"),
             company_names,
             data_folder
         )
@@ -483,15 +521,13 @@ async def get_batch_status(
     Returns the current status and progress of a batch tailoring operation.
     """
     try:
-        # In a real implementation, you'd track this in a database or cache
-        # For now, return a placeholder response
-        return ProcessingStatus(
-            status="processing",
-            progress=50,
-            current_step="Tailoring CV for company 2 of 4",
-            message="Batch processing in progress"
-        )
+        batch = await asyncio.to_thread(read_batch_status, task_id, current_user.email)
+        if batch is None:
+            raise HTTPException(status_code=404, detail=f"Batch task '{task_id}' not found")
+        return ProcessingStatus(**batch)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Failed to get batch status: {e}")
         raise HTTPException(
@@ -501,7 +537,7 @@ async def get_batch_status(
 
 
 @router.post("/tailor-real")
-async def tailor_cv_with_real_data(
+async def tailor_cv_real(
     company: str,
     custom_instructions: str = None,
     target_ats_score: int = 85,
@@ -652,6 +688,7 @@ async def save_edited_cv(
         # Write new TXT file
         with open(new_txt_path, 'w', encoding='utf-8') as f:
             f.write(content)
+        artifact_index.record_write(new_txt_path)
         files_updated.append(str(new_txt_path))
         logger.info(f"✅ [SAVE_EDITED] Created new TXT: {new_txt_path}")
 
@@ -676,6 +713,7 @@ async def save_edited_cv(
             
             with open(new_json_path, 'w', encoding='utf-8') as jf:
                 json.dump(updated_json, jf, indent=2, ensure_ascii=False)
+            artifact_index.record_write(new_json_path)
             files_updated.append(str(new_json_path))
             logger.info(f"✅ [SAVE_EDITED] Created new JSON: {new_json_path}")
             
@@ -897,15 +935,14 @@ async def get_framework(
     Returns the current version of the CV optimization framework for reference.
     """
     try:
-        framework_path = Path(__file__).parent.parent / "prompts" / "framework.md"
-        
-        with framework_path.open('r', encoding='utf-8') as f:
-            content = f.read()
+        from app.ai.prompt_registry import prompt_registry
+        framework = prompt_registry.get("tailoring_framework")
         
         return {
-            "framework_content": content,
+            "framework_content": framework.template,
             "version": "1.0",
-            "last_updated": datetime.fromtimestamp(framework_path.stat().st_mtime).isoformat()
+            "content_hash": framework.template_hash,
+            "last_updated": datetime.fromtimestamp(framework.mtime).isoformat()
         }
         
     except Exception as e:
@@ -1020,20 +1057,21 @@ async def preview_pdf(
     company: str,
     current_user: User = Depends(get_current_user)
 ):
-    """Return the pre-generated PDF content for preview in Job Tracking."""
+    """Return the PDF of the latest tailored CV for preview in Job Tracking (cached by content)."""
     try:
-        from app.tailored_cv.services.pdf_file_selector import get_latest_company_pdf
+        from app.tailored_cv.services.pdf_render_service import pdf_render_service
+        from app.utils.user_path_utils import get_user_base_path
 
-        # Get the latest pre-generated PDF for this company
-        pdf_path = get_latest_company_pdf(current_user.email, company)
-        
-        if not pdf_path or not pdf_path.exists():
+        pdf_export_dir = get_user_base_path(current_user.email) / "cvs" / "pdf_cvs"
+        try:
+            pdf_path = await pdf_render_service.export_company_pdf(current_user.email, company, pdf_export_dir)
+        except FileNotFoundError:
             raise HTTPException(
                 status_code=404, 
                 detail=f"No tailored CV PDF found for company: {company}. Please generate a tailored CV first."
             )
 
-        logger.info(f"✅ Serving pre-generated PDF for preview {company}: {pdf_path.name}")
+        logger.info(f"✅ Serving PDF for preview {company}: {pdf_path.name}")
 
         return FileResponse(
             path=str(pdf_path),
@@ -1052,27 +1090,22 @@ async def export_pdf(
     company: str,
     current_user: User = Depends(get_current_user)
 ):
-    """Return the PDF for the latest tailored CV for the given company. Generates PDF if not found."""
+    """Return the PDF for the latest tailored CV for the given company. Renders it only if the content changed."""
     try:
-        from app.tailored_cv.services.pdf_file_selector import get_latest_company_pdf
-        from app.tailored_cv.services.pdf_export_service import export_tailored_cv_pdf
+        from app.tailored_cv.services.pdf_render_service import pdf_render_service
         from app.utils.user_path_utils import get_user_base_path
 
-        # Get the latest pre-generated PDF for this company
-        pdf_path = get_latest_company_pdf(current_user.email, company)
+        # Get user's PDF export directory
+        pdf_export_dir = get_user_base_path(current_user.email) / "cvs" / "pdf_cvs"
         
-        if not pdf_path or not pdf_path.exists():
-            # PDF doesn't exist, generate a new one
-            logger.info(f"🔄 No PDF found for {company}, generating new PDF...")
-            
-            # Get user's PDF export directory
-            user_base = get_user_base_path(current_user.email)
-            pdf_export_dir = user_base / "cvs" / "pdf_cvs"
-            pdf_export_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Generate new PDF
-            pdf_path = export_tailored_cv_pdf(current_user.email, company, pdf_export_dir)
-            logger.info(f"✅ Generated new PDF for {company}: {pdf_path.name}")
+        # Cached by content: unchanged tailored CVs are served without rendering
+        try:
+            pdf_path = await pdf_render_service.export_company_pdf(current_user.email, company, pdf_export_dir)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No tailored CV found for company: {company}. Please generate a tailored CV first."
+            )
 
         logger.info(f"✅ Serving PDF for {company}: {pdf_path.name}")
 
@@ -1088,74 +1121,6 @@ async def export_pdf(
         raise HTTPException(status_code=500, detail=f"PDF download failed: {str(e)}")
 
 
-# Background task function
-async def _process_batch_tailoring(
-    task_id: str,
-    original_cv: OriginalCV,
-    company_names: List[str],
-    data_folder: str
-):
-    """
-    Background task to process batch CV tailoring
-    
-    This would typically update a database or cache with progress information.
-    """
-    try:
-        logger.info(f"🔄 Starting batch processing for task {task_id}")
-        
-        results = {}
-        data_path = Path(data_folder)
-        
-        for i, company_name in enumerate(company_names):
-            try:
-                company_folder = data_path / company_name
-                
-                # Load recommendation
-                recommendation = cv_tailoring_service.load_recommendation_file(str(company_folder))
-                
-                # Create tailoring request
-                request = CVTailoringRequest(
-                    original_cv=original_cv,
-                    recommendations=recommendation,
-                    company_folder=str(company_folder)
-                )
-                
-                # Process tailoring
-                response = await cv_tailoring_service.tailor_cv(request)
-                
-                # Save result
-                if response.success:
-                    file_path = cv_tailoring_service.save_tailored_cv(
-                        response.tailored_cv,
-                        str(company_folder)
-                    )
-                    results[company_name] = {
-                        "success": True,
-                        "file_path": file_path,
-                        "ats_score": response.tailored_cv.estimated_ats_score
-                    }
-                else:
-                    results[company_name] = {
-                        "success": False,
-                        "error": response.processing_summary.get("error", "Unknown error")
-                    }
-                
-                logger.info(f"✅ Completed tailoring for {company_name} ({i+1}/{len(company_names)})")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to process {company_name}: {e}")
-                results[company_name] = {
-                    "success": False,
-                    "error": str(e)
-                }
-        
-        logger.info(f"🎉 Batch processing completed for task {task_id}")
-        # In a real implementation, you'd save results to database/cache here
-        
-    except Exception as e:
-        logger.error(f"❌ Batch processing failed for task {task_id}: {e}")
-
-
 def _parse_cv_content_to_json(content: str, existing_json: dict) -> dict:
     """
     Parse edited CV content back into structured JSON format while preserving minimal metadata.
@@ -0,0 +1,240 @@
+"""
+Batch Tailoring Service
+
+Tailors one CV for several companies as a single background job.
+
+- The batch runs on the persistent job queue, so it survives restarts and
+  its state is readable from any worker
+- Companies are tailored concurrently, bounded per user and per AI provider
+  (BATCH_TAILORING_MAX_CONCURRENT_PER_USER / _PER_PROVIDER)
+- Each company's status, result or error is persisted as the job's progress
+  as soon as it changes; a retried batch skips companies already tailored
+"""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.core.model_dependency import get_request_model, request_model
+from app.services.job_queue import JobContext, job_queue
+
+logger = logging.getLogger(__name__)
+
+BATCH_TAILORING_JOB = "batch_tailoring"
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+_user_limits: Dict[str, asyncio.Semaphore] = {}
+_provider_limits: Dict[str, asyncio.Semaphore] = {}
+
+
+def _limit(limits: Dict[str, asyncio.Semaphore], key: str, size: int) -> asyncio.Semaphore:
+    semaphore = limits.get(key)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, size))
+        limits[key] = semaphore
+    return semaphore
+
+
+def enqueue_batch_tailoring(
+    user_email: str,
+    user_id: str,
+    original_cv: Dict[str, Any],
+    company_names: List[str],
+    data_folder: str,
+) -> str:
+    """
+    Queue a batch tailoring job
+
+    The model selected for the calling request is stored with the job, since the
+    worker has no request context.
+
+    Args:
+        user_email: Owner of the batch
+        user_id: Owner's user id
+        original_cv: OriginalCV as JSON-compatible data
+        company_names: Company folders under data_folder to tailor for
+        data_folder: Folder holding one subfolder per company
+
+    Returns:
+        The job id, used as the batch task id
+    """
+    model = get_request_model()
+    return job_queue.enqueue(
+        BATCH_TAILORING_JOB,
+        user_email,
+        {
+            "user_id": user_id,
+            "provider": _provider_for(model),
+            "model": model,
+            "original_cv": original_cv,
+            "company_names": list(dict.fromkeys(company_names)),
+            "data_folder": data_folder,
+        },
+    )
+
+
+def summarize_batch(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Batch state from a job record
+
+    Returns:
+        Dict with status, progress (0-100), current_step, message and the
+        per-company states
+    """
+    payload = job.get("payload") or {}
+    progress = job.get("progress") if isinstance(job.get("progress"), dict) else {}
+    names = payload.get("company_names") or []
+    companies = dict(progress.get("companies") or {})
+    if isinstance(job.get("result"), dict):
+        companies = job["result"].get("companies", companies)
+    for name in names:
+        companies.setdefault(name, {"status": PENDING})
+
+    total = len(names)
+    counts = {state: 0 for state in (PENDING, RUNNING, SUCCEEDED, FAILED)}
+    for state in companies.values():
+        counts[state.get("status", PENDING)] = counts.get(state.get("status", PENDING), 0) + 1
+    done = counts[SUCCEEDED] + counts[FAILED]
+
+    job_status = job.get("status")
+    if job_status == "succeeded":
+        status = "completed" if counts[FAILED] == 0 else "completed_with_errors"
+        step = f"Tailored {counts[SUCCEEDED]} of {total} companies"
+    elif job_status in ("failed", "cancelled"):
+        status = job_status
+        step = f"Stopped after {done} of {total} companies"
+    elif job_status == "running":
+        status = "processing"
+        step = f"Tailored {done} of {total} companies ({counts[RUNNING]} in progress)"
+    else:
+        status = "queued"
+        step = "Waiting for a worker"
+
+    message = job.get("error") if job_status == "failed" else None
+    if counts[FAILED] and not message:
+        message = f"{counts[FAILED]} compan{'y' if counts[FAILED] == 1 else 'ies'} failed"
+
+    return {
+        "status": status,
+        "progress": int(100 * done / total) if total else 100,
+        "current_step": step,
+        "message": message,
+        "companies": companies,
+    }
+
+
+def _provider_for(model: Optional[str]) -> str:
+    """The AI provider a model belongs to (the configured current provider without one)"""
+    from app.ai.ai_service import ai_service
+
+    if model:
+        for provider in ai_service.config.get_available_providers():
+            if ai_service._resolve_model_name(model, provider):
+                return provider
+    return ai_service.config.get_current_provider()
+
+
+async def _tailor_company(user_email: str, original_cv, company_name: str, data_folder: str) -> Dict[str, Any]:
+    """Tailor and save the CV for one company"""
+    from app.tailored_cv.models.cv_models import CVTailoringRequest
+    from app.tailored_cv.services.cv_tailoring_service import CVTailoringService
+
+    # One service per company: tailoring keeps per-run state on the instance
+    service = CVTailoringService(user_email=user_email)
+    company_folder = str(Path(data_folder) / company_name)
+    recommendation = await asyncio.to_thread(service.load_recommendation_file, company_folder)
+    request = CVTailoringRequest(
+        original_cv=original_cv,
+        recommendations=recommendation,
+        company_folder=company_folder
+    )
+
+    response = await service.tailor_cv(request)
+    if not response.success:
+        return {"status": FAILED, "error": response.processing_summary.get("error", "Unknown error")}
+
+    file_path = await asyncio.to_thread(service.save_tailored_cv, response.tailored_cv, company_folder)
+    return {
+        "status": SUCCEEDED,
+        "file_path": file_path,
+        "ats_score": response.tailored_cv.estimated_ats_score
+    }
+
+
+async def run_batch_tailoring_job(payload: Dict[str, Any], job: JobContext) -> Dict[str, Any]:
+    """Job queue handler: tailor the CV for every company in the batch"""
+    from app.tailored_cv.models.cv_models import OriginalCV
+
+    original_cv = OriginalCV(**payload["original_cv"])
+    company_names: List[str] = payload["company_names"]
+    data_folder: str = payload["data_folder"]
+
+    # Resume a retried batch: keep companies an earlier attempt already tailored
+    companies: Dict[str, Dict[str, Any]] = {name: {"status": PENDING} for name in company_names}
+    previous = await asyncio.to_thread(job_queue.get_job, job.job_id) or {}
+    if isinstance(previous.get("progress"), dict):
+        for name, state in (previous["progress"].get("companies") or {}).items():
+            if name in companies and state.get("status") == SUCCEEDED:
+                companies[name] = state
+
+    def _report() -> None:
+        job.report_progress(companies=companies)
+
+    model = payload.get("model")
+    provider = payload.get("provider") or _provider_for(model)
+    user_limit = _limit(_user_limits, job.user_email, settings.BATCH_TAILORING_MAX_CONCURRENT_PER_USER)
+    provider_limit = _limit(_provider_limits, provider, settings.BATCH_TAILORING_MAX_CONCURRENT_PER_PROVIDER)
+
+    async def _run(company_name: str) -> None:
+        async with user_limit, provider_limit:
+            started = time.time()
+            companies[company_name] = {"status": RUNNING, "started_at": started}
+            _report()
+            try:
+                outcome = await _tailor_company(job.user_email, original_cv, company_name, data_folder)
+            except Exception as e:
+                logger.error(f"❌ [BATCH_TAILOR] Failed to process {company_name}: {e}")
+                outcome = {"status": FAILED, "error": str(e)}
+            outcome["started_at"] = started
+            outcome["finished_at"] = time.time()
+            companies[company_name] = outcome
+            _report()
+            logger.info(
+                f"{'✅' if outcome['status'] == SUCCEEDED else '⚠️'} [BATCH_TAILOR] {company_name} "
+                f"{outcome['status']} in {outcome['finished_at'] - started:.1f}s ({job.job_id})"
+            )
+
+    todo = [name for name in company_names if companies[name]["status"] != SUCCEEDED]
+    logger.info(
+        f"🔄 [BATCH_TAILOR] Tailoring {len(todo)} of {len(company_names)} companies for {job.user_email} "
+        f"via {provider} ({job.job_id})"
+    )
+    _report()
+    # The worker has no request context: pin the AI calls to the same model the limits are counted against
+    model_token = request_model.set(model)
+    try:
+        await asyncio.gather(*(_run(name) for name in todo))
+    finally:
+        request_model.reset(model_token)
+
+    succeeded = sum(1 for state in companies.values() if state["status"] == SUCCEEDED)
+    logger.info(f"🎉 [BATCH_TAILOR] Batch {job.job_id} done: {succeeded}/{len(company_names)} succeeded")
+    return {"companies": companies, "succeeded": succeeded, "total": len(company_names)}
+
+
+def get_batch_status(job_id: str, user_email: str) -> Optional[Dict[str, Any]]:
+    """Summarized state of a user's batch, or None if it is not theirs or unknown"""
+    job = job_queue.get_job(job_id)
+    if not job or job["user_email"] != user_email or job["kind"] != BATCH_TAILORING_JOB:
+        return None
+    return summarize_batch(job)
+
+
+job_queue.register(BATCH_TAILORING_JOB, run_batch_tailoring_job)
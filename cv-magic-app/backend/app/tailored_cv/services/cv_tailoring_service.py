@@ -12,6 +12,9 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
 from app.ai.ai_service import ai_service
+from app.ai.prompt_registry import prompt_registry
+from app.utils.artifact_index import artifact_index
+from app.utils.sse import StreamEmitter
 from app.utils.timestamp_utils import TimestampUtils
 from app.tailored_cv.models.cv_models import (
     OriginalCV, RecommendationAnalysis, TailoredCV, 
@@ -33,28 +36,27 @@ class CVTailoringService:
         from app.utils.user_path_utils import get_user_base_path
         self.user_email = user_email
         self.cv_analysis_path = get_user_base_path(user_email)
-        self.framework_path = Path(__file__).parent.parent / "prompts" / "framework.md"
         self._load_framework()
     
     def _load_framework(self) -> None:
-        """Load the CV optimization framework"""
+        """Load the CV optimization framework (held in memory by the prompt registry)"""
         try:
-            with open(self.framework_path, 'r', encoding='utf-8') as f:
-                self.framework_content = f.read()
-            logger.info(f"✅ Loaded CV optimization framework from {self.framework_path}")
+            self.framework_content = prompt_registry.text("tailoring_framework")
         except Exception as e:
             logger.error(f"❌ Failed to load framework: {e}")
             raise Exception(f"Failed to load CV optimization framework: {e}")
     
     async def tailor_cv(
         self, 
-        request: CVTailoringRequest
+        request: CVTailoringRequest,
+        stream: Optional[StreamEmitter] = None
     ) -> CVTailoringResponse:
         """
         Main method to tailor a CV based on recommendations
         
         Args:
             request: CVTailoringRequest containing original CV and recommendations
+            stream: Optional emitter that receives generation tokens and stage updates
             
         Returns:
             CVTailoringResponse with tailored CV and processing details
@@ -63,6 +65,8 @@ class CVTailoringService:
             logger.info(f"🎯 Starting CV tailoring for {request.recommendations.company} - {request.recommendations.job_title}")
             
             # Step 1: Validate input data - strict validation, no tolerance for errors
+            if stream:
+                await stream.status(stage="validating")
             validation_result = self._validate_cv_data(request.original_cv)
             if not validation_result.is_valid:
                 error_messages = [f"{error.field}: {error.message}" for error in validation_result.errors]
@@ -79,7 +83,8 @@ class CVTailoringService:
                 request.original_cv,
                 request.recommendations, 
                 optimization_strategy,
-                request.custom_instructions
+                request.custom_instructions,
+                stream=stream
             )
 
             # Post-fix skills taxonomy if the model misclassified
@@ -123,6 +128,8 @@ class CVTailoringService:
                 updated_at=datetime.now()
             )
             
+            if stream:
+                await stream.status(stage="estimating_ats_score")
             estimated_score = await self._estimate_ats_score(tailored_cv, request.recommendations, user_data)
             tailored_cv.estimated_ats_score = estimated_score
             
@@ -355,9 +362,10 @@ class CVTailoringService:
         original_cv: OriginalCV,
         recommendations: RecommendationAnalysis,
         strategy: OptimizationStrategy,
-        custom_instructions: Optional[str] = None
+        custom_instructions: Optional[str] = None,
+        stream: Optional[StreamEmitter] = None
     ) -> TailoredCV:
-        """Generate tailored CV using AI service"""
+        """Generate tailored CV using AI service, streaming tokens to `stream` when provided"""
         import uuid
         request_id = str(uuid.uuid4())[:8]
         logger.info(f"[{request_id}] 🎯 Starting CV tailoring for {recommendations.company} with strategy: {strategy.education_strategy}")
@@ -442,12 +450,15 @@ class CVTailoringService:
                 else:
                     logger.warning(f"[{request_id}] ⚠️ Failed to auto-select provider: {first_provider}")
             
+            if stream:
+                await stream.status(stage="generating", attempt=attempt + 1, max_attempts=max_attempts)
             ai_response = await ai_service.generate_response(
                 prompt=user_prompt,
                 system_prompt=system_prompt,
                 temperature=temperature,
                 max_tokens=4000,
-                user=user_data
+                user=user_data,
+                on_chunk=stream.token if stream else None
             )
             
             # Log AI response stats
@@ -501,12 +512,15 @@ class CVTailoringService:
                 assessment.get("bullets_with_quantification", 0),
                 0.5
             )
+            if stream:
+                await stream.status(stage="enhancing", attempt=enhancement_tries, max_attempts=3)
             ai_response = await ai_service.generate_response(
                 prompt=user_prompt,
                 system_prompt=system_prompt,
                 temperature=0.0,
                 max_tokens=4000,
-                user=user_data
+                user=user_data,
+                on_chunk=stream.token if stream else None
             )
             try:
                 tailored_data = self._extract_and_parse_json(ai_response.content)
@@ -1511,26 +1525,22 @@ FIX: Output ONLY valid JSON!
             text_content = self._convert_tailored_cv_to_text(tailored_cv)
             with open(txt_file_path, 'w', encoding='utf-8') as f:
                 f.write(text_content)
+            artifact_index.record_write(json_file_path)
+            artifact_index.record_write(txt_file_path)
             
             logger.info(f"✅ Saved tailored CV to {json_file_path}")
             logger.info(f"✅ Saved tailored CV text to {txt_file_path}")
 
-            # Register files in DB (best-effort)
-            try:
-                from app.database import SessionLocal
-                from app.services.file_registry_service import FileRegistryService
-                db = SessionLocal()
-                try:
-                    registry = FileRegistryService.from_email(db, self.user_email)
-                    company_id = registry.upsert_company(company, display_name=company.replace('_', ' '))
-                    file_id = registry.register_file(company_id, "tailored_cv", json_file_path, timestamp=timestamp)
-                    registry.set_cv_pointer(company_id, "tailored", file_id)
-                    registry.record_analysis_run(company_id, kind="tailoring", output_file_id=file_id)
-                    db.commit()
-                finally:
-                    db.close()
-            except Exception as reg_err:
-                logger.warning(f"⚠️ [DB] Failed to register tailored CV: {reg_err}")
+            # Register files in DB (best-effort, without blocking the event loop)
+            from app.services.file_registry_service import register_in_background
+
+            def _register(registry) -> None:
+                company_id = registry.upsert_company(company, display_name=company.replace('_', ' '))
+                file_id = registry.register_file(company_id, "tailored_cv", json_file_path, timestamp=timestamp)
+                registry.set_cv_pointer(company_id, "tailored", file_id)
+                registry.record_analysis_run(company_id, kind="tailoring", output_file_id=file_id)
+
+            register_in_background(self.user_email, _register, "tailored CV")
             return str(json_file_path)
             
         except Exception as e:
@@ -1739,20 +1749,19 @@ FIX: Output ONLY valid JSON!
             text_content = self._convert_tailored_cv_to_text(tailored_cv)
             with open(txt_file_path, 'w', encoding='utf-8') as f:
                 f.write(text_content)
+            artifact_index.record_write(json_file_path)
+            artifact_index.record_write(txt_file_path)
             
-            # Generate PDF immediately after JSON/TXT creation
+            # Generate PDF right after JSON/TXT creation (in the background when on the event loop)
             try:
-                from app.tailored_cv.services.pdf_export_service import export_tailored_cv_pdf
-                from pathlib import Path
+                from app.tailored_cv.services.pdf_render_service import pdf_render_service
                 
                 # Create PDF export directory (company-specific)
                 pdf_export_dir = self.cv_analysis_path / "cvs" / "pdf_cvs"
                 pdf_export_dir.mkdir(parents=True, exist_ok=True)
                 
                 # Generate PDF using the same JSON file
-                pdf_path = export_tailored_cv_pdf(self.user_email, company, pdf_export_dir)
-                
-                logger.info(f"✅ Generated tailored CV PDF: {pdf_path}")
+                pdf_render_service.schedule_export(self.user_email, company, pdf_export_dir)
                 
             except Exception as pdf_error:
                 logger.warning(f"⚠️ Failed to generate PDF during CV save: {pdf_error}")
@@ -354,7 +354,8 @@ class ResumePDFGenerator:
     def _paragraph_block(self, text: str):
         return Paragraph(text, self.styles['BodyText'])
 
-    def generate(self, filename: str) -> str:
+    def generate(self, filename: Any) -> Any:
+        # filename may also be a binary file-like object (e.g. BytesIO)
         doc = SimpleDocTemplate(
             filename,
             pagesize=A4,
@@ -631,11 +632,18 @@ def build_resume_data_from_files(json_path: Optional[Path], _txt_path: Optional[
     return _map_tailored_json_to_generator_schema(raw)
 
 
-def export_tailored_cv_pdf(user_email: str, company: str, export_dir: Path) -> Path:
-    """Export the latest tailored CV as PDF (using the adapter that preserves JSON)."""
+def render_resume_pdf_bytes(pdf_data: Dict[str, Any]) -> bytes:
+    """Render generator-schema data to PDF bytes (top-level so a process pool can run it)."""
+    import io
+    buffer = io.BytesIO()
+    ResumePDFGenerator(pdf_data).generate(buffer)
+    return buffer.getvalue()
+
+
+def load_tailored_pdf_data(user_email: str, company: str) -> Dict[str, Any]:
+    """Load the latest tailored CV for a company and normalize it to the generator schema."""
     from app.unified_latest_file_selector import get_selector_for_user
     from app.tailored_cv.services.tailored_cv_adapter import load_tailored_cv_and_convert
-    from datetime import datetime
 
     selector = get_selector_for_user(user_email)
     cv_context = selector.get_latest_tailored_cv_only(company)
@@ -698,16 +706,14 @@ def export_tailored_cv_pdf(user_email: str, company: str, export_dir: Path) -> P
         logger.error("[PDF_EXPORT] normalization failed: %s", e)
         raise
 
-    export_dir.mkdir(parents=True, exist_ok=True)
-    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    safe_company = company.replace(" ", "_")
-    out_path = export_dir / f"{safe_company}_tailored_resume_{ts}.pdf"
-    logger.info("[PDF_EXPORT] writing to %s", out_path)
+    return pdf_data
 
-    try:
-        ResumePDFGenerator(pdf_data).generate(str(out_path))
-    except Exception as e:
-        logger.error("[PDF_EXPORT] generation failed: %s", e)
-        raise
 
-    return out_path
\ No newline at end of file
+def export_tailored_cv_pdf(user_email: str, company: str, export_dir: Path) -> Path:
+    """Export the latest tailored CV as PDF (using the adapter that preserves JSON).
+
+    Blocking; code on the event loop should use pdf_render_service.export_company_pdf.
+    Unchanged content reuses the cached render instead of writing a new PDF.
+    """
+    from app.tailored_cv.services.pdf_render_service import pdf_render_service
+    return pdf_render_service.export_company_pdf_sync(user_email, company, export_dir)
\ No newline at end of file
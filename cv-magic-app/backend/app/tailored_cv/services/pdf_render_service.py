@@ -0,0 +1,269 @@
+"""
+PDF Render Service
+
+Renders tailored CV PDFs off the event loop and caches them by content.
+
+- Renders are keyed by a hash of the normalized generator input plus
+  PDF_TEMPLATE_VERSION, and stored once in a content-addressed cache
+  directory; the least recently used renders are evicted
+- reportlab runs in a spawn process pool (or a thread with 0 workers), and
+  concurrent requests for the same content share one render
+- A company's export PDF ({company}_tailored_resume_{ts}.pdf) is only written
+  when the content changed; repeat exports and previews serve the existing
+  file, and older exports of the company are pruned
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.config import settings
+from app.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever ResumePDFGenerator's layout changes, so cached renders are not reused
+PDF_TEMPLATE_VERSION = "1"
+
+
+def content_hash(pdf_data: Dict[str, Any]) -> str:
+    """Hash of the generator input and template version"""
+    canonical = json.dumps(pdf_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{PDF_TEMPLATE_VERSION}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+def _file_sha256(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class PDFRenderService:
+    """
+    Content-addressed PDF render cache with an off-loop renderer.
+
+    Cached renders are plain files named {hash}.pdf. A company export is a
+    copy of one, so comparing file hashes tells whether it is still current.
+    """
+
+    def __init__(self, cache_dir: str, max_cached: int = 200, workers: int = 1, keep_exports: int = 3):
+        self.cache_dir = Path(cache_dir)
+        self.max_cached = max_cached
+        self.workers = workers
+        self.keep_exports = keep_exports
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._single_flight = SingleFlight("pdf_render_single_flight")
+        self._lock = threading.Lock()
+        self._background: Set[asyncio.Task] = set()
+        self._stats = {"cache_hits": 0, "renders": 0, "exports_written": 0, "exports_reused": 0, "evictions": 0}
+
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pdf"
+
+    def _lookup(self, key: str) -> Optional[Path]:
+        """Cached render for a key, marked as recently used"""
+        path = self._cache_path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        self._stats["cache_hits"] += 1
+        return path
+
+    def _store(self, key: str, data: bytes) -> Path:
+        path = self._cache_path(key)
+        _atomic_write_bytes(path, data)
+        self._evict()
+        return path
+
+    def _evict(self) -> None:
+        """Drop the least recently used renders beyond max_cached"""
+        with self._lock:
+            try:
+                entries = sorted(self.cache_dir.glob("*.pdf"), key=lambda p: p.stat().st_mtime)
+            except OSError:
+                return
+            for path in entries[: max(0, len(entries) - self.max_cached)]:
+                try:
+                    path.unlink()
+                    self._stats["evictions"] += 1
+                except OSError:
+                    pass
+
+    async def _render_off_loop(self, pdf_data: Dict[str, Any]) -> bytes:
+        from app.tailored_cv.services.pdf_export_service import render_resume_pdf_bytes
+
+        if self.workers <= 0:
+            return await asyncio.to_thread(render_resume_pdf_bytes, pdf_data)
+        if self._pool is None:
+            # spawn: forking a process that runs an event loop and threads is unsafe
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, render_resume_pdf_bytes, pdf_data)
+        except BrokenProcessPool:
+            logger.warning("⚠️ [PDF_RENDER] Render pool broke; recreating it and rendering in a thread")
+            self._pool = None
+            return await asyncio.to_thread(render_resume_pdf_bytes, pdf_data)
+
+    async def render(self, pdf_data: Dict[str, Any]) -> Tuple[str, Path]:
+        """
+        Cached PDF for generator-schema data, rendering it off the loop on a miss
+
+        Returns:
+            (content hash, path of the cached render)
+        """
+        key = content_hash(pdf_data)
+        cached = await asyncio.to_thread(self._lookup, key)
+        if cached is not None:
+            return key, cached
+
+        async def _render() -> Path:
+            data = await self._render_off_loop(pdf_data)
+            self._stats["renders"] += 1
+            return await asyncio.to_thread(self._store, key, data)
+
+        return key, await self._single_flight.do(SingleFlight.make_key("pdf_render", key), _render)
+
+    def render_sync(self, pdf_data: Dict[str, Any]) -> Tuple[str, Path]:
+        """render() for code without an event loop (renders in-process on a miss)"""
+        from app.tailored_cv.services.pdf_export_service import render_resume_pdf_bytes
+
+        key = content_hash(pdf_data)
+        cached = self._lookup(key)
+        if cached is not None:
+            return key, cached
+        data = render_resume_pdf_bytes(pdf_data)
+        self._stats["renders"] += 1
+        return key, self._store(key, data)
+
+    def _publish_export(self, rendered: Path, company: str, export_dir: Path) -> Path:
+        """Company export file for a render: the latest one if identical, else a new copy"""
+        safe_company = company.replace(" ", "_")
+        existing = [p for p in export_dir.glob(f"{safe_company}_tailored_resume_*.pdf") if p.is_file()]
+        existing.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        if existing and _file_sha256(existing[0]) == _file_sha256(rendered):
+            self._stats["exports_reused"] += 1
+            return existing[0]
+
+        export_dir.mkdir(parents=True, exist_ok=True)
+        ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        out_path = export_dir / f"{safe_company}_tailored_resume_{ts}.pdf"
+        if out_path.exists():
+            # Same second as the previous export: keep names unique
+            out_path = export_dir / f"{safe_company}_tailored_resume_{ts}_{int(time.time() * 1000) % 1000:03d}.pdf"
+        tmp_path = out_path.with_name(f".{out_path.name}.tmp")
+        shutil.copyfile(rendered, tmp_path)
+        os.replace(tmp_path, out_path)
+        self._stats["exports_written"] += 1
+        logger.info(f"📄 [PDF_RENDER] Wrote {out_path.name}")
+
+        for old in existing[max(0, self.keep_exports - 1):]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+        return out_path
+
+    async def export_company_pdf(self, user_email: str, company: str, export_dir: Path) -> Path:
+        """
+        PDF of the company's latest tailored CV, without blocking the event loop
+
+        Args:
+            user_email: Owner of the tailored CV
+            company: Company name
+            export_dir: The user's PDF directory (cvs/pdf_cvs)
+
+        Returns:
+            Path of the company's export PDF for the current content
+        """
+        from app.tailored_cv.services.pdf_export_service import load_tailored_pdf_data
+
+        pdf_data = await asyncio.to_thread(load_tailored_pdf_data, user_email, company)
+        _, rendered = await self.render(pdf_data)
+        return await asyncio.to_thread(self._publish_export, rendered, company, Path(export_dir))
+
+    def export_company_pdf_sync(self, user_email: str, company: str, export_dir: Path) -> Path:
+        """export_company_pdf for code without an event loop"""
+        from app.tailored_cv.services.pdf_export_service import load_tailored_pdf_data
+
+        pdf_data = load_tailored_pdf_data(user_email, company)
+        _, rendered = self.render_sync(pdf_data)
+        return self._publish_export(rendered, company, Path(export_dir))
+
+    def schedule_export(self, user_email: str, company: str, export_dir: Path) -> None:
+        """
+        Pre-render a company's PDF without blocking the caller
+
+        From sync code running on the event loop the export runs as a
+        background task; without a running loop it runs right away.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None:
+            try:
+                pdf_path = self.export_company_pdf_sync(user_email, company, export_dir)
+                logger.info(f"✅ Generated tailored CV PDF: {pdf_path}")
+            except Exception as pdf_error:
+                logger.warning(f"⚠️ Failed to generate PDF during CV save: {pdf_error}")
+            return
+
+        async def _export() -> None:
+            try:
+                pdf_path = await self.export_company_pdf(user_email, company, export_dir)
+                logger.info(f"✅ Generated tailored CV PDF: {pdf_path}")
+            except Exception as pdf_error:
+                logger.warning(f"⚠️ Failed to generate PDF during CV save: {pdf_error}")
+
+        task = loop.create_task(_export())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def shutdown(self) -> None:
+        """Shut down the render pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache hit, render, export and eviction counters"""
+        return dict(self._stats)
+
+
+# Global PDF render service instance
+pdf_render_service = PDFRenderService(
+    cache_dir=settings.PDF_RENDER_CACHE_DIR,
+    max_cached=settings.PDF_RENDER_CACHE_MAX_FILES,
+    workers=settings.PDF_RENDER_WORKERS,
+    keep_exports=settings.PDF_EXPORTS_KEEP_PER_COMPANY,
+)
@@ -10,6 +10,11 @@ from datetime import datetime
 from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
 
+from app.utils.artifact_index import artifact_index
+
+
+_TIMESTAMPED_NAME = re.compile(r'.*\d{8}_\d{6}')
+
 
 @dataclass
 class FileContext:
@@ -75,7 +80,7 @@ class UnifiedLatestFileSelector:
             
             from app.services.jd_usage_tracker import JDUsageTracker
             
-            # Create JD usage tracker for this user
+            # Lightweight per-user view over the shared, cached usage store
             tracker = JDUsageTracker(self.user_email)
             
             # Provide fallback values if both jd_url and jd_text are empty
@@ -338,17 +343,18 @@ class UnifiedLatestFileSelector:
         }
 
     def _find_tailored_cv_files(self, company: str) -> List[Tuple[Path, Optional[Path], str]]:
+        """Latest tailored CV for a company (indexed; only the newest candidate is returned)."""
         candidates: List[Tuple[Path, Optional[Path], str]] = []
         pattern = f"{company}_tailored_cv_*.json"
 
         # Only look in per-user global tailored folder: cv-analysis/cvs/tailored
-        if self.tailored_path.exists():
-            for json_file in self.tailored_path.glob(pattern):
-                timestamp = self._extract_timestamp_from_filename(json_file.name) or "00000000_000000"
-                txt_file = json_file.with_suffix('.txt')
-                if not txt_file.exists():
-                    txt_file = None
-                candidates.append((json_file, txt_file, timestamp))
+        json_file = artifact_index.latest(self.tailored_path, pattern)
+        if json_file:
+            timestamp = self._extract_timestamp_from_filename(json_file.name) or "00000000_000000"
+            txt_file = json_file.with_suffix('.txt')
+            if not txt_file.exists():
+                txt_file = None
+            candidates.append((json_file, txt_file, timestamp))
 
         return candidates
 
@@ -360,14 +366,8 @@ class UnifiedLatestFileSelector:
         if company:
             company_original_path = self.base_path / "applied_companies" / company / "cvs" / "original"
             if company_original_path.exists():
-                # Timestamped originals
-                for json_file in company_original_path.glob("original_cv_*.json"):
-                    ts = self._extract_timestamp_from_filename(json_file.name)
-                    txt_file = json_file.with_suffix('.txt')
-                    if not txt_file.exists():
-                        txt_file = None
-                    if ts:
-                        candidates.append((json_file, txt_file, ts))
+                # Latest timestamped original
+                candidates.extend(self._latest_timestamped_original(company_original_path))
                 # Base files as oldest
                 base_json = company_original_path / "original_cv.json"
                 if base_json.exists():
@@ -376,14 +376,8 @@ class UnifiedLatestFileSelector:
         
         # Fallback to global original CV folder
         if not candidates and self.original_path.exists():
-            # Timestamped originals
-            for json_file in self.original_path.glob("original_cv_*.json"):
-                ts = self._extract_timestamp_from_filename(json_file.name)
-                txt_file = json_file.with_suffix('.txt')
-                if not txt_file.exists():
-                    txt_file = None
-                if ts:
-                    candidates.append((json_file, txt_file, ts))
+            # Latest timestamped original
+            candidates.extend(self._latest_timestamped_original(self.original_path))
             # Base files as oldest
             base_json = self.original_path / "original_cv.json"
             if base_json.exists():
@@ -392,7 +386,16 @@ class UnifiedLatestFileSelector:
         
         return candidates
 
+    def _latest_timestamped_original(self, directory: Path) -> List[Tuple[Path, Optional[Path], str]]:
+        """Latest original_cv_<timestamp>.json in a folder (indexed)."""
+        json_file = artifact_index.latest(directory, "original_cv_*.json", accept=_TIMESTAMPED_NAME)
+        if not json_file:
+            return []
+        txt_file = json_file.with_suffix('.txt')
+        return [(json_file, txt_file if txt_file.exists() else None, self._extract_timestamp_from_filename(json_file.name))]
+
     def _find_analysis_files(self, directory: Path, company: str, analysis_type: str) -> List[Tuple[Path, str]]:
+        """Latest analysis file per naming pattern (indexed; at most one candidate per pattern)."""
         candidates: List[Tuple[Path, str]] = []
         patterns = [
             f"{company}_{analysis_type}_*.json",
@@ -401,7 +404,8 @@ class UnifiedLatestFileSelector:
             f"{analysis_type}.json",
         ]
         for pattern in patterns:
-            for file_path in directory.glob(pattern):
+            file_path = artifact_index.latest(directory, pattern)
+            if file_path:
                 timestamp = self._extract_timestamp_from_filename(file_path.name) or "00000000_000000"
                 candidates.append((file_path, timestamp))
         return candidates
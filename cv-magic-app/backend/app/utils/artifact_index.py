@@ -0,0 +1,245 @@
+"""
+Artifact Index
+
+Keeps an in-process index of the latest artifact per (directory, filename
+pattern) so "latest file" lookups do not glob and sort a whole company folder
+on every request.
+
+The index is maintained on write: writers call record_write() after saving an
+artifact, which compares the new file against the current winner of every
+indexed pattern it matches and replaces the winner if the new file is newer.
+A lookup then costs one stat() of the directory, one stat() of the cached
+winner and a dictionary access, however many files the folder holds.
+
+The directory's mtime is the fallback for writers that do not report: a new
+or removed file that was not recorded changes it, and the folder is rescanned
+once on the next lookup. An in-place rewrite of the winner is seen through
+its mtime; an unrecorded in-place rewrite of any other file is not.
+"""
+
+import fnmatch
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Pattern, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+_TRAILING_TIMESTAMP = re.compile(r'_(\d{8}_\d{6})(?:\.[^.]+)?$')
+_ANY_TIMESTAMP = re.compile(r'(\d{8}_\d{6})')
+_NO_TIMESTAMP = "00000000_000000"
+
+_EntryKey = Tuple[str, Optional[Pattern], str]
+_SortKey = Tuple
+
+
+class _Winner:
+    """Latest file for one (pattern, accept, order) and the key it won with"""
+
+    __slots__ = ("name", "sort_key", "mtime_ns")
+
+    def __init__(self, name: str, sort_key: _SortKey, mtime_ns: int):
+        self.name = name
+        self.sort_key = sort_key
+        self.mtime_ns = mtime_ns
+
+
+class _DirectorySnapshot:
+    """Cached listing of one directory and the latest file per indexed pattern"""
+
+    def __init__(self, mtime_ns: int, names: Set[str]):
+        self.mtime_ns = mtime_ns
+        self.names = names
+        # (pattern, accept, order) -> winner, or None when nothing matches
+        self.latest: Dict[_EntryKey, Optional[_Winner]] = {}
+
+
+class ArtifactIndex:
+    """
+    Latest-artifact index keyed by directory and filename pattern.
+
+    Ordering matches the existing selectors: by the YYYYMMDD_HHMMSS timestamp
+    in the filename (untimestamped files are oldest) with mtime as tiebreaker,
+    or by mtime alone for callers that always picked the newest-modified file.
+    """
+
+    def __init__(self, max_directories: int = 4096):
+        self.max_directories = max_directories
+        self._snapshots: "OrderedDict[str, _DirectorySnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def extract_timestamp(filename: str) -> Optional[str]:
+        """Extract the YYYYMMDD_HHMMSS timestamp from a filename, preferring the trailing one"""
+        match = _TRAILING_TIMESTAMP.search(filename) or _ANY_TIMESTAMP.search(filename)
+        return match.group(1) if match else None
+
+    @classmethod
+    def _sort_key(cls, name: str, mtime_ns: int, order: str) -> _SortKey:
+        if order == "mtime":
+            return (mtime_ns,)
+        return (cls.extract_timestamp(name) or _NO_TIMESTAMP, mtime_ns)
+
+    @staticmethod
+    def _matches(name: str, entry_key: _EntryKey) -> bool:
+        pattern, accept, _ = entry_key
+        return fnmatch.fnmatchcase(name, pattern) and (accept is None or accept.match(name) is not None)
+
+    @staticmethod
+    def _mtime_ns(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _snapshot(self, directory: Path) -> Optional[_DirectorySnapshot]:
+        key = str(directory)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            with self._lock:
+                self._snapshots.pop(key, None)
+            return None
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and snapshot.mtime_ns == mtime_ns:
+                self._snapshots.move_to_end(key)
+                return snapshot
+
+        try:
+            names = set(os.listdir(key))
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+        snapshot = _DirectorySnapshot(mtime_ns, names)
+        with self._lock:
+            self._snapshots[key] = snapshot
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.max_directories:
+                self._snapshots.popitem(last=False)
+        return snapshot
+
+    def _scan(self, directory: Path, names: Set[str], entry_key: _EntryKey) -> Optional[_Winner]:
+        """Pick the winner among every matching file (first lookup or after an unrecorded change)"""
+        order = entry_key[2]
+        matches = [n for n in names if self._matches(n, entry_key)]
+        if order != "mtime" and matches:
+            # Only files on the newest filename timestamp can win; stat just those
+            newest = max(self.extract_timestamp(n) or _NO_TIMESTAMP for n in matches)
+            matches = [n for n in matches if (self.extract_timestamp(n) or _NO_TIMESTAMP) == newest]
+
+        winner: Optional[_Winner] = None
+        for name in matches:
+            mtime_ns = self._mtime_ns(os.path.join(str(directory), name))
+            if mtime_ns is None:
+                continue
+            sort_key = self._sort_key(name, mtime_ns, order)
+            if winner is None or sort_key > winner.sort_key:
+                winner = _Winner(name, sort_key, mtime_ns)
+        return winner
+
+    def latest(
+        self,
+        directory: Union[str, Path],
+        pattern: str,
+        accept: Optional[Pattern] = None,
+        order: str = "timestamp",
+    ) -> Optional[Path]:
+        """
+        Return the latest file in a directory matching a glob pattern
+
+        Args:
+            directory: Directory to look in (not recursive)
+            pattern: Glob-style filename pattern, e.g. "Acme_tailored_cv_*.json"
+            accept: Optional compiled regex every filename must also match
+            order: "timestamp" (filename timestamp, then mtime) or "mtime"
+
+        Returns:
+            Path to the latest matching file, or None
+        """
+        directory = Path(directory)
+        snapshot = self._snapshot(directory)
+        if snapshot is None:
+            return None
+
+        entry_key = (pattern, accept, order)
+        with self._lock:
+            known = entry_key in snapshot.latest
+            winner = snapshot.latest.get(entry_key)
+            names = set(snapshot.names) if not known else None
+
+        if known and winner is not None:
+            mtime_ns = self._mtime_ns(str(directory / winner.name))
+            if mtime_ns is None:
+                # Removed without the directory changing since it was indexed; rescan below
+                known = False
+                with self._lock:
+                    snapshot.names.discard(winner.name)
+                    names = set(snapshot.names)
+            elif mtime_ns > winner.mtime_ns:
+                # Rewritten in place: a newer mtime only strengthens its lead
+                with self._lock:
+                    winner.sort_key = self._sort_key(winner.name, mtime_ns, order)
+                    winner.mtime_ns = mtime_ns
+            elif mtime_ns < winner.mtime_ns:
+                known = False
+                with self._lock:
+                    names = set(snapshot.names)
+
+        if not known:
+            winner = self._scan(directory, names, entry_key)
+            with self._lock:
+                snapshot.latest[entry_key] = winner
+
+        return directory / winner.name if winner is not None else None
+
+    def record_write(self, file_path: Union[str, Path]) -> None:
+        """Update the latest entries of a file's directory after it was written or removed"""
+        file_path = Path(file_path)
+        key = str(file_path.parent)
+        name = file_path.name
+        mtime_ns = self._mtime_ns(str(file_path))
+        dir_mtime_ns = self._mtime_ns(key)
+
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None:
+                return
+            if mtime_ns is None:
+                snapshot.names.discard(name)
+                # Entries this file was winning are recomputed on their next lookup
+                for entry_key, winner in list(snapshot.latest.items()):
+                    if winner is not None and winner.name == name:
+                        del snapshot.latest[entry_key]
+            else:
+                snapshot.names.add(name)
+                stale = []
+                for entry_key, winner in snapshot.latest.items():
+                    if not self._matches(name, entry_key):
+                        continue
+                    sort_key = self._sort_key(name, mtime_ns, entry_key[2])
+                    if winner is None or sort_key >= winner.sort_key:
+                        snapshot.latest[entry_key] = _Winner(name, sort_key, mtime_ns)
+                    elif winner.name == name:
+                        # The winner went back in time; another file may lead now
+                        stale.append(entry_key)
+                for entry_key in stale:
+                    del snapshot.latest[entry_key]
+            # The listing now reflects this write, so it no longer invalidates the snapshot.
+            # A file another writer added without recording it since the last lookup is
+            # missed until the directory changes again.
+            if dir_mtime_ns is not None:
+                snapshot.mtime_ns = dir_mtime_ns
+
+    def clear(self) -> None:
+        """Drop every cached directory listing"""
+        with self._lock:
+            self._snapshots.clear()
+
+
+# Global artifact index instance
+artifact_index = ArtifactIndex()
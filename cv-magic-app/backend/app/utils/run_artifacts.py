@@ -0,0 +1,416 @@
+"""
+Run Artifacts
+
+Per-run, in-memory handoff of analysis artifacts between pipeline stages.
+
+Within one pipeline run, stages write JSON/text artifacts (CV–JD matching,
+skills analysis entries, input recommendations, prompts) that the next stage
+immediately reads back. Inside a `pipeline_artifacts(...)` scope those writes
+land in memory first and are readable at once; persistence to disk happens as
+coalesced write-behind in a background thread. Files read during the run are
+parsed once.
+
+Outside a run scope the module-level helpers fall back to plain disk I/O, so
+services behave exactly as before when called from standalone endpoints.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+from app.utils.artifact_index import artifact_index
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+_current_run: contextvars.ContextVar[Optional["RunArtifacts"]] = contextvars.ContextVar(
+    "current_run_artifacts", default=None
+)
+
+
+class _Artifact:
+    """One file's in-memory state"""
+
+    __slots__ = ("kind", "data", "written_at", "seq", "dirty")
+
+    def __init__(self, kind: str, data: Any, written_at: Optional[float], seq: int, dirty: bool):
+        self.kind = kind
+        self.data = data
+        self.written_at = written_at
+        self.seq = seq
+        self.dirty = dirty
+
+
+def _serialize(kind: str, data: Any) -> str:
+    if kind == "json":
+        return json.dumps(data, indent=2, ensure_ascii=False)
+    return data
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class RunArtifacts:
+    """
+    Artifact store for one pipeline run.
+
+    Data returned by read_json is shared with the store: mutate it only if you
+    write it back with write_json.
+
+    Stages may also use the store from worker threads (asyncio.to_thread copies
+    the run context); the artifact table is guarded by a lock and flushes are
+    handed back to the run's event loop, so files are written in order.
+    """
+
+    def __init__(self, user_email: Optional[str] = None, company: Optional[str] = None, flush_delay: float = 0.05):
+        self.user_email = user_email
+        self.company = company
+        self.flush_delay = flush_delay
+        self._artifacts: Dict[str, _Artifact] = {}
+        self._on_persisted: Dict[str, List[Callable[[], None]]] = {}
+        self._inflight: set = set()
+        self._seq = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._lock = threading.Lock()
+        try:
+            self._loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        self._stats = {"memory_reads": 0, "disk_reads": 0, "writes": 0, "flushed_files": 0}
+
+    def _record(self, path: Path, kind: str, data: Any) -> None:
+        with self._lock:
+            self._seq += 1
+            self._artifacts[str(path)] = _Artifact(kind, data, time.time(), self._seq, dirty=True)
+            self._stats["writes"] += 1
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called from a worker thread: let the run's loop flush, so writes stay ordered
+            if self._loop is not None and not self._loop.is_closed():
+                try:
+                    self._loop.call_soon_threadsafe(self._schedule_flush)
+                    return
+                except RuntimeError:
+                    pass
+            # No loop to hand off to: persist synchronously instead
+            self._flush_sync()
+            return
+        self._loop = loop
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_soon())
+
+    async def _flush_soon(self) -> None:
+        # Short delay so back-to-back writes to the same file are coalesced
+        await asyncio.sleep(self.flush_delay)
+        await self.flush()
+
+    def _take_dirty(self) -> Dict[Path, str]:
+        pending: Dict[Path, str] = {}
+        with self._lock:
+            for key, artifact in self._artifacts.items():
+                if artifact.dirty:
+                    pending[Path(key)] = _serialize(artifact.kind, artifact.data)
+                    artifact.dirty = False
+            self._inflight.update(str(path) for path in pending)
+        return pending
+
+    def _persisted(self, path: Path) -> None:
+        artifact_index.record_write(path)
+        with self._lock:
+            self._inflight.discard(str(path))
+            self._stats["flushed_files"] += 1
+
+    def _run_callbacks(self, path: Path) -> None:
+        with self._lock:
+            callbacks = self._on_persisted.pop(str(path), [])
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"⚠️ [RUN_ARTIFACTS] Post-write callback for {path} failed: {e}")
+
+    def _flush_sync(self) -> None:
+        for path, text in self._take_dirty().items():
+            try:
+                _atomic_write(path, text)
+            except BaseException:
+                self._mark_unpersisted(path)
+                raise
+            self._persisted(path)
+            self._run_callbacks(path)
+
+    def _mark_unpersisted(self, path: Path) -> None:
+        with self._lock:
+            self._inflight.discard(str(path))
+            artifact = self._artifacts.get(str(path))
+            if artifact is not None:
+                artifact.dirty = True
+
+    async def flush(self) -> None:
+        """Persist every pending write to disk"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            # Serialize on the loop (stages may still mutate the data), write off the loop
+            pending = self._take_dirty()
+            first_error: Optional[Exception] = None
+            remaining = list(pending)
+            for path, text in pending.items():
+                try:
+                    await asyncio.to_thread(_atomic_write, path, text)
+                except Exception as e:
+                    logger.error(f"❌ [RUN_ARTIFACTS] Failed to persist {path}: {e}")
+                    self._mark_unpersisted(path)
+                    remaining.remove(path)
+                    first_error = first_error or e
+                    continue
+                except BaseException:
+                    # Cancelled: whatever was not written stays pending for the next flush
+                    for unwritten in remaining:
+                        self._mark_unpersisted(unwritten)
+                    raise
+                remaining.remove(path)
+                self._persisted(path)
+                if str(path) in self._on_persisted:
+                    await asyncio.to_thread(self._run_callbacks, path)
+            if first_error is not None:
+                raise first_error
+
+    async def close(self) -> None:
+        """Wait for the write-behind task and flush anything still pending"""
+        if self._flush_task is not None and not self._flush_task.done():
+            try:
+                await self._flush_task
+            except Exception:
+                pass
+        await self.flush()
+
+    def latest(self, directory: PathLike, base_name: str, extension: str = "json") -> Optional[Path]:
+        """Latest timestamped file, preferring artifacts written during this run"""
+        directory = Path(directory)
+        pattern = re.compile(rf"{re.escape(base_name)}_\d{{8}}_\d{{6}}\.{re.escape(extension)}$")
+        newest: Optional[_Artifact] = None
+        newest_path: Optional[str] = None
+        with self._lock:
+            artifacts = list(self._artifacts.items())
+        for key, artifact in artifacts:
+            if artifact.written_at is None:
+                continue
+            path = Path(key)
+            if path.parent == directory and pattern.match(path.name):
+                if newest is None or artifact.seq > newest.seq:
+                    newest, newest_path = artifact, key
+        if newest_path is not None:
+            return Path(newest_path)
+        from app.utils.timestamp_utils import TimestampUtils
+        return TimestampUtils.find_latest_timestamped_file(directory, base_name, extension)
+
+    def _load(self, path: Path, kind: str) -> Optional[Any]:
+        key = str(path)
+        with self._lock:
+            artifact = self._artifacts.get(key)
+            if artifact is not None:
+                self._stats["memory_reads"] += 1
+                return artifact.data
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f) if kind == "json" else f.read()
+        with self._lock:
+            self._stats["disk_reads"] += 1
+            # Another thread may have written the artifact meanwhile; its data wins
+            artifact = self._artifacts.get(key)
+            if artifact is not None:
+                return artifact.data
+            self._seq += 1
+            self._artifacts[key] = _Artifact(kind, data, None, self._seq, dirty=False)
+        return data
+
+    def read_json(self, path: PathLike) -> Optional[Any]:
+        """Parsed JSON for a path, from memory when available; None if the file does not exist"""
+        return self._load(Path(path), "json")
+
+    def read_text(self, path: PathLike) -> Optional[str]:
+        """Text content for a path, from memory when available; None if the file does not exist"""
+        return self._load(Path(path), "text")
+
+    def write_json(self, path: PathLike, data: Any) -> None:
+        """Publish JSON to later stages now; persist it in the background"""
+        self._record(Path(path), "json", data)
+
+    def write_text(self, path: PathLike, text: str) -> None:
+        """Publish text to later stages now; persist it in the background"""
+        self._record(Path(path), "text", text)
+
+    def when_persisted(self, path: PathLike, callback: Callable[[], None]) -> None:
+        """Run callback (off the loop) once the pending write of path reached disk"""
+        with self._lock:
+            artifact = self._artifacts.get(str(path))
+            pending = (artifact is not None and artifact.dirty) or str(path) in self._inflight
+            if pending:
+                self._on_persisted.setdefault(str(path), []).append(callback)
+        if not pending:
+            callback()
+
+    def exists(self, path: PathLike) -> bool:
+        """Whether the artifact was written in this run or exists on disk"""
+        with self._lock:
+            known = str(path) in self._artifacts
+        return known or Path(path).exists()
+
+    def mtime(self, path: PathLike) -> float:
+        """Modification time, using the in-memory write time for pending artifacts"""
+        with self._lock:
+            artifact = self._artifacts.get(str(path))
+            written_at = artifact.written_at if artifact is not None else None
+        if written_at is not None:
+            return written_at
+        try:
+            return Path(path).stat().st_mtime
+        except OSError:
+            return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Memory/disk read and write counters for this run"""
+        with self._lock:
+            return dict(self._stats)
+
+
+def current_artifacts() -> Optional[RunArtifacts]:
+    """The artifact store of the pipeline run executing in this context, if any"""
+    return _current_run.get()
+
+
+@asynccontextmanager
+async def pipeline_artifacts(user_email: Optional[str] = None, company: Optional[str] = None) -> AsyncIterator[RunArtifacts]:
+    """
+    Scope a pipeline run's artifact store
+
+    Tasks created inside the scope inherit it. Pending writes are flushed
+    before the scope exits, so files are on disk once the run completes.
+    Nested scopes reuse the outer run's store.
+    """
+    existing = _current_run.get()
+    if existing is not None:
+        yield existing
+        return
+    run = RunArtifacts(user_email, company)
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        await run.close()
+        logger.info(f"💾 [RUN_ARTIFACTS] Run for {company or 'pipeline'} finished: {run.get_stats()}")
+
+
+# Helpers used by services; they fall back to direct disk I/O outside a run
+
+def find_latest(directory: PathLike, base_name: str, extension: str = "json") -> Optional[Path]:
+    """Latest timestamped file, including artifacts still pending write-behind"""
+    run = _current_run.get()
+    if run is not None:
+        return run.latest(directory, base_name, extension)
+    from app.utils.timestamp_utils import TimestampUtils
+    return TimestampUtils.find_latest_timestamped_file(Path(directory), base_name, extension)
+
+
+def load_json(path: PathLike) -> Optional[Any]:
+    """Parsed JSON file, or None if it does not exist"""
+    run = _current_run.get()
+    if run is not None:
+        return run.read_json(path)
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_text(path: PathLike) -> Optional[str]:
+    """Text file content, or None if it does not exist"""
+    run = _current_run.get()
+    if run is not None:
+        return run.read_text(path)
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def save_json(path: PathLike, data: Any) -> None:
+    """Write JSON (indent=2, UTF-8) now, or as write-behind inside a run"""
+    run = _current_run.get()
+    if run is not None:
+        run.write_json(path, data)
+        return
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def save_text(path: PathLike, text: str) -> None:
+    """Write text now, or as write-behind inside a run"""
+    run = _current_run.get()
+    if run is not None:
+        run.write_text(path, text)
+        return
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def when_persisted(path: PathLike, callback: Callable[[], None]) -> None:
+    """Run callback once path is on disk (immediately outside a run)"""
+    run = _current_run.get()
+    if run is not None:
+        run.when_persisted(path, callback)
+    else:
+        callback()
+
+
+def artifact_exists(path: PathLike) -> bool:
+    """Whether a file exists on disk or is pending write-behind"""
+    run = _current_run.get()
+    return run.exists(path) if run is not None else Path(path).exists()
+
+
+def artifact_mtime(path: PathLike) -> float:
+    """File modification time (0 if missing), honouring pending writes"""
+    run = _current_run.get()
+    if run is not None:
+        return run.mtime(path)
+    try:
+        return Path(path).stat().st_mtime
+    except OSError:
+        return 0
@@ -0,0 +1,92 @@
+"""
+Single-Flight Utilities
+
+Collapses concurrent identical async calls into one in-flight task. The first
+caller for a key starts the work; every concurrent caller with the same key
+awaits that shared task instead of repeating it (e.g. the background pipeline
+and /trigger-complete-pipeline both asking for the same JD analysis).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import weakref
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    In-process map of in-flight tasks keyed by call identity
+
+    With share_errors=False only a successful result is shared: a caller that
+    joined a flight which failed makes its own call instead of receiving the
+    starter's exception.
+    """
+
+    def __init__(self, name: str = "single_flight", share_errors: bool = True):
+        self.name = name
+        self.share_errors = share_errors
+        # Tasks are bound to the loop that created them, so keep one map per loop
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = weakref.WeakKeyDictionary()
+        self._stats = {"started": 0, "joined": 0, "retried": 0}
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a stable key from user, company, stage and stage inputs"""
+        payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn() once per key among concurrent callers
+
+        Args:
+            key: Identity of the call (see make_key)
+            fn: Zero-argument coroutine factory performing the work
+
+        Returns:
+            The shared result; exceptions are propagated to every waiter
+            unless share_errors is False
+        """
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.setdefault(loop, {})
+        task = inflight.get(key)
+        joined = task is not None
+        if task is None:
+            task = loop.create_task(fn())
+            inflight[key] = task
+            self._stats["started"] += 1
+
+            def _release(done: asyncio.Task, key: str = key):
+                if inflight.get(key) is done:
+                    del inflight[key]
+
+            task.add_done_callback(_release)
+        else:
+            self._stats["joined"] += 1
+            logger.info(f"🔗 [{self.name.upper()}] Joining in-flight call {key[:12]}")
+
+        try:
+            # Shield so a cancelled waiter does not cancel the work shared with others
+            return await asyncio.shield(task)
+        except Exception:
+            if not joined or self.share_errors:
+                raise
+        self._stats["retried"] += 1
+        logger.info(f"🔁 [{self.name.upper()}] Joined call {key[:12]} failed; making this caller's own call")
+        return await fn()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return started/joined counters and the number of calls in flight"""
+        in_flight = sum(len(tasks) for tasks in self._inflight.values())
+        return {**self._stats, "in_flight": in_flight}
+
+
+# Shared instances: one for whole pipeline stages, one for individual LLM calls
+pipeline_single_flight = SingleFlight("pipeline_single_flight")
+llm_single_flight = SingleFlight("llm_single_flight", share_errors=False)
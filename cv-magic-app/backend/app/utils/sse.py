@@ -0,0 +1,116 @@
+"""
+Server-Sent Events Utilities
+
+Runs a long LLM-backed job in the background and relays its streamed tokens
+to the client as Server-Sent Events, so the first token reaches the client as
+soon as the provider emits it instead of after the whole generation.
+
+Event stream:
+- event: token     data: {"text": "..."}            (one per streamed delta)
+- event: status    data: {...}                      (optional progress notes from the job)
+- event: complete  data: <job result>
+- event: error     data: {"error": "..."}
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Set
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+}
+
+# Strong references so jobs outlive a disconnected client's response generator
+_running_jobs: Set[asyncio.Task] = set()
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one Server-Sent Event"""
+    payload = json.dumps(data, default=str, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+class StreamEmitter:
+    """Callbacks handed to a streaming job; they enqueue events for the SSE response"""
+
+    def __init__(self, queue: "asyncio.Queue[Optional[str]]"):
+        self._queue = queue
+        self.connected = True
+
+    async def token(self, text: str) -> None:
+        """Forward one text delta from the LLM"""
+        if self.connected and text:
+            await self._queue.put(format_sse("token", {"text": text}))
+
+    async def status(self, **data: Any) -> None:
+        """Forward a progress note (stage name, attempt number, ...)"""
+        if self.connected:
+            await self._queue.put(format_sse("status", data))
+
+
+async def stream_job_events(
+    job: Callable[[StreamEmitter], Awaitable[Any]],
+    serialize_result: Callable[[Any], Any] = lambda result: result,
+    keepalive_seconds: float = 15.0,
+) -> AsyncIterator[str]:
+    """
+    Run job(emitter) as a task and yield its events as SSE frames
+
+    The job keeps running if the client disconnects, so results that the job
+    persists (tailored CVs, recommendations) are not lost.
+
+    Args:
+        job: Coroutine factory receiving the StreamEmitter
+        serialize_result: Converts the job's return value into JSON-serializable data
+        keepalive_seconds: Interval for comment frames that keep idle connections open
+    """
+    queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+    emitter = StreamEmitter(queue)
+
+    async def _run() -> None:
+        try:
+            result = await job(emitter)
+            await queue.put(format_sse("complete", serialize_result(result)))
+        except Exception as e:
+            logger.error(f"❌ [SSE] Streaming job failed: {e}")
+            detail = getattr(e, "detail", None) or str(e)
+            await queue.put(format_sse("error", {"error": detail}))
+        finally:
+            await queue.put(None)
+
+    task = asyncio.create_task(_run())
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+    try:
+        while True:
+            try:
+                frame = await asyncio.wait_for(queue.get(), timeout=keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if frame is None:
+                break
+            yield frame
+    finally:
+        emitter.connected = False
+        if not task.done():
+            logger.info("🔌 [SSE] Client disconnected; job continues in background")
+
+
+def sse_response(
+    job: Callable[[StreamEmitter], Awaitable[Any]],
+    serialize_result: Callable[[Any], Any] = lambda result: result,
+) -> StreamingResponse:
+    """Build a text/event-stream response for a streaming job"""
+    return StreamingResponse(
+        stream_job_events(job, serialize_result),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
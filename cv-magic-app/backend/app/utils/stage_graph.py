@@ -0,0 +1,169 @@
+"""
+Stage Graph
+
+Small dependency-graph executor for async pipeline stages. Each stage starts
+as soon as the stages it depends on have finished, so independent stages run
+concurrently and end-to-end time approaches the critical path. Stage outputs
+are handed to dependants in memory.
+
+Dependency kinds:
+- depends_on: the stage needs the dependency's output; it is skipped if the
+  dependency failed (raised or returned None)
+- after: ordering only; the stage runs once the dependency finished, whatever
+  its outcome, and receives its output (None if it failed)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+StageFn = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+CANCELLED = "cancelled"
+
+
+class StageRun:
+    """Outcome and timing of one stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status: Optional[str] = None
+        self.output: Any = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.duration: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Timing summary for API responses"""
+        return {
+            "status": self.status,
+            "started_offset_seconds": self.started_at,
+            "duration_seconds": round(self.duration, 3),
+            "error": self.error,
+        }
+
+
+class _Stage:
+    def __init__(self, name: str, fn: StageFn, depends_on: List[str], after: List[str], required: bool):
+        self.name = name
+        self.fn = fn
+        self.depends_on = depends_on
+        self.after = after
+        self.required = required
+
+
+class StageGraph:
+    """
+    Async stage DAG.
+
+    A failed required stage cancels everything still pending or running,
+    mirroring a sequential pipeline that stops at its first hard failure.
+    """
+
+    def __init__(self, name: str = "pipeline"):
+        self.name = name
+        self._stages: Dict[str, _Stage] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: StageFn,
+        depends_on: Iterable[str] = (),
+        after: Iterable[str] = (),
+        required: bool = False,
+    ) -> "StageGraph":
+        """
+        Register a stage
+
+        Args:
+            name: Unique stage name
+            fn: Coroutine function receiving {dependency name: output} for all dependencies
+            depends_on: Stages whose output this stage needs
+            after: Stages that must finish first, regardless of outcome
+            required: Whether failure of this stage fails (and cancels) the whole run
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage '{name}' already registered")
+        self._stages[name] = _Stage(name, fn, list(depends_on), list(after), required)
+        return self
+
+    def _validate(self) -> None:
+        for stage in self._stages.values():
+            for dep in stage.depends_on + stage.after:
+                if dep not in self._stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+        # Reject cycles up front so run() cannot deadlock
+        visiting, done = set(), set()
+
+        def _visit(name: str) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage graph has a cycle through '{name}'")
+            visiting.add(name)
+            stage = self._stages[name]
+            for dep in stage.depends_on + stage.after:
+                _visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self._stages:
+            _visit(name)
+
+    async def run(self) -> Dict[str, StageRun]:
+        """Execute every stage as early as its dependencies allow"""
+        self._validate()
+        runs = {name: StageRun(name) for name in self._stages}
+        finished = {name: asyncio.Event() for name in self._stages}
+        origin = time.perf_counter()
+
+        async def _run_stage(stage: _Stage) -> None:
+            run = runs[stage.name]
+            try:
+                for dep in stage.depends_on + stage.after:
+                    await finished[dep].wait()
+                failed_deps = [dep for dep in stage.depends_on if runs[dep].status != SUCCEEDED]
+                if failed_deps:
+                    run.status = SKIPPED
+                    run.error = f"Dependencies not satisfied: {', '.join(failed_deps)}"
+                    logger.info(f"⏭️ [{self.name.upper()}] Skipping {stage.name} ({run.error})")
+                    return
+
+                inputs = {dep: runs[dep].output for dep in stage.depends_on + stage.after}
+                started = time.perf_counter()
+                run.started_at = round(started - origin, 3)
+                try:
+                    run.output = await stage.fn(inputs)
+                    run.status = SUCCEEDED if run.output is not None else FAILED
+                except Exception as e:
+                    run.status = FAILED
+                    run.error = str(e)
+                    logger.error(f"❌ [{self.name.upper()}] Stage {stage.name} raised: {e}")
+                finally:
+                    run.duration = time.perf_counter() - started
+                logger.info(f"⏱️ [{self.name.upper()}] {stage.name}: {run.status} in {run.duration:.2f}s")
+
+                if run.status == FAILED and stage.required:
+                    for name, task in tasks.items():
+                        if name != stage.name and not task.done():
+                            task.cancel()
+            except asyncio.CancelledError:
+                run.status = run.status or CANCELLED
+            finally:
+                finished[stage.name].set()
+
+        tasks = {name: asyncio.create_task(_run_stage(stage)) for name, stage in self._stages.items()}
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        for run in runs.values():
+            # A task cancelled before its first step never reaches its own handler
+            run.status = run.status or CANCELLED
+
+        total = time.perf_counter() - origin
+        logger.info(f"🏁 [{self.name.upper()}] {len(runs)} stage(s) finished in {total:.2f}s wall-clock")
+        return runs
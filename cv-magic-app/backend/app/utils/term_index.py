@@ -0,0 +1,126 @@
+"""
+Term Index
+
+Precompiled substring lookups for static skill/domain tables.
+
+Matching code across the services asks two questions of a fixed vocabulary:
+"which terms occur inside this text?" (`term in text`) and "which terms
+contain this text?" (`text in term`). Scanning a whole table with `in` for
+every query is O(size of table); these structures answer both in time
+proportional to the query length:
+
+- AhoCorasick: one pass over the text finds every vocabulary term in it
+- TermIndex: term -> group reverse index plus a substring -> term map, built once
+"""
+
+import logging
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AhoCorasick:
+    """Multi-pattern substring automaton"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+        self._matches_empty = False
+
+        for pattern in dict.fromkeys(patterns):
+            if not pattern:
+                self._matches_empty = True
+                continue
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                    self._goto[state][ch] = next_state
+                state = next_state
+            self._output[state] = self._output[state] + (pattern,)
+
+        # Breadth-first failure links; outputs inherit those of their failure state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_all(self, text: str) -> Set[str]:
+        """Return the distinct patterns that occur in text"""
+        found: Set[str] = {""} if self._matches_empty else set()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class TermIndex:
+    """
+    Bidirectional substring index over named groups of terms.
+
+    A text is related to a term when either one is a substring of the other,
+    which is the `a in b or b in a` test the matchers used to run in loops.
+    Groups keep their definition order so "first matching group" semantics
+    are preserved.
+    """
+
+    def __init__(self, groups: Mapping[str, Iterable[str]]):
+        self.group_names: List[str] = list(groups)
+        self._group_order = {name: i for i, name in enumerate(self.group_names)}
+        self._term_groups: Dict[str, List[str]] = {}
+        for name, terms in groups.items():
+            for term in terms:
+                owners = self._term_groups.setdefault(term, [])
+                if name not in owners:
+                    owners.append(name)
+
+        self._automaton = AhoCorasick(self._term_groups)
+        self._substring_terms: Dict[str, Set[str]] = {}
+        for term in self._term_groups:
+            for start in range(len(term) + 1):
+                for end in range(start, len(term) + 1):
+                    self._substring_terms.setdefault(term[start:end], set()).add(term)
+
+    def groups_of(self, term: str) -> List[str]:
+        """Groups that define the exact term"""
+        return self._term_groups.get(term, [])
+
+    def terms_in(self, text: str) -> Set[str]:
+        """Terms that occur inside text"""
+        return self._automaton.find_all(text)
+
+    def terms_containing(self, text: str) -> Set[str]:
+        """Terms that contain text"""
+        return self._substring_terms.get(text, set())
+
+    def related_terms(self, text: str) -> Set[str]:
+        """Terms where either the term is in text or text is in the term"""
+        return self.terms_in(text) | self.terms_containing(text)
+
+    def related_groups(self, text: str) -> List[str]:
+        """Groups with at least one related term, in definition order"""
+        names = {name for term in self.related_terms(text) for name in self._term_groups[term]}
+        return sorted(names, key=self._group_order.__getitem__)
+
+    def first_group(self, text: str) -> Optional[str]:
+        """The first group (in definition order) with a related term"""
+        groups = self.related_groups(text)
+        return groups[0] if groups else None
@@ -10,6 +10,8 @@ from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any
 import re
 
+from app.utils.artifact_index import artifact_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -114,12 +116,10 @@ class TimestampUtils:
         pattern = f".*{base_name}.*_\d{{8}}_\d{{6}}\.{extension}"
         logger.debug(f"🔍 [TIMESTAMP_UTILS] Using pattern: {pattern}")
         
-        matching_files = []
-        for file_path in directory.glob(f"{base_name}_*.{extension}"):
-            if re.match(pattern, file_path.name):
-                matching_files.append(file_path)
+        # Indexed lookup: only rescans the directory after it changed
+        latest_file = artifact_index.latest(directory, f"{base_name}_*.{extension}", accept=re.compile(pattern))
         
-        if not matching_files:
+        if not latest_file:
             if create_if_missing:
                 # Create new timestamped file
                 timestamp = TimestampUtils.get_timestamp()
@@ -129,10 +129,7 @@ class TimestampUtils:
                 return new_file
             return None
         
-        # Sort by timestamp in filename (newest first)
-        matching_files.sort(key=lambda x: TimestampUtils.extract_timestamp_from_filename(x.name), reverse=True)
-        
-        return matching_files[0]
+        return latest_file
     
     @staticmethod
     def find_all_timestamped_files(directory: Path, base_name: str, extension: str = "json") -> List[Path]:
@@ -112,6 +112,18 @@ def get_user_saved_jobs_path(user_email: Optional[str] = None) -> Path:
     base_path = get_user_base_path(user_email)
     return base_path / "saved_jobs" / "saved_jobs.json"
 
+def get_user_saved_jobs_db_path(user_email: Optional[str] = None) -> Path:
+    """
+    Get user-specific saved jobs database path
+    
+    Args:
+        user_email: User email address
+        
+    Returns:
+        Path to the saved_jobs.db SQLite file
+    """
+    return get_user_saved_jobs_path(user_email).with_name("saved_jobs.db")
+
 def get_user_cv_paths(user_email: Optional[str] = None) -> Dict[str, Path]:
     """
     Get paths for CV-related directories
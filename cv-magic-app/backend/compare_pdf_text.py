@@ -11,45 +11,21 @@ from pathlib import Path
 # Add the app directory to Python path
 sys.path.insert(0, '/app')
 
-try:
-    import PyPDF2
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
-    print("⚠️ PyPDF2 not available, will use alternative method")
-
+from app.services.document_text_extractor import iter_pdf_pages
 from app.tailored_cv.services.cv_tailoring_service import CVTailoringService
 from app.tailored_cv.models.cv_models import TailoredCV, ContactInfo, ExperienceEntry, SkillCategory, OptimizationStrategy
 
 
 def extract_pdf_text(pdf_path):
     """Extract text from PDF file"""
-    if PDF_AVAILABLE:
-        try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
-        except Exception as e:
-            print(f"❌ Error extracting PDF text: {e}")
-            return None
-    else:
-        # Alternative: Use pdfplumber if available
-        try:
-            import pdfplumber
-            with pdfplumber.open(pdf_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
-        except ImportError:
-            print("❌ No PDF text extraction library available")
-            return None
-        except Exception as e:
-            print(f"❌ Error extracting PDF text: {e}")
-            return None
+    try:
+        return "\n".join(text for _, text in iter_pdf_pages(Path(pdf_path))).strip()
+    except ImportError:
+        print("❌ No PDF text extraction library available")
+        return None
+    except Exception as e:
+        print(f"❌ Error extracting PDF text: {e}")
+        return None
 
 
 def get_json_text_content(json_path):
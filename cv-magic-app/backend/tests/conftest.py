@@ -0,0 +1,12 @@
+"""
+Shared test setup: make the backend's app package importable when pytest is
+run from cv-magic-app/backend or from the repository root.
+"""
+
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
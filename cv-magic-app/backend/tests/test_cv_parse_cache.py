@@ -0,0 +1,168 @@
+"""
+Tests for the structured CV parse cache and how the parser uses it: hits,
+misses, TTL and LRU limits, and that failed parses are never cached.
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import structured_cv_parser
+from app.services.cv_parse_cache import CVParseCache, cv_text_hash
+from app.services.structured_cv_parser import LLMStructuredCVParser
+
+CV_TEXT = "Jane Doe\njane@example.com\n\nEXPERIENCE\nData Analyst, Acme (2020-2024)"
+PARSED = {"personal_information": {"name": "Jane Doe"}, "skills": {"technical_skills": ["SQL"]}}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CVParseCache(str(tmp_path / "cv_parses.db"), ttl_seconds=3600, max_entries=3)
+
+
+def test_miss_then_hit(cache):
+    digest = cv_text_hash(CV_TEXT)
+    assert cache.get(digest, "v1", "openai:gpt-4o") is None
+
+    cache.set(digest, "v1", "openai:gpt-4o", PARSED)
+
+    assert cache.get(digest, "v1", "openai:gpt-4o") == PARSED
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_prompt_version_model_and_text_are_part_of_the_key(cache):
+    digest = cv_text_hash(CV_TEXT)
+    cache.set(digest, "v1", "openai:gpt-4o", PARSED)
+
+    assert cache.get(digest, "v2", "openai:gpt-4o") is None
+    assert cache.get(digest, "v1", "anthropic:claude") is None
+    assert cache.get(cv_text_hash(CV_TEXT + " "), "v1", "openai:gpt-4o") is None
+
+
+def test_any_model_lookup_returns_the_newest_parse(cache):
+    digest = cv_text_hash(CV_TEXT)
+    cache.set(digest, "v1", "openai:gpt-4o", {"by": "openai"})
+    time.sleep(0.01)
+    cache.set(digest, "v1", "anthropic:claude", {"by": "anthropic"})
+
+    assert cache.get(digest, "v1", None) == {"by": "anthropic"}
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = CVParseCache(str(tmp_path / "cv_parses.db"), ttl_seconds=1)
+    digest = cv_text_hash(CV_TEXT)
+    cache.set(digest, "v1", "openai:gpt-4o", PARSED)
+    with cache._lock:
+        conn = cache._connection()
+        conn.execute("UPDATE cv_parses SET created_at = ?", (time.time() - 10,))
+        conn.commit()
+
+    assert cache.get(digest, "v1", "openai:gpt-4o") is None
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    digests = [cv_text_hash(f"cv {n}") for n in range(4)]
+    for digest in digests[:3]:
+        cache.set(digest, "v1", "m", PARSED)
+        time.sleep(0.01)
+    # Touch the oldest so the second one becomes least recently used
+    cache.get(digests[0], "v1", "m")
+    time.sleep(0.01)
+
+    cache.set(digests[3], "v1", "m", PARSED)
+
+    assert cache.get(digests[1], "v1", "m") is None
+    assert cache.get(digests[0], "v1", "m") == PARSED
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = CVParseCache(str(tmp_path / "cv_parses.db"), enabled=False)
+    digest = cv_text_hash(CV_TEXT)
+    cache.set(digest, "v1", "m", PARSED)
+
+    assert cache.get(digest, "v1", "m") is None
+
+
+class _FakeAI:
+    """Stands in for the LLM: fails as often as told, then answers with PARSED"""
+
+    def __init__(self, failures: int = 0, content: str = json.dumps(PARSED)):
+        self.failures = failures
+        self.content = content
+        self.calls = 0
+
+    def resolve_provider(self, user, provider_name=None, model_name=None):
+        return SimpleNamespace(provider_name="openai", model_name="gpt-4o")
+
+    async def generate_response(self, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("rate limited")
+        return SimpleNamespace(content=self.content)
+
+
+@pytest.fixture
+def parser_env(cache, monkeypatch):
+    def _install(ai):
+        monkeypatch.setattr(structured_cv_parser, "cv_parse_cache", cache)
+        monkeypatch.setattr(structured_cv_parser, "ai_service", ai)
+        return LLMStructuredCVParser()
+    return _install
+
+
+@pytest.mark.asyncio
+async def test_parser_reuses_cached_parse(parser_env):
+    ai = _FakeAI()
+    parser = parser_env(ai)
+    user = SimpleNamespace(id=1, email="a@example.com")
+
+    first = await parser.parse_cv_content(CV_TEXT, user)
+    second = await parser.parse_cv_content(CV_TEXT, user)
+
+    assert ai.calls == 1
+    assert first["personal_information"]["name"] == second["personal_information"]["name"] == "Jane Doe"
+    assert "parsing_error" not in second
+
+
+@pytest.mark.asyncio
+async def test_parser_does_not_cache_llm_errors(parser_env, cache):
+    ai = _FakeAI(failures=1)
+    parser = parser_env(ai)
+    user = SimpleNamespace(id=1, email="a@example.com")
+
+    failed = await parser.parse_cv_content(CV_TEXT, user)
+    assert "parsing_error" in failed
+    assert cache.get_stats()["entries"] == 0
+
+    retried = await parser.parse_cv_content(CV_TEXT, user)
+    assert ai.calls == 2
+    assert "parsing_error" not in retried
+    assert cache.get_stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_parser_does_not_cache_unparseable_responses(parser_env, cache):
+    parser = parser_env(_FakeAI(content="Sorry, I cannot help with that."))
+
+    result = await parser.parse_cv_content(CV_TEXT, SimpleNamespace(id=1, email="a@example.com"))
+
+    assert "parsing_error" in result
+    assert cache.get_stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_parser_without_user_only_serves_cached_parses(parser_env):
+    ai = _FakeAI()
+    parser = parser_env(ai)
+
+    missing = await parser.parse_cv_content(CV_TEXT, None)
+    await parser.parse_cv_content(CV_TEXT, SimpleNamespace(id=1, email="a@example.com"))
+    cached = await parser.parse_cv_content(CV_TEXT, None)
+
+    assert "parsing_error" in missing
+    assert cached["personal_information"]["name"] == "Jane Doe"
+    assert ai.calls == 1
@@ -0,0 +1,156 @@
+"""
+Tests for the cached document text extractor: results per file type, the
+content-hash cache, and the process pool for multi-page PDFs.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.document_text_extractor import DocumentTextExtractor
+
+PAGE_TEXT = "Page {n}: built reporting pipelines with Python and SQL for finance teams"
+
+
+@pytest.fixture
+def extractor(tmp_path):
+    extractor = DocumentTextExtractor(str(tmp_path / "cache"), max_cached=10, workers=0, pages_per_chunk=2)
+    yield extractor
+    extractor.shutdown()
+
+
+def _write_pdf(path, pages):
+    canvas = pytest.importorskip("reportlab.pdfgen.canvas")
+    pdf = canvas.Canvas(str(path))
+    for n in range(1, pages + 1):
+        pdf.drawString(72, 720, PAGE_TEXT.format(n=n))
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+def _write_docx(path, paragraphs):
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    document.save(str(path))
+    return path
+
+
+def test_txt_extraction(extractor, tmp_path):
+    path = tmp_path / "cv.txt"
+    path.write_text("  Jane Doe\nData Analyst  \n", encoding="utf-8")
+
+    result = extractor.extract(path)
+
+    assert result["success"] is True
+    assert result["text"] == "Jane Doe\nData Analyst"
+    assert result["word_count"] == 4
+    assert result["file_type"] == "txt"
+    assert result["cached"] is False
+
+
+def test_docx_extraction(extractor, tmp_path):
+    path = _write_docx(tmp_path / "cv.docx", ["Jane Doe", "Data Analyst at Acme"])
+
+    result = extractor.extract(path)
+
+    assert result["success"] is True
+    assert result["text"] == "Jane Doe\nData Analyst at Acme"
+    assert result["file_type"] == "docx"
+
+
+def test_pdf_extraction_keeps_page_order(extractor, tmp_path):
+    pytest.importorskip("PyPDF2")
+    path = _write_pdf(tmp_path / "cv.pdf", pages=3)
+
+    result = extractor.extract(path)
+
+    assert result["success"] is True
+    assert result["file_type"] == "pdf"
+    assert result["pages"] == 3
+    positions = [result["text"].index(f"Page {n}:") for n in (1, 2, 3)]
+    assert positions == sorted(positions)
+
+
+def test_pdf_extraction_in_the_process_pool(tmp_path):
+    pytest.importorskip("PyPDF2")
+    path = _write_pdf(tmp_path / "cv.pdf", pages=5)
+    extractor = DocumentTextExtractor(str(tmp_path / "cache"), workers=2, pages_per_chunk=2)
+    try:
+        result = extractor.extract(path)
+    finally:
+        extractor.shutdown()
+
+    assert result["success"] is True
+    assert result["pages"] == 5
+    assert all(f"Page {n}:" in result["text"] for n in range(1, 6))
+    assert extractor.get_stats()["pool_extractions"] == 1
+
+
+def test_unsupported_type_fails_and_is_not_cached(extractor, tmp_path):
+    path = tmp_path / "cv.rtf"
+    path.write_text("{\\rtf1 Jane Doe}", encoding="utf-8")
+
+    result = extractor.extract(path)
+
+    assert result["success"] is False
+    assert "Unsupported file type" in result["error"]
+    assert list((tmp_path / "cache").glob("*.json")) == []
+
+
+def test_missing_file_fails(extractor, tmp_path):
+    result = extractor.extract(tmp_path / "missing.pdf")
+
+    assert result["success"] is False
+    assert result["text"] == ""
+
+
+def test_identical_content_is_served_from_the_cache(extractor, tmp_path):
+    first = tmp_path / "cv.txt"
+    first.write_text("Jane Doe\nData Analyst", encoding="utf-8")
+    reupload = tmp_path / "cv_copy.txt"
+    reupload.write_bytes(first.read_bytes())
+
+    extractor.extract(first)
+    result = extractor.extract(reupload)
+
+    assert result["cached"] is True
+    assert result["text"] == "Jane Doe\nData Analyst"
+    stats = extractor.get_stats()
+    assert (stats["extractions"], stats["cache_hits"]) == (1, 1)
+
+
+def test_changed_content_is_extracted_again(extractor, tmp_path):
+    path = tmp_path / "cv.txt"
+    path.write_text("Jane Doe", encoding="utf-8")
+    extractor.extract(path)
+    path.write_text("Jane Doe\nSenior Data Analyst", encoding="utf-8")
+
+    result = extractor.extract(path)
+
+    assert result["cached"] is False
+    assert result["text"] == "Jane Doe\nSenior Data Analyst"
+
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+    extractor = DocumentTextExtractor(str(tmp_path / "cache"), max_cached=2, workers=0)
+    for n in range(3):
+        path = tmp_path / f"cv_{n}.txt"
+        path.write_text(f"CV number {n}", encoding="utf-8")
+        extractor.extract(path)
+
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 2
+    assert extractor.get_stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_extractions_share_one_run(extractor, tmp_path):
+    path = tmp_path / "cv.txt"
+    path.write_text("Jane Doe\nData Analyst", encoding="utf-8")
+
+    results = await asyncio.gather(*(extractor.extract_async(path) for _ in range(5)))
+
+    assert all(result["text"] == "Jane Doe\nData Analyst" for result in results)
+    assert extractor.get_stats()["extractions"] == 1
@@ -0,0 +1,129 @@
+"""
+Tests for the SQLite JD usage store: read-through caching, invalidation when
+another connection commits (SQLite data_version), and legacy JSON import.
+"""
+
+import json
+
+import pytest
+
+from app.services.jd_usage_tracker import JDUsageStore, JDUsageTracker
+from app.utils import user_path_utils
+
+USER = "a@example.com"
+JD_URL = "https://jobs.example.com/123"
+
+
+@pytest.fixture(autouse=True)
+def user_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(user_path_utils, "get_user_base_path", lambda user_email: tmp_path / "users" / user_email)
+    return tmp_path / "users"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jd_usage.db")
+
+
+def test_first_use_then_reuse(db_path):
+    tracker = JDUsageTracker(USER, store=JDUsageStore(db_path))
+
+    assert tracker.is_jd_first_time_usage(JD_URL) is True
+    tracker.record_jd_usage(JD_URL, company="Acme", job_title="Analyst")
+    tracker.record_jd_usage(JD_URL, company="Globex")
+
+    assert tracker.is_jd_first_time_usage(JD_URL) is False
+    info = tracker.get_jd_usage_info(JD_URL)
+    assert info["usage_count"] == 2
+    assert info["companies_used_with"] == ["Acme", "Globex"]
+
+
+def test_usage_is_per_user(db_path):
+    store = JDUsageStore(db_path)
+    JDUsageTracker(USER, store=store).record_jd_usage(JD_URL)
+
+    assert JDUsageTracker("b@example.com", store=store).is_jd_first_time_usage(JD_URL) is True
+
+
+def test_repeated_checks_are_served_from_the_cache(db_path):
+    store = JDUsageStore(db_path)
+    store.contains(USER, "hash-1")
+    store.contains(USER, "hash-2")
+    store.get(USER, "hash-1")
+
+    stats = store.get_stats()
+    assert stats["loads"] == 1
+    assert stats["hits"] == 2
+
+
+def test_own_writes_update_the_cache_without_reloading(db_path):
+    store = JDUsageStore(db_path)
+    assert store.contains(USER, "hash-1") is False
+
+    store.record(USER, "hash-1", company="Acme")
+
+    assert store.contains(USER, "hash-1") is True
+    stats = store.get_stats()
+    assert stats["loads"] == 1
+    assert stats["invalidations"] == 0
+
+
+def test_commit_from_another_connection_invalidates_the_cache(db_path):
+    # Two stores on one file stand in for two worker processes
+    reader = JDUsageStore(db_path)
+    writer = JDUsageStore(db_path)
+    assert reader.contains(USER, "hash-1") is False
+
+    writer.record(USER, "hash-1", company="Acme")
+
+    assert reader.contains(USER, "hash-1") is True
+    assert reader.get(USER, "hash-1")["usage_count"] == 1
+    stats = reader.get_stats()
+    assert stats["invalidations"] == 1
+    assert stats["loads"] == 2
+
+
+def test_concurrent_increments_from_two_connections_are_not_lost(db_path):
+    first, second = JDUsageStore(db_path), JDUsageStore(db_path)
+    for _ in range(3):
+        first.record(USER, "hash-1")
+        second.record(USER, "hash-1")
+
+    assert first.get(USER, "hash-1")["usage_count"] == 6
+    assert second.get(USER, "hash-1")["usage_count"] == 6
+
+
+def test_clear_user_removes_only_that_users_rows(db_path):
+    store = JDUsageStore(db_path)
+    store.record(USER, "hash-1")
+    store.record("b@example.com", "hash-1")
+
+    store.clear_user(USER)
+
+    assert store.all_for_user(USER) == {}
+    assert store.contains("b@example.com", "hash-1") is True
+    assert JDUsageStore(db_path).all_for_user(USER) == {}
+
+
+def test_legacy_history_is_imported_once(db_path, user_dirs):
+    legacy = user_dirs / USER / "jd_usage_history.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(json.dumps({
+        "jd_usage": {
+            "legacy-hash": {
+                "jd_url": JD_URL,
+                "company": "Acme",
+                "first_used": "2024-01-01T00:00:00",
+                "last_used": "2024-01-02T00:00:00",
+                "usage_count": 3,
+                "companies_used_with": ["Acme"],
+            }
+        }
+    }))
+
+    store = JDUsageStore(db_path)
+    assert store.get(USER, "legacy-hash")["usage_count"] == 3
+
+    store.clear_user(USER)
+    # A fresh store (new process) must not import the file again
+    assert JDUsageStore(db_path).contains(USER, "legacy-hash") is False
@@ -0,0 +1,258 @@
+"""
+Tests for the SQLite-backed background job queue: fair claiming, retries,
+requeueing of orphaned jobs and graceful drain.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.job_queue import CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(
+        db_path=str(tmp_path / "jobs.db"),
+        workers=2,
+        max_running_per_user=1,
+        max_attempts=3,
+        retry_base_seconds=0.01,
+        retry_max_seconds=0.05,
+        heartbeat_seconds=60,
+        stale_after_seconds=5,
+        poll_seconds=0.05,
+    )
+
+
+async def _wait_for_status(queue: JobQueue, job_id: str, statuses, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get_job(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} stayed {queue.get_job(job_id)['status']}")
+
+
+def _mark_stale(queue: JobQueue, job_id: str) -> None:
+    with queue._lock:
+        conn = queue._connection()
+        conn.execute("UPDATE jobs SET heartbeat_at = ? WHERE job_id = ?", (time.time() - 60, job_id))
+        conn.commit()
+
+
+def test_enqueue_reuses_queued_job_with_same_dedupe_key(queue):
+    first = queue.enqueue("pipeline", "a@example.com", {"company": "Acme"}, dedupe_key="a:Acme")
+    second = queue.enqueue("pipeline", "a@example.com", {"company": "Acme"}, dedupe_key="a:Acme")
+
+    assert first == second
+    assert queue.get_job(first)["payload"] == {"company": "Acme"}
+    assert queue.get_stats()["counts"] == {QUEUED: 1}
+
+
+def test_claim_is_fair_across_users_and_respects_running_cap(queue):
+    a1 = queue.enqueue("pipeline", "a@example.com", {"n": 1})
+    a2 = queue.enqueue("pipeline", "a@example.com", {"n": 2})
+    b1 = queue.enqueue("pipeline", "b@example.com", {"n": 1})
+
+    first = queue._claim_next()
+    second = queue._claim_next()
+
+    assert first["job_id"] == a1
+    # a@ is at its running cap, so b@'s job goes next even though a2 is older
+    assert second["job_id"] == b1
+    assert queue._claim_next() is None
+    assert queue.get_job(a1)["status"] == RUNNING
+    assert queue.get_job(a1)["attempts"] == 1
+    assert queue.get_job(a2)["status"] == QUEUED
+
+
+def test_claim_skips_jobs_waiting_for_retry(queue):
+    job_id = queue.enqueue("pipeline", "a@example.com", {})
+    queue._claim_next()
+    queue.retry_base_seconds = queue.retry_max_seconds = 60
+    queue._retry_later(job_id, attempt=1, error="boom")
+
+    assert queue._claim_next() is None
+    job = queue.get_job(job_id)
+    assert job["status"] == QUEUED
+    assert job["error"] == "boom"
+
+
+def test_cancel_only_affects_queued_jobs(queue):
+    running = queue.enqueue("pipeline", "a@example.com", {})
+    queue._claim_next()
+    queued = queue.enqueue("pipeline", "b@example.com", {})
+
+    assert queue.cancel(queued) is True
+    assert queue.get_job(queued)["status"] == CANCELLED
+    assert queue.cancel(running) is False
+    assert queue.get_job(running)["status"] == RUNNING
+
+
+def test_maintenance_requeues_stale_jobs(queue):
+    job_id = queue.enqueue("pipeline", "a@example.com", {})
+    queue._claim_next()
+    _mark_stale(queue, job_id)
+
+    queue._maintenance()
+
+    job = queue.get_job(job_id)
+    assert job["status"] == QUEUED
+    assert job["attempts"] == 1
+
+
+def test_maintenance_fails_stale_jobs_on_their_final_attempt(queue):
+    job_id = queue.enqueue("pipeline", "a@example.com", {}, max_attempts=1)
+    queue._claim_next()
+    _mark_stale(queue, job_id)
+
+    queue._maintenance()
+
+    job = queue.get_job(job_id)
+    assert job["status"] == FAILED
+    assert "final attempt" in job["error"]
+
+
+def test_maintenance_leaves_jobs_with_fresh_heartbeats(queue):
+    job_id = queue.enqueue("pipeline", "a@example.com", {})
+    queue._claim_next()
+
+    queue._maintenance()
+
+    assert queue.get_job(job_id)["status"] == RUNNING
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_job_and_stores_result_and_progress(queue):
+    async def handler(payload, context):
+        context.report_progress(step="started")
+        context.report_progress(step="done")
+        return {"echo": payload["value"]}
+
+    queue.register("echo", handler)
+    queue.start()
+    try:
+        job_id = queue.enqueue("echo", "a@example.com", {"value": 42})
+        job = await _wait_for_status(queue, job_id, {SUCCEEDED, FAILED})
+    finally:
+        await queue.drain(timeout=1)
+
+    assert job["status"] == SUCCEEDED
+    assert job["result"] == {"echo": 42}
+    assert job["progress"] == {"step": "done"}
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_until_it_succeeds(queue):
+    calls = []
+
+    async def flaky(payload, context):
+        calls.append(context.attempt)
+        if context.attempt < 2:
+            raise RuntimeError("transient")
+        return "ok"
+
+    queue.register("flaky", flaky)
+    queue.start()
+    try:
+        job_id = queue.enqueue("flaky", "a@example.com", {})
+        job = await _wait_for_status(queue, job_id, {SUCCEEDED, FAILED})
+    finally:
+        await queue.drain(timeout=1)
+
+    assert job["status"] == SUCCEEDED
+    assert job["attempts"] == 2
+    assert calls == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_job_fails_after_exhausting_attempts(queue):
+    async def broken(payload, context):
+        raise ValueError("always")
+
+    queue.register("broken", broken)
+    queue.start()
+    try:
+        job_id = queue.enqueue("broken", "a@example.com", {}, max_attempts=2)
+        job = await _wait_for_status(queue, job_id, {SUCCEEDED, FAILED})
+    finally:
+        await queue.drain(timeout=1)
+
+    assert job["status"] == FAILED
+    assert job["attempts"] == 2
+    assert job["error"] == "ValueError: always"
+
+
+@pytest.mark.asyncio
+async def test_unknown_kind_fails_without_retry(queue):
+    queue.start()
+    try:
+        job_id = queue.enqueue("missing", "a@example.com", {})
+        job = await _wait_for_status(queue, job_id, {SUCCEEDED, FAILED})
+    finally:
+        await queue.drain(timeout=1)
+
+    assert job["status"] == FAILED
+    assert job["attempts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_running_jobs(queue):
+    started = asyncio.Event()
+
+    async def short(payload, context):
+        started.set()
+        await asyncio.sleep(0.1)
+        return "finished"
+
+    queue.register("short", short)
+    queue.start()
+    job_id = queue.enqueue("short", "a@example.com", {})
+    await asyncio.wait_for(started.wait(), timeout=5)
+
+    await queue.drain(timeout=5)
+
+    assert queue.get_job(job_id)["status"] == SUCCEEDED
+    assert queue.get_stats()["accepting"] is False
+
+
+@pytest.mark.asyncio
+async def test_drain_requeues_jobs_that_outlive_the_timeout(queue):
+    started = asyncio.Event()
+
+    async def slow(payload, context):
+        started.set()
+        await asyncio.sleep(30)
+
+    queue.register("slow", slow)
+    queue.start()
+    job_id = queue.enqueue("slow", "a@example.com", {})
+    await asyncio.wait_for(started.wait(), timeout=5)
+
+    await queue.drain(timeout=0.05)
+
+    job = queue.get_job(job_id)
+    assert job["status"] == QUEUED
+    # The interrupted attempt is not charged against the retry budget
+    assert job["attempts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_enqueue_from_a_thread_wakes_an_idle_worker(queue):
+    async def handler(payload, context):
+        return "ok"
+
+    queue.register("echo", handler)
+    queue.poll_seconds = 30  # only a wakeup can get the job claimed in time
+    queue.start()
+    await asyncio.sleep(0.05)  # let the workers go idle
+    try:
+        job_id = await asyncio.to_thread(queue.enqueue, "echo", "a@example.com", {})
+        job = await _wait_for_status(queue, job_id, {SUCCEEDED, FAILED}, timeout=2)
+    finally:
+        await queue.drain(timeout=1)
+
+    assert job["status"] == SUCCEEDED
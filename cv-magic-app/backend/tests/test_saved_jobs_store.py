@@ -0,0 +1,127 @@
+"""
+Tests for the SQLite saved jobs store and the service wrapping it.
+"""
+
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from app.services import saved_jobs_service
+from app.services.saved_jobs_service import SavedJobsService
+from app.services.saved_jobs_store import SavedJobsStore
+
+
+def _job(url, company="Acme", title="Data Analyst", **extra):
+    return {"job_url": url, "company_name": company, "job_title": title, **extra}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SavedJobsStore(tmp_path / "saved_jobs.db", tmp_path / "saved_jobs.json")
+
+
+def test_upsert_inserts_then_merges_by_url(store):
+    assert store.upsert(_job("https://jobs.example.com/1", location="Sydney")) is True
+    assert store.upsert(_job("https://jobs.example.com/1", job_title="Senior Data Analyst")) is False
+
+    job = store.get("https://jobs.example.com/1")
+    assert job["job_title"] == "Senior Data Analyst"
+    # Fields not in the update are kept
+    assert job["location"] == "Sydney"
+    assert store.count() == 1
+
+
+def test_jobs_without_url_are_keyed_by_company_and_title(store):
+    assert store.upsert(_job(None)) is True
+    assert store.upsert(_job(None, description="pasted")) is False
+    assert store.upsert(_job(None, title="Engineer")) is True
+
+    assert store.count() == 2
+
+
+def test_list_keeps_insertion_order_and_paginates(store):
+    for n in range(5):
+        store.upsert(_job(f"https://jobs.example.com/{n}"))
+    # Updating an old job does not move it
+    store.upsert(_job("https://jobs.example.com/0", job_title="Updated"))
+
+    urls = [job["job_url"] for job in store.list()]
+    assert urls == [f"https://jobs.example.com/{n}" for n in range(5)]
+    assert [job["job_url"] for job in store.list(offset=1, limit=2)] == urls[1:3]
+
+
+def test_add_if_absent_skips_saved_urls(store):
+    store.upsert(_job("https://jobs.example.com/1"))
+
+    added = store.add_if_absent([_job("https://jobs.example.com/1"), _job("https://jobs.example.com/2")])
+
+    assert added == 1
+    assert store.count() == 2
+
+
+def test_add_if_absent_matches_company_and_title_only_when_asked(store):
+    store.upsert(_job("https://jobs.example.com/1"))
+    duplicate_posting = _job("https://other-board.example.com/9")
+
+    assert store.add_if_absent([duplicate_posting], match_title=True) == 0
+    assert store.add_if_absent([duplicate_posting]) == 1
+
+
+def test_delete_and_clear(store):
+    store.upsert(_job("https://jobs.example.com/1"))
+    store.upsert(_job("https://jobs.example.com/2"))
+
+    assert store.delete("https://jobs.example.com/1") is True
+    assert store.delete("https://jobs.example.com/1") is False
+    assert store.count() == 1
+
+    store.clear()
+    assert store.list() == []
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = tmp_path / "saved_jobs.json"
+    legacy.write_text(json.dumps({"jobs": [_job("https://jobs.example.com/1"), _job("https://jobs.example.com/2")]}))
+
+    store = SavedJobsStore(tmp_path / "saved_jobs.db", legacy)
+    assert store.count() == 2
+    store.delete("https://jobs.example.com/1")
+
+    reopened = SavedJobsStore(tmp_path / "saved_jobs.db", legacy)
+    assert reopened.count() == 1
+
+
+def test_concurrent_upserts_are_not_lost(tmp_path):
+    db_path = tmp_path / "saved_jobs.db"
+    # Separate stores stand in for separate worker processes sharing the file
+    stores = [SavedJobsStore(db_path) for _ in range(4)]
+
+    def save(index, store):
+        for n in range(25):
+            store.upsert(_job(f"https://jobs.example.com/{index}-{n}"))
+
+    threads = [threading.Thread(target=save, args=(i, s)) for i, s in enumerate(stores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert SavedJobsStore(db_path).count() == 100
+
+
+class _BrokenStore:
+    def list(self, offset=0, limit=None):
+        raise sqlite3.OperationalError("database is locked")
+
+    def count(self):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_service_reads_degrade_to_empty_results(monkeypatch):
+    monkeypatch.setattr(saved_jobs_service, "get_saved_jobs_store", lambda user_email: _BrokenStore())
+    service = SavedJobsService("a@example.com")
+
+    assert service.get_all_jobs() == []
+    assert service.count_jobs() == 0
@@ -0,0 +1,185 @@
+"""
+Tests for the async stage graph: dependency ordering, concurrency of
+independent stages, skipping, and cancellation on required failures.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.utils.stage_graph import CANCELLED, FAILED, SKIPPED, SUCCEEDED, StageGraph
+
+
+def _stage(value, delay=0.0, log=None, name=None):
+    async def run(inputs):
+        if log is not None:
+            log.append(("start", name, dict(inputs)))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", name))
+        return value
+    return run
+
+
+async def _raise(inputs):
+    raise RuntimeError("llm timeout")
+
+
+async def _none(inputs):
+    return None
+
+
+@pytest.mark.asyncio
+async def test_dependants_receive_outputs_and_run_after_dependencies():
+    log = []
+    graph = (
+        StageGraph("test")
+        .add("extract", _stage("skills", log=log, name="extract"))
+        .add("compare", _stage("matched", log=log, name="compare"), depends_on=["extract"])
+    )
+
+    runs = await graph.run()
+
+    assert runs["extract"].status == runs["compare"].status == SUCCEEDED
+    assert runs["compare"].output == "matched"
+    assert log == [
+        ("start", "extract", {}),
+        ("end", "extract"),
+        ("start", "compare", {"extract": "skills"}),
+        ("end", "compare"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_concurrently():
+    graph = (
+        StageGraph("test")
+        .add("a", _stage(1, delay=0.2))
+        .add("b", _stage(2, delay=0.2))
+        .add("c", _stage(3, delay=0.2))
+        .add("join", _stage("done"), depends_on=["a", "b", "c"])
+    )
+
+    started = time.perf_counter()
+    runs = await graph.run()
+    elapsed = time.perf_counter() - started
+
+    assert runs["join"].status == SUCCEEDED
+    # Critical path is one 0.2s stage, not three in a row
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_failed_dependency_skips_dependants():
+    graph = (
+        StageGraph("test")
+        .add("extract", _raise)
+        .add("compare", _stage("matched"), depends_on=["extract"])
+        .add("report", _stage("report"), depends_on=["compare"])
+        .add("independent", _stage("ok"))
+    )
+
+    runs = await graph.run()
+
+    assert runs["extract"].status == FAILED
+    assert runs["extract"].error == "llm timeout"
+    assert runs["compare"].status == SKIPPED
+    assert "extract" in runs["compare"].error
+    assert runs["report"].status == SKIPPED
+    assert runs["independent"].status == SUCCEEDED
+
+
+@pytest.mark.asyncio
+async def test_returning_none_counts_as_failure():
+    graph = StageGraph("test").add("extract", _none).add("compare", _stage("matched"), depends_on=["extract"])
+
+    runs = await graph.run()
+
+    assert runs["extract"].status == FAILED
+    assert runs["compare"].status == SKIPPED
+
+
+@pytest.mark.asyncio
+async def test_after_runs_regardless_of_outcome():
+    log = []
+    graph = (
+        StageGraph("test")
+        .add("analysis", _raise)
+        .add("cleanup", _stage("cleaned", log=log, name="cleanup"), after=["analysis"])
+    )
+
+    runs = await graph.run()
+
+    assert runs["cleanup"].status == SUCCEEDED
+    # Failed ordering-only dependencies hand over None
+    assert log[0] == ("start", "cleanup", {"analysis": None})
+
+
+@pytest.mark.asyncio
+async def test_required_failure_cancels_pending_and_running_stages():
+    graph = (
+        StageGraph("test")
+        .add("extract", _raise, required=True)
+        .add("slow", _stage("late", delay=5))
+        .add("compare", _stage("matched"), after=["slow"])
+    )
+
+    started = time.perf_counter()
+    runs = await graph.run()
+
+    assert time.perf_counter() - started < 1
+    assert runs["extract"].status == FAILED
+    assert runs["slow"].status == CANCELLED
+    assert runs["compare"].status == CANCELLED
+
+
+@pytest.mark.asyncio
+async def test_optional_failure_does_not_cancel_other_stages():
+    graph = StageGraph("test").add("optional", _raise).add("slow", _stage("done", delay=0.05))
+
+    runs = await graph.run()
+
+    assert runs["optional"].status == FAILED
+    assert runs["slow"].status == SUCCEEDED
+
+
+@pytest.mark.asyncio
+async def test_timings_are_reported():
+    graph = StageGraph("test").add("a", _stage(1, delay=0.05)).add("b", _stage(2), depends_on=["a"])
+
+    runs = await graph.run()
+
+    summary = runs["b"].to_dict()
+    assert summary["status"] == SUCCEEDED
+    assert summary["started_offset_seconds"] >= 0.05
+    assert runs["a"].duration >= 0.05
+
+
+def test_duplicate_stage_names_are_rejected():
+    graph = StageGraph("test").add("a", _stage(1))
+
+    with pytest.raises(ValueError):
+        graph.add("a", _stage(2))
+
+
+@pytest.mark.asyncio
+async def test_unknown_dependency_is_rejected():
+    graph = StageGraph("test").add("a", _stage(1), depends_on=["missing"])
+
+    with pytest.raises(ValueError, match="unknown stage 'missing'"):
+        await graph.run()
+
+
+@pytest.mark.asyncio
+async def test_cycles_are_rejected_before_running():
+    log = []
+    graph = (
+        StageGraph("test")
+        .add("a", _stage(1, log=log, name="a"), depends_on=["b"])
+        .add("b", _stage(2, log=log, name="b"), after=["a"])
+    )
+
+    with pytest.raises(ValueError, match="cycle"):
+        await graph.run()
+    assert log == []